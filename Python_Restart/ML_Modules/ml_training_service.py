@@ -7,37 +7,97 @@ Monitors for training data, trains models, and provides predictions
 import pandas as pd
 import numpy as np
 import json
-import joblib
 import time
 import os
+import argparse
 from pathlib import Path
 from datetime import datetime
 
-# ML libraries
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.model_selection import TimeSeriesSplit, cross_val_score
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import classification_report, roc_auc_score, confusion_matrix
-import xgboost as xgb
+# ML libraries (sklearn, xgboost, joblib) are imported where models are
+# trained or unpickled: serving from ENSEMBLE_FILE needs only numpy
+from tree_ensemble import TreeEnsemble, export_ensemble
+from service_telemetry import ServiceTelemetry
 
 # Configuration
 DATA_DIR = Path("ML_Data")
 FEATURES_FILE = DATA_DIR / "current_features.json"
+# Feature store vector (python/scripts/run_feature_server.py), for models
+# trained on store features instead of the EA's
+STORE_FEATURES_FILE = DATA_DIR / "store_features.json"
 PREDICTION_FILE = DATA_DIR / "prediction.json"
 TRAINING_DATA_FILE = DATA_DIR / "training_data.csv"
 RETRAIN_TRIGGER_FILE = DATA_DIR / "retrain_trigger.txt"
 MODEL_FILE = "trading_model.pkl"
 SCALER_FILE = "feature_scaler.pkl"
+# Model + scaler as flat arrays for NumPy-only inference (tree_ensemble.py)
+ENSEMBLE_FILE = "trading_model.npz"
+
+# Default hyperparameters per model type (MLTradingModel / training_orchestrator override them)
+MODEL_PARAMS = {
+    'random_forest': {
+        'n_estimators': 200,
+        'max_depth': 15,
+        'min_samples_split': 20,
+        'min_samples_leaf': 10,
+        'max_features': 'sqrt',
+        'random_state': 42,
+        'class_weight': 'balanced',
+    },
+    'gradient_boosting': {
+        'n_estimators': 200,
+        'max_depth': 7,
+        'learning_rate': 0.05,
+        'subsample': 0.8,
+        'random_state': 42,
+    },
+    'xgboost': {
+        'n_estimators': 200,
+        'max_depth': 7,
+        'learning_rate': 0.05,
+        'subsample': 0.8,
+        'colsample_bytree': 0.8,
+        'random_state': 42,
+    },
+}
+
+
+def create_model(model_type, y, params=None, n_jobs=-1):
+    """
+    Unfitted classifier of model_type with MODEL_PARAMS updated by params
+
+    Args:
+        y: Training labels (set xgboost's scale_pos_weight)
+        n_jobs: Threads per model (1 when models run in a process pool)
+    """
+    if model_type not in MODEL_PARAMS:
+        raise ValueError(f"Unknown model type: {model_type}")
+    settings = dict(MODEL_PARAMS[model_type], **(params or {}))
+
+    if model_type == 'random_forest':
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(n_jobs=n_jobs, **settings)
+    if model_type == 'gradient_boosting':
+        from sklearn.ensemble import GradientBoostingClassifier
+        return GradientBoostingClassifier(**settings)
+    import xgboost as xgb
+    settings.setdefault('scale_pos_weight', (y == 0).sum() / (y == 1).sum())
+    return xgb.XGBClassifier(n_jobs=n_jobs, **settings)
+
 
 class MLTradingModel:
     """
     Machine learning model for trading signal prediction
     """
 
-    def __init__(self, model_type='random_forest'):
+    def __init__(self, model_type='random_forest', params=None):
         self.model_type = model_type
+        self.params = dict(params or {})
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None
+        # NumPy evaluator of model + scaler, used for predictions when available
+        self.ensemble = None
+        # File the model was last loaded from or saved to
+        self.model_file = None
         self.feature_importance = None
         self.metrics = {}
 
@@ -49,6 +109,10 @@ class MLTradingModel:
             df: DataFrame with features and labels
             target_rr: Minimum R:R for positive label
         """
+        from sklearn.model_selection import TimeSeriesSplit, cross_val_score
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.metrics import classification_report, roc_auc_score, confusion_matrix
+
         print(f"\n{'='*60}")
         print(f"Training {self.model_type} model...")
         print(f"{'='*60}")
@@ -62,43 +126,14 @@ class MLTradingModel:
         print(f"Positive samples: {y.sum()} ({y.mean()*100:.1f}%)")
 
         # Scale features
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
 
         # Time series cross-validation
         tscv = TimeSeriesSplit(n_splits=5)
 
         # Model selection
-        if self.model_type == 'random_forest':
-            self.model = RandomForestClassifier(
-                n_estimators=200,
-                max_depth=15,
-                min_samples_split=20,
-                min_samples_leaf=10,
-                max_features='sqrt',
-                random_state=42,
-                n_jobs=-1,
-                class_weight='balanced'
-            )
-        elif self.model_type == 'gradient_boosting':
-            self.model = GradientBoostingClassifier(
-                n_estimators=200,
-                max_depth=7,
-                learning_rate=0.05,
-                subsample=0.8,
-                random_state=42
-            )
-        elif self.model_type == 'xgboost':
-            scale_pos_weight = (y == 0).sum() / (y == 1).sum()
-            self.model = xgb.XGBClassifier(
-                n_estimators=200,
-                max_depth=7,
-                learning_rate=0.05,
-                subsample=0.8,
-                colsample_bytree=0.8,
-                scale_pos_weight=scale_pos_weight,
-                random_state=42,
-                n_jobs=-1
-            )
+        self.model = create_model(self.model_type, y, self.params)
 
         # Cross-validation
         print("\nPerforming time-series cross-validation...")
@@ -141,6 +176,7 @@ class MLTradingModel:
             'cv_roc_auc_mean': cv_scores.mean(),
             'cv_roc_auc_std': cv_scores.std(),
             'train_roc_auc': roc_auc_score(y, y_prob),
+            'params': self.params,
             'trained_at': datetime.now().isoformat()
         }
 
@@ -158,22 +194,26 @@ class MLTradingModel:
         Predict probability of profitable trade
 
         Args:
-            features: List or array of 80 features
+            features: Feature vector in training column order (EA's 40 features,
+                or core.feature_store.FEATURE_NAMES when trained on store features)
 
         Returns:
             dict with probability, confidence, and signal
         """
-        if self.model is None:
+        if self.model is None and self.ensemble is None:
             self.load()
 
-        # Ensure features is 2D array
-        features = np.array(features).reshape(1, -1)
+        if self.ensemble is not None:
+            probability = self.ensemble.predict_proba(features)[0]
+        else:
+            # Ensure features is 2D array
+            features = np.array(features).reshape(1, -1)
 
-        # Scale features
-        features_scaled = self.scaler.transform(features)
+            # Scale features
+            features_scaled = self.scaler.transform(features)
 
-        # Get prediction
-        probability = self.model.predict_proba(features_scaled)[0][1]
+            # Get prediction
+            probability = self.model.predict_proba(features_scaled)[0][1]
 
         # Calculate confidence (distance from 0.5)
         confidence = abs(probability - 0.5) * 2  # 0 to 1 scale
@@ -194,20 +234,47 @@ class MLTradingModel:
         }
 
     def save(self):
-        """Save model and scaler to disk"""
+        """Save model and scaler to disk (pickled, and as arrays for NumPy inference)"""
+        import joblib
+
         joblib.dump(self.model, MODEL_FILE)
         joblib.dump(self.scaler, SCALER_FILE)
         print(f"Model saved to {MODEL_FILE}")
         print(f"Scaler saved to {SCALER_FILE}")
 
+        try:
+            self.ensemble = export_ensemble(self.model, self.scaler, ENSEMBLE_FILE)
+            self.model_file = ENSEMBLE_FILE
+            print(f"Inference arrays saved to {ENSEMBLE_FILE}")
+        except ValueError as e:
+            self.ensemble = None
+            self.model_file = MODEL_FILE
+            print(f"WARNING: No NumPy export ({e})")
+
         # Save feature importance
         if self.feature_importance is not None:
             self.feature_importance.to_csv(DATA_DIR / 'feature_importance.csv', index=False)
 
     def load(self):
-        """Load model and scaler from disk"""
+        """
+        Load model and scaler from disk
+
+        The exported arrays are used when they are at least as new as the
+        pickled model; the pickles (and sklearn/xgboost) are then not loaded.
+        """
+        if os.path.exists(ENSEMBLE_FILE) and (not os.path.exists(MODEL_FILE) or
+                                              os.path.getmtime(ENSEMBLE_FILE) >= os.path.getmtime(MODEL_FILE)):
+            self.ensemble = TreeEnsemble.load(ENSEMBLE_FILE)
+            self.model_file = ENSEMBLE_FILE
+            print(f"Model loaded from {ENSEMBLE_FILE} ({self.ensemble.n_trees} trees)")
+            return True
+
         if os.path.exists(MODEL_FILE) and os.path.exists(SCALER_FILE):
+            import joblib
+
+            self.ensemble = None
             self.model = joblib.load(MODEL_FILE)
+            self.model_file = MODEL_FILE
             self.scaler = joblib.load(SCALER_FILE)
             print("Model and scaler loaded successfully")
             return True
@@ -215,15 +282,41 @@ class MLTradingModel:
             print("WARNING: Model files not found")
             return False
 
+    def feature_count(self):
+        """Features the model was trained on (0 if no model is loaded)"""
+        if self.ensemble is not None:
+            return self.ensemble.n_features
+        return int(getattr(self.scaler, 'n_features_in_', 0))
+
+    def model_info(self):
+        """Loaded model class, file and version (file modification time) for service status"""
+        if self.ensemble is not None:
+            model_class = self.ensemble.model_class
+        elif self.model is not None:
+            model_class = type(self.model).__name__
+        else:
+            return {'model_class': None, 'model_file': None, 'model_version': None}
+        version = (datetime.fromtimestamp(os.path.getmtime(self.model_file)).isoformat()
+                   if self.model_file and os.path.exists(self.model_file) else None)
+        return {'model_class': model_class, 'model_file': str(self.model_file), 'model_version': version}
+
 
 class PredictionServer:
     """
     Service that monitors for prediction requests and responds
+
+    Stage latencies, throughput and errors are published to
+    ML_Data/status/prediction_server.json (service_telemetry.py).
+
+    Args:
+        features_file: FEATURES_FILE (EA features) or STORE_FEATURES_FILE
     """
 
-    def __init__(self, model):
+    def __init__(self, model, features_file=FEATURES_FILE):
         self.model = model
+        self.features_file = Path(features_file)
         self.prediction_count = 0
+        self.telemetry = ServiceTelemetry('prediction_server', DATA_DIR, model.model_info())
 
     def run(self):
         """
@@ -232,31 +325,53 @@ class PredictionServer:
         print(f"\n{'='*60}")
         print("ML Prediction Server Started")
         print(f"{'='*60}")
-        print(f"Monitoring: {FEATURES_FILE}")
+        print(f"Monitoring: {self.features_file}")
         print(f"Predictions: {PREDICTION_FILE}")
         print("Waiting for requests...\n")
 
         last_modified_time = 0
+        telemetry = self.telemetry
 
         while True:
+            stage = None
             try:
                 # Check if features file exists and has been updated
-                if FEATURES_FILE.exists():
-                    current_modified_time = FEATURES_FILE.stat().st_mtime
+                if self.features_file.exists():
+                    current_modified_time = self.features_file.stat().st_mtime
 
                     if current_modified_time > last_modified_time:
                         # New request received
-                        with open(FEATURES_FILE, 'r') as f:
-                            data = json.load(f)
-
-                        features = data['features']
+                        stage = 'read'
+                        with telemetry.stage(stage):
+                            with open(self.features_file, 'r') as f:
+                                text = f.read()
+
+                        stage = 'parse'
+                        with telemetry.stage(stage):
+                            features = json.loads(text)['features']
+                            expected = self.model.feature_count()
+                            if expected and len(features) != expected:
+                                last_modified_time = current_modified_time
+                                raise ValueError(f"{self.features_file.name} has {len(features)} features, "
+                                                 f"the model was trained on {expected}")
 
                         # Get prediction
-                        prediction = self.model.predict_probability(features)
+                        stage = 'infer'
+                        with telemetry.stage(stage):
+                            prediction = self.model.predict_probability(features)
 
                         # Write prediction
-                        with open(PREDICTION_FILE, 'w') as f:
-                            json.dump(prediction, f, indent=2)
+                        stage = 'write'
+                        with telemetry.stage(stage):
+                            with open(PREDICTION_FILE, 'w') as f:
+                                json.dump(prediction, f, indent=2)
+
+                        # Feature file written -> prediction written
+                        telemetry.record('end_to_end', max(time.time() - current_modified_time, 0.0))
+                        telemetry.prediction()
+                        # Requests written while this one was served (the file only holds the latest)
+                        telemetry.set_gauge('queue_depth', int(self.features_file.stat().st_mtime > current_modified_time))
+                        stage = None
 
                         self.prediction_count += 1
                         print(f"[{datetime.now().strftime('%H:%M:%S')}] "
@@ -275,14 +390,18 @@ class PredictionServer:
 
                     # Load new data and retrain
                     if TRAINING_DATA_FILE.exists():
+                        stage = 'retrain'
                         df = pd.read_csv(TRAINING_DATA_FILE)
                         self.model.train(df)
+                        telemetry.set_info(**self.model.model_info())
+                        stage = None
 
                     # Remove trigger file
                     RETRAIN_TRIGGER_FILE.unlink()
 
                     print("Resuming prediction service...\n")
 
+                telemetry.publish()
                 time.sleep(0.1)  # Check every 100ms
 
             except KeyboardInterrupt:
@@ -290,6 +409,8 @@ class PredictionServer:
                 break
             except Exception as e:
                 print(f"ERROR: {e}")
+                telemetry.error(e, stage)
+                telemetry.publish(force=True)
                 time.sleep(1)
 
 
@@ -316,6 +437,11 @@ def main():
     """
     Main entry point
     """
+    parser = argparse.ArgumentParser(description="ML training and prediction service")
+    parser.add_argument('--store-features', action='store_true',
+                        help=f"Predict from {STORE_FEATURES_FILE} (model trained on feature store features)")
+    args = parser.parse_args()
+
     print("""
     ╔═══════════════════════════════════════════════════════════════╗
     ║        ML TRADING SERVICE - Real Machine Learning             ║
@@ -329,7 +455,7 @@ def main():
     # Initial training or load existing model
     model = MLTradingModel()
 
-    if os.path.exists(MODEL_FILE):
+    if os.path.exists(MODEL_FILE) or os.path.exists(ENSEMBLE_FILE):
         print("Loading existing model...")
         model.load()
     else:
@@ -344,7 +470,7 @@ def main():
             print("Using neutral predictions until first training...")
 
     # Start prediction server
-    server = PredictionServer(model)
+    server = PredictionServer(model, STORE_FEATURES_FILE if args.store_features else FEATURES_FILE)
     server.run()
 
 
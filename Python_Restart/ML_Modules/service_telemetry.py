@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Service Telemetry for ML Services
+Rolling latency histograms, throughput and error state of a prediction service
+
+Each service times its stages (read, parse, infer, write, and end_to_end
+from the input file's mtime to the prediction being written), counts
+predictions and errors, and publishes a status file
+ML_Data/status/<service>.json at most every PUBLISH_INTERVAL seconds.
+MLIntegration.get_ml_status in the dashboard reads these files, so prediction
+latency can be watched while the EA and services are under load.
+
+Histograms have the same layout as the dashboard's core/instrumentation.py:
+lifetime count/mean/max plus p50/p95/p99 and bucket counts of the last
+WINDOW_SIZE samples.
+"""
+
+import bisect
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Histogram bucket upper bounds (milliseconds); the last bucket is open-ended
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Samples kept per stage for the rolling percentiles/histogram
+WINDOW_SIZE = 512
+
+# Seconds over which throughput is measured
+THROUGHPUT_WINDOW = 60.0
+
+# Minimum seconds between status file writes
+PUBLISH_INTERVAL = 1.0
+
+STATUS_DIR_NAME = "status"
+
+
+class LatencyHistogram:
+    """
+    Latency of one stage: lifetime totals plus a rolling window of samples
+    """
+
+    def __init__(self, window=WINDOW_SIZE):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self):
+        ordered = sorted(self.samples)
+
+        def pct(p):
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000.0, 3) \
+                if ordered else 0.0
+
+        buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        for seconds in ordered:
+            buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, seconds * 1000.0)] += 1
+
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count * 1000.0, 3) if self.count else 0.0,
+            'p50_ms': pct(50),
+            'p95_ms': pct(95),
+            'p99_ms': pct(99),
+            'max_ms': round(self.max * 1000.0, 3),
+            'window': len(ordered),
+            'buckets': buckets,
+        }
+
+
+class ServiceTelemetry:
+    """
+    Stage timers, counters and status file of one service
+
+    Usage:
+        telemetry = ServiceTelemetry('prediction_server', DATA_DIR)
+        with telemetry.stage('infer'):
+            prediction = model.predict_probability(features)
+        telemetry.prediction()
+        telemetry.publish()
+    """
+
+    def __init__(self, service, ml_data_dir, info=None):
+        self.service = service
+        self.status_file = Path(ml_data_dir) / STATUS_DIR_NAME / f"{service}.json"
+        self.info = dict(info or {})
+        self.histograms = {}
+        self.gauges = {}
+        self.predictions = 0
+        self.errors = 0
+        self.last_error = None
+        self.started = time.time()
+        self._recent = deque()
+        self._last_publish = 0.0
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage `name` (recorded even if it raises)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.add(seconds)
+
+    def prediction(self, count=1):
+        """Count `count` predictions written"""
+        now = time.time()
+        self.predictions += count
+        self._recent.append((now, count))
+        self._expire(now)
+
+    def error(self, error, stage=None):
+        """Count an error and keep it as the last error"""
+        self.errors += 1
+        self.last_error = {
+            'message': str(error),
+            'type': type(error).__name__ if isinstance(error, BaseException) else 'error',
+            'stage': stage,
+            'time': datetime.now().isoformat(),
+        }
+
+    def set_gauge(self, name, value):
+        """Current value of e.g. queue depth"""
+        self.gauges[name] = value
+
+    def set_info(self, **info):
+        """Static details such as model_type / model_version"""
+        self.info.update(info)
+
+    def _expire(self, now):
+        while self._recent and self._recent[0][0] < now - THROUGHPUT_WINDOW:
+            self._recent.popleft()
+
+    def snapshot(self):
+        now = time.time()
+        self._expire(now)
+        window = min(THROUGHPUT_WINDOW, max(now - self.started, 1e-9))
+        attempts = self.predictions + self.errors
+        return {
+            'service': self.service,
+            'pid': os.getpid(),
+            'started': datetime.fromtimestamp(self.started).isoformat(),
+            'updated': now,
+            'uptime_s': round(now - self.started, 1),
+            'info': self.info,
+            'predictions': self.predictions,
+            'errors': self.errors,
+            'error_rate': round(self.errors / attempts, 4) if attempts else 0.0,
+            'throughput_per_min': round(sum(count for _, count in self._recent) / window * 60.0, 2),
+            'last_error': self.last_error,
+            'gauges': self.gauges,
+            'bucket_bounds_ms': list(BUCKET_BOUNDS_MS),
+            'stages': {name: self.histograms[name].to_dict() for name in sorted(self.histograms)},
+        }
+
+    def publish(self, force=False):
+        """Write the status file (at most every PUBLISH_INTERVAL seconds unless forced)"""
+        now = time.time()
+        if not force and now - self._last_publish < PUBLISH_INTERVAL:
+            return False
+        self._last_publish = now
+        try:
+            self.status_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.status_file.with_suffix('.json.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(self.snapshot(), f, indent=2)
+            tmp.replace(self.status_file)
+            return True
+        except OSError:
+            # Telemetry must never stop the service
+            return False
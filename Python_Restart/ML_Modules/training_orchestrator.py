@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Training Orchestrator for Trading EA
+Walk-forward model sweep: folds x model types x parameter grid in a process pool
+
+Every (candidate, fold) pair is fitted in its own worker process with a
+scaler fitted on the fold's training rows only, and scored on the fold's
+test rows. Fold results are cached in ML_Data/orchestrator_cache/ under a
+hash of the fold's data and the candidate, so rerunning a sweep (or
+extending the grid) only fits what is new. The leaderboard ranks
+candidates by mean out-of-sample ROC-AUC and reports timing per candidate.
+
+Usage:
+    python training_orchestrator.py
+    python training_orchestrator.py --models random_forest xgboost --folds 6 --cpus 8
+    python training_orchestrator.py --refit-best
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import TimeSeriesSplit
+from sklearn.preprocessing import StandardScaler
+
+from ml_training_service import DATA_DIR, MODEL_PARAMS, TRAINING_DATA_FILE, MLTradingModel, create_model
+
+CACHE_DIR = DATA_DIR / "orchestrator_cache"
+LEADERBOARD_FILE = DATA_DIR / "leaderboard.csv"
+
+# Parameter values swept per model type (unlisted parameters keep MODEL_PARAMS)
+PARAM_GRID = {
+    'random_forest': {
+        'max_depth': [7, 15],
+        'min_samples_leaf': [5, 10, 20],
+    },
+    'gradient_boosting': {
+        'max_depth': [3, 5, 7],
+        'learning_rate': [0.05, 0.1],
+    },
+    'xgboost': {
+        'max_depth': [3, 5, 7],
+        'learning_rate': [0.05, 0.1],
+    },
+}
+
+DEFAULT_FOLDS = 5
+# Rows dropped between each training window and its test window (overlapping trade labels)
+DEFAULT_GAP = 0
+
+# PredictionServer signals ENTER at P >= 0.6 with confidence >= 0.5, i.e. P >= 0.75
+ENTER_PROBABILITY = 0.75
+
+# Bump when the fold procedure changes so cached results are not reused
+CACHE_VERSION = 1
+
+# Worker process data (set once per worker by _init_worker)
+_X = None
+_y = None
+
+
+def candidates(model_types, grid=None):
+    """(model_type, params) for every combination of the grid values of each model type"""
+    grid = PARAM_GRID if grid is None else grid
+    for model_type in model_types:
+        model_grid = grid.get(model_type, {})
+        names = sorted(model_grid)
+        for values in itertools.product(*(model_grid[name] for name in names)):
+            yield model_type, dict(zip(names, values))
+
+
+def walk_forward_folds(n_samples, n_folds=DEFAULT_FOLDS, gap=DEFAULT_GAP):
+    """(train_end, test_start, test_end) row bounds of expanding-window folds"""
+    splitter = TimeSeriesSplit(n_splits=n_folds, gap=gap)
+    return [(int(train[-1]) + 1, int(test[0]), int(test[-1]) + 1)
+            for train, test in splitter.split(np.zeros((n_samples, 1)))]
+
+
+def fold_hash(X, y, fold):
+    """Hash of a fold's training and test rows and labels"""
+    train_end, test_start, test_end = fold
+    digest = hashlib.sha1()
+    for block in (X[:train_end], y[:train_end], X[test_start:test_end], y[test_start:test_end]):
+        digest.update(np.ascontiguousarray(block).tobytes())
+    return digest.hexdigest()
+
+
+def fold_key(data_hash, model_type, params):
+    """Cache key of one candidate on one fold"""
+    candidate = json.dumps([CACHE_VERSION, model_type, MODEL_PARAMS[model_type], params],
+                           sort_keys=True, default=str)
+    return hashlib.sha1((data_hash + candidate).encode()).hexdigest()
+
+
+def available_cpus():
+    """CPUs this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _init_worker(X, y):
+    global _X, _y
+    _X, _y = X, y
+
+
+def fit_fold(model_type, params, fold):
+    """Fit one candidate on one fold (in a worker) and score its test rows"""
+    train_end, test_start, test_end = fold
+    X_train, y_train = _X[:train_end], _y[:train_end]
+    X_test, y_test = _X[test_start:test_end], _y[test_start:test_end]
+
+    start = time.perf_counter()
+    scaler = StandardScaler().fit(X_train)
+    model = create_model(model_type, y_train, params, n_jobs=1)
+    model.fit(scaler.transform(X_train), y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    probability = model.predict_proba(scaler.transform(X_test))[:, 1]
+    predict_seconds = time.perf_counter() - start
+
+    enter = probability >= ENTER_PROBABILITY
+    return {
+        'roc_auc': float(roc_auc_score(y_test, probability)) if len(np.unique(y_test)) > 1 else float('nan'),
+        'accuracy': float(accuracy_score(y_test, probability >= 0.5)),
+        'enter_rate': float(enter.mean()),
+        'enter_win_rate': float(y_test[enter].mean()) if enter.any() else float('nan'),
+        'train_rows': train_end,
+        'test_rows': test_end - test_start,
+        'fit_seconds': fit_seconds,
+        'predict_seconds': predict_seconds,
+    }
+
+
+class TrainingOrchestrator:
+    """
+    Runs a walk-forward sweep and builds the leaderboard
+    """
+
+    def __init__(self, df, n_folds=DEFAULT_FOLDS, gap=DEFAULT_GAP, cpus=None, cache_dir=CACHE_DIR):
+        self.feature_cols = [col for col in df.columns if col.startswith('feature_')]
+        self.X = np.ascontiguousarray(df[self.feature_cols].to_numpy(dtype=float))
+        self.y = df['label'].to_numpy(dtype=int)
+        self.folds = walk_forward_folds(len(df), n_folds, gap)
+        self.cpus = cpus or max(1, available_cpus() - 1)
+        self.cache_dir = Path(cache_dir)
+
+    def _cached(self, key):
+        path = self.cache_dir / f"{key}.json"
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Ignoring cache {path.name}: {e}")
+        return None
+
+    def _store(self, key, result):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_dir / f"{key}.json.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(result, f)
+        tmp.replace(self.cache_dir / f"{key}.json")
+
+    def run(self, model_types, grid=None):
+        """
+        Fit every (candidate, fold) not in the cache, cpus processes at a time
+
+        Returns:
+            DataFrame with one row per (candidate, fold)
+        """
+        rows = []
+        pending = []
+        data_hashes = [fold_hash(self.X, self.y, fold) for fold in self.folds]
+        for model_type, params in candidates(model_types, grid):
+            for index, fold in enumerate(self.folds):
+                key = fold_key(data_hashes[index], model_type, params)
+                task = {'model_type': model_type, 'params': json.dumps(params, sort_keys=True),
+                        'fold': index, 'key': key}
+                cached = self._cached(key)
+                if cached is not None:
+                    rows.append({**task, **cached, 'cached': True})
+                else:
+                    pending.append((task, params, fold))
+
+        print(f"{len(rows) + len(pending)} fold fits ({len(self.folds)} folds), "
+              f"{len(rows)} cached, {len(pending)} to run on {self.cpus} processes")
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=min(self.cpus, len(pending)),
+                                     initializer=_init_worker, initargs=(self.X, self.y)) as pool:
+                futures = {pool.submit(fit_fold, task['model_type'], params, fold): task
+                           for task, params, fold in pending}
+                for done, future in enumerate(as_completed(futures), 1):
+                    task = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"ERROR: {task['model_type']} {task['params']} fold {task['fold']}: {e}")
+                        continue
+                    self._store(task['key'], result)
+                    rows.append({**task, **result, 'cached': False})
+                    print(f"[{done}/{len(pending)}] {task['model_type']} {task['params']} "
+                          f"fold {task['fold']}: AUC={result['roc_auc']:.4f} ({result['fit_seconds']:.1f}s)")
+
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def leaderboard(results):
+        """One row per candidate ranked by mean out-of-sample ROC-AUC"""
+        board = results.groupby(['model_type', 'params']).agg(
+            roc_auc_mean=('roc_auc', 'mean'),
+            roc_auc_std=('roc_auc', 'std'),
+            accuracy=('accuracy', 'mean'),
+            enter_rate=('enter_rate', 'mean'),
+            enter_win_rate=('enter_win_rate', 'mean'),
+            folds=('fold', 'count'),
+            cached_folds=('cached', 'sum'),
+            fit_seconds=('fit_seconds', 'sum'),
+            predict_ms_per_row=('predict_seconds', 'sum'),
+        ).reset_index()
+        test_rows = results.groupby(['model_type', 'params'])['test_rows'].sum().to_numpy()
+        board['predict_ms_per_row'] = board['predict_ms_per_row'] / test_rows * 1000
+        return board.sort_values('roc_auc_mean', ascending=False).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward model sweep")
+    parser.add_argument('--data', default=str(TRAINING_DATA_FILE), help="Training CSV (feature_* and label columns)")
+    parser.add_argument('--models', nargs='+', default=list(PARAM_GRID), choices=list(MODEL_PARAMS),
+                        help="Model types to sweep (default: all)")
+    parser.add_argument('--folds', type=int, default=DEFAULT_FOLDS, help="Walk-forward folds")
+    parser.add_argument('--gap', type=int, default=DEFAULT_GAP, help="Rows between train and test windows")
+    parser.add_argument('--cpus', type=int, help="Worker processes (default: all cores but one)")
+    parser.add_argument('--refit-best', action='store_true',
+                        help="Train and save the best candidate on all data (as MLTradingModel.train)")
+    args = parser.parse_args()
+
+    if not Path(args.data).exists():
+        print(f"No training data found at {args.data}")
+        return
+
+    df = pd.read_csv(args.data)
+    start = time.perf_counter()
+    orchestrator = TrainingOrchestrator(df, args.folds, args.gap, args.cpus)
+    results = orchestrator.run(args.models)
+    if results.empty:
+        print("No fold results")
+        return
+
+    board = TrainingOrchestrator.leaderboard(results)
+    DATA_DIR.mkdir(exist_ok=True)
+    board.to_csv(LEADERBOARD_FILE, index=False)
+
+    print(f"\n{'='*60}")
+    print(f"LEADERBOARD ({len(df)} samples, {len(orchestrator.feature_cols)} features, "
+          f"{time.perf_counter() - start:.1f}s)")
+    print(f"{'='*60}")
+    print(board.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print(f"\nSaved to {LEADERBOARD_FILE}")
+
+    if args.refit_best:
+        best = board.iloc[0]
+        print(f"\nRefitting best candidate: {best['model_type']} {best['params']}")
+        MLTradingModel(best['model_type'], json.loads(best['params'])).train(df)
+
+
+if __name__ == "__main__":
+    main()
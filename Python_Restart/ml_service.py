@@ -2,15 +2,22 @@
 """
 ML Service - Monitors EA exports and generates trading predictions
 Runs continuously in the background
+
+Stage latencies, throughput and errors are published to
+ML_Data/status/ml_service.json (ML_Modules/service_telemetry.py).
 """
 
 import json
 import os
+import sys
 import time
 from pathlib import Path
 from datetime import datetime
 import logging
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "ML_Modules"))
+from service_telemetry import ServiceTelemetry
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,6 +25,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ML_VERSION = '1.0_simple'
+MODEL_TYPE = 'rule_based'  # Change to 'xgboost' or 'neural_net' when you add real ML
+
 
 class MLPredictionService:
     """
@@ -50,6 +60,8 @@ class MLPredictionService:
         self.last_market_data_mtime = None
         self.last_features_mtime = None
         self.prediction_count = 0
+        self.telemetry = ServiceTelemetry('ml_service', self.ml_data_dir,
+                                          {'ml_version': ML_VERSION, 'model_type': MODEL_TYPE})
 
         logger.info(f"ML Service initialized")
         logger.info(f"Monitoring directory: {self.ml_data_dir}")
@@ -73,6 +85,7 @@ class MLPredictionService:
 
         except Exception as e:
             logger.error(f"Error checking file: {e}")
+            self.telemetry.error(e, 'check')
 
         return False
 
@@ -84,16 +97,21 @@ class MLPredictionService:
             dict: Market data or None if error
         """
         try:
-            with open(self.market_data_file, 'r') as f:
-                data = json.load(f)
+            with self.telemetry.stage('read'):
+                with open(self.market_data_file, 'r') as f:
+                    text = f.read()
+            with self.telemetry.stage('parse'):
+                data = json.loads(text)
             return data
 
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in market_data.json: {e}")
+            self.telemetry.error(e, 'parse')
             return None
 
         except Exception as e:
             logger.error(f"Error reading market_data.json: {e}")
+            self.telemetry.error(e, 'read')
             return None
 
     def generate_prediction(self, market_data):
@@ -149,8 +167,8 @@ class MLPredictionService:
             'timestamp': datetime.now().isoformat(),
             'symbol': symbol,
             'spread_analyzed': spread,
-            'ml_version': '1.0_simple',
-            'model_type': 'rule_based'  # Change to 'xgboost' or 'neural_net' when you add real ML
+            'ml_version': ML_VERSION,
+            'model_type': MODEL_TYPE
         }
 
         return prediction
@@ -166,14 +184,17 @@ class MLPredictionService:
             bool: Success status
         """
         try:
-            with open(self.prediction_file, 'w') as f:
-                json.dump(prediction, f, indent=2)
+            with self.telemetry.stage('write'):
+                with open(self.prediction_file, 'w') as f:
+                    json.dump(prediction, f, indent=2)
 
             self.prediction_count += 1
+            self.telemetry.prediction()
             return True
 
         except Exception as e:
             logger.error(f"Error writing prediction: {e}")
+            self.telemetry.error(e, 'write')
             return False
 
     def run_once(self):
@@ -194,10 +215,13 @@ class MLPredictionService:
 
         # Generate prediction
         logger.info(f"📊 Generating prediction for {market_data.get('symbol', 'UNKNOWN')}")
-        prediction = self.generate_prediction(market_data)
+        with self.telemetry.stage('infer'):
+            prediction = self.generate_prediction(market_data)
 
         # Write prediction
         if self.write_prediction(prediction):
+            # Market data written -> prediction written
+            self.telemetry.record('end_to_end', max(time.time() - self.last_market_data_mtime, 0.0))
             logger.info(f"✅ Prediction #{self.prediction_count}: {prediction['signal']} "
                        f"(prob: {prediction['probability']:.2f}, conf: {prediction['confidence']:.2f})")
             logger.info(f"   Reasoning: {prediction['reasoning']}")
@@ -223,6 +247,7 @@ class MLPredictionService:
         try:
             while True:
                 self.run_once()
+                self.telemetry.publish()
                 time.sleep(check_interval)
 
         except KeyboardInterrupt:
@@ -233,6 +258,8 @@ class MLPredictionService:
 
         except Exception as e:
             logger.error(f"Fatal error in ML service: {e}")
+            self.telemetry.error(e, 'fatal')
+            self.telemetry.publish(force=True)
             raise
 
 
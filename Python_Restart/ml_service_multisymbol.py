@@ -2,15 +2,22 @@
 """
 Multi-Symbol ML Service - Enterprise Grade
 Monitors 10 symbols, generates predictions for all, EA reads its symbol's prediction
+
+Stage latencies, throughput and errors are published to
+ML_Data/status/ml_service_multisymbol.json (ML_Modules/service_telemetry.py).
 """
 
 import json
 import os
+import sys
 import time
 from pathlib import Path
 from datetime import datetime
 import logging
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "ML_Modules"))
+from service_telemetry import ServiceTelemetry
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +32,9 @@ except ImportError:
     MT5_AVAILABLE = False
     logger.warning("MetaTrader5 module not available - install with: pip install MetaTrader5")
 
+ML_VERSION = '2.0_multi_symbol'
+MODEL_TYPE = 'rule_based_enhanced'
+
 
 class MultiSymbolMLService:
     """
@@ -65,6 +75,9 @@ class MultiSymbolMLService:
         # Tracking
         self.prediction_count = 0
         self.mt5_connected = False
+        self.telemetry = ServiceTelemetry('ml_service_multisymbol', self.ml_data_dir,
+                                          {'ml_version': ML_VERSION, 'model_type': MODEL_TYPE,
+                                           'symbols': len(self.symbols)})
 
         logger.info("Multi-Symbol ML Service initialized")
         logger.info(f"Monitoring {len(self.symbols)} symbols")
@@ -137,6 +150,7 @@ class MultiSymbolMLService:
 
         except Exception as e:
             logger.error(f"Error getting data for {symbol}: {e}")
+            self.telemetry.error(e, 'read')
             return None
 
     def generate_prediction(self, symbol_data):
@@ -207,19 +221,25 @@ class MultiSymbolMLService:
             dict: Predictions for all symbols
         """
         predictions = {}
+        missing = 0
 
         for symbol in self.symbols:
             # Get symbol data
-            symbol_data = self.get_symbol_data(symbol)
+            with self.telemetry.stage('read'):
+                symbol_data = self.get_symbol_data(symbol)
+            if symbol_data is None:
+                missing += 1
 
             # Generate prediction
-            prediction = self.generate_prediction(symbol_data)
+            with self.telemetry.stage('infer'):
+                prediction = self.generate_prediction(symbol_data)
 
             predictions[symbol] = prediction
 
             # Log
             logger.info(f"📊 {symbol}: {prediction['signal']} (prob: {prediction['probability']:.2f}, spread: {prediction.get('spread_analyzed', 0):.1f} pips)")
 
+        self.telemetry.set_gauge('symbols_without_data', missing)
         return predictions
 
     def write_predictions(self, predictions):
@@ -235,19 +255,22 @@ class MultiSymbolMLService:
         try:
             output = {
                 'timestamp': datetime.now().isoformat(),
-                'ml_version': '2.0_multi_symbol',
-                'model_type': 'rule_based_enhanced',
+                'ml_version': ML_VERSION,
+                'model_type': MODEL_TYPE,
                 'symbols': predictions
             }
 
-            with open(self.prediction_file, 'w') as f:
-                json.dump(output, f, indent=2)
+            with self.telemetry.stage('write'):
+                with open(self.prediction_file, 'w') as f:
+                    json.dump(output, f, indent=2)
 
             self.prediction_count += 1
+            self.telemetry.prediction(len(predictions))
             return True
 
         except Exception as e:
             logger.error(f"Error writing predictions: {e}")
+            self.telemetry.error(e, 'write')
             return False
 
     def run_once(self):
@@ -258,10 +281,13 @@ class MultiSymbolMLService:
         logger.info(f"Generating predictions for {len(self.symbols)} symbols...")
         logger.info("="*60)
 
+        start = time.perf_counter()
         predictions = self.generate_all_predictions()
 
         # Write to file
         if self.write_predictions(predictions):
+            # Whole batch: first symbol fetched -> prediction file written
+            self.telemetry.record('end_to_end', time.perf_counter() - start)
             logger.info("="*60)
             logger.info(f"✅ Batch #{self.prediction_count} - All predictions written")
             logger.info("="*60)
@@ -293,6 +319,7 @@ class MultiSymbolMLService:
         try:
             while True:
                 self.run_once()
+                self.telemetry.publish()
                 time.sleep(check_interval)
 
         except KeyboardInterrupt:
@@ -303,6 +330,8 @@ class MultiSymbolMLService:
 
         except Exception as e:
             logger.error(f"Fatal error: {e}")
+            self.telemetry.error(e, 'fatal')
+            self.telemetry.publish(force=True)
             raise
 
         finally:
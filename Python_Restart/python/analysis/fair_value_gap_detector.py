@@ -24,6 +24,8 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import pandas as pd
 
+from core.instrumentation import instrumentation
+
 
 class FairValueGapDetector:
     """
@@ -39,6 +41,7 @@ class FairValueGapDetector:
     def __init__(self):
         self.detected_fvgs = {}  # {symbol: [FVG1, FVG2, ...]}
 
+    @instrumentation.timed('analyzer')
     def detect_fair_value_gaps(self, candles: List[Dict], symbol: str = "UNKNOWN",
                                lookback: int = 50, min_gap_pips: float = 5) -> List[Dict]:
         """
@@ -19,6 +19,8 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import pandas as pd
 
+from core.instrumentation import instrumentation
+
 
 class LiquiditySweepDetector:
     """
@@ -34,6 +36,7 @@ class LiquiditySweepDetector:
     def __init__(self):
         self.detected_sweeps = {}  # {symbol: [sweep1, sweep2, ...]}
 
+    @instrumentation.timed('analyzer')
     def detect_liquidity_sweeps(self, candles: List[Dict], symbol: str = "UNKNOWN",
                                lookback: int = 50, tolerance_pips: float = 3) -> List[Dict]:
         """
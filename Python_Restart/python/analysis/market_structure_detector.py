@@ -21,6 +21,8 @@ from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import pandas as pd
 
+from core.instrumentation import instrumentation
+
 
 class MarketStructureDetector:
     """
@@ -37,6 +39,7 @@ class MarketStructureDetector:
         self.structure_events = {}  # {symbol: [event1, event2, ...]}
         self.current_trends = {}  # {symbol: 'BULLISH'/'BEARISH'/'NEUTRAL'}
 
+    @instrumentation.timed('analyzer')
     def detect_structure_shifts(self, candles: List[Dict], symbol: str = "UNKNOWN",
                                lookback: int = 50) -> Tuple[List[Dict], str]:
         """
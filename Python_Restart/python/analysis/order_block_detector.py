@@ -16,6 +16,8 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import pandas as pd
 
+from core.instrumentation import instrumentation
+
 
 class OrderBlockDetector:
     """
@@ -31,6 +33,7 @@ class OrderBlockDetector:
     def __init__(self):
         self.detected_order_blocks = {}  # {symbol: [OB1, OB2, ...]}
 
+    @instrumentation.timed('analyzer')
     def detect_order_blocks(self, candles: List[Dict], symbol: str = "UNKNOWN",
                            lookback: int = 50, min_impulse_pips: float = 15) -> List[Dict]:
         """
@@ -3,16 +3,20 @@ Wyckoff Method Analyzer
 Implements Richard Wyckoff's accumulation/distribution analysis with LPS/LPSY detection
 """
 
+import threading
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
-try:
-    import MetaTrader5 as mt5
-    MT5_AVAILABLE = True
-except ImportError:
-    MT5_AVAILABLE = False
+from core.lazy_loader import lazy_import
+from core.instrumentation import instrumentation
+from core.bar_resampler import bar_resampler
+from analysis.wyckoff_pipeline import WyckoffPipeline, PHASES, ACCUMULATION, DISTRIBUTION
+
+# MetaTrader5 is imported on first use to keep startup fast
+mt5 = lazy_import('MetaTrader5')
+MT5_AVAILABLE = mt5 is not None
 
 
 class WyckoffPhase(Enum):
@@ -71,14 +75,19 @@ class WyckoffAnalyzer:
         # Phase detection parameters
         self.range_periods = 50  # Bars to define accumulation/distribution range
         self.range_tolerance = 0.02  # 2% tolerance for ranging market
+
+        # Incremental feature/event state per (symbol, timeframe)
+        self._pipelines: Dict[Tuple, WyckoffPipeline] = {}
+        self._lock = threading.Lock()
         
+    @instrumentation.timed('analyzer')
     def analyze_symbol(self, symbol: str, timeframe, bars: int = 100) -> Optional[Dict]:
         """
         Perform complete Wyckoff analysis on a symbol
         
         Args:
             symbol: Trading symbol (e.g., "EURUSD")
-            timeframe: MT5 timeframe constant
+            timeframe: MT5 timeframe constant (or name, e.g. 'H4')
             bars: Number of bars to analyze
             
         Returns:
@@ -88,14 +97,8 @@ class WyckoffAnalyzer:
             return None
             
         try:
-            if not mt5.initialize():
-                return None
-                
-            # Get price and volume data
-            rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, bars)
-            tick_volume = mt5.copy_rates_from_pos(symbol, timeframe, 0, bars)
-            
-            mt5.shutdown()
+            # Price and tick volume, derived from the shared base series
+            rates = bar_resampler.copy_rates(symbol, timeframe, bars)
             
             if rates is None or len(rates) < self.lookback_bars:
                 return None
@@ -108,22 +111,23 @@ class WyckoffAnalyzer:
             volumes = rates['tick_volume']  # MT5 tick volume
             times = rates['time']
             
-            # Calculate technical indicators
-            atr = self._calculate_atr(highs, lows, closes, period=14)
-            volume_ma = self._calculate_sma(volumes, period=self.volume_ma_period)
+            # Rolling features and resolved events (only bars new since the last call are computed)
+            features, family_events = self._run_pipeline(symbol, timeframe, rates)
+            atr = features['atr']
+            volume_ma = features['volume_ma']
             
             # Detect current phase
-            current_phase = self._detect_phase(highs, lows, closes, volumes, volume_ma)
+            current_phase = self._detect_phase(features)
             
-            # Detect Wyckoff events
-            events = self._detect_events(
-                highs, lows, closes, opens, volumes, volume_ma, atr, current_phase
-            )
+            # Wyckoff events of the current phase
+            events = self._detect_events(family_events, current_phase)
             
             # Find LPS/LPSY opportunities
             lps_lpsy = self._find_lps_lpsy(
-                highs, lows, closes, opens, volumes, volume_ma, atr, events, current_phase
+                highs, lows, closes, opens, volumes, features, events, current_phase
             )
+            if lps_lpsy:
+                lps_lpsy['time'] = int(times[lps_lpsy['index']])
             
             # Volume analysis
             volume_analysis = self._analyze_volume(volumes, volume_ma, closes)
@@ -154,226 +158,53 @@ class WyckoffAnalyzer:
             print(f"Error in Wyckoff analysis: {e}")
             return None
             
-    def _calculate_atr(self, highs: np.ndarray, lows: np.ndarray, 
-                       closes: np.ndarray, period: int = 14) -> np.ndarray:
-        """Calculate Average True Range"""
-        tr = np.zeros(len(highs))
-        tr[0] = highs[0] - lows[0]
-        
-        for i in range(1, len(highs)):
-            hl = highs[i] - lows[i]
-            hc = abs(highs[i] - closes[i-1])
-            lc = abs(lows[i] - closes[i-1])
-            tr[i] = max(hl, hc, lc)
-            
-        # Simple moving average of TR
-        atr = np.convolve(tr, np.ones(period)/period, mode='same')
-        return atr
-        
-    def _calculate_sma(self, data: np.ndarray, period: int) -> np.ndarray:
-        """Calculate Simple Moving Average"""
-        return np.convolve(data, np.ones(period)/period, mode='same')
-        
-    def _detect_phase(self, highs: np.ndarray, lows: np.ndarray, 
-                      closes: np.ndarray, volumes: np.ndarray,
-                      volume_ma: np.ndarray) -> WyckoffPhase:
+    def _run_pipeline(self, symbol: str, timeframe, rates: np.ndarray) -> Tuple[Dict, Dict]:
+        """Features aligned with `rates` and events per family, from the symbol's pipeline"""
+        key = (symbol, bar_resampler.timeframe_name(timeframe) or timeframe)
+        with self._lock:
+            pipeline = self._pipelines.get(key)
+            if pipeline is None:
+                pipeline = self._pipelines[key] = WyckoffPipeline(self)
+            return pipeline.update(rates)
+
+    def _detect_phase(self, features: Dict[str, np.ndarray]) -> WyckoffPhase:
         """
-        Detect current Wyckoff phase
+        Current Wyckoff phase (the last bar's rolling phase)
         
-        Logic:
-        - ACCUMULATION: Price ranging with high volume (smart money buying)
-        - MARKUP: Price rising with increasing volume
-        - DISTRIBUTION: Price ranging at high levels with high volume
-        - MARKDOWN: Price falling with increasing volume
+        Logic (over the last range_periods bars):
+        - ACCUMULATION: Price ranging low in the range with rising volume (smart money buying)
+        - DISTRIBUTION: Price ranging high in the range with rising volume
+        - MARKUP: Price above a rising 20 SMA, 20 SMA > 50 SMA by 2%
+        - MARKDOWN: Price below a falling 20 SMA, 20 SMA < 50 SMA by 2%
         """
-        # Analyze last 50 bars
-        recent_bars = min(50, len(closes))
-        recent_closes = closes[-recent_bars:]
-        recent_highs = highs[-recent_bars:]
-        recent_lows = lows[-recent_bars:]
-        recent_volumes = volumes[-recent_bars:]
-        
-        # Calculate range metrics
-        range_high = np.max(recent_highs)
-        range_low = np.min(recent_lows)
-        range_size = range_high - range_low
-        current_price = closes[-1]
-        
-        # Price position in range
-        if range_size > 0:
-            price_position = (current_price - range_low) / range_size
-        else:
-            price_position = 0.5
-            
-        # Trend direction
-        sma_20 = np.mean(recent_closes[-20:])
-        sma_50 = np.mean(recent_closes) if len(recent_closes) >= 50 else sma_20
-        
-        # Volume trend
-        recent_volume_avg = np.mean(recent_volumes)
-        older_volume_avg = np.mean(volumes[-100:-50]) if len(volumes) >= 100 else recent_volume_avg
-        volume_increasing = recent_volume_avg > older_volume_avg * 1.1
-        
-        # Price volatility (ranging vs trending)
-        price_changes = np.diff(recent_closes)
-        volatility = np.std(price_changes)
-        
-        # Check if ranging (price oscillating within narrow range)
-        ranging = range_size < (range_high * self.range_tolerance)
-        
-        # Phase detection logic
-        if ranging and price_position < 0.4 and volume_increasing:
-            # Low price range with high volume = Accumulation
-            return WyckoffPhase.ACCUMULATION
+        return WyckoffPhase(PHASES[int(features['phase'][-1])])
             
-        elif ranging and price_position > 0.6 and volume_increasing:
-            # High price range with high volume = Distribution
-            return WyckoffPhase.DISTRIBUTION
-            
-        elif current_price > sma_20 > sma_50 and sma_20 > sma_50 * 1.02:
-            # Strong uptrend = Markup
-            return WyckoffPhase.MARKUP
-            
-        elif current_price < sma_20 < sma_50 and sma_20 < sma_50 * 0.98:
-            # Strong downtrend = Markdown
-            return WyckoffPhase.MARKDOWN
-            
-        else:
-            return WyckoffPhase.UNKNOWN
-            
-    def _detect_events(self, highs: np.ndarray, lows: np.ndarray,
-                       closes: np.ndarray, opens: np.ndarray,
-                       volumes: np.ndarray, volume_ma: np.ndarray,
-                       atr: np.ndarray, phase: WyckoffPhase) -> List[Dict]:
+    def _detect_events(self, family_events: Dict[int, List[Dict]],
+                       phase: WyckoffPhase) -> List[Dict]:
         """
-        Detect Wyckoff events in price history
+        Wyckoff events of the current phase's family
         
+        Accumulation events (SC, AR, ST, Spring) while accumulating,
+        distribution events (BC, AR, ST, UT) while distributing, none otherwise.
         Returns list of detected events with their bar index and details
         """
-        events = []
-        
-        # Only analyze recent bars for event detection
-        lookback = min(self.range_periods, len(closes))
-        
-        for i in range(lookback, len(closes)):
-            bar_range = highs[i] - lows[i]
-            relative_volume = volumes[i] / volume_ma[i] if volume_ma[i] > 0 else 1.0
-            
-            # Detect climax conditions (very high volume + wide spread)
-            is_climax = (relative_volume > self.climax_volume_threshold and 
-                        bar_range > atr[i] * self.wide_spread_threshold)
-            
-            # Detect low volume conditions
-            is_low_volume = relative_volume < self.low_volume_threshold
-            
-            # Detect narrow spread
-            is_narrow_spread = bar_range < atr[i] * self.narrow_spread_threshold
-            
-            # ACCUMULATION EVENTS
-            if phase == WyckoffPhase.ACCUMULATION:
-                
-                # Selling Climax (SC): Downward climax at bottom
-                if (is_climax and closes[i] < closes[i-1] and 
-                    lows[i] == np.min(lows[max(0, i-20):i+1])):
-                    events.append({
-                        'index': i,
-                        'event': WyckoffEvent.SC,
-                        'price': closes[i],
-                        'volume': volumes[i],
-                        'description': 'Selling Climax detected'
-                    })
-                    
-                # Automatic Rally (AR): Strong bounce after SC
-                elif (len(events) > 0 and events[-1]['event'] == WyckoffEvent.SC and
-                      i - events[-1]['index'] <= 5 and
-                      closes[i] > closes[i-1] and relative_volume > 1.2):
-                    events.append({
-                        'index': i,
-                        'event': WyckoffEvent.AR,
-                        'price': closes[i],
-                        'volume': volumes[i],
-                        'description': 'Automatic Rally after SC'
-                    })
-                    
-                # Secondary Test (ST): Test of SC low on lower volume
-                elif (is_low_volume and is_narrow_spread and
-                      abs(lows[i] - np.min(lows[max(0, i-30):i])) < atr[i] * 0.5):
-                    events.append({
-                        'index': i,
-                        'event': WyckoffEvent.ST,
-                        'price': closes[i],
-                        'volume': volumes[i],
-                        'description': 'Secondary Test on low volume'
-                    })
-                    
-                # Spring: False breakdown below support on low volume
-                elif (is_low_volume and 
-                      lows[i] < np.min(lows[max(0, i-20):i]) and
-                      closes[i] > lows[i] + bar_range * 0.6):  # Close in upper part
-                    events.append({
-                        'index': i,
-                        'event': WyckoffEvent.SPRING,
-                        'price': lows[i],
-                        'volume': volumes[i],
-                        'description': 'Spring - false breakdown'
-                    })
-                    
-            # DISTRIBUTION EVENTS
-            elif phase == WyckoffPhase.DISTRIBUTION:
-                
-                # Buying Climax (BC): Upward climax at top
-                if (is_climax and closes[i] > closes[i-1] and
-                    highs[i] == np.max(highs[max(0, i-20):i+1])):
-                    events.append({
-                        'index': i,
-                        'event': WyckoffEvent.BC,
-                        'price': closes[i],
-                        'volume': volumes[i],
-                        'description': 'Buying Climax detected'
-                    })
-                    
-                # Automatic Reaction (AR): Sharp drop after BC
-                elif (len(events) > 0 and events[-1]['event'] == WyckoffEvent.BC and
-                      i - events[-1]['index'] <= 5 and
-                      closes[i] < closes[i-1] and relative_volume > 1.2):
-                    events.append({
-                        'index': i,
-                        'event': WyckoffEvent.AR_DIST,
-                        'price': closes[i],
-                        'volume': volumes[i],
-                        'description': 'Automatic Reaction after BC'
-                    })
-                    
-                # Secondary Test (ST): Test of BC high on lower volume
-                elif (is_low_volume and is_narrow_spread and
-                      abs(highs[i] - np.max(highs[max(0, i-30):i])) < atr[i] * 0.5):
-                    events.append({
-                        'index': i,
-                        'event': WyckoffEvent.ST_DIST,
-                        'price': closes[i],
-                        'volume': volumes[i],
-                        'description': 'Secondary Test (Distribution) on low volume'
-                    })
-                    
-                # Upthrust (UT): False breakout above resistance on low volume
-                elif (is_low_volume and
-                      highs[i] > np.max(highs[max(0, i-20):i]) and
-                      closes[i] < highs[i] - bar_range * 0.6):  # Close in lower part
-                    events.append({
-                        'index': i,
-                        'event': WyckoffEvent.UPTHRUST,
-                        'price': highs[i],
-                        'volume': volumes[i],
-                        'description': 'Upthrust - false breakout'
-                    })
-                    
-        return events
+        family = {WyckoffPhase.ACCUMULATION: ACCUMULATION,
+                  WyckoffPhase.DISTRIBUTION: DISTRIBUTION}.get(phase)
+        if family is None:
+            return []
+        return [{
+            'index': event['index'],
+            'time': event['time'],
+            'event': WyckoffEvent(event['name']),
+            'price': event['price'],
+            'volume': event['volume'],
+            'description': event['description']
+        } for event in family_events[family]]
         
     def _find_lps_lpsy(self, highs: np.ndarray, lows: np.ndarray,
                        closes: np.ndarray, opens: np.ndarray,
-                       volumes: np.ndarray, volume_ma: np.ndarray,
-                       atr: np.ndarray, events: List[Dict],
-                       phase: WyckoffPhase) -> Optional[Dict]:
+                       volumes: np.ndarray, features: Dict[str, np.ndarray],
+                       events: List[Dict], phase: WyckoffPhase) -> Optional[Dict]:
         """
         Find Last Point of Support (LPS) or Last Point of Supply (LPSY)
         
@@ -386,137 +217,72 @@ class WyckoffAnalyzer:
         # Analyze last 20 bars for LPS/LPSY
         recent_bars = 20
         
-        # Check for LPS (Bullish)
         if phase in [WyckoffPhase.ACCUMULATION, WyckoffPhase.MARKUP]:
+            lps_type, setup_events = 'LPS', (WyckoffEvent.SPRING, WyckoffEvent.ST)
+        elif phase in [WyckoffPhase.DISTRIBUTION, WyckoffPhase.MARKDOWN]:
+            lps_type, setup_events = 'LPSY', (WyckoffEvent.UPTHRUST, WyckoffEvent.ST_DIST)
+        else:
+            return None
+        bullish = lps_type == 'LPS'
             
-            # Must have Spring or ST in recent history
-            has_spring = any(e['event'] == WyckoffEvent.SPRING for e in events[-10:]) if len(events) >= 10 else False
-            has_st = any(e['event'] == WyckoffEvent.ST for e in events[-10:]) if len(events) >= 10 else False
+        # Must have Spring/ST (LPS) or Upthrust/ST (LPSY) in recent history
+        if len(events) < 10 or not any(e['event'] in setup_events for e in events[-10:]):
+            return None
             
-            if not (has_spring or has_st):
-                return None
-                
-            # Look for LPS characteristics in last 10 bars
-            for i in range(len(closes) - 10, len(closes)):
-                if i < recent_bars:
-                    continue
-                    
-                bar_range = highs[i] - lows[i]
-                relative_volume = volumes[i] / volume_ma[i] if volume_ma[i] > 0 else 1.0
-                
-                # LPS criteria:
-                # 1. Low volume (< 80% of average)
-                # 2. Narrow spread (< 70% of ATR)
-                # 3. Close in upper half of bar
-                # 4. Higher low than Spring/ST
-                # 5. Pullback to support level
-                
-                is_low_vol = relative_volume < 0.8
-                is_narrow = bar_range < atr[i] * 0.7
-                close_upper = closes[i] > lows[i] + bar_range * 0.5
-                
-                # Check if this is a higher low
-                recent_low = np.min(lows[max(0, i-30):i])
-                is_higher_low = lows[i] > recent_low
-                
-                # Check if next bar bounces (confirmation)
-                if i < len(closes) - 1:
-                    next_bar_up = closes[i+1] > closes[i]
-                    volume_increases = volumes[i+1] > volumes[i]
-                else:
-                    next_bar_up = False
-                    volume_increases = False
-                    
-                if is_low_vol and is_narrow and close_upper and is_higher_low:
-                    
-                    # Calculate support/resistance flip level
-                    sr_flip = np.mean(highs[max(0, i-20):i])
-                    
-                    return {
-                        'type': 'LPS',
-                        'index': i,
-                        'price': closes[i],
-                        'low': lows[i],
-                        'high': highs[i],
-                        'volume': volumes[i],
-                        'relative_volume': relative_volume,
-                        'bar_range': bar_range,
-                        'confirmed': next_bar_up and volume_increases,
-                        'entry_trigger': highs[i],  # Enter above LPS high
-                        'stop_loss': lows[i],  # SL below LPS low
-                        'support_resistance': sr_flip,
-                        'description': 'Last Point of Support detected',
-                        'strength': self._calculate_lps_strength(
-                            is_low_vol, is_narrow, close_upper, next_bar_up, volume_increases
-                        )
-                    }
-                    
-        # Check for LPSY (Bearish)
-        elif phase in [WyckoffPhase.DISTRIBUTION, WyckoffPhase.MARKDOWN]:
+        # Look for LPS/LPSY characteristics in last 10 bars
+        bars = np.arange(max(len(closes) - 10, recent_bars), len(closes))
+        bar_range = features['bar_range'][bars]
+        relative_volume = features['relative_volume'][bars]
+        
+        # LPS (LPSY) criteria:
+        # 1. Low volume (< 80% of average)
+        # 2. Narrow spread (< 70% of ATR)
+        # 3. Close in upper (lower) half of bar
+        # 4. Higher low (lower high) than the last 30 bars
+        is_low_vol = relative_volume < 0.8
+        is_narrow = bar_range < features['atr'][bars] * 0.7
+        if bullish:
+            close_position = closes[bars] > lows[bars] + bar_range * 0.5
+            is_retest = lows[bars] > features['test_low'][bars]
+        else:
+            close_position = closes[bars] < highs[bars] - bar_range * 0.5
+            is_retest = highs[bars] < features['test_high'][bars]
             
-            # Must have Upthrust or ST in recent history
-            has_ut = any(e['event'] == WyckoffEvent.UPTHRUST for e in events[-10:]) if len(events) >= 10 else False
-            has_st = any(e['event'] == WyckoffEvent.ST_DIST for e in events[-10:]) if len(events) >= 10 else False
+        matches = np.flatnonzero(is_low_vol & is_narrow & close_position & is_retest)
+        if len(matches) == 0:
+            return None
+        k = matches[0]
+        i = int(bars[k])
+        
+        # Check if next bar moves away (confirmation)
+        if i < len(closes) - 1:
+            next_bar_confirms = closes[i+1] > closes[i] if bullish else closes[i+1] < closes[i]
+            volume_increases = volumes[i+1] > volumes[i]
+        else:
+            next_bar_confirms = False
+            volume_increases = False
             
-            if not (has_ut or has_st):
-                return None
-                
-            # Look for LPSY characteristics in last 10 bars
-            for i in range(len(closes) - 10, len(closes)):
-                if i < recent_bars:
-                    continue
-                    
-                bar_range = highs[i] - lows[i]
-                relative_volume = volumes[i] / volume_ma[i] if volume_ma[i] > 0 else 1.0
-                
-                # LPSY criteria:
-                # 1. Low volume
-                # 2. Narrow spread
-                # 3. Close in lower half of bar
-                # 4. Lower high than UT/ST
-                # 5. Rally to resistance level
-                
-                is_low_vol = relative_volume < 0.8
-                is_narrow = bar_range < atr[i] * 0.7
-                close_lower = closes[i] < highs[i] - bar_range * 0.5
-                
-                # Check if this is a lower high
-                recent_high = np.max(highs[max(0, i-30):i])
-                is_lower_high = highs[i] < recent_high
-                
-                # Check if next bar drops (confirmation)
-                if i < len(closes) - 1:
-                    next_bar_down = closes[i+1] < closes[i]
-                    volume_increases = volumes[i+1] > volumes[i]
-                else:
-                    next_bar_down = False
-                    volume_increases = False
-                    
-                if is_low_vol and is_narrow and close_lower and is_lower_high:
-                    
-                    # Calculate resistance/support flip level
-                    rs_flip = np.mean(lows[max(0, i-20):i])
-                    
-                    return {
-                        'type': 'LPSY',
-                        'index': i,
-                        'price': closes[i],
-                        'low': lows[i],
-                        'high': highs[i],
-                        'volume': volumes[i],
-                        'relative_volume': relative_volume,
-                        'bar_range': bar_range,
-                        'confirmed': next_bar_down and volume_increases,
-                        'entry_trigger': lows[i],  # Enter below LPSY low
-                        'stop_loss': highs[i],  # SL above LPSY high
-                        'support_resistance': rs_flip,
-                        'description': 'Last Point of Supply detected',
-                        'strength': self._calculate_lps_strength(
-                            is_low_vol, is_narrow, close_lower, next_bar_down, volume_increases
-                        )
-                    }
-                    
-        return None
+        # Support/resistance flip level
+        flip_level = np.mean(highs[max(0, i-20):i] if bullish else lows[max(0, i-20):i])
+        
+        return {
+            'type': lps_type,
+            'index': i,
+            'price': closes[i],
+            'low': lows[i],
+            'high': highs[i],
+            'volume': volumes[i],
+            'relative_volume': relative_volume[k],
+            'bar_range': bar_range[k],
+            'confirmed': bool(next_bar_confirms and volume_increases),
+            'entry_trigger': highs[i] if bullish else lows[i],  # Enter beyond the LPS/LPSY bar
+            'stop_loss': lows[i] if bullish else highs[i],  # SL on the other side
+            'support_resistance': flip_level,
+            'description': 'Last Point of Support detected' if bullish else 'Last Point of Supply detected',
+            'strength': self._calculate_lps_strength(
+                is_low_vol[k], is_narrow[k], close_position[k], next_bar_confirms, volume_increases
+            )
+        }
         
     def _calculate_lps_strength(self, low_vol: bool, narrow: bool,
                                 close_position: bool, next_confirm: bool,
@@ -0,0 +1,334 @@
+"""
+Wyckoff Event Pipeline
+Array-based features, event masks and incremental sequence state for WyckoffAnalyzer
+
+- Features are trailing rolling windows (ATR, volume MA, range extremes,
+  SMAs) computed with NumPy over whole arrays; no feature looks ahead, so
+  a closed bar's features never change
+- Every event is first a boolean candidate mask (climax, test, spring, ...)
+- Sequence rules (an AR must follow the SC within a few bars, one event per
+  bar per family) are resolved in one pass over the candidate bars only
+- A WyckoffPipeline keeps closed bars, their features and the resolver
+  state between calls: a new bar costs its own features over a fixed
+  context window, whatever the history length. The newest bar may still be
+  forming and is evaluated on a copy of the state, never committed
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Phase codes of the 'phase' feature (index into PHASES)
+PHASES = ('UNKNOWN', 'ACCUMULATION', 'MARKUP', 'DISTRIBUTION', 'MARKDOWN')
+UNKNOWN, ACCUMULATION, MARKUP, DISTRIBUTION, MARKDOWN = range(len(PHASES))
+
+ATR_PERIOD = 14
+SMA_FAST = 20
+# Windows of the climax/spring extremes and of the secondary test
+EXTREME_PERIOD = 20
+TEST_PERIOD = 30
+# AR: bars after the climax and minimum relative volume
+AR_MAX_BARS = 5
+AR_MIN_VOLUME = 1.2
+# ST: distance from the tested extreme, in ATRs
+TEST_TOLERANCE = 0.5
+# Spring/upthrust: close back inside this fraction of the bar
+TRAP_CLOSE = 0.6
+
+# Bars before a new bar that its features can depend on (volume trend: 2 x range_periods)
+CONTEXT_BARS = 101
+MAX_HISTORY = 2000
+
+# Event name, price field and description of each family, in resolution order
+EVENT_FAMILIES = {
+    ACCUMULATION: (('SC', 'close', 'Selling Climax detected'),
+                   ('AR', 'close', 'Automatic Rally after SC'),
+                   ('ST', 'close', 'Secondary Test on low volume'),
+                   ('SPRING', 'low', 'Spring - false breakdown')),
+    DISTRIBUTION: (('BC', 'close', 'Buying Climax detected'),
+                   ('AR_DIST', 'close', 'Automatic Reaction after BC'),
+                   ('ST_DIST', 'close', 'Secondary Test (Distribution) on low volume'),
+                   ('UPTHRUST', 'high', 'Upthrust - false breakout')),
+}
+
+
+# ----------------------------------------------------------------------
+# Rolling windows (trailing, shorter at the start of the series)
+# ----------------------------------------------------------------------
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    sums = np.cumsum(x, dtype=float)
+    sums[window:] = sums[window:] - sums[:-window]
+    return sums / np.minimum(np.arange(1, len(x) + 1), window)
+
+
+def trailing_windows(x: np.ndarray, window: int, fill: float) -> np.ndarray:
+    """(n, window) view whose row i is x[i-window+1 .. i], `fill` before the start"""
+    padded = np.concatenate([np.full(window - 1, fill), x])
+    return np.lib.stride_tricks.sliding_window_view(padded, window)
+
+
+def shift(x: np.ndarray, bars: int, fill: float) -> np.ndarray:
+    """x[i - bars] at i"""
+    out = np.full(len(x), fill, dtype=float)
+    if bars < len(x):
+        out[bars:] = x[:len(x) - bars]
+    return out
+
+
+# ----------------------------------------------------------------------
+# Features and candidate masks
+# ----------------------------------------------------------------------
+
+def compute_features(rates: np.ndarray, config, offset: int = 0) -> Dict[str, np.ndarray]:
+    """
+    Per-bar features of `rates` (MT5 layout)
+
+    `config` is the WyckoffAnalyzer whose thresholds apply; `offset` is the
+    position of rates[0] in the full history (warm-up rules use it).
+    """
+    highs = rates['high'].astype(float)
+    lows = rates['low'].astype(float)
+    closes = rates['close'].astype(float)
+    volumes = rates['tick_volume'].astype(float)
+    bars = offset + np.arange(1, len(rates) + 1)  # Bars of history up to and including i
+
+    prev_close = shift(closes, 1, closes[0])  # First bar: TR is its own range
+    bar_range = highs - lows
+    tr = np.maximum(bar_range, np.maximum(np.abs(highs - prev_close), np.abs(lows - prev_close)))
+    atr = rolling_mean(tr, ATR_PERIOD)
+
+    volume_ma = rolling_mean(volumes, config.volume_ma_period)
+    relative_volume = np.divide(volumes, volume_ma, out=np.ones_like(volumes), where=volume_ma > 0)
+
+    # Row i: bars i-width+1 .. i; column slices give every trailing extreme
+    period = config.range_periods
+    width = max(period, TEST_PERIOD + 1, EXTREME_PERIOD + 1)
+    high_windows = trailing_windows(highs, width, -np.inf)
+    low_windows = trailing_windows(lows, width, np.inf)
+
+    # Phase: range and trend of the last range_periods bars, volume against the range before
+    range_high = high_windows[:, -period:].max(axis=1)
+    range_low = low_windows[:, -period:].min(axis=1)
+    range_size = range_high - range_low
+    position = np.divide(closes - range_low, range_size, out=np.full_like(closes, 0.5),
+                         where=range_size > 0)
+    sma_fast = rolling_mean(closes, SMA_FAST)
+    sma_slow = np.where(bars >= period, rolling_mean(closes, period), sma_fast)
+    volume_avg = rolling_mean(volumes, period)
+    older_volume_avg = np.where(bars >= 2 * period, shift(volume_avg, period, 0.0), volume_avg)
+    volume_increasing = volume_avg > older_volume_avg * 1.1
+    ranging = range_size < range_high * config.range_tolerance
+
+    phase = np.full(len(rates), UNKNOWN, dtype=np.int8)
+    markdown = (closes < sma_fast) & (sma_fast < sma_slow) & (sma_fast < sma_slow * 0.98)
+    markup = (closes > sma_fast) & (sma_fast > sma_slow) & (sma_fast > sma_slow * 1.02)
+    phase[markdown] = MARKDOWN
+    phase[markup] = MARKUP
+    phase[ranging & (position > 0.6) & volume_increasing] = DISTRIBUTION
+    phase[ranging & (position < 0.4) & volume_increasing] = ACCUMULATION
+
+    return {
+        'prev_close': prev_close,
+        'bar_range': bar_range,
+        'atr': atr,
+        'volume_ma': volume_ma,
+        'relative_volume': relative_volume,
+        'low_min': low_windows[:, -EXTREME_PERIOD - 1:].min(axis=1),          # lows[i-20 .. i]
+        'high_max': high_windows[:, -EXTREME_PERIOD - 1:].max(axis=1),
+        'prior_low': low_windows[:, -EXTREME_PERIOD - 1:-1].min(axis=1),      # lows[i-20 .. i-1]
+        'prior_high': high_windows[:, -EXTREME_PERIOD - 1:-1].max(axis=1),
+        'test_low': low_windows[:, -TEST_PERIOD - 1:-1].min(axis=1),          # lows[i-30 .. i-1]
+        'test_high': high_windows[:, -TEST_PERIOD - 1:-1].max(axis=1),
+        'phase': phase,
+    }
+
+
+def event_masks(rates: np.ndarray, features: Dict[str, np.ndarray], config,
+                family: int) -> Tuple[np.ndarray, ...]:
+    """Candidate masks (climax, follow-through, test, trap) of one event family"""
+    highs, lows, closes = rates['high'], rates['low'], rates['close']
+    atr = features['atr']
+    bar_range = features['bar_range']
+    relative_volume = features['relative_volume']
+
+    climax = (relative_volume > config.climax_volume_threshold) & \
+             (bar_range > atr * config.wide_spread_threshold)
+    low_volume = relative_volume < config.low_volume_threshold
+    narrow = bar_range < atr * config.narrow_spread_threshold
+    up = closes > features['prev_close']
+    down = closes < features['prev_close']
+
+    if family == ACCUMULATION:
+        return (climax & down & (lows == features['low_min']),
+                up & (relative_volume > AR_MIN_VOLUME),
+                low_volume & narrow & (np.abs(lows - features['test_low']) < atr * TEST_TOLERANCE),
+                low_volume & (lows < features['prior_low']) & (closes > lows + bar_range * TRAP_CLOSE))
+    return (climax & up & (highs == features['high_max']),
+            down & (relative_volume > AR_MIN_VOLUME),
+            low_volume & narrow & (np.abs(highs - features['test_high']) < atr * TEST_TOLERANCE),
+            low_volume & (highs > features['prior_high']) & (closes < highs - bar_range * TRAP_CLOSE))
+
+
+# ----------------------------------------------------------------------
+# Incremental pipeline
+# ----------------------------------------------------------------------
+
+class WyckoffPipeline:
+    """
+    Closed bars, features and resolved events of one symbol/timeframe
+
+    Usage:
+        pipeline = WyckoffPipeline(analyzer)
+        features, events = pipeline.update(rates)   # any window of the latest bars
+        events[ACCUMULATION]                         # [{'index', 'time', 'event', ...}]
+    """
+
+    def __init__(self, config, max_history: int = MAX_HISTORY):
+        self.config = config
+        self.max_history = max_history
+        self.reset()
+
+    def reset(self):
+        self.rates: Optional[np.ndarray] = None   # Closed bars, oldest first
+        self.features: Dict[str, np.ndarray] = {}
+        self.start = 0                             # Position of rates[0] since the first bar seen
+        self.events: Dict[int, List[Dict]] = {family: [] for family in EVENT_FAMILIES}
+        # Last event per family: (event name, position)
+        self.last_event: Dict[int, Tuple[Optional[str], int]] = {
+            family: (None, 0) for family in EVENT_FAMILIES}
+
+    # ------------------------------------------------------------------
+    # Updating
+    # ------------------------------------------------------------------
+
+    def update(self, rates: np.ndarray) -> Tuple[Dict[str, np.ndarray], Dict[int, List[Dict]]]:
+        """
+        Features aligned with `rates` and each family's events in it
+
+        rates[-1] is treated as forming; earlier bars are committed once.
+        Event 'index' is the position in `rates`.
+        """
+        closed = rates[:-1]
+        new_from = self._continuation(rates)
+        if new_from is None:
+            self.reset()
+            new_from = 0
+        self.max_history = max(self.max_history, len(rates))
+        new = closed[new_from:]
+
+        # One feature pass over context + new closed bars + the forming bar
+        context = min(self._size(), CONTEXT_BARS)
+        tail = np.concatenate([self.rates[-context:], new, rates[-1:]]) if context \
+            else np.concatenate([new, rates[-1:]])
+        offset = self.start + self._size() - context
+        features = {name: values[context:] for name, values in compute_features(tail, self.config, offset).items()}
+        masks = {family: event_masks(tail[context:], features, self.config, family)
+                 for family in EVENT_FAMILIES}
+        self._commit(new, {name: values[:-1] for name, values in features.items()},
+                     {family: [mask[:-1] for mask in family_masks] for family, family_masks in masks.items()},
+                     offset + context)
+
+        # The forming bar resolves against the committed state but is never committed
+        forming_position = self.start + self._size()
+        forming_features = {name: values[-1:] for name, values in features.items()}
+        forming_events = {family: self._resolve(family, rates[-1:], [mask[-1:] for mask in masks[family]],
+                                                forming_position, self.last_event[family])[0]
+                          for family in EVENT_FAMILIES}
+
+        features = {name: np.concatenate([self.features[name][self._size() - len(closed):], values])
+                    if len(closed) else values
+                    for name, values in forming_features.items()}
+
+        window_start = forming_position - len(closed)
+        first_event = window_start + min(self.config.range_periods, len(rates))
+        events = {}
+        for family, family_events in self.events.items():
+            positions = [event['position'] for event in family_events]
+            selected = family_events[bisect_left(positions, first_event):] + forming_events[family]
+            events[family] = [dict(event, index=event['position'] - window_start) for event in selected]
+        return features, events
+
+    def _size(self) -> int:
+        return 0 if self.rates is None else len(self.rates)
+
+    def _continuation(self, rates: np.ndarray) -> Optional[int]:
+        """Index in `rates` of the first closed bar not yet committed (None: start over)"""
+        if not self._size():
+            return None
+        times = rates['time']
+        first, last = self.rates['time'][0], self.rates['time'][-1]
+        at = int(np.searchsorted(times, last))
+        if times[0] < first or at >= len(rates) - 1 or times[at] != last:
+            return None
+        return at + 1
+
+    def _commit(self, new: np.ndarray, features: Dict[str, np.ndarray],
+                masks: Dict[int, List[np.ndarray]], position: int):
+        """Append closed bars (new[0] at `position`) and resolve their events"""
+        if len(new) == 0:
+            return
+        for family in EVENT_FAMILIES:
+            events, self.last_event[family] = self._resolve(
+                family, new, masks[family], position, self.last_event[family])
+            self.events[family].extend(events)
+
+        if self.rates is None:
+            self.rates, self.features = new.copy(), features
+        else:
+            self.rates = np.concatenate([self.rates, new])
+            self.features = {name: np.concatenate([self.features[name], values])
+                             for name, values in features.items()}
+
+        excess = len(self.rates) - self.max_history
+        if excess > 0:
+            self.rates = self.rates[excess:]
+            self.features = {name: values[excess:] for name, values in self.features.items()}
+            self.start += excess
+            for family, family_events in self.events.items():
+                self.events[family] = [e for e in family_events if e['position'] >= self.start]
+
+    # ------------------------------------------------------------------
+    # Sequence rules
+    # ------------------------------------------------------------------
+
+    def _resolve(self, family: int, rates: np.ndarray, masks: List[np.ndarray],
+                 position: int, last_event: Tuple[Optional[str], int]) -> Tuple[List[Dict], Tuple]:
+        """
+        One pass over the candidate bars of `rates` (rates[0] is at `position`)
+
+        At most one event per bar, in family order: climax, then the
+        follow-through if the family's last event is the climax within
+        AR_MAX_BARS, then the test, then the trap.
+        """
+        climax, follow, test, trap = masks
+        # Events need range_periods bars of history, as the full-window scan did
+        eligible = position + np.arange(len(rates)) >= self.config.range_periods
+        candidates = np.flatnonzero((climax | follow | test | trap) & eligible)
+
+        climax_name = EVENT_FAMILIES[family][0][0]
+        events = []
+        for i in candidates.tolist():
+            bar_position = position + i
+            if climax[i]:
+                kind = 0
+            elif follow[i] and last_event[0] == climax_name and bar_position - last_event[1] <= AR_MAX_BARS:
+                kind = 1
+            elif test[i]:
+                kind = 2
+            elif trap[i]:
+                kind = 3
+            else:
+                continue
+            name, price_field, description = EVENT_FAMILIES[family][kind]
+            events.append({
+                'position': bar_position,
+                'time': int(rates['time'][i]),
+                'name': name,
+                'price': float(rates[price_field][i]),
+                'volume': rates['tick_volume'][i],
+                'description': description,
+            })
+            last_event = (name, bar_position)
+        return events, last_event
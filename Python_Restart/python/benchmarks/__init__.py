@@ -0,0 +1,11 @@
+"""
+AppleTrader Pro - Benchmarks
+Reproducible timing/memory benchmarks of the analysis and widget back-ends
+
+Runs headless (no MT5, no Qt) on seeded synthetic OHLCV data:
+    python -m benchmarks --sizes 500x5 2000x10 --save benchmarks/baseline.json
+    python -m benchmarks --compare benchmarks/baseline.json
+"""
+
+from .synthetic_data import generate_ohlcv, generate_watchlist
+from .runner import compare_results, load_baseline, run_benchmarks, save_baseline
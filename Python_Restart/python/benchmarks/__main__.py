@@ -0,0 +1,68 @@
+"""
+Run the benchmark suite
+
+Usage (from Python_Restart/python):
+    python -m benchmarks                                   # run, print timings
+    python -m benchmarks --save                            # write benchmarks/baseline.json
+    python -m benchmarks --compare                         # fail (exit 1) on regressions
+    python -m benchmarks --sizes 5000x20 --cases wyckoff_analyzer order_block_detector
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.cases import CASES_BY_NAME
+from benchmarks.runner import (
+    BASELINE_FILE, DEFAULT_REPEATS, DEFAULT_SIZES, MEMORY_TOLERANCE, TIME_TOLERANCE,
+    compare_results, format_comparison, has_regressions, load_baseline, run_benchmarks,
+    save_baseline
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Benchmark the analysis and widget back-ends")
+    parser.add_argument('--sizes', nargs='+', default=list(DEFAULT_SIZES),
+                        help="Data sizes as BARSxSYMBOLS (default: %(default)s)")
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES_BY_NAME), help="Only these cases")
+    parser.add_argument('--seed', type=int, default=0, help="Synthetic data seed")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help="Timed runs per case")
+    parser.add_argument('--save', nargs='?', const=str(BASELINE_FILE), help="Save results as baseline")
+    parser.add_argument('--compare', nargs='?', const=str(BASELINE_FILE), help="Compare against baseline")
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE,
+                        help="Allowed slowdown as a fraction (default: %(default)s)")
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE,
+                        help="Allowed peak memory growth as a fraction (default: %(default)s)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"BENCHMARKS (seed {args.seed}, {args.repeats} repeats)")
+    print("=" * 60)
+    report = run_benchmarks(args.sizes, args.cases, args.seed, args.repeats)
+
+    status = 0
+    if args.compare:
+        baseline = load_baseline(Path(args.compare))
+        if baseline is None:
+            print(f"No baseline at {args.compare}")
+            status = 2
+        else:
+            rows = compare_results(report, baseline, args.time_tolerance, args.memory_tolerance)
+            print("-" * 60)
+            print(format_comparison(rows))
+            if has_regressions(rows):
+                print("REGRESSIONS FOUND")
+                status = 1
+
+    if args.save:
+        save_baseline(report, Path(args.save))
+        print(f"Baseline written to {args.save}")
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
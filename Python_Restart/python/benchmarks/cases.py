@@ -0,0 +1,126 @@
+"""
+AppleTrader Pro - Benchmark Cases
+One case per analysis/widget back-end
+
+Each case's setup receives the generated watchlist ({symbol: DataFrame}),
+does all preparation outside the timed region and returns a zero-argument
+callable that runs the component over every symbol once.
+"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from benchmarks.synthetic_data import resample_ohlcv, to_candles
+
+
+Watchlist = Dict[str, pd.DataFrame]
+
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    setup: Callable[[Watchlist], Callable[[], object]]
+    min_bars: int = 0  # Component needs at least this many bars
+
+
+def _detector_case(module: str, attribute: str, method: str):
+    """Smart money detector over the full history of every symbol"""
+    def setup(watchlist: Watchlist):
+        detect = getattr(getattr(importlib.import_module(module), attribute), method)
+        candles = {symbol: to_candles(df) for symbol, df in watchlist.items()}
+
+        def run():
+            for symbol, symbol_candles in candles.items():
+                detect(symbol_candles, symbol, lookback=len(symbol_candles))
+        return run
+    return setup
+
+
+def _wyckoff(watchlist: Watchlist):
+    from analysis.wyckoff_analyzer import WyckoffAnalyzer
+    from core.replay_data_source import ReplayDataSource
+    from core.replay_engine import replay_data_source
+
+    source = ReplayDataSource()
+    for symbol, df in watchlist.items():
+        source.add_bars(symbol, 'M5', df)
+    # Clock after the last bar so the whole history is visible
+    source.set_time(max(int(source.bars[symbol]['M5']['time'][-1]) for symbol in watchlist) + 300)
+    analyzer = WyckoffAnalyzer()
+    sizes = {symbol: len(df) for symbol, df in watchlist.items()}
+
+    def run():
+        with replay_data_source(source):
+            for symbol, bars in sizes.items():
+                analyzer.analyze_symbol(symbol, 'M5', bars=bars)
+    return run
+
+
+def _correlation(watchlist: Watchlist):
+    from widgets.correlation_analyzer import MultiSymbolCorrelationAnalyzer
+
+    analyzer = MultiSymbolCorrelationAnalyzer(symbols=list(watchlist))
+    return lambda: analyzer.calculate_correlations(watchlist)
+
+
+def _session_momentum(watchlist: Watchlist):
+    from widgets.session_momentum_scanner import SessionMomentumScanner
+
+    scanner = SessionMomentumScanner()
+    for symbol in watchlist:
+        scanner.get_pip_size(symbol)
+    return lambda: scanner.scan_momentum(watchlist)
+
+
+def _mtf_structure(watchlist: Watchlist):
+    from widgets.mtf_structure_map import MTFStructureMap
+
+    structure_map = MTFStructureMap()
+    inputs = [
+        ({tf: resample_ohlcv(df, tf) for tf in ('M15', 'H1', 'H4')}, float(df['close'].iloc[-1]))
+        for df in watchlist.values()
+    ]
+
+    def run():
+        for data_by_timeframe, price in inputs:
+            structure_map.analyze_structure(data_by_timeframe, price)
+    return run
+
+
+def _position_sizer(watchlist: Watchlist):
+    from core.symbol_manager import symbol_specs_manager
+    from widgets.volatility_position_sizer import VolatilityPositionSizer
+
+    sizer = VolatilityPositionSizer()
+    trades = []
+    for symbol, df in watchlist.items():
+        entry = float(df['close'].iloc[-1])
+        stop = entry - 20 * symbol_specs_manager.get_pip_size(symbol)
+        trades.append((symbol, df, entry, stop))
+
+    def run():
+        for symbol, df, entry, stop in trades:
+            sizer.calculate_position_size(symbol, df, entry, stop, 'BUY')
+    return run
+
+
+BENCHMARK_CASES: List[BenchmarkCase] = [
+    BenchmarkCase('fair_value_gap_detector', _detector_case(
+        'analysis.fair_value_gap_detector', 'fair_value_gap_detector', 'detect_fair_value_gaps'), 10),
+    BenchmarkCase('order_block_detector', _detector_case(
+        'analysis.order_block_detector', 'order_block_detector', 'detect_order_blocks'), 10),
+    BenchmarkCase('liquidity_sweep_detector', _detector_case(
+        'analysis.liquidity_sweep_detector', 'liquidity_sweep_detector', 'detect_liquidity_sweeps'), 20),
+    BenchmarkCase('market_structure_detector', _detector_case(
+        'analysis.market_structure_detector', 'market_structure_detector', 'detect_structure_shifts'), 10),
+    BenchmarkCase('wyckoff_analyzer', _wyckoff, 100),
+    BenchmarkCase('correlation_analyzer', _correlation, 100),
+    BenchmarkCase('session_momentum_scanner', _session_momentum, 50),
+    BenchmarkCase('mtf_structure_map', _mtf_structure, 20 * 48),
+    BenchmarkCase('volatility_position_sizer', _position_sizer, 50),
+]
+
+CASES_BY_NAME = {case.name: case for case in BENCHMARK_CASES}
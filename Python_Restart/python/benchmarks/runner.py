@@ -0,0 +1,190 @@
+"""
+AppleTrader Pro - Benchmark Runner
+Times each case, records peak memory, saves/compares JSON baselines
+
+Timing is the median of `repeats` runs after one warm-up run; peak memory
+is the tracemalloc peak of one extra run (traced separately so tracing does
+not skew the timings). Component console output is suppressed while
+measuring.
+"""
+
+import io
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.cases import BENCHMARK_CASES, CASES_BY_NAME
+from benchmarks.synthetic_data import generate_watchlist
+
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+
+DEFAULT_SIZES = ('500x5', '2000x10')
+DEFAULT_REPEATS = 5
+
+# A case regresses when slower/bigger than baseline by more than the
+# tolerance AND by more than the absolute floor (noise on tiny timings)
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.25
+MIN_TIME_DELTA_MS = 1.0
+MIN_MEMORY_DELTA_KB = 256.0
+
+
+def parse_size(size: str) -> Tuple[int, int]:
+    """'2000x10' -> (2000 bars, 10 symbols)"""
+    bars, _, symbols = size.lower().partition('x')
+    return int(bars), int(symbols or 1)
+
+
+def result_key(case: str, bars: int, symbols: int) -> str:
+    return f"{case}@{bars}x{symbols}"
+
+
+def measure(run, repeats: int = DEFAULT_REPEATS) -> Dict:
+    """Median/min wall time (ms) and peak traced memory (KB) of run()"""
+    sink = io.StringIO()
+    with redirect_stdout(sink):
+        run()  # Warm-up: imports, caches, lazy singletons
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'repeats': repeats,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(sizes: Iterable[str] = DEFAULT_SIZES, cases: Optional[Iterable[str]] = None,
+                   seed: int = 0, repeats: int = DEFAULT_REPEATS, progress=print) -> Dict:
+    """
+    Run the selected cases at every size
+
+    Returns:
+        {'meta': {...}, 'results': {result_key: {...}}}
+    """
+    selected = [CASES_BY_NAME[name] for name in cases] if cases else BENCHMARK_CASES
+    results = {}
+
+    for size in sizes:
+        bars, symbols = parse_size(size)
+        watchlist = generate_watchlist(symbols=symbols, bars=bars, seed=seed)
+
+        for case in selected:
+            if bars < case.min_bars:
+                if progress:
+                    progress(f"  skip {case.name} @ {size} (needs {case.min_bars} bars)")
+                continue
+            with redirect_stdout(io.StringIO()):
+                run = case.setup(watchlist)
+            entry = measure(run, repeats)
+            entry.update(case=case.name, bars=bars, symbols=symbols)
+            results[result_key(case.name, bars, symbols)] = entry
+            if progress:
+                progress(f"  {case.name:<28} {size:>10}  {entry['median_ms']:10.2f} ms  "
+                         f"{entry['peak_kb']:10.1f} KB")
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'seed': seed,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+        },
+        'results': results,
+    }
+
+
+def save_baseline(report: Dict, path: Path = BASELINE_FILE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> Optional[Dict]:
+    """Load a saved baseline (None if missing)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def compare_results(report: Dict, baseline: Dict, time_tolerance: float = TIME_TOLERANCE,
+                    memory_tolerance: float = MEMORY_TOLERANCE) -> List[Dict]:
+    """
+    Compare a run against a baseline
+
+    Returns:
+        One row per result: key, median_ms, baseline_ms, time_change_pct,
+        peak_kb, baseline_kb, status ('OK', 'SLOWER', 'MORE_MEMORY',
+        'FASTER', 'NEW')
+    """
+    rows = []
+    base_results = baseline.get('results', {})
+
+    for key, entry in report['results'].items():
+        base = base_results.get(key)
+        row = {'key': key, 'median_ms': entry['median_ms'], 'peak_kb': entry['peak_kb'],
+               'baseline_ms': None, 'baseline_kb': None, 'time_change_pct': None, 'status': 'NEW'}
+        if base is None:
+            rows.append(row)
+            continue
+
+        row['baseline_ms'] = base['median_ms']
+        row['baseline_kb'] = base['peak_kb']
+        time_delta = entry['median_ms'] - base['median_ms']
+        memory_delta = entry['peak_kb'] - base['peak_kb']
+        if base['median_ms'] > 0:
+            row['time_change_pct'] = round(time_delta / base['median_ms'] * 100, 1)
+
+        if time_delta > base['median_ms'] * time_tolerance and time_delta > MIN_TIME_DELTA_MS:
+            row['status'] = 'SLOWER'
+        elif memory_delta > base['peak_kb'] * memory_tolerance and memory_delta > MIN_MEMORY_DELTA_KB:
+            row['status'] = 'MORE_MEMORY'
+        elif -time_delta > base['median_ms'] * time_tolerance and -time_delta > MIN_TIME_DELTA_MS:
+            row['status'] = 'FASTER'
+        else:
+            row['status'] = 'OK'
+        rows.append(row)
+
+    return rows
+
+
+def has_regressions(rows: List[Dict]) -> bool:
+    return any(row['status'] in ('SLOWER', 'MORE_MEMORY') for row in rows)
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    lines = [f"{'benchmark':<42} {'ms':>10} {'base ms':>10} {'change':>8} {'KB':>10} {'base KB':>10}  status"]
+    for row in rows:
+        change = f"{row['time_change_pct']:+.1f}%" if row['time_change_pct'] is not None else '-'
+        base_ms = f"{row['baseline_ms']:.2f}" if row['baseline_ms'] is not None else '-'
+        base_kb = f"{row['baseline_kb']:.1f}" if row['baseline_kb'] is not None else '-'
+        lines.append(f"{row['key']:<42} {row['median_ms']:>10.2f} {base_ms:>10} {change:>8} "
+                     f"{row['peak_kb']:>10.1f} {base_kb:>10}  {row['status']}")
+    return '\n'.join(lines)
@@ -0,0 +1,156 @@
+"""
+AppleTrader Pro - Synthetic OHLCV Generator
+Seeded market data with trend/range regimes, gaps and volume spikes
+
+Same seed, size and profile always produce the same bars, so benchmark
+timings are comparable between runs and machines. Symbols in a watchlist
+share a common market factor, so correlations are realistic (USD-base
+pairs move against it).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.replay_data_source import TIMEFRAME_SECONDS
+
+
+DEFAULT_SYMBOLS = [
+    'EURUSD', 'GBPUSD', 'USDJPY', 'USDCHF', 'AUDUSD', 'USDCAD',
+    'NZDUSD', 'EURGBP', 'EURJPY', 'GBPJPY', 'AUDJPY', 'NZDJPY',
+]
+
+REGIMES = ('TREND_UP', 'TREND_DOWN', 'RANGE')
+
+# 2024-01-01 00:00 UTC
+DEFAULT_START = 1704067200
+
+
+@dataclass
+class MarketProfile:
+    """Shape of the generated market (all returns are log-returns per bar)"""
+    volatility: float = 0.0004          # Std of per-bar returns
+    trend_drift: float = 0.15           # Trend drift per bar, in volatilities
+    range_persistence: float = 0.9      # AR(1) coefficient of range oscillation
+    mean_regime_bars: int = 300         # Average regime length
+    gap_probability: float = 0.002      # Chance a bar opens with a gap
+    gap_size: float = 6.0               # Gap std, in volatilities
+    base_volume: float = 200.0
+    volume_spike_probability: float = 0.01
+    volume_spike_multiplier: float = 5.0
+    market_factor: float = 0.6          # Correlation with the common factor
+
+
+def symbol_names(count: int) -> List[str]:
+    """Watchlist of `count` symbols (majors first, then numbered copies)"""
+    names = []
+    for i in range(count):
+        base = DEFAULT_SYMBOLS[i % len(DEFAULT_SYMBOLS)]
+        copy = i // len(DEFAULT_SYMBOLS)
+        names.append(base if copy == 0 else f"{base}{copy + 1}")
+    return names
+
+
+def _regime_path(rng: np.random.Generator, bars: int, mean_bars: int) -> np.ndarray:
+    """Regime index per bar (into REGIMES) from geometric segment lengths"""
+    lengths = rng.geometric(1.0 / max(mean_bars, 1), size=bars // max(mean_bars, 1) + 2)
+    while lengths.sum() < bars:
+        lengths = np.concatenate([lengths, rng.geometric(1.0 / max(mean_bars, 1), size=len(lengths))])
+    codes = rng.integers(0, len(REGIMES), size=len(lengths))
+    return np.repeat(codes, lengths)[:bars]
+
+
+def generate_ohlcv(bars: int, seed: int = 0, symbol: str = 'EURUSD', timeframe: str = 'M5',
+                   profile: Optional[MarketProfile] = None, start: int = DEFAULT_START,
+                   market: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """
+    Generate one symbol's bars
+
+    Args:
+        bars: Number of bars
+        seed: RNG seed
+        symbol: Symbol name (JPY pairs are priced around 150, others around 1.1)
+        timeframe: Bar timeframe (sets the time spacing)
+        profile: Market shape (default MarketProfile())
+        start: Time of the first bar (epoch seconds)
+        market: Optional common factor shocks (standard normal, length bars)
+
+    Returns:
+        DataFrame with time, open, high, low, close, tick_volume, spread, regime
+    """
+    profile = profile or MarketProfile()
+    rng = np.random.default_rng(seed)
+    vol = profile.volatility
+
+    regimes = _regime_path(rng, bars, profile.mean_regime_bars)
+    shocks = rng.standard_normal(bars)
+    if market is not None:
+        factor = profile.market_factor * (-1 if symbol.startswith('USD') else 1)
+        shocks = np.sqrt(1 - factor ** 2) * shocks + factor * market[:bars]
+
+    # Trend: drift + noise; range: truncated AR(1) oscillation around an anchor
+    kernel = profile.range_persistence ** np.arange(50)
+    oscillation = np.convolve(shocks, kernel)[:bars] * vol * np.sqrt(1 - profile.range_persistence ** 2)
+    drift = np.select([regimes == 0, regimes == 1], [1.0, -1.0], 0.0) * profile.trend_drift * vol
+    returns = np.where(regimes == 2, np.diff(oscillation, prepend=0.0), drift + shocks * vol)
+
+    # Gaps: the bar opens away from the previous close
+    gaps = np.where(rng.random(bars) < profile.gap_probability,
+                    rng.normal(0, profile.gap_size * vol, bars), 0.0)
+    gaps[0] = 0.0
+
+    base_price = (150.0 if 'JPY' in symbol else 1.1) * np.exp(rng.normal(0, 0.05))
+    log_close = np.log(base_price) + np.cumsum(returns + gaps)
+    close = np.exp(log_close)
+    open_ = np.exp(np.concatenate([[np.log(base_price)], log_close[:-1]]) + gaps)
+
+    wick = np.abs(rng.normal(0, 0.5 * vol, (2, bars)))
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+
+    # Volume follows absolute moves, higher in trends, with occasional spikes
+    activity = 1 + np.abs(returns + gaps) / vol + (regimes != 2) * 0.3
+    volume = profile.base_volume * activity * rng.lognormal(0, 0.3, bars)
+    spikes = rng.random(bars) < profile.volume_spike_probability
+    volume[spikes] *= profile.volume_spike_multiplier
+
+    bar_seconds = TIMEFRAME_SECONDS[timeframe]
+    return pd.DataFrame({
+        'time': pd.to_datetime(start + np.arange(bars, dtype=np.int64) * bar_seconds, unit='s'),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'tick_volume': np.maximum(volume, 1).astype(np.int64),
+        'spread': rng.integers(5, 20, bars),
+        'regime': np.array(REGIMES, dtype=object)[regimes],
+    })
+
+
+def generate_watchlist(symbols: int = 5, bars: int = 1000, seed: int = 0, timeframe: str = 'M5',
+                       profile: Optional[MarketProfile] = None) -> Dict[str, pd.DataFrame]:
+    """Generate correlated bars for a watchlist of `symbols` symbols"""
+    seeds = np.random.SeedSequence(seed).spawn(symbols + 1)
+    market = np.random.default_rng(seeds[0]).standard_normal(bars)
+    return {
+        name: generate_ohlcv(bars, seeds[i + 1], name, timeframe, profile, market=market)
+        for i, name in enumerate(symbol_names(symbols))
+    }
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Aggregate bars to a higher timeframe"""
+    rule = f"{TIMEFRAME_SECONDS[timeframe]}s"
+    grouped = df.set_index('time').resample(rule, label='left', closed='left')
+    out = grouped.agg({'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last',
+                       'tick_volume': 'sum', 'spread': 'max'})
+    return out.dropna().reset_index()
+
+
+def to_candles(df: pd.DataFrame) -> List[Dict]:
+    """Bars as candle dicts (same keys as DataManager.get_candles)"""
+    frame = df[['time', 'open', 'high', 'low', 'close', 'tick_volume']].rename(
+        columns={'tick_volume': 'volume'})
+    return frame.to_dict('records')
@@ -0,0 +1,627 @@
+"""
+AppleTrader Pro - AI Bridge Server
+Python end of the EA's CAIBridgePipe (Include_Restart/AI_Bridge.mqh)
+
+The EA sends one request at a time and blocks until the reply arrives:
+
+    int32 little-endian length | message
+    (length in characters, message UTF-16LE - MQL5 FileWriteInteger /
+    FileWriteString on a FILE_BIN pipe handle)
+
+and reads the reply in the same framing. Messages are JSON:
+- {"type":"ping"}
+- {"type":"market_data", symbol, timeframe, timestamp, bid, ask, spread,
+   ohlcv: [{t,o,h,l,c,v}, ...] newest first (t = bar open time),
+   optional features: [...]}
+- {"type":"get_signal","symbol":...}  -> "direction", "confidence"
+- {"type":"risk_score","symbol":...}  -> "risk_score", "factors"
+
+The EA scans replies with StringFind('"direction":"'), so replies are
+written without spaces after ':' and ','.
+
+Signals come from the same logic as the file-based ML services: the
+MLTradingModel (ML_Modules/ml_training_service.py) when a model is loaded,
+otherwise the spread rules of MultiSymbolMLService (ml_service_multisymbol.py).
+The model gets the EA's feature vector when the message carries one of the
+model's width ("features"); a model trained on the feature store
+(core/feature_store.py FEATURE_NAMES) gets its features computed here from
+the snapshot bars, appended to the symbol's context history. Until that
+history is warm (WARMUP_BARS) the spread rules answer. The latest market
+snapshot gives the direction. Replies take milliseconds
+instead of the 100 ms - 10 s of polling prediction.json.
+
+Transports (address):
+- \\\\.\\pipe\\mt5_ai_bridge   Windows named pipe (what the EA opens; needs
+                               the proactor event loop, the default on Windows)
+- /tmp/mt5_ai_bridge.sock      Unix domain socket (local clients, tests)
+- tcp://127.0.0.1:47801        TCP
+
+Every connection is served concurrently; per-message-type latency and
+request/error counts are kept in stats(). BridgeClient speaks the same
+protocol as CAIBridgePipe for local testing.
+Start it with scripts/run_ai_bridge.py.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.feature_store import FEATURE_NAMES, MA_PERIODS, compute_features, context_bars, feature_store
+from core.instrumentation import LatencyHistogram, instrumentation
+from core.replay_data_source import RATES_DTYPE, TIMEFRAME_SECONDS
+
+
+DEFAULT_PIPE_NAME = r'\\.\pipe\mt5_ai_bridge'
+DEFAULT_SOCKET_PATH = Path(tempfile.gettempdir()) / 'mt5_ai_bridge.sock'
+PIPE_PREFIX = '\\\\.\\pipe\\'
+TCP_PREFIX = 'tcp://'
+
+# MQL5 strings are UTF-16; the length prefix counts characters
+WIRE_ENCODING = 'utf-16-le'
+# CAIBridgePipe::ReadResponse rejects longer replies
+MAX_MESSAGE_CHARS = 1048576
+
+# Bars used for the direction (fast/slow mean of closes) and the risk score
+FAST_BARS = 10
+SLOW_BARS = 30
+RISK_RANGE_BARS = 5
+# Spread (pips) and range expansion at which their risk components saturate
+RISK_SPREAD_PIPS = 5.0
+RISK_RANGE_RATIO = 2.0
+# A snapshot older than this counts as stale in the risk score
+STALE_SECONDS = 60.0
+
+# symbol_data (MultiSymbolMLService.get_symbol_data layout) -> prediction
+SpreadPredictor = Callable[[Optional[Dict]], Dict]
+
+
+def default_address() -> str:
+    """Named pipe on Windows (what the EA opens), Unix socket elsewhere"""
+    return DEFAULT_PIPE_NAME if os.name == 'nt' else str(DEFAULT_SOCKET_PATH)
+
+
+def _unit_size(encoding: str) -> int:
+    return 2 if encoding.replace('_', '-').lower().startswith('utf-16') else 1
+
+
+def encode_frame(text: str, encoding: str = WIRE_ENCODING) -> bytes:
+    """Length prefix (characters) + encoded message"""
+    payload = text.encode(encoding)
+    return struct.pack('<i', len(payload) // _unit_size(encoding)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader, encoding: str = WIRE_ENCODING) -> Optional[str]:
+    """Next message from `reader` (None when the peer closed the connection)"""
+    try:
+        header = await reader.readexactly(4)
+    except asyncio.IncompleteReadError:
+        return None
+    length = struct.unpack('<i', header)[0]
+    if length <= 0 or length > MAX_MESSAGE_CHARS:
+        raise ValueError(f"Invalid frame length {length}")
+    payload = await reader.readexactly(length * _unit_size(encoding))
+    return payload.decode(encoding)
+
+
+def encode_reply(reply: Dict) -> str:
+    """Compact JSON, as CAIBridgePipe's string scanning expects"""
+    return json.dumps(reply, separators=(',', ':'))
+
+
+@dataclass
+class MarketSnapshot:
+    """Latest market_data message of one symbol"""
+    symbol: str
+    timeframe: str
+    timestamp: int
+    bid: float
+    ask: float
+    spread_points: int
+    # open, high, low, close, volume per row, oldest first
+    bars: np.ndarray
+    # Bar open times (None when the EA did not send them)
+    times: Optional[np.ndarray]
+    features: Optional[List[float]]
+    received: float
+
+    @property
+    def spread_pips(self) -> float:
+        # Same measure as MultiSymbolMLService.get_symbol_data
+        return (self.ask - self.bid) / self.bid * 10000 if self.bid else 0.0
+
+    def symbol_data(self) -> Dict:
+        """MultiSymbolMLService.get_symbol_data layout"""
+        data = {'symbol': self.symbol, 'bid': self.bid, 'ask': self.ask,
+                'spread': self.spread_pips, 'bars': len(self.bars)}
+        if len(self.bars):
+            data.update(last_close=float(self.bars[-1, 3]), last_high=float(self.bars[-1, 1]),
+                        last_low=float(self.bars[-1, 2]))
+        return data
+
+    def closed_rates(self) -> Optional[np.ndarray]:
+        """Bars as an MT5 rates array without the newest (still forming) one"""
+        if self.times is None or len(self.bars) < 2:
+            return None
+        rates = np.zeros(len(self.bars) - 1, dtype=RATES_DTYPE)
+        rates['time'] = self.times[:-1]
+        for column, field in enumerate(('open', 'high', 'low', 'close', 'tick_volume')):
+            rates[field] = self.bars[:-1, column]
+        return rates
+
+
+def parse_market_data(message: Dict, received: float) -> MarketSnapshot:
+    ohlcv = message.get('ohlcv') or []
+    bars = np.array([[bar['o'], bar['h'], bar['l'], bar['c'], bar['v']] for bar in reversed(ohlcv)],
+                    dtype=float).reshape(-1, 5)
+    times = None
+    if ohlcv and all('t' in bar for bar in ohlcv):
+        times = np.array([bar['t'] for bar in reversed(ohlcv)], dtype=np.int64)
+    features = message.get('features')
+    return MarketSnapshot(
+        symbol=message['symbol'],
+        timeframe=str(message.get('timeframe', '')).replace('PERIOD_', ''),
+        timestamp=int(message.get('timestamp', 0)),
+        bid=float(message.get('bid', 0.0)),
+        ask=float(message.get('ask', 0.0)),
+        spread_points=int(message.get('spread', 0)),
+        bars=bars,
+        times=times,
+        features=[float(value) for value in features] if features else None,
+        received=received,
+    )
+
+
+def neutral_prediction(symbol_data: Optional[Dict]) -> Dict:
+    """Predictor used when no ML service logic is plugged in"""
+    return {'signal': 'WAIT', 'probability': 0.50, 'confidence': 0.50,
+            'reasoning': 'No predictor loaded'}
+
+
+def model_feature_count(model) -> int:
+    """Features the model was trained on (0 if unknown)"""
+    if getattr(model, 'ensemble', None) is not None:
+        return int(model.ensemble.n_features)
+    return int(getattr(getattr(model, 'scaler', None), 'n_features_in_', 0))
+
+
+class SignalEngine:
+    """
+    Market snapshots per symbol and the signal / risk logic answering the EA
+
+    Args:
+        spread_predictor: MultiSymbolMLService.generate_prediction (or any
+            callable taking its symbol_data dict)
+        model: MLTradingModel (anything with predict_probability(features));
+            fed the EA's "features" or, when trained on FEATURE_NAMES, the
+            store features of the snapshot bars
+        store: FeatureStore seeding the bar history of each symbol
+    """
+
+    def __init__(self, spread_predictor: Optional[SpreadPredictor] = None, model=None, store=None):
+        self.spread_predictor = spread_predictor or neutral_prediction
+        self.model = model
+        self.store = store or feature_store
+        self.model_features = model_feature_count(model) if model is not None else 0
+        self.markets: Dict[str, MarketSnapshot] = {}
+        # (symbol, timeframe) -> closed bars (MT5 rates, oldest first) and
+        # the store vector of the newest one (None while not warm)
+        self.history: Dict[Tuple[str, str], np.ndarray] = {}
+        self.store_vectors: Dict[Tuple[str, str], Tuple[int, Optional[List[float]]]] = {}
+        self._history_lock = threading.Lock()
+        self.clock = time.monotonic
+
+    def update_market(self, message: Dict) -> MarketSnapshot:
+        snapshot = parse_market_data(message, self.clock())
+        self.markets[snapshot.symbol] = snapshot
+        return snapshot
+
+    def _ea_features(self, snapshot: MarketSnapshot) -> bool:
+        return snapshot.features is not None and self.model_features in (0, len(snapshot.features))
+
+    def _store_features(self, snapshot: MarketSnapshot) -> bool:
+        return (self.model_features == len(FEATURE_NAMES) and snapshot.times is not None
+                and snapshot.timeframe in TIMEFRAME_SECONDS)
+
+    def uses_model(self, symbol: str) -> bool:
+        """Whether the model can answer for `symbol` (store features may still be warming up)"""
+        snapshot = self.markets.get(symbol)
+        return (self.model is not None and snapshot is not None
+                and (self._ea_features(snapshot) or self._store_features(snapshot)))
+
+    def store_vector(self, snapshot: MarketSnapshot) -> Optional[List[float]]:
+        """
+        FEATURE_NAMES vector of the newest closed bar of the snapshot
+
+        The snapshot's closed bars are appended to the symbol's history
+        (seeded from the feature store's context bars); None until that
+        history covers WARMUP_BARS, the same rows training_frame drops.
+        """
+        closed = snapshot.closed_rates()
+        if closed is None or len(closed) == 0:
+            return None
+        key = (snapshot.symbol.upper(), snapshot.timeframe)
+        newest = int(closed['time'][-1])
+        with self._history_lock:
+            cached = self.store_vectors.get(key)
+            if cached is not None and cached[0] == newest:
+                return cached[1]
+
+            history = self.history.get(key)
+            if history is None:
+                history = self.store.context_rates(*key)
+            if history is not None and len(history) and history['time'][-1] >= closed['time'][0]:
+                history = np.concatenate([history[history['time'] < closed['time'][0]], closed])
+            else:
+                # No overlap: a gap would corrupt the rolling features, start over
+                history = closed
+            history = history[-context_bars(snapshot.timeframe):]
+            self.history[key] = history
+
+            columns = compute_features(history, snapshot.timeframe, snapshot.symbol)
+            vector = None
+            if np.isfinite(columns[f'ma_distance_{max(MA_PERIODS)}'][-1]):
+                vector = [float(columns[name][-1]) if np.isfinite(columns[name][-1]) else 0.0
+                          for name in FEATURE_NAMES]
+            self.store_vectors[key] = (newest, vector)
+            return vector
+
+    def predict(self, symbol: str) -> Tuple[Dict, str]:
+        """(prediction, source) in the ML services' format"""
+        snapshot = self.markets.get(symbol)
+        if self.model is not None and snapshot is not None:
+            if self._ea_features(snapshot):
+                return self.model.predict_probability(snapshot.features), 'model'
+            if self._store_features(snapshot):
+                vector = self.store_vector(snapshot)
+                if vector is not None:
+                    return self.model.predict_probability(vector), 'model'
+        return self.spread_predictor(snapshot.symbol_data() if snapshot else None), 'rules'
+
+    @staticmethod
+    def trend(bars: np.ndarray) -> int:
+        """+1 / -1 when the fast mean of closes is above / below the slow one"""
+        if len(bars) < SLOW_BARS:
+            return 0
+        closes = bars[:, 3]
+        fast, slow = closes[-FAST_BARS:].mean(), closes[-SLOW_BARS:].mean()
+        return int(np.sign(fast - slow))
+
+    def get_signal(self, symbol: str) -> Dict:
+        snapshot = self.markets.get(symbol)
+        if snapshot is None:
+            return {'type': 'signal', 'symbol': symbol, 'direction': 'NEUTRAL', 'confidence': 0.0,
+                    'signal': 'WAIT', 'reasoning': 'No market data received for symbol'}
+
+        prediction, source = self.predict(symbol)
+        trend = self.trend(snapshot.bars)
+        direction = 'NEUTRAL'
+        if prediction.get('signal') == 'ENTER' and trend:
+            direction = 'BUY' if trend > 0 else 'SELL'
+        return {
+            'type': 'signal',
+            'symbol': symbol,
+            'direction': direction,
+            'confidence': round(float(prediction.get('confidence', 0.0)), 4),
+            'probability': round(float(prediction.get('probability', 0.0)), 4),
+            'signal': prediction.get('signal', 'WAIT'),
+            'reasoning': prediction.get('reasoning', ''),
+            'source': source,
+        }
+
+    def get_risk_score(self, symbol: str) -> Dict:
+        """0 (calm) - 1 (avoid): spread, range expansion and data age"""
+        snapshot = self.markets.get(symbol)
+        if snapshot is None:
+            return {'type': 'risk', 'symbol': symbol, 'risk_score': 1.0,
+                    'factors': 'no market data received'}
+
+        spread_pips = snapshot.spread_pips
+        spread_risk = min(1.0, spread_pips / RISK_SPREAD_PIPS)
+        factors = [f"spread {spread_pips:.1f} pips"]
+
+        range_risk = 0.0
+        if len(snapshot.bars) > RISK_RANGE_BARS:
+            ranges = snapshot.bars[:, 1] - snapshot.bars[:, 2]
+            mean_range = ranges.mean()
+            ratio = ranges[-RISK_RANGE_BARS:].mean() / mean_range if mean_range > 0 else 1.0
+            range_risk = float(np.clip((ratio - 1.0) / (RISK_RANGE_RATIO - 1.0), 0.0, 1.0))
+            factors.append(f"range x{ratio:.2f} of {len(ranges)}-bar mean")
+
+        age = self.clock() - snapshot.received
+        stale_risk = 1.0 if age > STALE_SECONDS else 0.0
+        if stale_risk:
+            factors.append(f"data {age:.0f}s old")
+
+        score = 0.4 * spread_risk + 0.4 * range_risk + 0.2 * stale_risk
+        return {'type': 'risk', 'symbol': symbol, 'risk_score': round(score, 4),
+                'factors': '; '.join(factors)}
+
+
+class AIBridgeServer:
+    """
+    Serves CAIBridgePipe clients on a named pipe, Unix socket or TCP address
+
+    Usage:
+        server = AIBridgeServer(SignalEngine(service.generate_prediction, model))
+        await server.start()
+        ...
+        await server.stop()
+    """
+
+    def __init__(self, engine: Optional[SignalEngine] = None, address: Optional[str] = None,
+                 encoding: str = WIRE_ENCODING):
+        self.engine = engine or SignalEngine()
+        self.address = address or default_address()
+        self.encoding = encoding
+        self.handlers = {
+            'ping': self.on_ping,
+            'market_data': self.on_market_data,
+            'get_signal': self.on_get_signal,
+            'risk_score': self.on_risk_score,
+        }
+
+        self.request_count = 0
+        self.error_count = 0
+        self.connections = 0
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.started = time.time()
+
+        self._servers = []
+        self._writers = set()
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        address = self.address
+        if address.startswith(PIPE_PREFIX):
+            loop = asyncio.get_running_loop()
+            if not hasattr(loop, 'start_serving_pipe'):
+                raise RuntimeError("Named pipes need the Windows proactor event loop")
+
+            def protocol_factory():
+                return asyncio.StreamReaderProtocol(asyncio.StreamReader(), self._serve_client)
+
+            self._servers = await loop.start_serving_pipe(protocol_factory, address)
+        elif address.startswith(TCP_PREFIX):
+            host, port = address[len(TCP_PREFIX):].rsplit(':', 1)
+            server = await asyncio.start_server(self._serve_client, host, int(port))
+            # Port 0 picks a free port; report the real one
+            self.address = f"{TCP_PREFIX}{host}:{server.sockets[0].getsockname()[1]}"
+            self._servers = [server]
+        else:
+            if os.path.exists(address):
+                os.unlink(address)  # Stale socket of a previous run
+            self._servers = [await asyncio.start_unix_server(self._serve_client, address)]
+
+    async def stop(self):
+        for server in self._servers:
+            server.close()
+        for writer in list(self._writers):
+            writer.close()
+        for server in self._servers:
+            if hasattr(server, 'wait_closed'):
+                await server.wait_closed()
+        self._servers = []
+        if not self.address.startswith((PIPE_PREFIX, TCP_PREFIX)) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                text = await read_frame(reader, self.encoding)
+                if text is None:
+                    return
+                writer.write(encode_frame(encode_reply(await self.handle(text)), self.encoding))
+                await writer.drain()
+        except (ConnectionError, ValueError, asyncio.CancelledError):
+            # ValueError: corrupt framing, the stream cannot be resynchronised
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def handle(self, text: str) -> Dict:
+        """One request -> reply (errors are replied, never raised)"""
+        start = time.perf_counter()
+        kind = 'invalid'
+        try:
+            message = json.loads(text)
+            handler = self.handlers.get(message.get('type'))
+            if handler is None:
+                raise ValueError(f"Unknown message type {message.get('type')!r}")
+            kind = message['type']
+            reply = await handler(message)
+        except Exception as e:
+            self.error_count += 1
+            reply = {'type': 'error', 'error': str(e)}
+        self.request_count += 1
+
+        elapsed = time.perf_counter() - start
+        histogram = self.latency.get(kind)
+        if histogram is None:
+            histogram = self.latency[kind] = LatencyHistogram()
+        histogram.add(elapsed)
+        instrumentation.record(f"ai_bridge.{kind}", elapsed)
+        return reply
+
+    async def on_ping(self, message: Dict) -> Dict:
+        return {'type': 'pong', 'status': 'ok', 'timestamp': time.time()}
+
+    async def on_market_data(self, message: Dict) -> Dict:
+        snapshot = self.engine.update_market(message)
+        return {'type': 'ack', 'symbol': snapshot.symbol, 'bars': len(snapshot.bars)}
+
+    async def on_get_signal(self, message: Dict) -> Dict:
+        symbol = message['symbol']
+        if self.engine.uses_model(symbol):
+            # Model inference can take milliseconds: keep other clients responsive
+            return await asyncio.to_thread(self.engine.get_signal, symbol)
+        return self.engine.get_signal(symbol)
+
+    async def on_risk_score(self, message: Dict) -> Dict:
+        return self.engine.get_risk_score(message['symbol'])
+
+    def stats(self) -> Dict:
+        """Request/error counts and per-message-type latency"""
+        return {
+            'address': self.address,
+            'since': self.started,
+            'connections': self.connections,
+            'open_connections': len(self._writers),
+            'requests': self.request_count,
+            'errors': self.error_count,
+            'symbols': sorted(self.engine.markets),
+            'latency': {kind: self.latency[kind].to_dict() for kind in sorted(self.latency)},
+        }
+
+
+class BridgeClient:
+    """
+    Blocking client behaving like CAIBridgePipe, for local testing
+
+    Replies are parsed the way the EA parses them (string scanning), so a
+    reply the EA would misread fails here too.
+    """
+
+    def __init__(self, address: Optional[str] = None, encoding: str = WIRE_ENCODING, timeout: float = 5.0):
+        self.address = address or default_address()
+        self.encoding = encoding
+        self.timeout = timeout
+        self.request_count = 0
+        self.error_count = 0
+        self._socket = None
+        self._pipe = None
+
+    def connect(self) -> bool:
+        """Open the connection and ping (like CAIBridgePipe::Connect)"""
+        if self.address.startswith(PIPE_PREFIX):
+            self._pipe = open(self.address, 'r+b', buffering=0)
+        elif self.address.startswith(TCP_PREFIX):
+            host, port = self.address[len(TCP_PREFIX):].rsplit(':', 1)
+            self._socket = socket.create_connection((host, int(port)), self.timeout)
+        else:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(self.timeout)
+            self._socket.connect(self.address)
+        return '"pong"' in self.send_message('{"type":"ping"}')
+
+    def close(self):
+        for handle in (self._socket, self._pipe):
+            if handle is not None:
+                handle.close()
+        self._socket = self._pipe = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _write(self, data: bytes):
+        if self._pipe is not None:
+            self._pipe.write(data)
+        else:
+            self._socket.sendall(data)
+
+    def _read_exact(self, size: int) -> bytes:
+        data = b''
+        while len(data) < size:
+            chunk = self._pipe.read(size - len(data)) if self._pipe is not None \
+                else self._socket.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("AI bridge closed the connection")
+            data += chunk
+        return data
+
+    def send_message(self, message: str) -> str:
+        """One request/reply round trip ('' on failure, like the EA)"""
+        try:
+            self._write(encode_frame(message, self.encoding))
+            length = struct.unpack('<i', self._read_exact(4))[0]
+            if length <= 0 or length > MAX_MESSAGE_CHARS:
+                self.error_count += 1
+                return ''
+            response = self._read_exact(length * _unit_size(self.encoding)).decode(self.encoding)
+        except (OSError, ConnectionError):
+            self.error_count += 1
+            return ''
+        self.request_count += 1
+        return response
+
+    def send_market_data(self, symbol: str, timeframe: str, bars, bid: float, ask: float,
+                         spread: int = 0, timestamp: Optional[int] = None, features=None) -> bool:
+        """
+        market_data as BuildJSON() writes it
+
+        `bars` is a DataFrame / MT5 rates array (oldest first) with time, open,
+        high, low, close and tick_volume; the last 50 are sent newest first.
+        """
+        t, o, h, l, c, v = (np.asarray(bars[column])[-50:][::-1]
+                            for column in ('time', 'open', 'high', 'low', 'close', 'tick_volume'))
+        if np.issubdtype(t.dtype, np.datetime64):
+            t = t.astype('datetime64[s]').astype(np.int64)
+        rows = [{'t': int(t[i]), 'o': round(float(o[i]), 5), 'h': round(float(h[i]), 5),
+                 'l': round(float(l[i]), 5), 'c': round(float(c[i]), 5), 'v': int(v[i])}
+                for i in range(len(o))]
+        message = {'type': 'market_data', 'timestamp': int(timestamp or time.time()), 'symbol': symbol,
+                   'timeframe': f"PERIOD_{timeframe}", 'bid': round(bid, 5), 'ask': round(ask, 5),
+                   'spread': int(spread), 'ohlcv': rows}
+        if features is not None:
+            message['features'] = [float(value) for value in features]
+        return len(self.send_message(encode_reply(message))) > 0
+
+    @staticmethod
+    def _scan_string(response: str, key: str) -> Optional[str]:
+        pos = response.find(f'"{key}":"')
+        if pos < 0:
+            return None
+        pos += len(key) + 4
+        end = response.find('"', pos)
+        return response[pos:end] if end > pos else None
+
+    @staticmethod
+    def _scan_number(response: str, key: str) -> Optional[float]:
+        pos = response.find(f'"{key}":')
+        if pos < 0:
+            return None
+        pos += len(key) + 3
+        num = ''
+        for ch in response[pos:pos + 20]:
+            if ch.isdigit() or ch == '.':
+                num += ch
+            elif num:
+                break
+        return float(num) if num else None
+
+    def get_signal(self, symbol: str) -> Optional[Tuple[str, float]]:
+        """(direction, confidence) as CAIBridgePipe::GetAISignal reads them"""
+        response = self.send_message(encode_reply({'type': 'get_signal', 'symbol': symbol}))
+        if not response:
+            return None
+        return self._scan_string(response, 'direction'), self._scan_number(response, 'confidence')
+
+    def get_risk_score(self, symbol: str) -> Optional[Tuple[float, str]]:
+        """(risk_score, factors) as CAIBridgePipe::GetRiskScore reads them"""
+        response = self.send_message(encode_reply({'type': 'risk_score', 'symbol': symbol}))
+        if not response:
+            return None
+        return self._scan_number(response, 'risk_score'), self._scan_string(response, 'factors')
@@ -0,0 +1,369 @@
+"""
+AppleTrader Pro - Headless Analysis Service
+Runs the connector and analysis stack on an asyncio loop, without Qt
+
+One process polls the EA export (MT5Connector), feeds data_manager, runs the
+Smart Money detectors, opportunity generation and ML status, and publishes
+each result to any number of GUI clients. Opportunities are built from the
+same exported candles the detectors see; a symbol whose spread is not in the
+export gets none (no fallback prices):
+- FilePublisher: latest result as JSON (atomic replace), for polling clients
+- SocketPublisher: newline-delimited JSON over a local TCP socket; a client
+  gets the latest result on connect, then every new one
+
+Analysis runs in a worker thread so the loop keeps serving clients; updates
+arriving while it runs are coalesced (only the newest data is analysed).
+Start it with scripts/run_analysis_service.py (sets TRADING_APP_HEADLESS=1
+so core QObjects use the plain signals from core/qt_compat.py).
+"""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 47800
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_TIMEFRAME = 'H4'
+ANALYSIS_CANDLES = 200
+
+# Messages a slow socket client may fall behind before old ones are dropped
+CLIENT_QUEUE_SIZE = 16
+
+
+def _json_default(value):
+    """JSON encoding for the numpy/pandas/datetime values analysers return"""
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, Enum):
+        return value.value
+    if is_dataclass(value):
+        return asdict(value)
+    return str(value)
+
+
+def encode_message(message: Dict) -> bytes:
+    """One message as a JSON line"""
+    return (json.dumps(message, default=_json_default) + '\n').encode('utf-8')
+
+
+class FilePublisher:
+    """Writes every message to one JSON file (tmp file + atomic replace)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    async def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def publish(self, message: Dict):
+        if message.get('type') != 'analysis':
+            return
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(encode_message(message))
+        os.replace(tmp, self.path)
+
+    async def stop(self):
+        pass
+
+
+class SocketPublisher:
+    """Broadcasts messages as JSON lines to every connected TCP client"""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.clients: Dict[asyncio.StreamWriter, asyncio.Queue] = {}
+        self.latest: Optional[bytes] = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve_client, self.host, self.port)
+        # Port 0 picks a free port; report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        if self.latest is not None:
+            queue.put_nowait(self.latest)
+        self.clients[writer] = queue
+        try:
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            writer.close()
+
+    def publish(self, message: Dict):
+        line = encode_message(message)
+        if message.get('type') == 'analysis':
+            self.latest = line
+        for queue in self.clients.values():
+            if queue.full():
+                queue.get_nowait()  # Drop the oldest for slow clients
+            queue.put_nowait(line)
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            for writer in list(self.clients):
+                writer.close()
+            await self.server.wait_closed()
+
+
+async def stream_results(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """Client side of SocketPublisher: yields each published message"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            yield json.loads(line)
+    finally:
+        writer.close()
+
+
+def read_published(path: Path) -> Optional[Dict]:
+    """Client side of FilePublisher: latest result (None if not written yet)"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+class AnalysisService:
+    """
+    Headless driver of the analysis stack
+
+    Usage:
+        service = AnalysisService(publishers=[SocketPublisher(), FilePublisher(path)])
+        service.add_listener(lambda message: print(message['type']))
+        asyncio.run(service.run())
+    """
+
+    def __init__(self, connector=None, symbols: Optional[List[str]] = None,
+                 timeframe: str = DEFAULT_TIMEFRAME, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 publishers: Optional[List] = None):
+        if connector is None:
+            from core.mt5_connector import mt5_connector
+            connector = mt5_connector
+        self.connector = connector
+        self.symbols = symbols
+        self.timeframe = timeframe
+        self.poll_interval = poll_interval
+        self.publishers = list(publishers or [])
+        self.listeners: List[Callable[[Dict], None]] = []
+
+        self.sequence = 0
+        self.latest_data: Optional[Dict] = None
+        self._data_ready: Optional[asyncio.Event] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+        # The service polls; the connector's own timer must not
+        self.connector.update_timer.stop()
+        self.connector.data_updated.connect(self._on_data)
+        self.connector.connection_status_changed.connect(self._on_connection_changed)
+        self.connector.error_occurred.connect(self._on_error)
+
+    def add_listener(self, callback: Callable[[Dict], None]):
+        """Call `callback(message)` on the loop for every published message"""
+        self.listeners.append(callback)
+
+    # ------------------------------------------------------------------
+    # Connector callbacks (run on the loop, inside connector.update_data)
+    # ------------------------------------------------------------------
+
+    def _on_data(self, data: Dict):
+        self.latest_data = data
+        if self._data_ready is not None:
+            self._data_ready.set()
+
+    def _on_connection_changed(self, connected: bool):
+        self.publish({'type': 'status', 'connected': connected, 'timestamp': datetime.now()})
+
+    def _on_error(self, message: str):
+        self.publish({'type': 'error', 'message': message, 'timestamp': datetime.now()})
+
+    # ------------------------------------------------------------------
+    # Analysis (worker thread)
+    # ------------------------------------------------------------------
+
+    def resolve_symbols(self) -> List[str]:
+        """Configured symbols, else every symbol the EA exported for the timeframe"""
+        if self.symbols:
+            return list(self.symbols)
+        suffix = f"_{self.timeframe}"
+        return [key[len('candles_'):-len(suffix)] for key in self.latest_data or {}
+                if key.startswith('candles_') and key.endswith(suffix)]
+
+    def get_candles(self, symbol: str) -> Optional[List[Dict]]:
+        """Exported candles of one symbol as records (None without candles)"""
+        df = self.connector.get_candles(symbol, self.timeframe, ANALYSIS_CANDLES)
+        if df is None or df.empty:
+            return None
+        return df.to_dict('records')
+
+    @staticmethod
+    def spread_pips(symbol: str, data: Dict, candles: List[Dict]) -> Optional[float]:
+        """
+        Spread of a symbol from the EA export (None if it is not there)
+
+        The export's own bid/ask for its chart symbol, else the last candle's
+        MT5 spread (points) for a symbol with known specs.
+        """
+        pip_value = 0.01 if 'JPY' in symbol else 0.0001
+        if data.get('symbol') == symbol and data.get('ask') and data.get('bid'):
+            return (float(data['ask']) - float(data['bid'])) / pip_value
+        if candles and candles[-1].get('spread') is not None:
+            from core.symbol_manager import symbol_specs_manager
+            specs = symbol_specs_manager.get_symbol_specs(symbol)
+            if specs is not None:
+                return float(candles[-1]['spread']) * specs.point / pip_value
+        return None
+
+    def analyze_symbol(self, symbol: str, candles: Optional[List[Dict]] = None) -> Optional[Dict]:
+        """Smart Money zones and structure of one symbol (None without candles)"""
+        from analysis.order_block_detector import order_block_detector
+        from analysis.fair_value_gap_detector import fair_value_gap_detector
+        from analysis.liquidity_sweep_detector import liquidity_sweep_detector
+        from analysis.market_structure_detector import market_structure_detector
+
+        if candles is None:
+            candles = self.get_candles(symbol)
+        if not candles:
+            return None
+
+        events, trend = market_structure_detector.detect_structure_shifts(candles, symbol)
+        return {
+            'bars': len(candles),
+            'last_close': candles[-1]['close'],
+            'order_blocks': order_block_detector.detect_order_blocks(candles, symbol),
+            'fair_value_gaps': fair_value_gap_detector.detect_fair_value_gaps(candles, symbol),
+            'liquidity_sweeps': liquidity_sweep_detector.detect_liquidity_sweeps(candles, symbol),
+            'structure': {'events': events, 'trend': trend},
+        }
+
+    def analyze(self, data: Dict) -> Dict:
+        """Run the whole stack on one EA export"""
+        from core.data_manager import data_manager
+        from core.opportunity_generator import opportunity_generator
+        from core.ml_integration import ml_integration
+
+        started = time.perf_counter()
+        data_manager.update_from_mt5_data(data)
+
+        symbols = self.resolve_symbols()
+        results = {}
+        opportunities = []
+        for symbol in symbols:
+            candles = self.get_candles(symbol)
+            try:
+                result = self.analyze_symbol(symbol, candles)
+            except Exception as e:
+                result = {'error': str(e)}
+            if result is not None:
+                results[symbol] = result
+
+            spread = self.spread_pips(symbol, data, candles)
+            if candles and spread is not None:
+                opportunities.extend(opportunity_generator.scan_candles(
+                    symbol, self.timeframe, candles, spread))
+        opportunities.sort(key=lambda x: x.get('quality_score', 0), reverse=True)
+
+        return {
+            'type': 'analysis',
+            'timestamp': datetime.now(),
+            'symbol': data.get('symbol'),
+            'timeframe': self.timeframe,
+            'symbols': results,
+            'opportunities': opportunities,
+            'ml': ml_integration.get_ml_status(),
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    def publish(self, message: Dict):
+        for publisher in self.publishers:
+            try:
+                publisher.publish(message)
+            except Exception as e:
+                print(f"[AnalysisService] {type(publisher).__name__} failed: {e}")
+        for callback in list(self.listeners):
+            callback(message)
+
+    async def _poll(self):
+        while not self._stopping.is_set():
+            self.connector.update_data()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _analyze_loop(self):
+        while True:
+            await self._data_ready.wait()
+            self._data_ready.clear()
+            data = self.latest_data
+            try:
+                message = await asyncio.to_thread(self.analyze, data)
+            except Exception as e:
+                self.publish({'type': 'error', 'message': f"Analysis failed: {e}",
+                              'timestamp': datetime.now()})
+                continue
+            self.sequence += 1
+            message['sequence'] = self.sequence
+            self.publish(message)
+
+    async def run(self):
+        """Poll and analyse until stop() is called"""
+        self._data_ready = asyncio.Event()
+        self._stopping = asyncio.Event()
+        if self.latest_data is not None:
+            self._data_ready.set()
+
+        for publisher in self.publishers:
+            await publisher.start()
+
+        analyzer = asyncio.create_task(self._analyze_loop())
+        try:
+            await self._poll()
+        finally:
+            analyzer.cancel()
+            try:
+                await analyzer
+            except asyncio.CancelledError:
+                pass
+            for publisher in self.publishers:
+                await publisher.stop()
+
+    def stop(self):
+        """Stop run() after the current poll"""
+        if self._stopping is not None:
+            self._stopping.set()
@@ -0,0 +1,313 @@
+"""
+AppleTrader Pro - Bar Resampler
+One base series per symbol from MT5, every higher timeframe derived locally
+
+Scanners used to call copy_rates_from_pos once per symbol per timeframe
+(M5, M15, M30, H1, H4, D1 ...). The resampler fetches only the base
+timeframe (M5 by default): a full history once, then a small incremental
+window at most once per refresh interval. Higher timeframes are aggregated
+from it, so they are mutually consistent (an H4 bar is exactly its 48 M5
+bars).
+
+Bar boundaries follow MT5: intraday and D1 bars align to server midnight
+(shifted by `day_offset_hours` for brokers whose trading day starts
+elsewhere), W1 bars start on Sunday. The newest aggregated bar is the
+forming one, like MT5's bar at position 0; copy_rates(include_partial=False)
+drops it while its base bars do not yet reach the bar's end.
+
+Aggregation is incremental: after a refresh only the buckets touched by
+new or revised base bars are rebuilt.
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from core.instrumentation import instrumentation
+from core.lazy_loader import lazy_import
+from core.replay_data_source import RATES_DTYPE, TIMEFRAME_SECONDS
+
+# MetaTrader5 is imported on first use to keep startup fast
+mt5 = lazy_import('MetaTrader5')
+
+
+BASE_TIMEFRAME = 'M5'
+
+# Base bars fetched the first time a symbol is used (100 H4 bars of M5)
+DEFAULT_HISTORY_BARS = 5000
+# Hard cap when a caller needs more (about 100 D1 bars of M5)
+MAX_HISTORY_BARS = 32000
+# Base bars re-fetched on each refresh (covers revisions of the forming bar)
+INCREMENTAL_BARS = 64
+# Seconds a base series is reused before it is refreshed again
+REFRESH_INTERVAL = 1.0
+
+# 1970-01-04 00:00 was a Sunday: W1 buckets start there
+WEEK_ANCHOR = 3 * 86400
+
+TimeframeLike = Union[str, int]
+
+
+def bucket_starts(times: np.ndarray, timeframe: str, day_offset: int = 0) -> np.ndarray:
+    """Start time (epoch seconds) of the `timeframe` bar each time falls in"""
+    seconds = TIMEFRAME_SECONDS[timeframe]
+    anchor = day_offset + (WEEK_ANCHOR if timeframe == 'W1' else 0)
+    return (times - anchor) // seconds * seconds + anchor
+
+
+def aggregate_rates(rates: np.ndarray, timeframe: str, day_offset: int = 0) -> np.ndarray:
+    """
+    Aggregate MT5 rates (sorted by time) to a higher timeframe
+
+    open = first, high = max, low = min, close = last, volumes = sum,
+    spread = max of the base bars in each bucket.
+    """
+    if len(rates) == 0:
+        return np.zeros(0, dtype=RATES_DTYPE)
+
+    keys = bucket_starts(rates['time'], timeframe, day_offset)
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    ends = np.concatenate((starts[1:], [len(rates)])) - 1
+
+    out = np.zeros(len(starts), dtype=RATES_DTYPE)
+    out['time'] = keys[starts]
+    out['open'] = rates['open'][starts]
+    out['high'] = np.maximum.reduceat(rates['high'], starts)
+    out['low'] = np.minimum.reduceat(rates['low'], starts)
+    out['close'] = rates['close'][ends]
+    out['tick_volume'] = np.add.reduceat(rates['tick_volume'], starts)
+    out['spread'] = np.maximum.reduceat(rates['spread'], starts)
+    out['real_volume'] = np.add.reduceat(rates['real_volume'], starts)
+    return out
+
+
+class _SymbolSeries:
+    """Base bars of one symbol plus the aggregates derived from them"""
+
+    def __init__(self, base: np.ndarray, capacity: int):
+        self.base = base
+        self.capacity = capacity
+        # Fewer bars than asked for: the terminal has no older history
+        self.exhausted = len(base) < capacity
+        self.fetched_at = 0.0
+        self.aggregates: Dict[str, np.ndarray] = {}
+        # Earliest base time changed since each aggregate was built
+        self.dirty_from: Dict[str, int] = {}
+
+    def mark_changed(self, changed_from: int):
+        for timeframe in self.aggregates:
+            self.dirty_from[timeframe] = min(self.dirty_from.get(timeframe, changed_from), changed_from)
+
+
+class BarResampler:
+    """
+    (symbol, timeframe) -> MT5 rates, fetched once per symbol and derived locally
+
+    Usage:
+        rates = bar_resampler.copy_rates('EURUSD', 'H4', 100)      # or mt5.TIMEFRAME_H4
+        df = bar_resampler.get_frame('EURUSD', 'M15', 100)
+    """
+
+    def __init__(self, base_timeframe: str = BASE_TIMEFRAME, history_bars: int = DEFAULT_HISTORY_BARS,
+                 refresh_interval: float = REFRESH_INTERVAL, day_offset_hours: int = 0):
+        self.base_timeframe = base_timeframe
+        self.base_seconds = TIMEFRAME_SECONDS[base_timeframe]
+        self.history_bars = history_bars
+        self.refresh_interval = refresh_interval
+        self.day_offset = day_offset_hours * 3600
+        self.clock = time.monotonic
+
+        self._series: Dict[str, _SymbolSeries] = {}
+        self._lock = threading.RLock()
+
+    def reset(self):
+        """Drop every cached series (e.g. after switching account or data source)"""
+        with self._lock:
+            self._series.clear()
+
+    # ------------------------------------------------------------------
+    # MT5 access
+    # ------------------------------------------------------------------
+
+    def timeframe_name(self, timeframe: TimeframeLike) -> Optional[str]:
+        """'H4' for 'H4' or mt5.TIMEFRAME_H4 (None if unknown)"""
+        if isinstance(timeframe, str) and timeframe in TIMEFRAME_SECONDS:
+            return timeframe
+        if mt5 is not None:
+            for name in TIMEFRAME_SECONDS:
+                if getattr(mt5, f"TIMEFRAME_{name}", None) == timeframe:
+                    return name
+        return None
+
+    def _copy_from_terminal(self, symbol: str, timeframe: str, count: int) -> Optional[np.ndarray]:
+        if mt5 is None or not mt5.initialize():
+            return None
+        rates = mt5.copy_rates_from_pos(symbol, getattr(mt5, f"TIMEFRAME_{timeframe}"), 0, count)
+        if rates is None or len(rates) == 0:
+            return None
+        return np.asarray(rates).astype(RATES_DTYPE)
+
+    def _fetch_base(self, symbol: str, count: int) -> Optional[np.ndarray]:
+        instrumentation.count('resampler.base_fetches')
+        with instrumentation.span('resampler.fetch'):
+            return self._copy_from_terminal(symbol, self.base_timeframe, count)
+
+    # ------------------------------------------------------------------
+    # Base series
+    # ------------------------------------------------------------------
+
+    def refresh(self, symbol: str, min_base_bars: int = 0, force: bool = False) -> Optional[_SymbolSeries]:
+        """
+        Bring the base series of `symbol` up to date
+
+        Fetches the full history the first time (or when more history is
+        needed), otherwise only the last INCREMENTAL_BARS base bars, and
+        at most once per refresh_interval unless `force`.
+        """
+        with self._lock:
+            series = self._series.get(symbol)
+            now = self.clock()
+            wants_history = series is not None and min_base_bars > series.capacity \
+                and not series.exhausted and series.capacity < MAX_HISTORY_BARS
+
+            if series is None or wants_history:
+                capacity = min(MAX_HISTORY_BARS, max(self.history_bars, min_base_bars))
+                rates = self._fetch_base(symbol, capacity)
+                if rates is None:
+                    return series
+                series = self._series[symbol] = _SymbolSeries(rates, capacity)
+                series.fetched_at = now
+                return series
+
+            if not force and now - series.fetched_at < self.refresh_interval:
+                return series
+
+            rates = self._fetch_base(symbol, INCREMENTAL_BARS)
+            series.fetched_at = now
+            if rates is None:
+                return series
+
+            if rates['time'][0] > series.base['time'][-1]:
+                # Missed more than the incremental window: start over
+                rates = self._fetch_base(symbol, series.capacity)
+                if rates is not None:
+                    fresh = self._series[symbol] = _SymbolSeries(rates, series.capacity)
+                    fresh.fetched_at = now
+                    return fresh
+                return series
+
+            changed_from = int(rates['time'][0])
+            keep = series.base[:np.searchsorted(series.base['time'], changed_from)]
+            if np.array_equal(series.base[len(keep):], rates):
+                return series
+
+            base = np.concatenate((keep, rates))
+            if len(base) > series.capacity:
+                base = base[-series.capacity:]
+                series.exhausted = False
+            series.base = base
+            series.mark_changed(changed_from)
+            return series
+
+    def _aggregate(self, series: _SymbolSeries, timeframe: str) -> np.ndarray:
+        """Aggregate of the base series, rebuilding only the changed buckets"""
+        base = series.base
+        if timeframe == self.base_timeframe:
+            return base
+
+        cached = series.aggregates.get(timeframe)
+        if cached is None:
+            agg = aggregate_rates(base, timeframe, self.day_offset)
+        elif timeframe in series.dirty_from:
+            start = int(bucket_starts(np.array([series.dirty_from.pop(timeframe)]),
+                                      timeframe, self.day_offset)[0])
+            head = cached[:np.searchsorted(cached['time'], start)]
+            tail = aggregate_rates(base[np.searchsorted(base['time'], start):], timeframe, self.day_offset)
+            agg = np.concatenate((head, tail))
+        else:
+            return cached
+
+        # History trimmed at the front: drop buckets that lost their first bars
+        first = int(bucket_starts(base['time'][:1], timeframe, self.day_offset)[0])
+        agg = agg[np.searchsorted(agg['time'], first):]
+        if not series.exhausted and first < base['time'][0] and len(agg) > 1:
+            agg = agg[1:]
+
+        series.aggregates[timeframe] = agg
+        return agg
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def copy_rates(self, symbol: str, timeframe: TimeframeLike, count: int,
+                   include_partial: bool = True) -> Optional[np.ndarray]:
+        """
+        Latest `count` bars of `symbol` on `timeframe` (oldest first), MT5 layout
+
+        Timeframes below the base timeframe, or requests the base history
+        cannot cover, are fetched from the terminal directly.
+        """
+        name = self.timeframe_name(timeframe)
+        if name is None:
+            return None
+        seconds = TIMEFRAME_SECONDS[name]
+        if seconds < self.base_seconds or seconds % self.base_seconds:
+            return self._direct(symbol, name, count)
+
+        ratio = seconds // self.base_seconds
+        with self._lock:
+            series = self.refresh(symbol, (count + 1) * ratio)
+            if series is None:
+                return self._direct(symbol, name, count)
+
+            agg = self._aggregate(series, name)
+            if len(agg) < count and not series.exhausted and series.capacity < MAX_HISTORY_BARS:
+                # Gaps (closed sessions) made buckets thinner than `ratio`: get more history
+                series = self.refresh(symbol, series.capacity * 2)
+                agg = self._aggregate(series, name)
+
+            if not include_partial and self._is_partial(series, name, agg):
+                agg = agg[:-1]
+
+            if len(agg) < count and not series.exhausted:
+                return self._direct(symbol, name, count)
+
+            instrumentation.count('resampler.served')
+            return agg[-count:].copy()
+
+    def get_frame(self, symbol: str, timeframe: TimeframeLike, count: int,
+                  include_partial: bool = True) -> Optional[pd.DataFrame]:
+        """copy_rates() as a DataFrame with `time` as datetime"""
+        rates = self.copy_rates(symbol, timeframe, count, include_partial)
+        if rates is None or len(rates) == 0:
+            return None
+        df = pd.DataFrame(rates)
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        return df
+
+    def is_partial(self, symbol: str, timeframe: TimeframeLike) -> bool:
+        """Whether the newest bar of `timeframe` is still forming"""
+        name = self.timeframe_name(timeframe)
+        with self._lock:
+            series = self._series.get(symbol)
+            if series is None or name is None:
+                return False
+            return self._is_partial(series, name, self._aggregate(series, name))
+
+    def _is_partial(self, series: _SymbolSeries, timeframe: str, agg: np.ndarray) -> bool:
+        if len(agg) == 0:
+            return False
+        base_end = int(series.base['time'][-1]) + self.base_seconds
+        return base_end < int(agg['time'][-1]) + TIMEFRAME_SECONDS[timeframe]
+
+    def _direct(self, symbol: str, timeframe: str, count: int) -> Optional[np.ndarray]:
+        instrumentation.count('resampler.direct_fetches')
+        return self._copy_from_terminal(symbol, timeframe, count)
+
+
+# Global resampler instance
+bar_resampler = BarResampler()
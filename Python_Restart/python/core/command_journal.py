@@ -0,0 +1,253 @@
+"""
+AppleTrader Pro - Command Journal
+Append-only, sequence-numbered command log shared by every Python sender
+
+commands.jsonl (in the EA's Common Files directory):
+
+    {"journal":"AppleTrader","generation":3}                  <- header
+    {"seq":41,"command":"FILTER_TOGGLE","timestamp":"...","filter":"UseVolumeFilter","enabled":true}
+    {"seq":42,"command":"PLACE_ORDER","timestamp":"...","type":"BUY","volume":0.1}
+
+commands.ack (written by the EA's CJSONReader after each command it takes):
+
+    {"seq":42,"offset":1234,"generation":3}
+
+- Sequence numbers only grow (they continue across restarts); the EA skips
+  anything at or below its acked seq, so a command is taken at most once
+- Appending is O(1) in the journal size: senders queue a line, a writer
+  thread flushes each burst with one append (orders flush immediately)
+- Compaction: once the journal passes COMPACT_BYTES, the acked prefix is
+  dropped by rewriting the unacked tail under a new generation; the EA sees
+  the new header and rescans from the top
+- One writing process per journal (the GUI or the headless service)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+JOURNAL_FILE = 'commands.jsonl'
+ACK_FILE = 'commands.ack'
+JOURNAL_NAME = 'AppleTrader'
+
+# Seconds a burst of commands is gathered before one write
+FLUSH_DELAY = 0.005
+# Journal size that triggers compaction of the acked prefix
+COMPACT_BYTES = 256 * 1024
+# Tail read on open to recover the last sequence number
+TAIL_BYTES = 64 * 1024
+
+# Keys owned by the journal; parameters cannot override them
+RESERVED_KEYS = ('seq', 'command', 'timestamp')
+
+
+def encode_line(record: Dict[str, Any]) -> bytes:
+    return (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class CommandJournal:
+    """
+    Append-only command log of one EA directory
+
+    Usage:
+        journal = CommandJournal(ea_dir)
+        seq = journal.append('FILTER_TOGGLE', {'filter': 'UseVolumeFilter', 'enabled': True})
+        journal.acked_seq() >= seq      # the EA has taken it
+    """
+
+    def __init__(self, directory: Path, flush_delay: float = FLUSH_DELAY,
+                 compact_bytes: int = COMPACT_BYTES):
+        self.directory = Path(directory)
+        self.path = self.directory / JOURNAL_FILE
+        self.ack_path = self.directory / ACK_FILE
+        self.flush_delay = flush_delay
+        self.compact_bytes = compact_bytes
+
+        self.generation = 0
+        self.last_seq = 0
+        self.size = 0
+        self.compactions = 0
+        self._compact_at = compact_bytes
+        self._pending: List[bytes] = []
+        self._opened = False
+
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._writer = None
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Opening
+    # ------------------------------------------------------------------
+
+    def _open(self):
+        """Create the journal or recover generation / last seq from it"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists():
+            # A deleted journal does not reset the EA: continue above its acked
+            # seq (or new commands would be skipped) under a newer generation
+            ack = self.read_ack()
+            self.last_seq = ack.get('seq', 0)
+            self._rewrite(ack.get('generation', 0) + 1, [])
+        else:
+            with open(self.path, 'rb') as f:
+                header = self._parse(f.readline())
+                self.generation = int(header.get('generation', 1)) if header else 1
+                f.seek(0, os.SEEK_END)
+                self.size = f.tell()
+                f.seek(max(0, self.size - TAIL_BYTES))
+                tail = f.read().split(b'\n')
+            for line in reversed(tail):
+                record = self._parse(line)
+                if record and 'seq' in record:
+                    self.last_seq = int(record['seq'])
+                    break
+            # The journal may have been compacted to nothing: acked seqs still count
+            self.last_seq = max(self.last_seq, self.read_ack().get('seq', 0))
+        self._opened = True
+
+    @staticmethod
+    def _parse(line: bytes) -> Optional[Dict]:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return record if isinstance(record, dict) else None
+
+    # ------------------------------------------------------------------
+    # Appending
+    # ------------------------------------------------------------------
+
+    def append(self, command: str, parameters: Optional[Dict[str, Any]] = None,
+               flush: bool = False) -> int:
+        """
+        Queue one command and return its sequence number
+
+        `flush` writes it (and anything queued before it) before returning;
+        otherwise the writer thread flushes within flush_delay.
+        """
+        with self._lock:
+            if not self._opened:
+                self._open()
+            self.last_seq += 1
+            seq = self.last_seq
+            record = {'seq': seq, 'command': command, 'timestamp': datetime.now().isoformat()}
+            record.update((k, v) for k, v in (parameters or {}).items() if k not in RESERVED_KEYS)
+            self._pending.append(encode_line(record))
+            if not flush:
+                self._start_writer()
+                self._wakeup.notify()
+        if flush:
+            self.flush()
+        return seq
+
+    def _start_writer(self):
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name='CommandJournal', daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    def _write_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                if self._closed:
+                    return
+            time.sleep(self.flush_delay)  # Let the rest of the burst arrive
+            self.flush()
+
+    def flush(self):
+        """Write every queued command with one append"""
+        with self._io_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if not lines:
+                return
+            data = b''.join(lines)
+            with open(self.path, 'ab') as f:
+                f.write(data)
+            self.size += len(data)
+            if self.size > self._compact_at:
+                self.compact()
+                # Not compacted far enough (EA behind or offline): wait for more growth
+                self._compact_at = max(self.compact_bytes, self.size + self.compact_bytes // 4)
+
+    def close(self):
+        """Flush what is queued and stop the writer thread"""
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Acknowledgement and compaction
+    # ------------------------------------------------------------------
+
+    def read_ack(self) -> Dict[str, int]:
+        """The EA's position: {'seq', 'offset', 'generation'} (empty if it has not acked yet)"""
+        try:
+            with open(self.ack_path, 'r', encoding='utf-8') as f:
+                ack = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {key: int(ack.get(key, 0)) for key in ('seq', 'offset', 'generation')}
+
+    def acked_seq(self) -> int:
+        return self.read_ack().get('seq', 0)
+
+    def pending_count(self) -> int:
+        """Commands not yet taken by the EA"""
+        return max(0, self.last_seq - self.acked_seq())
+
+    def compact(self) -> bool:
+        """Drop the acked prefix (False if the EA is on an older generation or the file is busy)"""
+        ack = self.read_ack()
+        if ack.get('generation') != self.generation:
+            return False
+        with open(self.path, 'rb') as f:
+            f.seek(ack.get('offset', 0))
+            # Keep whole lines only; the EA's offset always ends on one
+            tail = [line + b'\n' for line in f.read().split(b'\n') if line.strip()]
+        try:
+            self._rewrite(self.generation + 1, tail)
+        except PermissionError:
+            return False  # The EA has the file open (Windows); retry on a later flush
+        self.compactions += 1
+        return True
+
+    def clear(self):
+        """Discard every command the EA has not taken yet"""
+        with self._io_lock:
+            with self._lock:
+                if not self._opened:
+                    self._open()
+                self._pending = []
+            self._rewrite(self.generation + 1, [])
+
+    def _rewrite(self, generation: int, lines: List[bytes]):
+        header = encode_line({'journal': JOURNAL_NAME, 'generation': generation})
+        data = header + b''.join(lines)
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+        self.generation = generation
+        self.size = len(data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'path': str(self.path),
+            'generation': self.generation,
+            'last_seq': self.last_seq,
+            'acked_seq': self.acked_seq(),
+            'queued': len(self._pending),
+            'size': self.size,
+            'compactions': self.compactions,
+        }
@@ -1,29 +1,29 @@
 """
 AppleTrader Pro - Command Manager
-Sends commands from Python GUI to MT5 EA via JSON files
+Sends commands from Python GUI to MT5 EA via the command journal
 """
 
-import json
 import os
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from core.command_journal import CommandJournal
+from core.lazy_loader import LazySingleton
 
 
 class CommandManager:
     """
     Manages bidirectional communication with MT5 EA
-    Sends commands via JSON file that EA monitors
+    Sends commands via the append-only journal the EA consumes
+    (core/command_journal.py: commands.jsonl + commands.ack)
     """
 
     def __init__(self):
         # Find MT5 Common Files directory
-        self.commands_file = self.find_commands_file()
-        self.command_queue = []
-
+        self.journal = CommandJournal(self.find_commands_dir())
 
-    def find_commands_file(self) -> Path:
-        """Find or create commands.json in MT5 Common Files"""
+    def find_commands_dir(self) -> Path:
+        """Find the AppleTrader directory in MT5 Common Files"""
         # Try common MT5 paths
         possible_paths = [
             Path.home() / 'AppData' / 'Roaming' / 'MetaQuotes' / 'Terminal' / 'Common' / 'Files' / 'AppleTrader',
@@ -33,21 +33,43 @@ class CommandManager:
 
         for path in possible_paths:
             if path.exists():
-                commands_path = path / 'commands.json'
+                return path
 
-                # Create commands file if it doesn't exist
-                if not commands_path.exists():
-                    commands_path.write_text(json.dumps({'commands': []}, indent=2))
+        # Fallback: local directory (created on the first command)
+        return Path('./data')
 
-                return commands_path
+    def set_directory(self, directory: Path):
+        """Send to another EA directory (e.g. MT5Connector.set_data_directory)"""
+        directory = Path(directory)
+        if directory != self.journal.directory:
+            self.journal.close()
+            self.journal = CommandJournal(directory)
 
-        # Fallback: create in local directory
-        local_path = Path('./data/commands.json')
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-        if not local_path.exists():
-            local_path.write_text(json.dumps({'commands': []}, indent=2))
+    @property
+    def commands_file(self) -> Path:
+        return self.journal.path
 
-        return local_path
+    def send_command(self, command: str, parameters: Optional[Dict[str, Any]] = None,
+                     flush: bool = False) -> int:
+        """
+        Queue a command for the EA (the one API every sender uses)
+
+        Args:
+            command: Command name (e.g. 'FILTER_TOGGLE', 'PLACE_ORDER')
+            parameters: Command fields
+            flush: Write before returning instead of within a few ms (orders)
+
+        Returns:
+            Sequence number of the command (compare with acked_seq())
+        """
+        try:
+            return self.journal.append(command, parameters, flush)
+        except OSError:
+            return 0
+
+    def acked_seq(self) -> int:
+        """Highest sequence number the EA has taken"""
+        return self.journal.acked_seq()
 
     def send_filter_toggle(self, filter_name: str, enabled: bool):
         """
@@ -57,14 +79,10 @@ class CommandManager:
             filter_name: Name of filter (e.g., 'UseVolumeFilter', 'UseSpreadFilter')
             enabled: True to enable, False to disable
         """
-        command = {
-            'type': 'FILTER_TOGGLE',
+        self.send_command('FILTER_TOGGLE', {
             'filter': filter_name,
             'enabled': enabled,
-            'timestamp': datetime.now().isoformat(),
-        }
-
-        self._send_command(command)
+        })
 
     def send_risk_update(self, risk_percent: float):
         """
@@ -73,13 +91,9 @@ class CommandManager:
         Args:
             risk_percent: Risk per trade (0.1 - 2.0%)
         """
-        command = {
-            'type': 'RISK_UPDATE',
+        self.send_command('RISK_UPDATE', {
             'risk_percent': risk_percent,
-            'timestamp': datetime.now().isoformat(),
-        }
-
-        self._send_command(command)
+        })
 
     def send_trading_mode(self, enabled: bool):
         """
@@ -88,13 +102,9 @@ class CommandManager:
         Args:
             enabled: True for trading ON, False for OFF
         """
-        command = {
-            'type': 'TRADING_MODE',
+        self.send_command('TRADING_MODE', {
             'enabled': enabled,
-            'timestamp': datetime.now().isoformat(),
-        }
-
-        self._send_command(command)
+        })
 
     def send_order(self, order_type: str, symbol: str, lot_size: float):
         """
@@ -105,15 +115,11 @@ class CommandManager:
             symbol: Trading symbol
             lot_size: Position size
         """
-        command = {
-            'type': 'MANUAL_ORDER',
+        self.send_command('MANUAL_ORDER', {
             'order_type': order_type,
             'symbol': symbol,
             'lot_size': lot_size,
-            'timestamp': datetime.now().isoformat(),
-        }
-
-        self._send_command(command)
+        }, flush=True)
 
     def send_visual_toggle(self, visual_name: str, enabled: bool):
         """
@@ -123,55 +129,18 @@ class CommandManager:
             visual_name: Name of visual (e.g., 'ShowFVGZones', 'ShowOrderBlocks')
             enabled: True to show, False to hide
         """
-        command = {
-            'type': 'VISUAL_TOGGLE',
+        self.send_command('VISUAL_TOGGLE', {
             'visual': visual_name,
             'enabled': enabled,
-            'timestamp': datetime.now().isoformat(),
-        }
-
-        self._send_command(command)
-
-    def _send_command(self, command: Dict[str, Any]):
-        """
-        Write command to commands.json file for EA to read
-
-        Args:
-            command: Command dictionary
-        """
-        try:
-            # Read existing commands
-            if self.commands_file.exists():
-                with open(self.commands_file, 'r') as f:
-                    data = json.load(f)
-            else:
-                data = {'commands': []}
-
-            # Add new command
-            if 'commands' not in data:
-                data['commands'] = []
-
-            data['commands'].append(command)
-
-            # Keep only last 100 commands to prevent file bloat
-            if len(data['commands']) > 100:
-                data['commands'] = data['commands'][-100:]
-
-            # Write back to file
-            with open(self.commands_file, 'w') as f:
-                json.dump(data, f, indent=2)
-
-        except Exception as e:
-            pass
+        })
 
     def clear_commands(self):
         """Clear all pending commands"""
         try:
-            with open(self.commands_file, 'w') as f:
-                json.dump({'commands': []}, f, indent=2)
-        except Exception as e:
+            self.journal.clear()
+        except OSError:
             pass
 
 
 # Global command manager instance
-command_manager = CommandManager()
+command_manager = LazySingleton(CommandManager, 'command_manager')
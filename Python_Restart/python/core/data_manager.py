@@ -9,6 +9,11 @@ from collections import deque
 import pandas as pd
 
 from core.risk_manager import risk_manager
+from core.instrumentation import instrumentation
+from core.lazy_loader import LazySingleton
+from core.log_manager import get_logger
+
+logger = get_logger('data_manager')
 
 
 class MarketDataBuffer:
@@ -202,6 +207,7 @@ class DataManager:
         # Store last raw data from EA for debugging
         self.last_raw_data = {}
 
+    @instrumentation.timed('data_manager', 'update')
     def update_from_mt5_data(self, data: Dict):
         """
         Update all buffers from MT5 data (either from API or IPC file)
@@ -209,15 +215,9 @@ class DataManager:
         Args:
             data: Market data dictionary from MT5
         """
-        print("=" * 80)
-        print("📊 [DATA MANAGER] RECEIVING REAL MT5 DATA")
-        if 'symbol' in data:
-            print(f"   Symbol: {data['symbol']}")
-        if 'account_balance' in data:
-            print(f"   ✓ REAL Account Balance: ${data['account_balance']:,.2f}")
-        if 'account_equity' in data:
-            print(f"   ✓ REAL Account Equity: ${data['account_equity']:,.2f}")
-        print("=" * 80)
+        logger.debug("📊 [DATA MANAGER] MT5 update: %s balance=%s equity=%s",
+                     data.get('symbol', '?'), data.get('account_balance', '-'),
+                     data.get('account_equity', '-'))
 
         try:
             timestamp = data.get('timestamp')
@@ -396,5 +396,5 @@ class DataManager:
         return age <= max_age_seconds
 
 
-# Global data manager instance
-data_manager = DataManager()
+# Global data manager instance (constructed on first use)
+data_manager = LazySingleton(DataManager, 'data_manager')
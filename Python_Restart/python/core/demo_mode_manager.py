@@ -8,7 +8,7 @@ Provides:
 4. Multi-symbol support
 """
 
-from PyQt6.QtCore import QObject, pyqtSignal
+from core.qt_compat import QObject, pyqtSignal
 from typing import Dict, List, Any
 import random
 from datetime import datetime, timedelta
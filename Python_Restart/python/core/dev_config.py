@@ -21,6 +21,43 @@ if os.getenv('TRADING_APP_DEV_MODE'):
     DEVELOPMENT_MODE = True
 
 
+# =============================================================================
+# STARTUP MODE
+# =============================================================================
+
+# Lazy startup: dashboard tabs are placeholders until first shown and heavy
+# modules/singletons are loaded on first use.
+# export TRADING_APP_LAZY_STARTUP=0    # Build every widget at startup
+LAZY_STARTUP = os.getenv('TRADING_APP_LAZY_STARTUP', '1') != '0'
+
+# Print the per-component startup timing report once the window has painted
+# export TRADING_APP_STARTUP_REPORT=1
+STARTUP_REPORT = bool(os.getenv('TRADING_APP_STARTUP_REPORT'))
+
+# Hot-path latency spans/counters (core/instrumentation.py), also toggled
+# from View > Diagnostics
+# export TRADING_APP_INSTRUMENTATION=1
+INSTRUMENTATION = bool(os.getenv('TRADING_APP_INSTRUMENTATION'))
+
+# Headless: core QObjects use plain Python signals/timers (core/qt_compat.py)
+# even when PyQt6 is installed. Set by scripts/run_analysis_service.py.
+# export TRADING_APP_HEADLESS=1
+HEADLESS = bool(os.getenv('TRADING_APP_HEADLESS'))
+
+
+# =============================================================================
+# LOGGING
+# =============================================================================
+
+# Verbose (vprint) output at startup; toggled from Settings > Verbose Console Output
+# export TRADING_APP_VERBOSE=1
+VERBOSE = bool(os.getenv('TRADING_APP_VERBOSE'))
+
+# Per-category log levels (core/log_manager.py), e.g.
+# export TRADING_APP_LOG_LEVELS="scanner=WARNING,data_manager=DEBUG"
+LOG_LEVELS = os.getenv('TRADING_APP_LOG_LEVELS', '')
+
+
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
@@ -40,6 +77,52 @@ def should_enforce_license() -> bool:
     return not DEVELOPMENT_MODE
 
 
+def is_lazy_startup() -> bool:
+    """Check if tabs and heavy modules should be loaded on first use"""
+    return LAZY_STARTUP
+
+
+def should_print_startup_report() -> bool:
+    """Check if the startup timing report should be printed"""
+    return STARTUP_REPORT
+
+
+def is_instrumentation_enabled() -> bool:
+    """Check if hot-path instrumentation should start enabled"""
+    return INSTRUMENTATION
+
+
+def is_headless() -> bool:
+    """Check if core modules should run without Qt"""
+    return HEADLESS
+
+
+def is_verbose_default() -> bool:
+    """Check if verbose console output should start enabled"""
+    return VERBOSE
+
+
+def get_log_levels() -> dict:
+    """
+    Per-category log levels from TRADING_APP_LOG_LEVELS ({category: level name})
+
+    Unknown level names are skipped with a warning, so a typo cannot stop startup.
+    """
+    import logging
+
+    levels = {}
+    for item in LOG_LEVELS.split(','):
+        category, _, level = item.partition('=')
+        category, level = category.strip(), level.strip().upper()
+        if not category or not level:
+            continue
+        if not isinstance(logging.getLevelName(level), int):
+            print(f"⚠️ TRADING_APP_LOG_LEVELS: unknown level '{level}' for '{category}' - ignored")
+            continue
+        levels[category] = level
+    return levels
+
+
 # =============================================================================
 # USAGE EXAMPLES
 # =============================================================================
@@ -0,0 +1,306 @@
+"""
+AppleTrader Pro - Excursion Engine
+Empirical MFE/MAE statistics and take-profit reach probabilities from bar history
+
+Every historical bar is treated as a hypothetical entry at its close. Over
+the next N bars the running maximum favorable excursion (MFE) and maximum
+adverse excursion (MAE) are measured in ATR units for both directions,
+fully vectorized over all bars. From the excursion paths a lookup table of
+P(reach k·R before -1R) is built for a grid of stop sizes (in ATR) and
+R multiples, cached in memory and on disk (data/reach_tables/).
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.news_impact_stats import BARS_DIR, load_cached_bars
+
+
+REACH_CACHE_DIR = Path(__file__).parent.parent / "data" / "reach_tables"
+
+# Stop distances (in ATR) and R multiples the table is evaluated on
+STOP_GRID_ATR = (0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0)
+R_GRID = tuple(np.round(np.arange(0.5, 10.01, 0.25), 2))
+
+# Bars a trade is given to reach its target, per timeframe
+HORIZON_BARS = {'M1': 240, 'M5': 144, 'M15': 96, 'M30': 72, 'H1': 48, 'H4': 30, 'D1': 20, 'W1': 12}
+DEFAULT_HORIZON = 50
+
+ATR_PERIOD = 14
+
+# Entries processed per chunk (bounds memory of the per-entry hit arrays)
+CHUNK_SIZE = 50000
+
+
+def average_true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                       period: int = ATR_PERIOD) -> np.ndarray:
+    """Simple-average ATR (NaN until `period` bars are available)"""
+    prev_close = np.concatenate(([close[0]], close[:-1]))
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close),
+                                                   np.abs(low - prev_close)))
+    atr = np.full(len(close), np.nan)
+    if len(close) >= period:
+        csum = np.cumsum(true_range)
+        atr[period - 1:] = (csum[period - 1:] - np.concatenate(([0.0], csum[:-period]))) / period
+    return atr
+
+
+def compute_excursions(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                       atr: np.ndarray, horizon: int) -> Dict[str, np.ndarray]:
+    """
+    Running excursion paths for every bar as an entry at its close
+
+    Row i covers bars i+1 .. i+horizon. Only entries with a full horizon
+    and a valid ATR are returned.
+
+    Returns:
+        {
+            'entry_index': (E,) bar index of each entry,
+            'up': (E, horizon) running max of (high - entry) / ATR, floored at 0,
+            'down': (E, horizon) running max of (entry - low) / ATR, floored at 0,
+        }
+        For a BUY 'up' is the MFE path and 'down' the MAE path; for a SELL
+        they swap.
+    """
+    n_entries = len(close) - horizon
+    if n_entries <= 0:
+        empty = np.empty((0, horizon))
+        return {'entry_index': np.empty(0, dtype=int), 'up': empty, 'down': empty}
+
+    entry_index = np.flatnonzero(np.isfinite(atr[:n_entries]) & (atr[:n_entries] > 0))
+    entry = close[entry_index][:, None]
+    scale = atr[entry_index][:, None]
+
+    future_high = sliding_window_view(high[1:], horizon)[entry_index]
+    future_low = sliding_window_view(low[1:], horizon)[entry_index]
+
+    up = np.maximum.accumulate(np.maximum(future_high - entry, 0.0) / scale, axis=1)
+    down = np.maximum.accumulate(np.maximum(entry - future_low, 0.0) / scale, axis=1)
+    return {'entry_index': entry_index, 'up': up, 'down': down}
+
+
+def _first_hit(paths: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """
+    Index of the first bar at which each monotone path reaches each level
+
+    Returns (E, len(levels)); horizon means the level was never reached.
+    """
+    return (paths[:, :, None] < levels[None, None, :]).sum(axis=1)
+
+
+def reach_counts(favorable: np.ndarray, adverse: np.ndarray,
+                 stop_grid: np.ndarray, r_grid: np.ndarray) -> np.ndarray:
+    """
+    Count entries that reached k·R before -1R for every (stop, k) pair
+
+    Because the paths are running maxima, a target is reached before the
+    stop exactly when the favorable excursion on the bar before the stop
+    bar already covers it. A target and stop hit inside the same bar
+    count as a loss.
+
+    Returns:
+        (len(stop_grid), len(r_grid)) array of win counts
+    """
+    n_entries, horizon = favorable.shape
+    stop_hits = _first_hit(adverse, stop_grid)  # (E, S), horizon = never stopped
+
+    # Favorable excursion achieved before each stop was hit (-inf if stopped on bar 1)
+    before_stop = np.where(
+        stop_hits > 0,
+        np.take_along_axis(favorable, np.maximum(stop_hits - 1, 0), axis=1),
+        -np.inf
+    )
+
+    wins = np.empty((len(stop_grid), len(r_grid)), dtype=np.int64)
+    for s, stop in enumerate(stop_grid):
+        reached = np.sort(before_stop[:, s])
+        wins[s] = n_entries - np.searchsorted(reached, stop * r_grid, side='left')
+    return wins
+
+
+class ReachTable:
+    """
+    Lookup table of P(reach k·R before -1R) for one symbol/timeframe
+
+    probabilities[d, s, k]: direction d (0 = BUY, 1 = SELL), stop size
+    stop_grid[s] in ATR, target r_grid[k] in R multiples. Values 0-1.
+    """
+
+    def __init__(self, probabilities: np.ndarray, stop_grid: np.ndarray, r_grid: np.ndarray,
+                 last_atr: float, samples: int, horizon: int,
+                 mfe_median: Tuple[float, float] = (0.0, 0.0),
+                 mae_median: Tuple[float, float] = (0.0, 0.0)):
+        self.probabilities = probabilities
+        self.stop_grid = np.asarray(stop_grid, dtype=float)
+        self.r_grid = np.asarray(r_grid, dtype=float)
+        self.last_atr = float(last_atr)
+        self.samples = int(samples)
+        self.horizon = int(horizon)
+        self.mfe_median = tuple(mfe_median)  # (BUY, SELL) median MFE over the horizon, ATR units
+        self.mae_median = tuple(mae_median)  # (BUY, SELL) median MAE over the horizon, ATR units
+
+    def stop_in_atr(self, r_distance: float) -> float:
+        """Express a stop distance (price units) in ATR units of the latest bar"""
+        return r_distance / self.last_atr if self.last_atr > 0 else 1.0
+
+    def probability(self, direction: str, stop_atr: float, r_multiples) -> np.ndarray:
+        """
+        Interpolated reach probabilities (0-1)
+
+        Args:
+            direction: 'BUY' or 'SELL'
+            stop_atr: Stop distance in ATR units (clamped to the grid)
+            r_multiples: Scalar or array of target R multiples (clamped to the grid)
+        """
+        curves = self.probabilities[0 if direction == 'BUY' else 1]
+
+        # Linear interpolation between the two neighbouring stop rows
+        stop_atr = float(np.clip(stop_atr, self.stop_grid[0], self.stop_grid[-1]))
+        upper = int(np.clip(np.searchsorted(self.stop_grid, stop_atr), 1, len(self.stop_grid) - 1))
+        lower = upper - 1
+        span = self.stop_grid[upper] - self.stop_grid[lower]
+        weight = (stop_atr - self.stop_grid[lower]) / span if span > 0 else 0.0
+        curve = curves[lower] * (1.0 - weight) + curves[upper] * weight
+
+        return np.interp(r_multiples, self.r_grid, curve)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Arrays for np.savez"""
+        return {
+            'probabilities': self.probabilities,
+            'stop_grid': self.stop_grid,
+            'r_grid': self.r_grid,
+            'meta': np.array([self.last_atr, self.samples, self.horizon]),
+            'mfe_median': np.array(self.mfe_median),
+            'mae_median': np.array(self.mae_median),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> 'ReachTable':
+        """Rebuild from np.load output"""
+        last_atr, samples, horizon = arrays['meta']
+        return cls(arrays['probabilities'], arrays['stop_grid'], arrays['r_grid'],
+                   last_atr, int(samples), int(horizon),
+                   tuple(arrays['mfe_median']), tuple(arrays['mae_median']))
+
+
+def build_reach_table(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                      horizon: int = DEFAULT_HORIZON,
+                      stop_grid: Sequence[float] = STOP_GRID_ATR,
+                      r_grid: Sequence[float] = R_GRID) -> Optional[ReachTable]:
+    """Build a ReachTable from OHLC arrays (None if there is not enough history)"""
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    stop_grid = np.asarray(stop_grid, dtype=float)
+    r_grid = np.asarray(r_grid, dtype=float)
+
+    atr = average_true_range(high, low, close)
+    excursions = compute_excursions(high, low, close, atr, horizon)
+    up, down = excursions['up'], excursions['down']
+    samples = len(up)
+    if samples == 0:
+        return None
+
+    wins = np.zeros((2, len(stop_grid), len(r_grid)), dtype=np.int64)
+    for start in range(0, samples, CHUNK_SIZE):
+        up_chunk = up[start:start + CHUNK_SIZE]
+        down_chunk = down[start:start + CHUNK_SIZE]
+        wins[0] += reach_counts(up_chunk, down_chunk, stop_grid, r_grid)
+        wins[1] += reach_counts(down_chunk, up_chunk, stop_grid, r_grid)
+
+    return ReachTable(
+        probabilities=wins / samples,
+        stop_grid=stop_grid,
+        r_grid=r_grid,
+        last_atr=atr[np.isfinite(atr)][-1],
+        samples=samples,
+        horizon=horizon,
+        mfe_median=(float(np.median(up[:, -1])), float(np.median(down[:, -1]))),
+        mae_median=(float(np.median(down[:, -1])), float(np.median(up[:, -1]))),
+    )
+
+
+class ExcursionEngine:
+    """
+    Builds and caches ReachTables per (symbol, timeframe)
+
+    Tables are looked up in memory, then in the on-disk cache (valid while
+    the source bar file is unchanged), then built from cached bars in
+    data/bars/<SYMBOL>_<TIMEFRAME>.csv. Symbols without bar history return
+    None so callers can fall back to heuristics.
+    """
+
+    def __init__(self, bars_dir: Path = BARS_DIR, cache_dir: Path = REACH_CACHE_DIR):
+        self.bars_dir = Path(bars_dir)
+        self.cache_dir = Path(cache_dir)
+        self.tables: Dict[Tuple[str, str], Optional[ReachTable]] = {}
+
+    def _bars_file(self, symbol: str, timeframe: str) -> Path:
+        return self.bars_dir / f"{symbol}_{timeframe}.csv"
+
+    def _cache_file(self, symbol: str, timeframe: str) -> Path:
+        return self.cache_dir / f"{symbol}_{timeframe}.npz"
+
+    def get_table(self, symbol: str, timeframe: str) -> Optional[ReachTable]:
+        """Get the reach table for symbol/timeframe (None if no history)"""
+        key = (symbol.upper(), timeframe)
+        if key not in self.tables:
+            self.tables[key] = self._load_or_build(*key)
+        return self.tables[key]
+
+    def _load_or_build(self, symbol: str, timeframe: str) -> Optional[ReachTable]:
+        bars_file = self._bars_file(symbol, timeframe)
+        if not bars_file.exists():
+            return None
+
+        cache_file = self._cache_file(symbol, timeframe)
+        if cache_file.exists() and cache_file.stat().st_mtime >= bars_file.stat().st_mtime:
+            try:
+                with np.load(cache_file) as arrays:
+                    return ReachTable.from_arrays(arrays)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[ExcursionEngine] Ignoring cache {cache_file.name}: {e}")
+
+        return self.build_table(symbol, timeframe)
+
+    def build_table(self, symbol: str, timeframe: str) -> Optional[ReachTable]:
+        """Build (and cache on disk) the reach table from cached bars"""
+        bars = load_cached_bars(self.bars_dir, timeframe, [symbol]).get(symbol.upper())
+        if bars is None:
+            return None
+
+        table = build_reach_table(
+            bars['high'].to_numpy(), bars['low'].to_numpy(), bars['close'].to_numpy(),
+            horizon=HORIZON_BARS.get(timeframe, DEFAULT_HORIZON)
+        )
+        if table is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            np.savez(self._cache_file(symbol.upper(), timeframe), **table.to_arrays())
+        self.tables[(symbol.upper(), timeframe)] = table
+        return table
+
+    def reach_probability(self, symbol: str, timeframe: str, direction: str,
+                          r_distance: float, r_multiples) -> Optional[np.ndarray]:
+        """
+        Empirical P(reach k·R before -1R) in percent for each R multiple
+
+        Returns:
+            Array of probabilities (0-100), or None if the symbol has no history
+        """
+        table = self.get_table(symbol, timeframe)
+        if table is None:
+            return None
+        stop_atr = table.stop_in_atr(r_distance)
+        return table.probability(direction, stop_atr, r_multiples) * 100.0
+
+    def clear(self):
+        """Drop in-memory tables (disk cache is kept)"""
+        self.tables.clear()
+
+
+# Global excursion engine instance
+excursion_engine = ExcursionEngine()
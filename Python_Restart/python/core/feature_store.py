@@ -0,0 +1,543 @@
+"""
+AppleTrader Pro - Feature Store
+Vectorized ML features from bar history, materialized per symbol/timeframe
+
+MLTradingModel trains on the feature_* columns of ML_Data/training_data.csv
+and PredictionServer predicts from ML_Data/current_features.json, but only
+the EA (ML_FeatureExtractor.mqh) computed those features, bar by bar. The
+store computes the same feature set for whole bar arrays at once - the EA's
+40 candle / momentum / MA / volume / range / higher-timeframe / time /
+session features, followed by smart money zone distances and regime
+factors - so training exports and the latest row served for inference come
+from one definition.
+
+Layout: data/features/<SYMBOL>/<TIMEFRAME>/<YYYY-MM>.npz, one array per
+column (time + FEATURE_NAMES), partitioned by month so appending new bars
+rewrites only the current month. Rows are computed on closed bars only.
+
+Features are stored raw, not z-scored with running statistics as the EA
+does; MLTradingModel's StandardScaler normalizes them with the training
+statistics. Values that need more history than is available, and zone
+distances with no zone in range, are NaN on disk and 0 in vectors handed to
+training and inference.
+
+Serving: a model trained on store features reads ML_Data/store_features.json
+(ml_training_service.py --store-features), never the EA's
+current_features.json; scripts/run_feature_server.py refreshes the store and
+writes the newest row there on every closed bar.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from core.bar_resampler import bar_resampler, bucket_starts
+from core.excursion_engine import average_true_range
+from core.news_impact_stats import BARS_DIR, asset_class, pip_size
+from core.replay_data_source import BAR_FILE_SUFFIXES, TIMEFRAME_SECONDS, load_bar_file
+from core.trend_matrix import adx_scores, trend_scores
+
+
+FEATURE_DIR = Path(__file__).parent.parent / "data" / "features"
+# Latest vector for PredictionServer --store-features (in its ML_Data dir)
+SERVING_FILE_NAME = "store_features.json"
+
+# EA feature groups (ML_FeatureExtractor.mqh), in EA order
+MOMENTUM_PERIODS = (5, 10, 15, 20, 25)
+MA_PERIODS = (10, 20, 50, 100, 200)
+VOLUME_AVERAGE_BARS = 20
+VOLUME_PERIODS = (5, 10, 15, 20)
+RANGE_PERIODS = (5, 10, 15, 20, 25)
+HTF_TIMEFRAMES = ('M15', 'H1', 'H4', 'D1', 'W1')
+# (name, first hour, end hour) in server time
+SESSIONS = (('asian', 0, 8), ('london', 8, 13), ('overlap', 13, 16), ('ny', 16, 21))
+
+# Smart money zones: most recent zone within this many bars, else NaN
+ZONE_LOOKBACK = 100
+# Swing high/low = beyond SWING_BARS neighbours on each side (as the structure detectors)
+SWING_BARS = 2
+# Same minimum gap as FairValueGapDetector.detect_fair_value_gaps (forex)
+MIN_FVG_PIPS = 5
+# Other asset classes (pip size = point): minimum gap as a fraction of price,
+# about what 5 pips are on EURUSD
+MIN_FVG_PRICE_FRACTION = 0.0005
+
+# Regime: trend matrix factors over the last TREND_WINDOW bars (all of them
+# look at most 20 bars back), ATR relative to its VOLATILITY_BARS average
+TREND_WINDOW = 20
+VOLATILITY_BARS = 100
+
+# Longest lookback of any feature (SMA200); the higher-timeframe direction
+# additionally needs the previous higher-timeframe bar
+WARMUP_BARS = max(MA_PERIODS)
+
+# Rows per chunk of the windowed regime factors (bounds memory)
+CHUNK_SIZE = 50000
+
+FEATURE_NAMES = (
+    ['body', 'upper_wick', 'lower_wick', 'direction', 'range'] +
+    [f'momentum_{p}' for p in MOMENTUM_PERIODS] +
+    [f'ma_distance_{p}' for p in MA_PERIODS] +
+    ['volume_ratio'] +
+    [f'volume_momentum_{p}' for p in VOLUME_PERIODS] +
+    [f'range_ratio_{p}' for p in RANGE_PERIODS] +
+    [f'htf_direction_{tf}' for tf in HTF_TIMEFRAMES] +
+    ['hour_sin', 'hour_cos', 'weekday_sin', 'weekday_cos'] +
+    [f'session_{name}' for name, _, _ in SESSIONS] + ['session_closed', 'monday'] +
+    ['fvg_bullish_distance', 'fvg_bearish_distance', 'swing_high_distance', 'swing_low_distance'] +
+    ['regime_trend', 'regime_adx', 'regime_volatility', 'atr_percent']
+)
+# Leading features that match the EA's TOTAL_FEATURES vector
+EA_FEATURE_COUNT = 40
+
+
+# ==================== VECTORIZED FEATURES ====================
+
+
+def _lag(values: np.ndarray, periods: int) -> np.ndarray:
+    """Value `periods` bars back (NaN where there is no such bar)"""
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Mean of the last `period` values including the current one (NaN before)"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        csum = np.cumsum(values, dtype=float)
+        out[period - 1:] = (csum[period - 1:] - np.concatenate(([0.0], csum[:-period]))) / period
+    return out
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, default: float) -> np.ndarray:
+    """numerator / denominator, `default` where the denominator is not positive (NaN stays NaN)"""
+    safe = np.where(denominator > 0, denominator, 1.0)
+    out = np.where(denominator > 0, numerator / safe, default)
+    return np.where(np.isnan(denominator), np.nan, out)
+
+
+def _last_index(mask: np.ndarray, max_age: int) -> np.ndarray:
+    """Index of the latest True at or before each position within `max_age` bars, -1 if none"""
+    positions = np.arange(len(mask))
+    last = np.maximum.accumulate(np.where(mask, positions, -1))
+    last[positions - last >= max_age] = -1
+    return last
+
+
+def htf_direction(times: np.ndarray, opens: np.ndarray, closes: np.ndarray,
+                  timeframe: str, chart_timeframe: str) -> np.ndarray:
+    """
+    +1/-1 when the close is above/below the open of the previous `timeframe`
+    bar (the EA's iClose(tf, 0) vs iOpen(tf, 1)), 0 when `timeframe` is not
+    above the chart timeframe or there is no previous bar
+    """
+    if TIMEFRAME_SECONDS[timeframe] <= TIMEFRAME_SECONDS[chart_timeframe] or len(times) == 0:
+        return np.zeros(len(times))
+    keys = bucket_starts(times, timeframe)
+    new_bucket = np.concatenate(([True], keys[1:] != keys[:-1]))
+    bucket = np.cumsum(new_bucket) - 1
+    bucket_open = opens[new_bucket]
+    prev_open = bucket_open[np.maximum(bucket - 1, 0)]
+    return np.where(bucket > 0, np.where(closes > prev_open, 1.0, -1.0), 0.0)
+
+
+def zone_distances(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray,
+                   atr: np.ndarray, symbol: str) -> Dict[str, np.ndarray]:
+    """
+    (close - zone) / ATR to the most recent fair value gaps and swing points
+
+    Bullish FVG: low[j-2] > high[j]; bearish FVG: high[j-2] < low[j] (gap at
+    least MIN_FVG_PIPS for forex, MIN_FVG_PRICE_FRACTION of the close for
+    metals/indices/crypto; zone = gap midpoint). Swings are confirmed
+    SWING_BARS bars after the swing bar, so no row sees a swing before it is known.
+    """
+    n = len(closes)
+    if asset_class(symbol) == 'forex':
+        min_gap = MIN_FVG_PIPS * pip_size(symbol)
+    else:
+        min_gap = MIN_FVG_PRICE_FRACTION * closes[2:]
+    bullish_fvg = np.zeros(n, dtype=bool)
+    bearish_fvg = np.zeros(n, dtype=bool)
+    fvg_mid = np.zeros(n)
+    if n > 2:
+        bullish_fvg[2:] = lows[:-2] - highs[2:] >= min_gap
+        bearish_fvg[2:] = lows[2:] - highs[:-2] >= min_gap
+    bullish_mid = np.concatenate(([0.0, 0.0], (lows[:-2] + highs[2:]) / 2)) if n > 2 else fvg_mid
+    bearish_mid = np.concatenate(([0.0, 0.0], (highs[:-2] + lows[2:]) / 2)) if n > 2 else fvg_mid
+
+    span = 2 * SWING_BARS + 1
+    swing_high = np.zeros(n, dtype=bool)
+    swing_low = np.zeros(n, dtype=bool)
+    if n >= span:
+        high_windows = sliding_window_view(highs, span)
+        low_windows = sliding_window_view(lows, span)
+        centre_high = high_windows[:, SWING_BARS:SWING_BARS + 1]
+        centre_low = low_windows[:, SWING_BARS:SWING_BARS + 1]
+        others = np.r_[0:SWING_BARS, SWING_BARS + 1:span]
+        # Row i of the windows is confirmed at bar i + span - 1
+        swing_high[span - 1:] = np.all(centre_high > high_windows[:, others], axis=1)
+        swing_low[span - 1:] = np.all(centre_low < low_windows[:, others], axis=1)
+
+    def distance(mask: np.ndarray, levels: np.ndarray) -> np.ndarray:
+        last = _last_index(mask, ZONE_LOOKBACK)
+        level = np.where(last >= 0, levels[np.maximum(last, 0)], np.nan)
+        return _ratio(closes - level, atr, np.nan)
+
+    return {
+        'fvg_bullish_distance': distance(bullish_fvg, bullish_mid),
+        'fvg_bearish_distance': distance(bearish_fvg, bearish_mid),
+        'swing_high_distance': distance(swing_high, _lag(highs, SWING_BARS)),
+        'swing_low_distance': distance(swing_low, _lag(lows, SWING_BARS)),
+    }
+
+
+def regime_factors(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray,
+                   volumes: np.ndarray, atr: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-bar trend matrix composite and ADX score, ATR relative to its average"""
+    n = len(closes)
+    trend = np.full(n, np.nan)
+    adx = np.full(n, np.nan)
+    if n >= TREND_WINDOW:
+        windows = [sliding_window_view(values, TREND_WINDOW)
+                   for values in (highs, lows, closes, volumes.astype(float))]
+        for start in range(0, len(windows[0]), CHUNK_SIZE):
+            h, l, c, v = (w[start:start + CHUNK_SIZE] for w in windows)
+            rows = slice(TREND_WINDOW - 1 + start, TREND_WINDOW - 1 + start + len(h))
+            trend[rows] = trend_scores(h, l, c, v)
+            adx[rows] = adx_scores(h, l, c)
+
+    # Average of the ATR from its first valid value on
+    atr_average = np.full(n, np.nan)
+    valid = np.flatnonzero(np.isfinite(atr))
+    if len(valid):
+        atr_average[valid[0]:] = _rolling_mean(atr[valid[0]:], VOLATILITY_BARS)
+
+    return {
+        'regime_trend': trend,
+        'regime_adx': adx,
+        'regime_volatility': _ratio(atr, atr_average, np.nan),
+        'atr_percent': _ratio(atr, closes, np.nan),
+    }
+
+
+def compute_features(rates: np.ndarray, timeframe: str, symbol: str = '') -> Dict[str, np.ndarray]:
+    """
+    Features of every bar of `rates` (MT5 layout, oldest first)
+
+    Returns:
+        {'time': epoch seconds, name: values for each of FEATURE_NAMES}
+    """
+    times = rates['time'].astype(np.int64)
+    opens = rates['open'].astype(float)
+    highs = rates['high'].astype(float)
+    lows = rates['low'].astype(float)
+    closes = rates['close'].astype(float)
+    volumes = rates['tick_volume'].astype(float)
+    columns = {'time': times}
+
+    # Candle shape
+    columns['body'] = np.abs(closes - opens) / closes
+    columns['upper_wick'] = (highs - np.maximum(opens, closes)) / closes
+    columns['lower_wick'] = (np.minimum(opens, closes) - lows) / closes
+    columns['direction'] = np.where(closes > opens, 1.0, -1.0)
+    columns['range'] = (highs - lows) / closes
+
+    for period in MOMENTUM_PERIODS:
+        past = _lag(closes, period)
+        columns[f'momentum_{period}'] = _ratio(closes - past, past, 0.0)
+    for period in MA_PERIODS:
+        columns[f'ma_distance_{period}'] = (closes - _rolling_mean(closes, period)) / closes
+
+    # Volume (average of the previous bars, excluding the current one)
+    columns['volume_ratio'] = _ratio(volumes, _lag(_rolling_mean(volumes, VOLUME_AVERAGE_BARS), 1), 1.0)
+    for period in VOLUME_PERIODS:
+        columns[f'volume_momentum_{period}'] = _ratio(volumes, _lag(volumes, period), 1.0)
+
+    ranges = highs - lows
+    for period in RANGE_PERIODS:
+        columns[f'range_ratio_{period}'] = _ratio(ranges, _lag(ranges, period), 1.0)
+
+    for htf in HTF_TIMEFRAMES:
+        columns[f'htf_direction_{htf}'] = htf_direction(times, opens, closes, htf, timeframe)
+
+    # Time and sessions (MQL day_of_week: 0 = Sunday; 1970-01-01 was a Thursday)
+    hour = (times // 3600) % 24
+    weekday = (times // 86400 + 4) % 7
+    columns['hour_sin'] = np.sin(2 * np.pi * hour / 24.0)
+    columns['hour_cos'] = np.cos(2 * np.pi * hour / 24.0)
+    columns['weekday_sin'] = np.sin(2 * np.pi * weekday / 7.0)
+    columns['weekday_cos'] = np.cos(2 * np.pi * weekday / 7.0)
+    for name, first, end in SESSIONS:
+        columns[f'session_{name}'] = ((hour >= first) & (hour < end)).astype(float)
+    columns['session_closed'] = (hour >= SESSIONS[-1][2]).astype(float)
+    columns['monday'] = (weekday == 1).astype(float)
+
+    atr = average_true_range(highs, lows, closes)
+    columns.update(zone_distances(highs, lows, closes, atr, symbol))
+    columns.update(regime_factors(highs, lows, closes, volumes, atr))
+    return columns
+
+
+def context_start(times: np.ndarray, first: int, timeframe: str) -> int:
+    """
+    Index of the first bar needed to compute bar `first` onwards: WARMUP_BARS
+    of history and the start of the previous bar of every higher timeframe
+    """
+    start = max(first - WARMUP_BARS, 0)
+    chart_seconds = TIMEFRAME_SECONDS[timeframe]
+    for htf in HTF_TIMEFRAMES:
+        if TIMEFRAME_SECONDS[htf] <= chart_seconds:
+            continue
+        keys = bucket_starts(times[:first + 1], htf)
+        earlier = keys[:-1][keys[:-1] < keys[-1]]
+        if len(earlier):
+            start = min(start, int(np.searchsorted(keys, earlier[-1])))
+    return start
+
+
+def context_bars(timeframe: str) -> int:
+    """Closed bars to fetch so that the newest bar has its full context"""
+    return WARMUP_BARS + 2 * TIMEFRAME_SECONDS['W1'] // TIMEFRAME_SECONDS[timeframe] + 1
+
+
+# ==================== STORE ====================
+
+
+def _month_keys(times: np.ndarray) -> np.ndarray:
+    return times.astype('datetime64[s]').astype('datetime64[M]').astype(str)
+
+
+class FeatureStore:
+    """
+    Features per (symbol, timeframe), on disk and the latest row in memory
+
+    Usage:
+        feature_store.build('EURUSD', 'H1')           # from data/bars/EURUSD_H1.csv
+        feature_store.refresh('EURUSD', 'H1')         # append newly closed bars
+        vector = feature_store.latest_vector('EURUSD', 'H1')
+    """
+
+    def __init__(self, bars_dir: Path = BARS_DIR, store_dir: Path = FEATURE_DIR):
+        self.bars_dir = Path(bars_dir)
+        self.store_dir = Path(store_dir)
+        self._latest: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _partition_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.store_dir / symbol.upper() / timeframe
+
+    def _partitions(self, symbol: str, timeframe: str) -> List[Path]:
+        return sorted(self._partition_dir(symbol, timeframe).glob("*.npz"))
+
+    def _bars_file(self, symbol: str, timeframe: str) -> Optional[Path]:
+        for suffix in BAR_FILE_SUFFIXES:
+            path = self.bars_dir / f"{symbol.upper()}_{timeframe}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def build(self, symbol: str, timeframe: str, rates: Optional[np.ndarray] = None) -> int:
+        """
+        (Re)build all features of a symbol/timeframe, replacing stored ones
+
+        Args:
+            rates: Closed bars, oldest first (default: the cached bar file)
+
+        Returns:
+            Rows written
+        """
+        if rates is None:
+            bars_file = self._bars_file(symbol, timeframe)
+            if bars_file is None:
+                return 0
+            rates = load_bar_file(bars_file)
+        if len(rates) == 0:
+            return 0
+
+        columns = compute_features(rates, timeframe, symbol)
+        with self._lock:
+            for path in self._partitions(symbol, timeframe):
+                path.unlink()
+            self._write(symbol, timeframe, columns)
+        return len(rates)
+
+    def update(self, symbol: str, timeframe: str, rates: np.ndarray) -> int:
+        """
+        Append the bars of `rates` newer than the stored ones
+
+        `rates` are closed bars, oldest first, including the context of the
+        first new bar (see context_bars); only the new bars plus that context
+        are recomputed. Builds from `rates` when nothing is stored yet.
+
+        Returns:
+            Rows appended
+        """
+        if rates is None or len(rates) == 0:
+            return 0
+        latest = self.latest(symbol, timeframe)
+        if latest is None:
+            return self.build(symbol, timeframe, rates)
+
+        first = int(np.searchsorted(rates['time'], int(latest['time']), side='right'))
+        if first >= len(rates):
+            return 0
+        start = context_start(rates['time'], first, timeframe)
+        columns = compute_features(rates[start:], timeframe, symbol)
+        new_columns = {name: values[first - start:] for name, values in columns.items()}
+        with self._lock:
+            self._write(symbol, timeframe, new_columns)
+        return len(rates) - first
+
+    def refresh(self, symbol: str, timeframe: str) -> int:
+        """Append newly closed bars from the bar resampler; returns rows appended"""
+        rates = bar_resampler.copy_rates(symbol, timeframe, context_bars(timeframe), include_partial=False)
+        return self.update(symbol, timeframe, rates) if rates is not None else 0
+
+    def context_rates(self, symbol: str, timeframe: str) -> Optional[np.ndarray]:
+        """
+        Latest context_bars() closed bars, oldest first: from the bar
+        resampler (terminal), else from the cached bar file
+        """
+        count = context_bars(timeframe)
+        rates = bar_resampler.copy_rates(symbol, timeframe, count, include_partial=False)
+        if rates is not None and len(rates):
+            return rates
+        bars_file = self._bars_file(symbol, timeframe)
+        if bars_file is None:
+            return None
+        try:
+            return load_bar_file(bars_file)[-count:]
+        except (ImportError, ValueError) as e:
+            print(f"[FeatureStore] Could not load {bars_file.name}: {e}")
+            return None
+
+    def _write(self, symbol: str, timeframe: str, columns: Dict[str, np.ndarray]):
+        """Append rows (newer than any stored row) to their month partitions"""
+        directory = self._partition_dir(symbol, timeframe)
+        directory.mkdir(parents=True, exist_ok=True)
+        months = _month_keys(columns['time'])
+        for month in np.unique(months):
+            rows = months == month
+            part = {name: values[rows] for name, values in columns.items()}
+            path = directory / f"{month}.npz"
+            if path.exists():
+                with np.load(path) as stored:
+                    keep = stored['time'] < part['time'][0]
+                    part = {name: np.concatenate((stored[name][keep], part[name])) for name in part}
+            np.savez(path, **part)
+
+        self._latest[(symbol.upper(), timeframe)] = {name: values[-1].item()
+                                                     for name, values in columns.items()}
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def load(self, symbol: str, timeframe: str, start: Optional[int] = None,
+             end: Optional[int] = None) -> pd.DataFrame:
+        """Stored features (time as epoch seconds), optionally limited to start <= time <= end"""
+        first_month = _month_keys(np.array([start]))[0] if start is not None else None
+        last_month = _month_keys(np.array([end]))[0] if end is not None else None
+        frames = []
+        for path in self._partitions(symbol, timeframe):
+            if (first_month and path.stem < first_month) or (last_month and path.stem > last_month):
+                continue
+            with np.load(path) as stored:
+                frames.append(pd.DataFrame({name: stored[name] for name in ['time'] + FEATURE_NAMES}))
+        if not frames:
+            return pd.DataFrame(columns=['time'] + FEATURE_NAMES)
+
+        df = pd.concat(frames, ignore_index=True)
+        if start is not None:
+            df = df[df['time'] >= start]
+        if end is not None:
+            df = df[df['time'] <= end]
+        return df.reset_index(drop=True)
+
+    def latest(self, symbol: str, timeframe: str) -> Optional[Dict[str, float]]:
+        """Newest stored row as {'time': ..., feature: value}"""
+        key = (symbol.upper(), timeframe)
+        if key not in self._latest:
+            partitions = self._partitions(symbol, timeframe)
+            if not partitions:
+                return None
+            with np.load(partitions[-1]) as stored:
+                self._latest[key] = {name: stored[name][-1].item() for name in stored.files}
+        return self._latest[key]
+
+    def latest_vector(self, symbol: str, timeframe: str) -> Optional[List[float]]:
+        """Newest row as a feature vector in FEATURE_NAMES order (NaN as 0)"""
+        row = self.latest(symbol, timeframe)
+        if row is None:
+            return None
+        return [row[name] if np.isfinite(row[name]) else 0.0 for name in FEATURE_NAMES]
+
+    def write_latest(self, symbol: str, timeframe: str, path: Path) -> bool:
+        """Write the newest row as a store_features.json for PredictionServer"""
+        vector = self.latest_vector(symbol, timeframe)
+        if vector is None:
+            return False
+        payload = {
+            'timestamp': pd.Timestamp(self.latest(symbol, timeframe)['time'], unit='s').strftime('%Y.%m.%d %H:%M'),
+            'symbol': symbol.upper(),
+            'timeframe': timeframe,
+            'features': [round(value, 6) for value in vector],
+        }
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(payload, f)
+        tmp.replace(path)
+        return True
+
+    def refresh_latest(self, symbol: str, timeframe: str, path: Path) -> bool:
+        """
+        refresh() and, when a bar closed (or `path` does not exist yet),
+        write_latest(); returns whether `path` was written
+        """
+        if self.refresh(symbol, timeframe) == 0 and Path(path).exists():
+            return False
+        return self.write_latest(symbol, timeframe, path)
+
+    def training_frame(self, symbol: str, timeframe: str, samples: pd.DataFrame) -> pd.DataFrame:
+        """
+        EA training samples with their feature_* columns replaced by store features
+
+        Each sample (EA training_data.csv row, 'timestamp' = entry time) gets
+        the features of the last bar closed at its entry - the row the
+        prediction server would have seen. Samples whose bar has less than
+        WARMUP_BARS of history are dropped.
+        """
+        entry = pd.to_datetime(samples['timestamp']).to_numpy().astype('datetime64[s]').astype(np.int64)
+        features = self.load(symbol, timeframe)
+        close_time = features['time'].to_numpy(dtype=np.int64) + TIMEFRAME_SECONDS[timeframe]
+        row = np.searchsorted(close_time, entry, side='right') - 1
+        warm = features[f'ma_distance_{max(MA_PERIODS)}'].notna().to_numpy()
+        valid = row >= 0
+        valid[valid] = warm[row[valid]]
+
+        labels = samples.loc[valid, [c for c in samples.columns if not c.startswith('feature_')]]
+        values = np.nan_to_num(features[FEATURE_NAMES].to_numpy(dtype=float)[row[valid]])
+        feature_columns = pd.DataFrame(values, columns=[f'feature_{i}' for i in range(len(FEATURE_NAMES))],
+                                       index=labels.index)
+        out = pd.concat([labels[['timestamp']], feature_columns, labels.drop(columns='timestamp')], axis=1)
+        return out.reset_index(drop=True)
+
+    def clear(self):
+        """Drop in-memory latest rows (disk store is kept)"""
+        self._latest.clear()
+
+
+# Global feature store instance
+feature_store = FeatureStore()
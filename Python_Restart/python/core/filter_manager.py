@@ -8,8 +8,14 @@ ENHANCED with professional-grade logic:
 - MTF alignment checking
 """
 
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
 from core.market_analyzer import market_analyzer
 from core.verbose_mode_manager import vprint
+from core.instrumentation import instrumentation
 
 
 class FilterManager:
@@ -48,6 +54,9 @@ class FilterManager:
         self.require_mtf_alignment = False  # Optional strict MTF requirement
         self.min_session_quality = 0  # RELAXED: Accept all sessions (was 5)
 
+        # Rejections per filter from the last filter_opportunities() batch
+        self.last_rejection_histogram = {}
+
     def set_filter(self, filter_name: str, enabled: bool):
         """Enable/disable a specific filter"""
         # Normalize filter name to attribute name
@@ -169,7 +178,8 @@ class FilterManager:
         # SENTIMENT FILTER - Trend alignment
         if self.sentiment_filter:
             sentiment = opportunity.get('sentiment', 'neutral')
-            h4_trend = opportunity.get('h4_trend', 'neutral')
+            h4_trend = opportunity.get('h4_trend') or \
+                market_analyzer.trend_matrix.cached_trend(opportunity.get('symbol'), 'H4')
             direction = opportunity.get('direction', 'BUY')
 
             # Reject counter-trend trades
@@ -233,6 +243,150 @@ class FilterManager:
         vprint(f"[Filter] ✅ {symbol} {timeframe}: PASSED all filters!")
         return True
 
+    @instrumentation.timed('analyzer')
+    def filter_opportunities(
+        self,
+        opportunities: Union[List[Dict], pd.DataFrame]
+    ) -> Tuple[Union[List[Dict], pd.DataFrame], Dict[str, int]]:
+        """
+        Batch version of filter_opportunity() for a whole scan result
+
+        All enabled filters are evaluated as column-wise boolean masks and
+        the current session is looked up once per batch instead of once
+        per opportunity. Same thresholds and defaults as filter_opportunity().
+
+        Args:
+            opportunities: List of opportunity dicts or a DataFrame with one row per opportunity
+
+        Returns:
+            (survivors, rejection_histogram)
+            survivors: passing opportunities, same type as the input (original dicts for lists)
+            rejection_histogram: {filter name: rejected count}; each rejection is
+                attributed to the first failing filter, in filter_opportunity() order
+        """
+        is_frame = isinstance(opportunities, pd.DataFrame)
+        if not is_frame:
+            opportunities = list(opportunities)
+        n = len(opportunities)
+
+        histogram: Dict[str, int] = {}
+        if n == 0:
+            self.last_rejection_histogram = histogram
+            return opportunities, histogram
+
+        def column(key: str, default) -> np.ndarray:
+            """Column as an object array, missing values replaced by default"""
+            if is_frame:
+                if key not in opportunities.columns:
+                    return np.full(n, default, dtype=object)
+                values = opportunities[key]
+                return values.where(values.notna(), default).to_numpy(dtype=object)
+            values = [opp.get(key, default) for opp in opportunities]
+            return np.array([default if v is None else v for v in values], dtype=object)
+
+        def numeric(key: str, default: float) -> np.ndarray:
+            return column(key, default).astype(float)
+
+        def flag(key: str, default: bool) -> np.ndarray:
+            return column(key, default).astype(bool)
+
+        # (filter name, rejection mask) in the same order as filter_opportunity()
+        checks = [('Quality Score', numeric('quality_score', 0) < self.min_quality_score)]
+
+        if self.avoid_asian_session:
+            session = column('session', market_analyzer.get_current_session())
+            checks.append(('Session', np.isin(session, ['asian', 'dead'])))
+
+        session_quality = numeric('session_quality', market_analyzer.get_session_quality_score())
+        checks.append(('Session Quality', session_quality < self.min_session_quality))
+
+        if self.volume_filter:
+            volume_minimums = {'M5': 50, 'M15': 50, 'M30': 50, 'H1': 50, 'H4': 50}
+            min_volume = np.array([volume_minimums.get(tf, 50) for tf in column('timeframe', 'H1')], dtype=float)
+            checks.append(('Volume Filter', numeric('volume', 0) < min_volume))
+
+        if self.spread_filter:
+            atr = numeric('atr', 10)
+            spread = numeric('spread', 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                spread_pct = np.where(atr > 0, spread / np.where(atr > 0, atr, 1.0), 1.0)
+            checks.append(('Spread Filter', spread_pct > self.max_spread_pct_of_atr))
+
+        if self.strong_price_model:
+            checks.append(('Strong Price Model', numeric('pattern_strength', 0) < self.min_pattern_strength))
+
+        if self.multi_timeframe:
+            if self.require_mtf_alignment:
+                checks.append(('Multi-Timeframe', numeric('mtf_score', 0) < 10))
+            else:
+                checks.append(('Multi-Timeframe', ~flag('mtf_confirmed', False)))
+
+        if self.dynamic_risk:
+            checks.append(('Dynamic Risk', numeric('risk_reward', 0) < self.min_rr_ratio))
+
+        if self.volatility_filter:
+            atr = numeric('atr', 0)
+            entry = numeric('entry', 0)
+            checks.append(('Volatility Filter', (atr <= 0) | ((entry > 0) & (atr > entry * 0.1))))
+
+        if self.sentiment_filter:
+            direction = column('direction', 'BUY')
+            h4_trend = column('h4_trend', None)
+            missing = np.array([trend is None for trend in h4_trend], dtype=bool)
+            if missing.any():
+                # Opportunities without an H4 trend use the trend matrix's last H4 cell
+                symbols = column('symbol', '')
+                h4_trend = h4_trend.copy()
+                h4_trend[missing] = [market_analyzer.trend_matrix.cached_trend(s, 'H4')
+                                     for s in symbols[missing]]
+            counter_trend = (((direction == 'BUY') & (h4_trend == 'bearish')) |
+                             ((direction == 'SELL') & (h4_trend == 'bullish')))
+            checks.append(('Sentiment Filter', counter_trend))
+
+        if self.liquidity_sweep:
+            checks.append(('Liquidity Sweep', ~flag('liquidity_sweep', False)))
+
+        if self.retail_trap_detection:
+            checks.append(('Retail Trap Detection', flag('is_retail_trap', False)))
+
+        if self.order_block_invalidation:
+            checks.append(('Order Block Invalidation', ~flag('order_block_valid', True)))
+
+        if self.market_structure:
+            checks.append(('Market Structure', ~flag('structure_aligned', False)))
+
+        if self.pattern_tracking:
+            checks.append(('Pattern Tracking', numeric('pattern_reliability', 0) < 65))
+
+        if self.parameter_adaptation:
+            checks.append(('Parameter Adaptation', ~flag('parameters_optimized', True)))
+
+        if self.regime_strategy:
+            checks.append(('Regime Strategy', ~flag('regime_match', True)))
+
+        # Attribute each rejection to the first failing filter
+        alive = np.ones(n, dtype=bool)
+        for name, rejected in checks:
+            first_fail = alive & rejected
+            count = int(first_fail.sum())
+            if count:
+                histogram[name] = count
+            alive &= ~rejected
+
+        self.last_rejection_histogram = histogram
+
+        if histogram:
+            summary = ", ".join(f"{name}={count}" for name, count in histogram.items())
+            vprint(f"[Filter] {int(alive.sum())}/{n} passed | rejected: {summary}")
+        else:
+            vprint(f"[Filter] {n}/{n} passed")
+
+        if is_frame:
+            return opportunities[alive], histogram
+
+        survivors = [opportunities[i] for i in np.flatnonzero(alive)]
+        return survivors, histogram
+
     def get_active_filters(self) -> list:
         """Get list of currently active filter names"""
         active = []
@@ -0,0 +1,214 @@
+"""
+AppleTrader Pro - Instrumentation
+Opt-in latency spans, rolling histograms and counters for the data hot path
+
+Stages are named '<category>.<name>':
+- connector.read / connector.parse / connector.dispatch  (MT5Connector)
+- data_manager.update                                     (DataManager)
+- analyzer.<Class>.<method>                               (analysis back-ends)
+- widget.<Class>.<method>                                 (widget refreshes)
+- draw.<Class>                                            (canvas.draw)
+
+Disabled by default. Enable with TRADING_APP_INSTRUMENTATION=1, from the
+Diagnostics panel or with instrumentation.set_enabled(True). While disabled
+a span is a flag check returning a shared no-op context manager, and a
+timed() method is one extra call plus the same check.
+"""
+
+import bisect
+import json
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from core.dev_config import is_instrumentation_enabled
+
+
+# Histogram bucket upper bounds (milliseconds); the last bucket is open-ended
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Samples kept per stage for the rolling percentiles/histogram
+WINDOW_SIZE = 512
+
+DUMP_FILE = Path.home() / ".trading_app" / "instrumentation.json"
+
+
+class LatencyHistogram:
+    """
+    Latency of one stage: lifetime totals plus a rolling window of samples
+
+    Percentiles and bucket counts are computed from the last WINDOW_SIZE
+    samples when read, so recording stays O(1).
+    """
+
+    def __init__(self, window: int = WINDOW_SIZE):
+        self.window = window
+        self.samples: List[float] = []
+        self._next = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        if len(self.samples) < self.window:
+            self.samples.append(seconds)
+        else:
+            self.samples[self._next] = seconds
+            self._next = (self._next + 1) % self.window
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Percentile (0-100) of the rolling window, in seconds"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def bucket_counts(self) -> List[int]:
+        """Rolling window counts per BUCKET_BOUNDS_MS bucket (+ overflow)"""
+        counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        for seconds in self.samples:
+            counts[bisect.bisect_left(BUCKET_BOUNDS_MS, seconds * 1000.0)] += 1
+        return counts
+
+    def to_dict(self) -> Dict:
+        ordered = sorted(self.samples)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000.0, 3) \
+                if ordered else 0.0
+
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000.0, 3),
+            'mean_ms': round(self.total / self.count * 1000.0, 3) if self.count else 0.0,
+            'p50_ms': pct(50),
+            'p95_ms': pct(95),
+            'p99_ms': pct(99),
+            'max_ms': round(self.max * 1000.0, 3),
+            'window': len(ordered),
+            'buckets': self.bucket_counts(),
+        }
+
+
+class _NullSpan:
+    """Shared no-op context manager returned while instrumentation is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('owner', 'name', 'start')
+
+    def __init__(self, owner: 'Instrumentation', name: str):
+        self.owner = owner
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.owner.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Instrumentation:
+    """
+    Hot-path timers and counters
+
+    Usage:
+        with instrumentation.span('connector.parse'):
+            data = json.loads(text)
+
+        @instrumentation.timed('analyzer')
+        def scan_momentum(self, market_data): ...
+
+        instrumentation.count('connector.read_failures')
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.time()
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+
+    def span(self, name: str):
+        """Context manager timing the enclosed block as stage `name`"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, category: str, name: Optional[str] = None) -> Callable:
+        """
+        Decorator timing every call as '<category>.<name>'
+
+        name defaults to the function's qualified name (Class.method).
+        """
+        def decorator(func: Callable) -> Callable:
+            stage = f"{category}.{name or func.__qualname__}"
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def record(self, name: str, seconds: float):
+        """Record one duration for stage `name`"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.add(seconds)
+
+    def count(self, name: str, amount: int = 1):
+        """Increment counter `name` (no-op while disabled)"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def reset(self):
+        self.histograms.clear()
+        self.counters.clear()
+        self.started = time.time()
+
+    def snapshot(self) -> Dict:
+        """All stages and counters as plain data (stages sorted by name)"""
+        return {
+            'enabled': self.enabled,
+            'since': self.started,
+            'bucket_bounds_ms': list(BUCKET_BOUNDS_MS),
+            'stages': {name: self.histograms[name].to_dict() for name in sorted(self.histograms)},
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def dump(self, path: Path = DUMP_FILE) -> Path:
+        """Write snapshot() as JSON and return the path"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+
+# Global instrumentation instance
+instrumentation = Instrumentation(enabled=is_instrumentation_enabled())
@@ -0,0 +1,104 @@
+"""
+AppleTrader Pro - Lazy Loader
+Defers heavy module imports and global singleton construction until first use
+"""
+
+import importlib
+import importlib.util
+from typing import Any, Callable, Optional
+
+from core.startup_profiler import startup_profiler
+
+
+class LazySingleton:
+    """
+    Proxy for a module-level singleton that is constructed on first use
+
+    Attribute reads, writes and method calls are forwarded to the real
+    instance, so existing call sites (`data_manager.get_candles(...)`,
+    `mt5_connector.data_updated.connect(...)`) keep working unchanged.
+
+    Usage:
+        data_manager = LazySingleton(DataManager, 'data_manager')
+    """
+
+    def __init__(self, factory: Callable[[], Any], name: str):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_obj', None)
+
+    def instance(self) -> Any:
+        """Get the real instance, constructing it if needed"""
+        obj = object.__getattribute__(self, '_obj')
+        if obj is None:
+            name = object.__getattribute__(self, '_name')
+            with startup_profiler.measure(name, 'construct'):
+                obj = object.__getattribute__(self, '_factory')()
+            object.__setattr__(self, '_obj', obj)
+        return obj
+
+    def is_initialized(self) -> bool:
+        """Check if the real instance has been constructed"""
+        return object.__getattribute__(self, '_obj') is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.instance(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self.instance(), attr, value)
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, '_name')
+        if self.is_initialized():
+            return f"<LazySingleton {name}: {self.instance()!r}>"
+        return f"<LazySingleton {name} (not initialized)>"
+
+
+class LazyModule:
+    """
+    Proxy for a module that is imported on first attribute access
+
+    Usage:
+        mt5 = lazy_import('MetaTrader5')
+        mt5.initialize()  # MetaTrader5 is imported here
+    """
+
+    def __init__(self, module_name: str):
+        object.__setattr__(self, '_module_name', module_name)
+        object.__setattr__(self, '_module', None)
+
+    def _load(self):
+        module = object.__getattribute__(self, '_module')
+        if module is None:
+            name = object.__getattribute__(self, '_module_name')
+            with startup_profiler.measure(name, 'import'):
+                module = importlib.import_module(name)
+            object.__setattr__(self, '_module', module)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, '_module_name')
+        return f"<LazyModule {name}>"
+
+
+def module_available(module_name: str) -> bool:
+    """Check if a module can be imported without importing it"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_import(module_name: str) -> Optional[LazyModule]:
+    """
+    Get a lazy proxy for an optional module
+
+    Returns:
+        LazyModule proxy, or None if the module is not installed
+    """
+    if not module_available(module_name):
+        return None
+    return LazyModule(module_name)
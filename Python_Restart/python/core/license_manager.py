@@ -19,6 +19,8 @@ from pathlib import Path
 from typing import Optional, Dict, Tuple
 import base64
 
+from core.lazy_loader import LazySingleton
+
 # Development mode support
 try:
     from core.dev_config import is_dev_mode
@@ -409,8 +411,8 @@ class LicenseManager:
         return False
 
 
-# Global license manager instance
-license_manager = LicenseManager()
+# Global license manager instance (constructed on first use)
+license_manager = LazySingleton(LicenseManager, 'license_manager')
 
 
 # Decorator for feature protection
@@ -0,0 +1,187 @@
+"""
+AppleTrader Pro - Log Manager
+Queue-based, rate-limited logging so console speed never slows the update path
+
+Every category logs through `appletrader.<category>` (get_logger). Records
+are filtered on the calling thread (level check, deduplication, per-category
+rate limit) and handed to a queue; a background listener thread does the
+slow part - console output and the in-app ring buffer (View > Log).
+
+- Per-category levels: set_level('scanner', logging.WARNING), or
+  TRADING_APP_LOG_LEVELS="scanner=WARNING,data_manager=DEBUG"
+- Deduplication: an identical message from the same category within
+  DEDUP_WINDOW seconds is dropped; the next one that gets through notes
+  how many were suppressed
+- Rate limit: at most RATE_LIMIT_PER_SECOND records per second per
+  category (warnings and errors are exempt)
+"""
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Tuple
+
+from core.dev_config import get_log_levels
+
+
+ROOT_LOGGER = 'appletrader'
+DEFAULT_LEVEL = logging.INFO
+
+DEDUP_WINDOW = 5.0
+RATE_LIMIT_PER_SECOND = 20.0
+RING_BUFFER_SIZE = 2000
+
+# Prune the dedup table once it holds this many distinct messages
+MAX_DEDUP_KEYS = 5000
+
+# (created, level name, category, message)
+LogEntry = Tuple[float, str, str, str]
+
+
+def category_of(record: logging.LogRecord) -> str:
+    """'scanner' for a record from appletrader.scanner"""
+    return record.name[len(ROOT_LOGGER) + 1:] if record.name.startswith(ROOT_LOGGER + '.') \
+        else record.name
+
+
+class RateLimitFilter(logging.Filter):
+    """Drops repeated messages and per-category bursts (runs on the caller's thread)"""
+
+    def __init__(self, window: float = DEDUP_WINDOW, per_second: float = RATE_LIMIT_PER_SECOND):
+        super().__init__()
+        self.window = window
+        self.per_second = per_second
+        self.suppressed: Dict[str, int] = {}
+        self._seen: Dict[Tuple[str, int, str], List] = {}  # key -> [last emitted, repeats]
+        self._tokens: Dict[str, Tuple[float, float]] = {}  # category -> (tokens, updated)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        message = record.getMessage()
+        key = (record.name, record.levelno, message)
+
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.window:
+                seen[1] += 1
+                self._count(record)
+                return False
+
+            if record.levelno < logging.WARNING:
+                tokens, updated = self._tokens.get(record.name, (self.per_second, now))
+                tokens = min(self.per_second, tokens + (now - updated) * self.per_second)
+                if tokens < 1:
+                    self._tokens[record.name] = (tokens, now)
+                    self._count(record)
+                    return False
+                self._tokens[record.name] = (tokens - 1, now)
+
+            if seen is not None and seen[1]:
+                record.msg = f"{message} (+{seen[1]} repeats suppressed)"
+                record.args = None
+            self._seen[key] = [now, 0]
+
+            if len(self._seen) > MAX_DEDUP_KEYS:
+                self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.window}
+        return True
+
+    def _count(self, record: logging.LogRecord):
+        category = category_of(record)
+        self.suppressed[category] = self.suppressed.get(category, 0) + 1
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last `capacity` records for the in-app log view"""
+
+    def __init__(self, capacity: int = RING_BUFFER_SIZE):
+        super().__init__()
+        self.entries = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        self.entries.append((record.created, record.levelname, category_of(record), record.getMessage()))
+
+
+class LogManager:
+    """
+    Owns the queue, the listener thread and the category levels
+
+    Usage:
+        logger = get_logger('data_manager')
+        logger.debug("Update for %s", symbol)      # formatted only if enabled
+    """
+
+    def __init__(self):
+        self.root = logging.getLogger(ROOT_LOGGER)
+        self.root.setLevel(DEFAULT_LEVEL)
+        self.root.propagate = False
+
+        self.queue = queue.SimpleQueue()
+        self.rate_limiter = RateLimitFilter()
+        self.ring_buffer = RingBufferHandler()
+
+        queue_handler = QueueHandler(self.queue)
+        queue_handler.addFilter(self.rate_limiter)
+        self.root.addHandler(queue_handler)
+
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(logging.Formatter('%(message)s'))
+        self.listener = QueueListener(self.queue, console, self.ring_buffer)
+        self.listener.start()
+        atexit.register(self.shutdown)
+
+        for category, level in get_log_levels().items():
+            self.set_level(category, level)
+
+    def get_logger(self, category: str) -> logging.Logger:
+        return logging.getLogger(f"{ROOT_LOGGER}.{category}")
+
+    def set_level(self, category: str, level) -> bool:
+        """
+        Minimum level of one category ('' for the default of all categories)
+
+        Returns False (with a warning, level unchanged) for an unknown level name.
+        """
+        if isinstance(level, str):
+            name, level = level, logging.getLevelName(level.strip().upper())
+            if not isinstance(level, int):
+                self.root.warning(f"Unknown log level '{name}' for '{category or ROOT_LOGGER}' - ignored")
+                return False
+        logger = self.get_logger(category) if category else self.root
+        logger.setLevel(level)
+        return True
+
+    def get_levels(self) -> Dict[str, str]:
+        """Explicitly set category levels (category -> level name)"""
+        prefix = ROOT_LOGGER + '.'
+        return {
+            name[len(prefix):]: logging.getLevelName(logger.level)
+            for name, logger in logging.Logger.manager.loggerDict.items()
+            if name.startswith(prefix) and isinstance(logger, logging.Logger) and logger.level
+        }
+
+    def recent(self, category: Optional[str] = None, min_level: int = logging.NOTSET) -> List[LogEntry]:
+        """Ring buffer contents (oldest first), optionally filtered"""
+        entries = list(self.ring_buffer.entries)
+        return [entry for entry in entries
+                if (category is None or entry[2] == category)
+                and logging.getLevelName(entry[1]) >= min_level]
+
+    def shutdown(self):
+        """Flush the queue and stop the listener thread"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+
+# Global log manager instance
+log_manager = LogManager()
+
+
+def get_logger(category: str) -> logging.Logger:
+    """Logger of one category (appletrader.<category>)"""
+    return log_manager.get_logger(category)
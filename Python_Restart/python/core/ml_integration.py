@@ -8,6 +8,7 @@ Features:
 - Symbol-aware predictions (multi-symbol support)
 - Demo mode integration
 - Caches predictions per symbol
+- Service health (stage latencies, throughput, last error) from ML_Data/status/
 """
 
 import json
@@ -19,6 +20,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Status files older than this belong to a stopped service
+STATUS_STALE_SECONDS = 60
+
 
 class MLIntegration:
     """
@@ -28,6 +32,7 @@ class MLIntegration:
     1. EA writes features to ML_Data/current_features.json
     2. ml_training_service.py writes predictions to ML_Data/prediction.json
     3. This class reads predictions and provides to widgets
+    4. Each service publishes its telemetry to ML_Data/status/<service>.json
     """
 
     def __init__(self, ml_data_dir: str = None):
@@ -64,6 +69,7 @@ class MLIntegration:
         self.features_file = self.ml_data_dir / "current_features.json"
         self.training_data_file = self.ml_data_dir / "training_data.csv"
         self.models_dir = self.ml_data_dir / "models"
+        self.status_dir = self.ml_data_dir / "status"
 
         # Create models directory if doesn't exist
         self.models_dir.mkdir(exist_ok=True)
@@ -80,6 +86,10 @@ class MLIntegration:
         Returns:
             True if service is responding, False otherwise
         """
+        # A service publishing telemetry is running even between predictions
+        if any(not status['stale'] for status in self.get_service_status().values()):
+            return True
+
         # Check if prediction file exists and was recently modified (< 60 seconds)
         if not self.prediction_file.exists():
             return False
@@ -89,6 +99,35 @@ class MLIntegration:
 
         return age < 60  # Service active if file modified in last minute
 
+    def get_service_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get telemetry published by the ML services
+
+        Returns:
+            Dictionary of service name -> status (stage latency histograms in
+            'stages', throughput, errors, last_error) plus 'age_s' and 'stale'
+        """
+        services = {}
+        if not self.status_dir.exists():
+            return services
+
+        now = datetime.now().timestamp()
+        for path in sorted(self.status_dir.glob("*.json")):
+            try:
+                with open(path, 'r') as f:
+                    status = json.load(f)
+                updated = status.get('updated') or os.path.getmtime(path)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.debug(f"Skipping status file {path.name}: {e}")
+                continue
+
+            age = now - updated
+            status['age_s'] = round(age, 1)
+            status['stale'] = age > STATUS_STALE_SECONDS
+            services[status.get('service', path.stem)] = status
+
+        return services
+
     def get_current_prediction(self) -> Optional[Dict[str, Any]]:
         """
         Get latest ML prediction from EA ML system
@@ -204,6 +243,7 @@ class MLIntegration:
             'features_available': has_features,
             'ml_data_dir': str(self.ml_data_dir),
             'last_update': self.last_update.isoformat() if self.last_update else None,
+            'services': self.get_service_status(),
         }
 
         if has_prediction:
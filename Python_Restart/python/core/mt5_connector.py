@@ -9,7 +9,11 @@ from pathlib import Path
 from typing import Dict, Optional, List
 from datetime import datetime
 import pandas as pd
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from core.command_manager import command_manager
+from core.instrumentation import instrumentation
+from core.qt_compat import QObject, QTimer, pyqtSignal
+from core.lazy_loader import LazySingleton
 
 
 class MT5Connector(QObject):
@@ -28,13 +32,9 @@ class MT5Connector(QObject):
         super().__init__()
 
         # Find MT5 data directory
-        self.data_dir = self._find_mt5_data_dir()
+        self.data_dir = None
         self.market_data_file = None
-        self.commands_file = None
-
-        if self.data_dir:
-            self.market_data_file = self.data_dir / "market_data.json"
-            self.commands_file = self.data_dir / "commands.json"
+        self.set_data_directory(self._find_mt5_data_dir())
 
         # Data cache
         self.last_data = {}
@@ -51,6 +51,15 @@ class MT5Connector(QObject):
         self.update_timer.timeout.connect(self.update_data)
         self.update_timer.start(2000)  # Default to NORMAL speed (2 seconds)
 
+    def set_data_directory(self, data_dir: Optional[Path]):
+        """Point the connector at an EA export directory (e.g. a Wine prefix on Linux)"""
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.market_data_file = self.data_dir / "market_data.json" if self.data_dir else None
+        self.last_file_modified = None
+        if self.data_dir:
+            # Commands go to the same EA directory the data comes from
+            command_manager.set_directory(self.data_dir)
+
     def _find_mt5_data_dir(self) -> Optional[Path]:
         """Find MT5 data directory"""
         # Try common locations
@@ -91,10 +100,14 @@ class MT5Connector(QObject):
             data = None
             for attempt in range(3):
                 try:
-                    with open(self.market_data_file, 'r') as f:
-                        data = json.load(f)
+                    with instrumentation.span('connector.read'):
+                        with open(self.market_data_file, 'r') as f:
+                            text = f.read()
+                    with instrumentation.span('connector.parse'):
+                        data = json.loads(text)
                     break
                 except (json.JSONDecodeError, PermissionError):
+                    instrumentation.count('connector.read_retries')
                     if attempt < 2:
                         import time
                         time.sleep(0.05)  # Brief pause before retry
@@ -113,8 +126,10 @@ class MT5Connector(QObject):
                 self.is_connected = True
                 self.connection_status_changed.emit(True)
 
-            # Emit data update
-            self.data_updated.emit(data)
+            # Emit data update (span covers every connected slot)
+            instrumentation.count('connector.updates')
+            with instrumentation.span('connector.dispatch'):
+                self.data_updated.emit(data)
 
         except Exception as e:
             self._handle_read_failure(str(e))
@@ -122,6 +137,7 @@ class MT5Connector(QObject):
     def _handle_read_failure(self, reason: str):
         """Handle read failure with grace period to avoid flickering"""
         self.consecutive_failures += 1
+        instrumentation.count('connector.read_failures')
 
         # Only mark as disconnected after multiple consecutive failures
         if self.consecutive_failures >= self.max_failures_before_disconnect:
@@ -214,27 +230,19 @@ class MT5Connector(QObject):
 
     def send_command(self, command: str, parameters: Dict = None):
         """
-        Send command to MT5 EA
+        Send command to MT5 EA (through the shared command journal)
 
         Args:
             command: Command name
             parameters: Command parameters
-        """
-        if not self.commands_file:
-            return
-
-        try:
-            command_data = {
-                'command': command,
-                'parameters': parameters or {},
-                'timestamp': datetime.now().isoformat()
-            }
-
-            with open(self.commands_file, 'w') as f:
-                json.dump(command_data, f, indent=2)
 
-        except Exception as e:
-            self.error_occurred.emit(f"Error sending command: {str(e)}")
+        Returns:
+            Sequence number of the command (0 if it could not be written)
+        """
+        seq = command_manager.send_command(command, parameters)
+        if not seq:
+            self.error_occurred.emit(f"Error sending command: {command}")
+        return seq
 
     def get_all_symbols_data(self) -> Dict[str, pd.DataFrame]:
         """
@@ -272,5 +280,5 @@ class MT5Connector(QObject):
         return self.data_dir
 
 
-# Global instance
-mt5_connector = MT5Connector()
+# Global instance (constructed on first use)
+mt5_connector = LazySingleton(MT5Connector, 'mt5_connector')
@@ -8,10 +8,12 @@ Manages:
 4. Symbol-specific AI predictions
 """
 
-from PyQt6.QtCore import QObject, pyqtSignal
+from core.qt_compat import QObject, pyqtSignal
 from typing import List, Dict, Optional, Any
 from collections import defaultdict
 
+from core.lazy_loader import LazySingleton
+
 
 class MultiSymbolManager(QObject):
     """
@@ -202,8 +204,8 @@ class MultiSymbolManager(QObject):
             self._symbol_predictions.clear()
 
 
-# Global singleton instance
-symbol_manager = MultiSymbolManager()
+# Global singleton instance (constructed on first use)
+symbol_manager = LazySingleton(MultiSymbolManager, 'multi_symbol_manager')
 
 
 # Convenience functions
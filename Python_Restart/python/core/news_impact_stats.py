@@ -0,0 +1,333 @@
+"""
+AppleTrader Pro - News Impact Statistics
+Measures how price actually reacted to past economic releases
+
+Offline batch job: reads the local economic calendar plus cached bar history
+and computes, for every (event, symbol) pair, the realized pip range, the
+direction of the move and the time-to-peak in windows after the release.
+The aggregated result is written to an impact table that NewsImpactPredictor
+loads at startup.
+
+Ranges are in pips of each symbol (SymbolManager pip size: pips for forex,
+points for metals, indices and crypto), so an event's headline stats are
+computed over forex pairs only; other asset classes are kept separately
+under 'asset_classes'.
+
+Bar cache layout: data/bars/<SYMBOL>_<TIMEFRAME>.csv with columns
+time, open, high, low, close (time as ISO string or epoch seconds, as
+exported by MT5 copy_rates_*).
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CALENDAR_FILE = DATA_DIR / "economic_calendar.json"
+BARS_DIR = DATA_DIR / "bars"
+IMPACT_TABLE_FILE = DATA_DIR / "news_impact_table.json"
+
+# Minutes after the release over which the reaction is measured
+DEFAULT_WINDOWS = (15, 60, 240)
+PRIMARY_WINDOW = 60
+
+# Reference bar must have opened within this many minutes before the release
+MAX_REFERENCE_GAP_MINUTES = 30
+
+# Asset class whose reactions make up an event's headline stats
+HEADLINE_ASSET_CLASS = 'forex'
+
+
+def pip_size(symbol: str) -> float:
+    """Pip size of a symbol (pip for forex, point for other assets) from SymbolManager"""
+    from core.symbol_manager import symbol_specs_manager
+    return symbol_specs_manager.get_pip_size(symbol)
+
+
+def asset_class(symbol: str) -> str:
+    """Asset class of a symbol ('forex', 'commodity', 'crypto', ...) from SymbolManager"""
+    from core.symbol_manager import symbol_specs_manager
+    return symbol_specs_manager.get_asset_class(symbol)
+
+
+def load_calendar_events(calendar_file: Path = CALENDAR_FILE,
+                         until: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Load past events from the local calendar file
+
+    Same file and format as CalendarFetcher._fetch_from_local_file, but
+    returns released events (timestamp before `until`) instead of upcoming ones.
+
+    Returns:
+        DataFrame with columns name, currency, timestamp, forecast, actual
+    """
+    columns = ['name', 'currency', 'timestamp', 'forecast', 'actual']
+    calendar_file = Path(calendar_file)
+    if not calendar_file.exists():
+        return pd.DataFrame(columns=columns)
+
+    with open(calendar_file, 'r') as f:
+        calendar_data = json.load(f)
+
+    rows = []
+    for event_data in calendar_data.get('events', []):
+        try:
+            rows.append((
+                event_data['name'],
+                event_data['currency'],
+                datetime.fromisoformat(event_data['timestamp']),
+                event_data.get('forecast'),
+                event_data.get('actual'),
+            ))
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"[NewsImpactStats] Skipping calendar event: {e}")
+
+    events = pd.DataFrame(rows, columns=columns)
+    if until is None:
+        until = datetime.now()
+    events = events[events['timestamp'] < until]
+    events['forecast'] = pd.to_numeric(events['forecast'], errors='coerce')
+    events['actual'] = pd.to_numeric(events['actual'], errors='coerce')
+    return events.sort_values('timestamp').reset_index(drop=True)
+
+
+def load_cached_bars(bars_dir: Path = BARS_DIR, timeframe: str = 'M1',
+                     symbols: Optional[Iterable[str]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Load cached bar history for each symbol
+
+    Returns:
+        {symbol: DataFrame(time, high, low, close)} sorted by time
+    """
+    bars_dir = Path(bars_dir)
+    wanted = {s.upper() for s in symbols} if symbols else None
+    bars = {}
+
+    for path in sorted(bars_dir.glob(f"*_{timeframe}.csv")):
+        symbol = path.stem[:-(len(timeframe) + 1)].upper()
+        if wanted is not None and symbol not in wanted:
+            continue
+
+        df = pd.read_csv(path, usecols=['time', 'high', 'low', 'close'])
+        if pd.api.types.is_numeric_dtype(df['time']):
+            df['time'] = pd.to_datetime(df['time'], unit='s')
+        else:
+            df['time'] = pd.to_datetime(df['time'])
+        bars[symbol] = df.sort_values('time').reset_index(drop=True)
+
+    return bars
+
+
+def _symbol_currencies(symbol: str) -> Optional[Tuple[str, str]]:
+    return (symbol[:3], symbol[3:6]) if len(symbol) >= 6 else None
+
+
+def measure_reactions(events: pd.DataFrame, bars: Dict[str, pd.DataFrame],
+                      windows: Sequence[int] = DEFAULT_WINDOWS) -> pd.DataFrame:
+    """
+    Measure the price reaction to every event on every affected symbol
+
+    A symbol is affected when the event currency is its base or quote currency.
+    For each window the reference price is the close of the last bar that
+    opened before the release; the window covers bars opening in
+    [release, release + window).
+
+    Returns:
+        DataFrame with one row per (event, symbol, window):
+        name, currency, timestamp, symbol, asset_class, window, range_pips, move_pips,
+        direction (+1/-1/0 for price), currency_direction (+1 = currency
+        strengthened), minutes_to_peak, surprise
+    """
+    frames = []
+    if events.empty:
+        return pd.DataFrame()
+
+    event_ns = events['timestamp'].values.astype('datetime64[ns]').astype(np.int64)
+    event_currency = events['currency'].to_numpy(dtype=object)
+    surprise = (events['actual'] - events['forecast']).values
+    max_gap_ns = np.int64(MAX_REFERENCE_GAP_MINUTES * 60 * 1_000_000_000)
+
+    for symbol, df in bars.items():
+        currencies = _symbol_currencies(symbol)
+        if currencies is None or df.empty:
+            continue
+        base, quote = currencies
+
+        affected = np.flatnonzero((event_currency == base) | (event_currency == quote))
+        if affected.size == 0:
+            continue
+
+        times = df['time'].values.astype('datetime64[ns]').astype(np.int64)
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        close = df['close'].to_numpy(dtype=float)
+        pip = pip_size(symbol)
+        symbol_class = asset_class(symbol)
+
+        ev = event_ns[affected]
+        ref_idx = np.searchsorted(times, ev, side='left') - 1
+        has_ref = ref_idx >= 0
+        ref_idx = np.maximum(ref_idx, 0)
+        has_ref &= (ev - times[ref_idx]) <= max_gap_ns
+        start = ref_idx + 1
+
+        # +1 when a move up in price means the event currency strengthened
+        currency_sign = np.where(event_currency[affected] == base, 1, -1)
+
+        for window in windows:
+            end = np.searchsorted(times, ev + np.int64(window * 60 * 1_000_000_000), side='left')
+            count = np.where(has_ref, end - start, 0)
+            valid = count > 0
+            if not valid.any():
+                continue
+
+            rows = np.flatnonzero(valid)
+            r_start, r_count, r_end = start[rows], count[rows], end[rows]
+            ref = close[ref_idx[rows]]
+
+            # Bars of every event window as one (events x max_bars) matrix
+            offsets = np.arange(r_count.max())
+            in_window = offsets[None, :] < r_count[:, None]
+            idx = np.minimum(r_start[:, None] + offsets[None, :], len(times) - 1)
+            win_high = np.where(in_window, high[idx], -np.inf)
+            win_low = np.where(in_window, low[idx], np.inf)
+
+            high_arg = win_high.argmax(axis=1)
+            low_arg = win_low.argmin(axis=1)
+            max_high = win_high[np.arange(len(rows)), high_arg]
+            min_low = win_low[np.arange(len(rows)), low_arg]
+
+            up = max_high - ref
+            down = ref - min_low
+            peak_idx = r_start + np.where(up >= down, high_arg, low_arg)
+            direction = np.sign(close[r_end - 1] - ref).astype(int)
+            event_rows = affected[rows]
+
+            frames.append(pd.DataFrame({
+                'name': events['name'].to_numpy(dtype=object)[event_rows],
+                'currency': event_currency[event_rows],
+                'timestamp': events['timestamp'].values[event_rows],
+                'symbol': symbol,
+                'asset_class': symbol_class,
+                'window': window,
+                'range_pips': (max_high - min_low) / pip,
+                'move_pips': np.maximum(up, down) / pip,
+                'direction': direction,
+                'currency_direction': direction * currency_sign[rows],
+                'minutes_to_peak': (times[peak_idx] - ev[rows]) / 60e9,
+                'surprise': surprise[event_rows],
+            }))
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def _aggregate(group: pd.DataFrame) -> Dict:
+    """Summary statistics for a group of reactions"""
+    surprised = group[(group['surprise'].notna()) & (group['surprise'] != 0) &
+                      (group['currency_direction'] != 0)]
+    stats = {
+        'samples': int(len(group)),
+        'avg_range_pips': round(float(group['range_pips'].mean()), 1),
+        'median_range_pips': round(float(group['range_pips'].median()), 1),
+        'p90_range_pips': round(float(group['range_pips'].quantile(0.9)), 1),
+        'avg_move_pips': round(float(group['move_pips'].mean()), 1),
+        'currency_bullish_pct': round(float((group['currency_direction'] > 0).mean() * 100), 1),
+        'median_minutes_to_peak': round(float(group['minutes_to_peak'].median()), 1),
+    }
+    if len(surprised):
+        # How often the currency moved in the direction of the surprise
+        aligned = np.sign(surprised['surprise'].values) == surprised['currency_direction'].values
+        stats['surprise_samples'] = int(len(surprised))
+        stats['surprise_alignment_pct'] = round(float(aligned.mean() * 100), 1)
+    return stats
+
+
+def build_impact_table(reactions: pd.DataFrame,
+                       windows: Sequence[int] = DEFAULT_WINDOWS,
+                       primary_window: int = PRIMARY_WINDOW) -> Dict:
+    """
+    Aggregate per-reaction measurements into the impact table
+
+    Top-level event stats come from the primary window of the headline asset
+    class (forex, or the most measured class when no forex pair was); every
+    window of that class is also kept under 'windows', and the primary window
+    is broken down per asset class and per symbol. Pips of different asset
+    classes are never averaged together.
+    """
+    table = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'windows_minutes': list(windows),
+        'primary_window_minutes': primary_window,
+        'events': {},
+    }
+    if reactions.empty:
+        return table
+
+    for name, event_rows in reactions.groupby('name', sort=True):
+        primary = event_rows[event_rows['window'] == primary_window]
+        if primary.empty:
+            continue
+
+        class_counts = primary['asset_class'].value_counts()
+        headline_class = (HEADLINE_ASSET_CLASS if HEADLINE_ASSET_CLASS in class_counts.index
+                          else str(class_counts.index[0]))
+        headline_rows = event_rows[event_rows['asset_class'] == headline_class]
+
+        entry = {'currency': str(primary['currency'].iloc[0]), 'asset_class': headline_class}
+        entry.update(_aggregate(headline_rows[headline_rows['window'] == primary_window]))
+        entry['event_count'] = int(primary['timestamp'].nunique())
+        entry['windows'] = {
+            str(window): _aggregate(rows)
+            for window, rows in headline_rows.groupby('window', sort=True)
+        }
+        entry['asset_classes'] = {
+            cls: _aggregate(rows)
+            for cls, rows in primary.groupby('asset_class', sort=True)
+        }
+        entry['symbols'] = {
+            symbol: _aggregate(rows)
+            for symbol, rows in primary.groupby('symbol', sort=True)
+        }
+        table['events'][name] = entry
+
+    return table
+
+
+def save_impact_table(table: Dict, path: Path = IMPACT_TABLE_FILE):
+    """Write the impact table as JSON"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(table, f, indent=2)
+
+
+def load_impact_table(path: Path = IMPACT_TABLE_FILE) -> Optional[Dict]:
+    """Load the impact table (None if it has not been computed yet)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[NewsImpactStats] Could not read {path}: {e}")
+        return None
+
+
+def compute_impact_table(calendar_file: Path = CALENDAR_FILE, bars_dir: Path = BARS_DIR,
+                         timeframe: str = 'M1', windows: Sequence[int] = DEFAULT_WINDOWS,
+                         primary_window: int = PRIMARY_WINDOW,
+                         symbols: Optional[List[str]] = None) -> Dict:
+    """Run the full batch job: load calendar + bars, measure, aggregate"""
+    events = load_calendar_events(calendar_file)
+    bars = load_cached_bars(bars_dir, timeframe, symbols)
+    windows = sorted(set(windows) | {primary_window})
+    reactions = measure_reactions(events, bars, windows)
+    return build_impact_table(reactions, windows, primary_window)
@@ -5,12 +5,11 @@ Generates REAL opportunities based on actual market analysis, not random data
 This replaces the amateur random.randint() approach with institutional-grade analysis.
 """
 
-try:
-    import MetaTrader5 as mt5
-    MT5_AVAILABLE = True
-except ImportError:
-    MT5_AVAILABLE = False
-    mt5 = None
+from core.lazy_loader import lazy_import
+
+# MetaTrader5 is imported on first use to keep startup fast
+mt5 = lazy_import('MetaTrader5')
+MT5_AVAILABLE = mt5 is not None
 import random
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -24,6 +23,7 @@ from analysis.order_block_detector import order_block_detector
 from analysis.liquidity_sweep_detector import liquidity_sweep_detector
 from analysis.fair_value_gap_detector import fair_value_gap_detector
 from analysis.market_structure_detector import market_structure_detector
+from core.instrumentation import instrumentation
 
 
 class OpportunityGenerator:
@@ -51,6 +51,7 @@ class OpportunityGenerator:
         except:
             self.mt5_available = False
 
+    @instrumentation.timed('analyzer')
     def generate_opportunities(self, symbols: List[str], timeframes: List[str],
                               max_per_group: int = 12) -> List[Dict]:
         """
@@ -77,6 +78,7 @@ class OpportunityGenerator:
 
         return opportunities
 
+    @instrumentation.timed('analyzer')
     def scan_symbol_timeframe(self, symbol: str, timeframe: str,
                              max_opportunities: int = 3) -> List[Dict]:
         """
@@ -115,6 +117,45 @@ class OpportunityGenerator:
 
         return opportunities
 
+    @instrumentation.timed('analyzer')
+    def scan_candles(self, symbol: str, timeframe: str, candles: List[Dict],
+                     spread: float, max_opportunities: int = 3) -> List[Dict]:
+        """
+        Scan candles already in hand (e.g. the EA export) for opportunities
+
+        Entry, ATR(14) and patterns all come from `candles`; `spread` is in
+        pips. Unlike scan_symbol_timeframe there is no MT5, fallback price or
+        synthetic pattern: too few candles means no opportunities.
+        """
+        if len(candles) < 20:
+            return []
+
+        pip_value = 0.01 if 'JPY' in symbol else 0.0001
+        high = np.array([c['high'] for c in candles], dtype=float)
+        low = np.array([c['low'] for c in candles], dtype=float)
+        close = np.array([c['close'] for c in candles], dtype=float)
+        true_range = np.maximum(high[1:], close[:-1]) - np.minimum(low[1:], close[:-1])
+        atr = float(true_range[-14:].mean()) / pip_value
+
+        price_data = {
+            'rates': candles,
+            'current_price': float(close[-1]),
+            'spread': spread,
+            'volume': candles[-1].get('tick_volume', candles[-1].get('volume', 0)),
+        }
+
+        opportunities = []
+        try:
+            patterns = self.detect_patterns(price_data, symbol, timeframe)
+            for pattern in patterns[:max_opportunities]:
+                opp = self.create_opportunity_from_pattern(pattern, symbol, timeframe, atr, price_data)
+                if opp:
+                    opportunities.append(opp)
+        except Exception as e:
+            print(f"[OpportunityGen] Error scanning {symbol} {timeframe} candles: {e}")
+
+        return opportunities
+
     def get_mt5_price_data(self, symbol: str, timeframe: str) -> Optional[Dict]:
         """Get real price data from MT5"""
         try:
@@ -0,0 +1,275 @@
+"""
+AppleTrader Pro - Pattern Statistics Store
+Regime-aware running win-rate / RR aggregates for the Pattern Quality Scorer
+
+Stats are keyed by (pattern, regime, session, timeframe). Every recorded
+trade also updates the coarser roll-up keys (any dimension replaced by ANY),
+so a lookup at any granularity is a single dict access. Sources:
+- EA pattern performance CSVs (MLTrainingData/IGTR*_PatternPerformance*.csv),
+  bulk-loaded at startup
+- Trades recorded by the app, persisted to ~/.trading_app/pattern_stats.json
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from itertools import product
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from core.verbose_mode_manager import vprint
+
+
+ANY = 'ANY'
+
+# MARKET_REGIME enum order in the EA (InstitutionalTradingRobot_v4.mq5)
+EA_REGIMES = {0: 'TREND', 1: 'RANGE', 2: 'TRANSITION'}
+
+EA_PERFORMANCE_COLUMNS = ['PatternName', 'Regime', 'TotalTrades', 'WinningTrades', 'TotalPnL', 'AvgRR']
+
+# Where the EA performance CSVs may live
+EA_PERFORMANCE_DIRS = [
+    Path(__file__).parent.parent.parent.parent / "MLTrainingData",
+    Path.home() / "MLTrainingData",
+    Path("MLTrainingData"),
+]
+
+STORE_FILE = Path.home() / ".trading_app" / "pattern_stats.json"
+
+StatsKey = Tuple[str, str, str, str]
+
+
+def wilson_interval(wins: int, total: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score confidence interval for a win rate (0-1)"""
+    if total <= 0:
+        return 0.0, 0.0
+    p = wins / total
+    denom = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denom
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denom
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+@dataclass
+class PatternStats:
+    """Running aggregate for one stats key"""
+    trades: int = 0
+    wins: int = 0
+    total_pnl: float = 0.0
+    total_rr: float = 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trades if self.trades else 0.0
+
+    @property
+    def avg_rr(self) -> float:
+        return self.total_rr / self.trades if self.trades else 0.0
+
+    @property
+    def avg_pnl(self) -> float:
+        return self.total_pnl / self.trades if self.trades else 0.0
+
+    def wilson_bounds(self, z: float = 1.96) -> Tuple[float, float]:
+        """(lower, upper) confidence bounds of the win rate"""
+        return wilson_interval(self.wins, self.trades, z)
+
+    def add(self, trades: int, wins: int, pnl: float, rr_sum: float):
+        """Accumulate trades into this aggregate"""
+        self.trades += trades
+        self.wins += wins
+        self.total_pnl += pnl
+        self.total_rr += rr_sum
+
+    def to_dict(self) -> Dict:
+        return {'trades': self.trades, 'wins': self.wins,
+                'total_pnl': self.total_pnl, 'total_rr': self.total_rr}
+
+
+def normalize_pattern(pattern: str) -> str:
+    """Case/whitespace-insensitive pattern name used in keys"""
+    return ' '.join(str(pattern).split()).upper()
+
+
+def _normalize_dim(value: Optional[str]) -> str:
+    return str(value).upper() if value not in (None, '') else ANY
+
+
+class PatternStatsStore:
+    """
+    Pattern performance store with O(1) lookups at every granularity
+
+    Usage:
+        store.record_trade('Bullish Engulfing', profit=120.0, rr=2.1,
+                           regime='TREND', session='LONDON', timeframe='H1')
+        stats = store.lookup('Bullish Engulfing', regime='TREND', session='LONDON')
+        lower, upper = stats.wilson_bounds()
+    """
+
+    def __init__(self, store_file: Path = STORE_FILE):
+        self.store_file = Path(store_file)
+
+        # Every key (including ANY roll-ups) -> aggregate
+        self.stats: Dict[StatsKey, PatternStats] = {}
+
+        # Leaf aggregates of trades recorded by the app (persisted)
+        self.local_stats: Dict[StatsKey, PatternStats] = {}
+
+        self.loaded_files: List[Path] = []
+
+    @staticmethod
+    def make_key(pattern: str, regime: Optional[str] = None, session: Optional[str] = None,
+                 timeframe: Optional[str] = None) -> StatsKey:
+        return (normalize_pattern(pattern), _normalize_dim(regime),
+                _normalize_dim(session), _normalize_dim(timeframe))
+
+    @staticmethod
+    def _rollup_keys(key: StatsKey) -> Iterable[StatsKey]:
+        """The key plus every coarser key (each known dimension optionally ANY)"""
+        pattern, *dims = key
+        options = [(dim, ANY) if dim != ANY else (ANY,) for dim in dims]
+        for combo in product(*options):
+            yield (pattern,) + combo
+
+    def _accumulate(self, key: StatsKey, trades: int, wins: int, pnl: float, rr_sum: float):
+        for rollup in self._rollup_keys(key):
+            entry = self.stats.get(rollup)
+            if entry is None:
+                entry = self.stats[rollup] = PatternStats()
+            entry.add(trades, wins, pnl, rr_sum)
+
+    def record_trade(self, pattern: str, profit: float, rr: float,
+                     regime: Optional[str] = None, session: Optional[str] = None,
+                     timeframe: Optional[str] = None, save: bool = True):
+        """Record one completed trade"""
+        key = self.make_key(pattern, regime, session, timeframe)
+        win = 1 if profit > 0 else 0
+
+        self._accumulate(key, 1, win, profit, rr)
+        self.local_stats.setdefault(key, PatternStats()).add(1, win, profit, rr)
+
+        if save:
+            self.save()
+
+    def lookup(self, pattern: str, regime: Optional[str] = None, session: Optional[str] = None,
+               timeframe: Optional[str] = None, min_samples: int = 0) -> PatternStats:
+        """
+        Get stats for the most specific key that has at least min_samples trades
+
+        Backs off timeframe, then session, then regime. Returns an empty
+        PatternStats if the pattern is unknown.
+        """
+        pattern, regime, session, timeframe = self.make_key(pattern, regime, session, timeframe)
+        candidates = (
+            (pattern, regime, session, timeframe),
+            (pattern, regime, session, ANY),
+            (pattern, regime, ANY, ANY),
+            (pattern, ANY, ANY, ANY),
+        )
+
+        best = None
+        for key in candidates:
+            entry = self.stats.get(key)
+            if entry is None:
+                continue
+            if entry.trades >= min_samples:
+                return entry
+            if best is None:
+                best = entry
+        return best if best is not None else PatternStats()
+
+    # ------------------------------------------------------------------
+    # EA performance CSVs
+    # ------------------------------------------------------------------
+
+    def load_ea_performance(self, directories: Optional[Iterable[Path]] = None) -> int:
+        """
+        Bulk-load IGTR*_PatternPerformance*.csv files written by the EA
+
+        Rows are keyed (pattern, regime, ANY, ANY); the EA does not record
+        session or timeframe. Header fragments and empty rows are skipped.
+        Directories and files are compared by resolved path, so a file
+        reachable through two of the directories (or already loaded) is only
+        counted once.
+
+        Returns:
+            Number of (pattern, regime) rows loaded
+        """
+        files = []
+        seen = set(self.loaded_files)
+        for directory in directories or EA_PERFORMANCE_DIRS:
+            directory = Path(directory)
+            if not directory.is_dir():
+                continue
+            for path in sorted(directory.glob("IGTR*_PatternPerformance*.csv")):
+                path = path.resolve()
+                if path not in seen:
+                    seen.add(path)
+                    files.append(path)
+        if not files:
+            return 0
+
+        frames = []
+        for path in files:
+            try:
+                frames.append(pd.read_csv(path, usecols=EA_PERFORMANCE_COLUMNS))
+                self.loaded_files.append(path)
+            except (OSError, ValueError) as e:
+                vprint(f"[PatternStats] Skipping {path.name}: {e}")
+        if not frames:
+            return 0
+
+        df = pd.concat(frames, ignore_index=True)
+        for column in EA_PERFORMANCE_COLUMNS[1:]:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+        df = df.dropna()
+        df = df[(df['TotalTrades'] > 0) & ~df['PatternName'].isin(EA_PERFORMANCE_COLUMNS + ['WinRate'])]
+        if df.empty:
+            return 0
+
+        df['RRSum'] = df['AvgRR'] * df['TotalTrades']
+        totals = df.groupby(['PatternName', 'Regime'], sort=False)[
+            ['TotalTrades', 'WinningTrades', 'TotalPnL', 'RRSum']].sum()
+
+        for (pattern, regime), row in totals.iterrows():
+            key = self.make_key(pattern, EA_REGIMES.get(int(regime), str(int(regime))))
+            self._accumulate(key, int(row['TotalTrades']), int(row['WinningTrades']),
+                             float(row['TotalPnL']), float(row['RRSum']))
+
+        vprint(f"[PatternStats] Loaded {len(totals)} pattern/regime rows from {len(files)} EA file(s)")
+        return len(totals)
+
+    # ------------------------------------------------------------------
+    # Persistence of app-recorded trades
+    # ------------------------------------------------------------------
+
+    def load(self) -> int:
+        """Load trades recorded by the app in previous sessions"""
+        if not self.store_file.exists():
+            return 0
+        try:
+            with open(self.store_file, 'r') as f:
+                records = json.load(f).get('stats', [])
+        except (OSError, ValueError) as e:
+            vprint(f"[PatternStats] Could not read {self.store_file}: {e}")
+            return 0
+
+        for record in records:
+            key = tuple(record['key'])
+            entry = PatternStats(record['trades'], record['wins'],
+                                 record['total_pnl'], record['total_rr'])
+            self.local_stats[key] = entry
+            self._accumulate(key, entry.trades, entry.wins, entry.total_pnl, entry.total_rr)
+        return len(records)
+
+    def save(self):
+        """Persist app-recorded trade aggregates"""
+        records = [dict(key=list(key), **entry.to_dict()) for key, entry in self.local_stats.items()]
+        try:
+            self.store_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.store_file, 'w') as f:
+                json.dump({'stats': records}, f, indent=1)
+        except OSError as e:
+            vprint(f"[PatternStats] Could not save {self.store_file}: {e}")
@@ -0,0 +1,96 @@
+"""
+AppleTrader Pro - Qt Compatibility
+QObject / pyqtSignal / QTimer for core modules, with or without PyQt6
+
+The GUI uses the real PyQt6 classes. Headless processes (analysis service,
+benchmarks, scripts) get plain Python stand-ins when PyQt6 is missing or
+when TRADING_APP_HEADLESS=1:
+- pyqtSignal: per-instance signals, emit() calls slots synchronously
+- QTimer: never fires on its own; the headless driver polls instead
+"""
+
+from core.dev_config import is_headless
+
+QT_AVAILABLE = False
+if not is_headless():
+    try:
+        from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+        QT_AVAILABLE = True
+    except ImportError:
+        pass
+
+
+class BoundSignal:
+    """Signal of one object: connect/disconnect/emit like a PyQt bound signal"""
+
+    def __init__(self):
+        self._slots = []
+
+    def connect(self, slot):
+        self._slots.append(slot)
+
+    def disconnect(self, slot=None):
+        if slot is None:
+            self._slots.clear()
+        else:
+            self._slots.remove(slot)
+
+    def emit(self, *args):
+        for slot in list(self._slots):
+            slot(*args)
+
+
+class _Signal:
+    """Class-level signal declaration; each instance gets its own BoundSignal"""
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        bound = obj.__dict__.get(self.name)
+        if bound is None:
+            bound = obj.__dict__[self.name] = BoundSignal()
+        return bound
+
+
+class _Timer:
+    """Inert QTimer: keeps interval/active state, never fires"""
+
+    timeout = _Signal()
+
+    def __init__(self, parent=None):
+        self._interval = 0
+        self._active = False
+        self._single_shot = False
+
+    def setInterval(self, interval_ms: int):
+        self._interval = interval_ms
+
+    def interval(self) -> int:
+        return self._interval
+
+    def setSingleShot(self, single_shot: bool):
+        self._single_shot = single_shot
+
+    def start(self, interval_ms: int = None):
+        if interval_ms is not None:
+            self._interval = interval_ms
+        self._active = True
+
+    def stop(self):
+        self._active = False
+
+    def isActive(self) -> bool:
+        return self._active
+
+
+if not QT_AVAILABLE:
+    QObject = object
+    pyqtSignal = _Signal
+    QTimer = _Timer
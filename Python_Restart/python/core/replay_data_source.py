@@ -0,0 +1,262 @@
+"""
+AppleTrader Pro - Replay Data Source
+Serves recorded bar history through the MetaTrader5 API subset the analysis stack uses
+
+MarketAnalyzer, OpportunityGenerator and WyckoffAnalyzer read prices through
+their module-level `mt5` handle (initialize, copy_rates_from_pos,
+symbol_info_tick, symbol_info, TIMEFRAME_*), and OpportunityGenerator reads
+candles through `data_manager` (get_candles, get_latest_price).
+ReplayDataSource implements both interfaces on top of bars loaded from
+CSV/Parquet, so the replay engine can plug it in place of the live feed.
+
+Only bars that have closed at the replay clock are visible - there is no
+look-ahead into the bar being replayed or into forming higher timeframe bars.
+
+Bar files: data/bars/<SYMBOL>_<TIMEFRAME>.csv or .parquet with columns
+time, open, high, low, close and optionally tick_volume (or volume),
+spread, real_volume (time as ISO string or epoch seconds).
+"""
+
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from core.news_impact_stats import BARS_DIR
+
+
+# Same record layout as MetaTrader5.copy_rates_*
+RATES_DTYPE = np.dtype([
+    ('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+    ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8'),
+])
+
+TIMEFRAME_SECONDS = {
+    'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800,
+    'H1': 3600, 'H4': 14400, 'D1': 86400, 'W1': 604800,
+}
+
+BAR_FILE_SUFFIXES = ('.parquet', '.csv')
+
+# Spread (in points) used when a bar file has no spread column
+DEFAULT_SPREAD_POINTS = 10
+
+
+def load_bar_file(path: Path) -> np.ndarray:
+    """
+    Load one bar file (CSV or Parquet) as an MT5 rates array sorted by time
+
+    Raises:
+        ImportError: Parquet file but no parquet engine (pyarrow) installed
+        ValueError: Missing OHLC columns
+    """
+    path = Path(path)
+    if path.suffix.lower() == '.parquet':
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    return rates_from_frame(df)
+
+
+def rates_from_frame(df: pd.DataFrame) -> np.ndarray:
+    """Convert an OHLC DataFrame to an MT5 rates array sorted by time"""
+    missing = [col for col in ('time', 'open', 'high', 'low', 'close') if col not in df.columns]
+    if missing:
+        raise ValueError(f"Bar data missing columns: {', '.join(missing)}")
+
+    if pd.api.types.is_numeric_dtype(df['time']):
+        times = df['time'].to_numpy(dtype=np.int64)
+    else:
+        times = pd.to_datetime(df['time']).to_numpy().astype('datetime64[s]').astype(np.int64)
+
+    rates = np.zeros(len(df), dtype=RATES_DTYPE)
+    rates['time'] = times
+    for field in ('open', 'high', 'low', 'close'):
+        rates[field] = df[field].to_numpy(dtype=float)
+
+    volume_col = 'tick_volume' if 'tick_volume' in df.columns else (
+        'volume' if 'volume' in df.columns else None)
+    if volume_col:
+        rates['tick_volume'] = df[volume_col].fillna(0).to_numpy(dtype=np.uint64)
+    rates['spread'] = df['spread'].fillna(0).to_numpy(dtype=np.int32) if 'spread' in df.columns \
+        else DEFAULT_SPREAD_POINTS
+    if 'real_volume' in df.columns:
+        rates['real_volume'] = df['real_volume'].fillna(0).to_numpy(dtype=np.uint64)
+
+    order = np.argsort(rates['time'], kind='stable')
+    return rates[order]
+
+
+def default_point(symbol: str) -> float:
+    """Point size of a 5-digit (3-digit JPY) broker quote"""
+    return 0.001 if 'JPY' in symbol else 0.00001
+
+
+class ReplayDataSource:
+    """
+    Historical bars behind the MetaTrader5 + DataManager read API
+
+    Usage:
+        source = ReplayDataSource.from_directory(BARS_DIR, ['EURUSD'], ['M5', 'H1', 'H4'])
+        source.set_time(some_epoch_seconds)
+        rates = source.copy_rates_from_pos('EURUSD', source.TIMEFRAME_H1, 0, 100)
+    """
+
+    # MT5 timeframe constants; timeframes are passed around as their names
+    TIMEFRAME_M1 = 'M1'
+    TIMEFRAME_M5 = 'M5'
+    TIMEFRAME_M15 = 'M15'
+    TIMEFRAME_M30 = 'M30'
+    TIMEFRAME_H1 = 'H1'
+    TIMEFRAME_H4 = 'H4'
+    TIMEFRAME_D1 = 'D1'
+    TIMEFRAME_W1 = 'W1'
+
+    def __init__(self, candle_timeframe: str = 'M5', points: Optional[Dict[str, float]] = None):
+        self.bars: Dict[str, Dict[str, np.ndarray]] = {}  # {symbol: {timeframe: rates}}
+        self.points = dict(points or {})
+
+        # Replay clock (epoch seconds); bars closed at or before it are visible
+        self.now = 0
+
+        # Symbol/timeframe served through the DataManager interface
+        self.active_symbol = ''
+        self.candle_timeframe = candle_timeframe
+
+        self._candle_cache = {}
+
+    @classmethod
+    def from_directory(cls, bars_dir: Path = BARS_DIR, symbols: Optional[Iterable[str]] = None,
+                       timeframes: Iterable[str] = ('M5', 'H1', 'H4'),
+                       candle_timeframe: str = 'M5') -> 'ReplayDataSource':
+        """Load data/bars/<SYMBOL>_<TIMEFRAME>.(parquet|csv) for every wanted symbol/timeframe"""
+        source = cls(candle_timeframe=candle_timeframe)
+        bars_dir = Path(bars_dir)
+        wanted = {s.upper() for s in symbols} if symbols else None
+
+        for timeframe in timeframes:
+            seen = set()
+            for suffix in BAR_FILE_SUFFIXES:
+                for path in sorted(bars_dir.glob(f"*_{timeframe}{suffix}")):
+                    symbol = path.stem[:-(len(timeframe) + 1)].upper()
+                    if symbol in seen or (wanted is not None and symbol not in wanted):
+                        continue
+                    source.add_bars(symbol, timeframe, load_bar_file(path))
+                    seen.add(symbol)
+
+        return source
+
+    def add_bars(self, symbol: str, timeframe: str, bars: Union[np.ndarray, pd.DataFrame]):
+        """Add bar history for symbol/timeframe (DataFrame or MT5 rates array)"""
+        if isinstance(bars, pd.DataFrame):
+            bars = rates_from_frame(bars)
+        self.bars.setdefault(symbol, {})[timeframe] = bars
+        self._candle_cache.clear()
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.bars)
+
+    def timeframes(self, symbol: str) -> List[str]:
+        return list(self.bars.get(symbol, {}))
+
+    def set_time(self, now: int):
+        """Move the replay clock (epoch seconds)"""
+        self.now = int(now)
+        self._candle_cache.clear()
+
+    def visible_count(self, symbol: str, timeframe: str) -> int:
+        """Number of bars of symbol/timeframe that have closed at the replay clock"""
+        rates = self.bars.get(symbol, {}).get(timeframe)
+        if rates is None:
+            return 0
+        cutoff = self.now - TIMEFRAME_SECONDS.get(timeframe, 0)
+        return int(np.searchsorted(rates['time'], cutoff, side='right'))
+
+    def current_datetime(self) -> datetime:
+        """Replay clock as a naive UTC datetime"""
+        return np.datetime64(self.now, 's').astype(datetime)
+
+    # ------------------------------------------------------------------
+    # MetaTrader5 API subset
+    # ------------------------------------------------------------------
+
+    def initialize(self, *args, **kwargs) -> bool:
+        return True
+
+    def shutdown(self):
+        pass
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: str, start_pos: int,
+                            count: int) -> Optional[np.ndarray]:
+        """Latest `count` closed bars, `start_pos` bars back from the newest (oldest first)"""
+        rates = self.bars.get(symbol, {}).get(timeframe)
+        if rates is None:
+            return None
+        end = self.visible_count(symbol, timeframe) - start_pos
+        if end <= 0:
+            return None
+        return rates[max(0, end - count):end]
+
+    def _last_bar(self, symbol: str):
+        timeframes = self.bars.get(symbol, {})
+        # Finest loaded timeframe gives the most recent price
+        for timeframe in sorted(timeframes, key=lambda tf: TIMEFRAME_SECONDS.get(tf, 0)):
+            count = self.visible_count(symbol, timeframe)
+            if count:
+                return timeframes[timeframe][count - 1]
+        return None
+
+    def symbol_info(self, symbol: str) -> Optional[SimpleNamespace]:
+        if symbol not in self.bars:
+            return None
+        point = self.points.get(symbol, default_point(symbol))
+        digits = int(round(-np.log10(point)))
+        return SimpleNamespace(name=symbol, point=point, digits=digits)
+
+    def symbol_info_tick(self, symbol: str) -> Optional[SimpleNamespace]:
+        """Tick at the replay clock: bid = last close, ask = bid + bar spread"""
+        bar = self._last_bar(symbol)
+        if bar is None:
+            return None
+        point = self.points.get(symbol, default_point(symbol))
+        bid = float(bar['close'])
+        ask = bid + int(bar['spread']) * point
+        return SimpleNamespace(time=self.now, bid=bid, ask=ask, last=bid,
+                               volume=int(bar['tick_volume']))
+
+    # ------------------------------------------------------------------
+    # DataManager API subset (active symbol, candle timeframe)
+    # ------------------------------------------------------------------
+
+    def get_candles(self, count: int = 200) -> List[Dict]:
+        """Latest closed candles of the active symbol as dicts (same keys as live candles)"""
+        key = (self.active_symbol, count)
+        if key not in self._candle_cache:
+            rates = self.copy_rates_from_pos(self.active_symbol, self.candle_timeframe, 0, count)
+            candles = []
+            if rates is not None:
+                times = rates['time'].astype('datetime64[s]').tolist()
+                columns = {field: rates[field].tolist()
+                           for field in ('open', 'high', 'low', 'close', 'tick_volume')}
+                for i, time in enumerate(times):
+                    candles.append({
+                        'time': time,
+                        'open': columns['open'][i],
+                        'high': columns['high'][i],
+                        'low': columns['low'][i],
+                        'close': columns['close'][i],
+                        'volume': columns['tick_volume'][i],
+                    })
+            self._candle_cache[key] = candles
+        return self._candle_cache[key]
+
+    def get_latest_price(self) -> Dict:
+        tick = self.symbol_info_tick(self.active_symbol)
+        if tick is None:
+            return {}
+        return {'symbol': self.active_symbol, 'bid': tick.bid, 'ask': tick.ask,
+                'time': self.current_datetime()}
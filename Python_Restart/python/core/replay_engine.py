@@ -0,0 +1,351 @@
+"""
+AppleTrader Pro - Historical Replay Engine
+Drives the analysis stack bar-by-bar from recorded history
+
+The engine plugs a ReplayDataSource into MarketAnalyzer, OpportunityGenerator
+and WyckoffAnalyzer in place of MT5/data_manager, then walks the watchlist
+timeline one closed bar at a time. For every bar it runs:
+- opportunities: OpportunityGenerator scan + FilterManager decision
+- zones: order block, FVG, liquidity sweep and structure detectors
+- wyckoff: WyckoffAnalyzer phase/signal
+
+Everything produced is recorded with the replay timestamp, and the report
+gives throughput in bars/second plus time spent per component. Replay runs
+at max speed by default, or paced to a target bars/second.
+"""
+
+import importlib
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from core.replay_data_source import TIMEFRAME_SECONDS, ReplayDataSource
+
+
+REPLAY_COMPONENTS = ('opportunities', 'zones', 'wyckoff')
+
+# Modules whose `mt5` handle is replaced by the replay data source
+MT5_MODULES = ('core.market_analyzer', 'core.opportunity_generator', 'analysis.wyckoff_analyzer')
+
+# Candles handed to the zone detectors (same as OpportunityGenerator)
+ZONE_CANDLES = 100
+
+# Bars needed before a symbol is analyzed (WyckoffAnalyzer needs 100)
+DEFAULT_WARMUP_BARS = 100
+
+
+@contextmanager
+def replay_data_source(source: ReplayDataSource):
+    """
+    Plug source into the analysis stack for the duration of the block
+
+    Replaces the module-level mt5 handles, OpportunityGenerator's
+    data_manager, the MarketAnalyzer session clock, the bar resampler's
+    cache and the trend matrix; everything is restored on exit.
+    """
+    from core.bar_resampler import bar_resampler
+    from core.market_analyzer import market_analyzer
+    from core.opportunity_generator import opportunity_generator
+
+    patches = []
+    for name in MT5_MODULES:
+        module = importlib.import_module(name)
+        patches.append((module, 'mt5', source))
+        patches.append((module, 'MT5_AVAILABLE', True))
+    patches.append((importlib.import_module('core.opportunity_generator'), 'data_manager', source))
+    patches.append((opportunity_generator, 'mt5_available', True))
+    patches.append((market_analyzer, 'clock', source.current_datetime))
+    # Resampler: fetch through the source, never reuse bars across replay steps
+    patches.append((importlib.import_module('core.bar_resampler'), 'mt5', source))
+    patches.append((bar_resampler, 'refresh_interval', 0))
+    patches.append((bar_resampler, '_series', {}))
+    patches.append((market_analyzer.trend_matrix, 'cells', {}))
+
+    saved = [(target, attr, getattr(target, attr)) for target, attr, _ in patches]
+    saved_atr_cache = market_analyzer.atr_cache
+    market_analyzer.atr_cache = {}
+    try:
+        for target, attr, value in patches:
+            setattr(target, attr, value)
+        yield source
+    finally:
+        for target, attr, value in saved:
+            setattr(target, attr, value)
+        market_analyzer.atr_cache = saved_atr_cache
+
+
+class ReplayRecorder:
+    """
+    Timestamped log of what the stack produced during a replay
+
+    Records are kept in memory, or streamed to a JSON-lines file when a
+    path is given (months of M5 data produce far too many to keep).
+    """
+
+    def __init__(self, path: Optional[Path] = None, kinds: Optional[Iterable[str]] = None):
+        self.path = Path(path) if path else None
+        self.kinds = set(kinds) if kinds else None
+        self.records: List[Dict] = []
+        self.counts: Dict[str, int] = {}
+        self._file = None
+
+    def open(self):
+        if self.path and self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'w')
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def record(self, kind: str, when: datetime, symbol: str, data: Dict):
+        if self.kinds is not None and kind not in self.kinds:
+            return
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        entry = {'time': when, 'kind': kind, 'symbol': symbol, 'data': data}
+        if self._file is not None:
+            self._file.write(json.dumps(entry, default=str) + '\n')
+        else:
+            self.records.append(entry)
+
+
+@dataclass
+class ReplayReport:
+    """Throughput and output summary of a replay run"""
+    symbols: List[str]
+    timeframe: str
+    bars: int = 0
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    elapsed_seconds: float = 0.0
+    component_seconds: Dict[str, float] = field(default_factory=dict)
+    record_counts: Dict[str, int] = field(default_factory=dict)
+    rejection_histogram: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def bars_per_second(self) -> float:
+        return self.bars / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"Replayed {self.bars} {self.timeframe} bars of {len(self.symbols)} symbols "
+            f"({self.start} -> {self.end})",
+            f"{self.elapsed_seconds:.2f}s, {self.bars_per_second:.1f} bars/sec",
+        ]
+        for component, seconds in self.component_seconds.items():
+            per_bar = seconds / self.bars * 1000 if self.bars else 0.0
+            lines.append(f"  {component:<14} {seconds:8.2f}s  {per_bar:7.3f} ms/bar")
+        for kind, count in self.record_counts.items():
+            lines.append(f"  {kind:<14} {count:8d} records")
+        return '\n'.join(lines)
+
+
+class ReplayEngine:
+    """
+    Replays recorded bars through the analysis stack
+
+    Usage:
+        source = ReplayDataSource.from_directory(BARS_DIR, ['EURUSD', 'GBPUSD'])
+        engine = ReplayEngine(source, timeframe='M5')
+        report = engine.run()
+        print(report.summary())
+    """
+
+    def __init__(self, source: ReplayDataSource, symbols: Optional[List[str]] = None,
+                 timeframe: str = 'M5', components: Iterable[str] = REPLAY_COMPONENTS,
+                 recorder: Optional[ReplayRecorder] = None,
+                 warmup_bars: int = DEFAULT_WARMUP_BARS, speed: Optional[float] = None):
+        """
+        Args:
+            source: Bar history to replay
+            symbols: Symbols to replay (default: all with `timeframe` bars)
+            timeframe: Replay (stepping) timeframe
+            components: Subset of REPLAY_COMPONENTS to run on every bar
+            recorder: Where records go (default: in-memory recorder)
+            warmup_bars: Closed bars required before a symbol is analyzed
+            speed: Target bars/second, or None for max speed
+        """
+        unknown = set(components) - set(REPLAY_COMPONENTS)
+        if unknown:
+            raise ValueError(f"Unknown replay components: {', '.join(sorted(unknown))}")
+        if timeframe not in TIMEFRAME_SECONDS:
+            raise ValueError(f"Unknown timeframe: {timeframe}")
+
+        self.source = source
+        self.timeframe = timeframe
+        self.symbols = [s for s in (symbols or source.symbols) if timeframe in source.timeframes(s)]
+        self.components = tuple(components)
+        self.recorder = recorder or ReplayRecorder()
+        self.warmup_bars = warmup_bars
+        self.speed = speed
+
+        source.candle_timeframe = timeframe
+        self.report = ReplayReport(symbols=self.symbols, timeframe=timeframe)
+
+        self._seen_zones: Dict[str, set] = {}
+        self._wyckoff_state: Dict[str, tuple] = {}
+        self._wyckoff = None
+
+    def timeline(self, start: Optional[datetime] = None,
+                 end: Optional[datetime] = None) -> List[tuple]:
+        """
+        (bar open time, [symbols with a bar at that time]) in time order
+
+        Bars before each symbol's warmup are skipped.
+        """
+        times, owners = [], []
+        for index, symbol in enumerate(self.symbols):
+            bar_times = self.source.bars[symbol][self.timeframe]['time'][self.warmup_bars - 1:]
+            times.append(bar_times)
+            owners.append(np.full(len(bar_times), index))
+        if not times:
+            return []
+
+        times = np.concatenate(times)
+        owners = np.concatenate(owners)
+        keep = np.ones(len(times), dtype=bool)
+        if start is not None:
+            keep &= times >= np.datetime64(start, 's').astype(np.int64)
+        if end is not None:
+            keep &= times <= np.datetime64(end, 's').astype(np.int64)
+        times, owners = times[keep], owners[keep]
+
+        order = np.argsort(times, kind='stable')
+        times, owners = times[order], owners[order]
+        unique_times, first = np.unique(times, return_index=True)
+        groups = np.split(owners, first[1:])
+        return [(int(t), [self.symbols[i] for i in group]) for t, group in zip(unique_times, groups)]
+
+    def run(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+            max_bars: Optional[int] = None,
+            on_bar: Optional[Callable[[str, datetime], None]] = None) -> ReplayReport:
+        """
+        Replay every bar whose open time is between start and end (bar time)
+
+        Args:
+            max_bars: Stop after this many (symbol, bar) steps
+            on_bar: Called after every processed bar with (symbol, replay time)
+
+        Returns:
+            ReplayReport (also kept as self.report)
+        """
+        timeline = self.timeline(start, end)
+        bar_seconds = TIMEFRAME_SECONDS[self.timeframe]
+        report = self.report
+
+        self.recorder.open()
+        started = time.perf_counter()
+        try:
+            with replay_data_source(self.source):
+                for bar_time, symbols in timeline:
+                    # Clock sits at the close of the replayed bar
+                    self.source.set_time(bar_time + bar_seconds)
+                    when = self.source.current_datetime()
+                    if report.start is None:
+                        report.start = when
+
+                    for symbol in symbols:
+                        self.process_bar(symbol, when)
+                        report.bars += 1
+                        report.end = when
+                        if on_bar:
+                            on_bar(symbol, when)
+                        if self.speed:
+                            delay = report.bars / self.speed - (time.perf_counter() - started)
+                            if delay > 0:
+                                time.sleep(delay)
+                        if max_bars and report.bars >= max_bars:
+                            break
+                    if max_bars and report.bars >= max_bars:
+                        break
+        finally:
+            self.recorder.close()
+            report.elapsed_seconds += time.perf_counter() - started
+            report.record_counts = dict(self.recorder.counts)
+
+        return report
+
+    def process_bar(self, symbol: str, when: datetime):
+        """Run every enabled component for symbol at the current replay clock"""
+        self.source.active_symbol = symbol
+        for component in self.components:
+            started = time.perf_counter()
+            getattr(self, f'_run_{component}')(symbol, when)
+            self.report.component_seconds[component] = (
+                self.report.component_seconds.get(component, 0.0) + time.perf_counter() - started)
+
+    def _run_opportunities(self, symbol: str, when: datetime):
+        from core.filter_manager import filter_manager
+        from core.market_analyzer import market_analyzer
+        from core.opportunity_generator import opportunity_generator
+
+        # ATR cache validity is wall-clock based; stale across replayed bars
+        market_analyzer.atr_cache.clear()
+
+        opportunities = opportunity_generator.scan_symbol_timeframe(symbol, self.timeframe)
+        if not opportunities:
+            return
+
+        survivors, histogram = filter_manager.filter_opportunities(opportunities)
+        accepted = {id(opp) for opp in survivors}
+        for name, count in histogram.items():
+            self.report.rejection_histogram[name] = self.report.rejection_histogram.get(name, 0) + count
+
+        for opp in opportunities:
+            self.recorder.record('opportunity', when, symbol, opp)
+            self.recorder.record('decision', when, symbol, {
+                'pattern_type': opp.get('pattern_type'),
+                'direction': opp.get('direction'),
+                'quality_score': opp.get('quality_score'),
+                'accepted': id(opp) in accepted,
+            })
+
+    def _run_zones(self, symbol: str, when: datetime):
+        from analysis.fair_value_gap_detector import fair_value_gap_detector
+        from analysis.liquidity_sweep_detector import liquidity_sweep_detector
+        from analysis.market_structure_detector import market_structure_detector
+        from analysis.order_block_detector import order_block_detector
+
+        candles = self.source.get_candles(ZONE_CANDLES)
+        if len(candles) < 10:
+            return
+
+        seen = self._seen_zones.setdefault(symbol, set())
+        detections = (
+            ('order_block', order_block_detector.detect_order_blocks(candles, symbol)),
+            ('fvg', fair_value_gap_detector.detect_fair_value_gaps(candles, symbol)),
+            ('liquidity_sweep', liquidity_sweep_detector.detect_liquidity_sweeps(candles, symbol)),
+            ('structure', market_structure_detector.detect_structure_shifts(candles, symbol)[0]),
+        )
+        # Detectors re-report zones on every bar; only record new ones
+        for zone_type, zones in detections:
+            for zone in zones or []:
+                key = (zone_type, zone.get('type'), str(zone.get('timestamp')))
+                if key in seen:
+                    continue
+                seen.add(key)
+                self.recorder.record('zone', when, symbol, dict(zone, zone_type=zone_type))
+
+    def _run_wyckoff(self, symbol: str, when: datetime):
+        if self._wyckoff is None:
+            from analysis.wyckoff_analyzer import WyckoffAnalyzer
+            self._wyckoff = WyckoffAnalyzer()
+
+        result = self._wyckoff.analyze_symbol(symbol, self.timeframe, bars=self._wyckoff.lookback_bars)
+        if not result:
+            return
+
+        signals = result['signals']
+        state = (result['current_phase'].value, signals['action'])
+        # Record phase/signal changes only
+        if self._wyckoff_state.get(symbol) == state:
+            return
+        self._wyckoff_state[symbol] = state
+        self.recorder.record('wyckoff', when, symbol, dict(signals, phase=state[0]))
@@ -6,6 +6,8 @@ Symbol position limits, risk calculations, and exposure tracking
 from typing import Dict, Tuple, List
 from datetime import datetime
 
+from core.lazy_loader import LazySingleton
+
 
 class SymbolExposure:
     """Tracks exposure for a single symbol"""
@@ -375,5 +377,5 @@ class RiskManager:
         return "\n".join(lines) if lines else "No open positions"
 
 
-# Global instance
-risk_manager = RiskManager()
+# Global instance (constructed on first use)
+risk_manager = LazySingleton(RiskManager, 'risk_manager')
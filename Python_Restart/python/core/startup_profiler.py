@@ -0,0 +1,106 @@
+"""
+AppleTrader Pro - Startup Profiler
+Records how long each dashboard component takes to import, construct and paint
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class StartupProfiler:
+    """
+    Collects startup timings per component
+
+    Phases recorded for each component:
+    - import:      module import time (seconds)
+    - construct:   object/widget construction time (seconds)
+    - first_paint: time from application start until the component first painted
+    """
+
+    PHASES = ('import', 'construct', 'first_paint')
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.components: Dict[str, Dict[str, float]] = {}
+        self.order: List[str] = []
+
+    def _entry(self, component: str) -> Dict[str, float]:
+        if component not in self.components:
+            self.components[component] = {}
+            self.order.append(component)
+        return self.components[component]
+
+    def elapsed(self) -> float:
+        """Seconds since the profiler was created (application start)"""
+        return time.perf_counter() - self.t0
+
+    def record(self, component: str, phase: str, seconds: float):
+        """Record a duration for component/phase (accumulates repeats)"""
+        entry = self._entry(component)
+        entry[phase] = entry.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, component: str, phase: str):
+        """
+        Context manager that records the duration of the enclosed block
+
+        Usage:
+            with startup_profiler.measure('ChartPanel', 'construct'):
+                self.chart_panel = ChartPanel()
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(component, phase, time.perf_counter() - start)
+
+    def mark_first_paint(self, component: str):
+        """Record time-to-first-paint for a component (only the first call counts)"""
+        entry = self._entry(component)
+        if 'first_paint' not in entry:
+            entry['first_paint'] = self.elapsed()
+
+    def has_first_paint(self, component: str) -> bool:
+        """Check if the component has already painted"""
+        return 'first_paint' in self.components.get(component, {})
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Get timings as {component: {phase: milliseconds}}"""
+        return {
+            name: {phase: round(value * 1000.0, 2) for phase, value in self.components[name].items()}
+            for name in self.order
+        }
+
+    def format_report(self) -> str:
+        """Format the startup timing report as a text table"""
+        lines = [
+            "=" * 72,
+            "STARTUP TIMING REPORT (ms)",
+            "=" * 72,
+            f"{'Component':<32}{'Import':>12}{'Construct':>13}{'First Paint':>15}",
+            "-" * 72,
+        ]
+
+        def fmt(value: Optional[float]) -> str:
+            return f"{value * 1000.0:.1f}" if value is not None else "-"
+
+        for name in self.order:
+            entry = self.components[name]
+            lines.append(
+                f"{name:<32}{fmt(entry.get('import')):>12}"
+                f"{fmt(entry.get('construct')):>13}{fmt(entry.get('first_paint')):>15}"
+            )
+
+        lines.append("-" * 72)
+        lines.append(f"Total elapsed since start: {self.elapsed() * 1000.0:.1f} ms")
+        lines.append("=" * 72)
+        return "\n".join(lines)
+
+    def print_report(self):
+        """Print the startup timing report to the console"""
+        print(self.format_report())
+
+
+# Global startup profiler instance (created at first import = application start)
+startup_profiler = StartupProfiler()
@@ -3,12 +3,11 @@ AppleTrader Pro - Symbol Manager
 Manages multi-asset symbol specifications (Forex, Stocks, Indices, Commodities, Crypto)
 """
 
-try:
-    import MetaTrader5 as mt5
-    MT5_AVAILABLE = True
-except ImportError:
-    MT5_AVAILABLE = False
-    mt5 = None
+from core.lazy_loader import lazy_import
+
+# MetaTrader5 is imported on first use to keep startup fast
+mt5 = lazy_import('MetaTrader5')
+MT5_AVAILABLE = mt5 is not None
 
 import json
 from pathlib import Path
@@ -377,6 +376,11 @@ class SymbolManager:
             if specs.asset_class == asset_class
         ]
 
+    def get_asset_class(self, symbol: str) -> str:
+        """Asset class from the symbol's specs, or detected from its name if unknown"""
+        specs = self.get_symbol_specs(symbol)
+        return specs.asset_class if specs else self._detect_asset_class(symbol)
+
     def calculate_pip_value(self, symbol: str, distance: float) -> float:
         """
         Calculate pip/point value in account currency
@@ -410,6 +414,22 @@ class SymbolManager:
 
         return distance
 
+    def get_pip_size(self, symbol: str) -> float:
+        """
+        Get the price distance of one pip (forex) or point (other assets)
+
+        Forex quoted with 3/5 digits uses 10 points per pip (0.0001 for
+        EURUSD, 0.01 for USDJPY). Unknown symbols fall back to the JPY rule.
+        """
+        specs = self.get_symbol_specs(symbol)
+        if not specs:
+            return 0.01 if 'JPY' in symbol else 0.0001
+
+        if specs.asset_class == 'forex' and specs.digits in (3, 5):
+            return specs.point * 10
+
+        return specs.point
+
     def get_display_unit(self, symbol: str) -> str:
         """
         Get appropriate display unit for symbol
@@ -0,0 +1,326 @@
+"""
+AppleTrader Pro - Trend Matrix
+Symbols x timeframes trend scores, computed in one vectorized pass
+
+MarketAnalyzer.get_trend used to fetch 100 bars and run its structure /
+ADX / volume / momentum loops for one symbol and timeframe per call, plus
+another fetch for the higher-timeframe bias. The matrix keeps one cell per
+(symbol, timeframe), reads bars from the bar resampler's cached series and
+recomputes only the cells whose bar has closed since they were computed -
+all of them stacked into one (cells x bars) array pass.
+
+Cells are computed on closed bars only, so a cell's score is stable until
+its next bar closes. Scores follow MarketAnalyzer's composite:
+structure 40%, ADX 20%, volume 15%, momentum 15%, higher-timeframe bias 10%;
+> 0.3 is bullish, < -0.3 bearish.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.bar_resampler import bar_resampler, bucket_starts
+from core.instrumentation import instrumentation
+
+
+TREND_TIMEFRAMES = ('M5', 'M15', 'M30', 'H1', 'H4')
+# Timeframe whose trend biases each timeframe's score
+HIGHER_TIMEFRAME = {'M5': 'H1', 'M15': 'H4', 'M30': 'H4', 'H1': 'H4', 'H4': 'D1', 'D1': 'W1'}
+
+LOOKBACK = 100
+HTF_BARS = 50
+ADX_PERIOD = 14
+
+WEIGHTS = {'structure': 0.40, 'adx': 0.20, 'volume': 0.15, 'momentum': 0.15, 'mtf': 0.10}
+TREND_THRESHOLD = 0.3
+
+
+# ==================== VECTORIZED FACTORS ====================
+# Every function takes (cells, bars) arrays, oldest bar first, and returns one score per cell
+
+
+def _strictly_monotonic(values: np.ndarray, mask: np.ndarray, increasing: bool) -> np.ndarray:
+    """Per row: the masked values, in order, strictly increase (or decrease)"""
+    positions = np.where(mask, np.arange(mask.shape[1]), -1)
+    last = np.maximum.accumulate(positions, axis=1)
+    previous = np.concatenate((np.full((len(mask), 1), -1), last[:, :-1]), axis=1)
+    prev_values = np.take_along_axis(values, np.maximum(previous, 0), axis=1)
+    step_ok = values > prev_values if increasing else values < prev_values
+    return np.all(step_ok | ~(mask & (previous >= 0)), axis=1)
+
+
+def structure_scores(highs: np.ndarray, lows: np.ndarray) -> np.ndarray:
+    """
+    Swing structure of the last bars: +1 higher highs and higher lows,
+    -1 lower highs and lower lows, +/-0.5 when only one side agrees
+
+    A swing high/low is a bar beyond its two neighbours on each side,
+    looked for among bars -10 .. -3.
+    """
+    n = highs.shape[1]
+    idx = np.arange(max(2, n - 10), n - 2)
+    if len(idx) == 0:
+        return np.zeros(len(highs))
+
+    def swings(values: np.ndarray, sign: int) -> np.ndarray:
+        centre = values[:, idx] * sign
+        return ((centre > values[:, idx - 1] * sign) & (centre > values[:, idx - 2] * sign) &
+                (centre > values[:, idx + 1] * sign) & (centre > values[:, idx + 2] * sign))
+
+    high_mask, low_mask = swings(highs, 1), swings(lows, -1)
+    swing_highs, swing_lows = highs[:, idx], lows[:, idx]
+
+    higher_highs = _strictly_monotonic(swing_highs, high_mask, True)
+    higher_lows = _strictly_monotonic(swing_lows, low_mask, True)
+    lower_highs = _strictly_monotonic(swing_highs, high_mask, False)
+    lower_lows = _strictly_monotonic(swing_lows, low_mask, False)
+
+    enough = (high_mask.sum(axis=1) >= 2) & (low_mask.sum(axis=1) >= 2)
+    scores = np.select(
+        [higher_highs & higher_lows, lower_highs & lower_lows,
+         higher_highs | higher_lows, lower_highs | lower_lows],
+        [1.0, -1.0, 0.5, -0.5], 0.0)
+    return np.where(enough, scores, 0.0)
+
+
+def adx_scores(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, period: int = ADX_PERIOD) -> np.ndarray:
+    """
+    Directional strength over the last `period` bars: +/-min(DX/50, 1)
+    when DX > 25 (trending), 0 otherwise
+    """
+    if highs.shape[1] < period + 1:
+        return np.zeros(len(highs))
+    h, l, c = highs[:, -period - 1:], lows[:, -period - 1:], closes[:, -period - 1:]
+
+    tr = np.maximum.reduce([h[:, 1:] - l[:, 1:], np.abs(h[:, 1:] - c[:, :-1]), np.abs(l[:, 1:] - c[:, :-1])])
+    up = h[:, 1:] - h[:, :-1]
+    down = l[:, :-1] - l[:, 1:]
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+
+    tr_mean = tr.mean(axis=1)
+    safe_tr = np.where(tr_mean > 0, tr_mean, 1.0)
+    plus_di = np.where(tr_mean > 0, plus_dm.mean(axis=1) / safe_tr * 100, 0.0)
+    minus_di = np.where(tr_mean > 0, minus_dm.mean(axis=1) / safe_tr * 100, 0.0)
+
+    di_sum = plus_di + minus_di
+    dx = np.where(di_sum > 0, np.abs(plus_di - minus_di) / np.where(di_sum > 0, di_sum, 1.0) * 100, 0.0)
+    strength = np.minimum(dx / 50, 1.0)
+    return np.where(dx > 25, np.where(plus_di > minus_di, strength, -strength), 0.0)
+
+
+def volume_scores(closes: np.ndarray, volumes: np.ndarray, bars: int = 20) -> np.ndarray:
+    """(up-bar volume - down-bar volume) / total over the last `bars` bars"""
+    if closes.shape[1] < bars:
+        return np.zeros(len(closes))
+    c, v = closes[:, -bars:], volumes[:, -bars:].astype(float)
+    up = np.where(c[:, 1:] > c[:, :-1], v[:, 1:], 0.0).sum(axis=1)
+    down = np.where(c[:, 1:] < c[:, :-1], v[:, 1:], 0.0).sum(axis=1)
+    total = up + down
+    return np.where(total > 0, np.clip((up - down) / np.where(total > 0, total, 1.0), -1.0, 1.0), 0.0)
+
+
+def momentum_scores(closes: np.ndarray) -> np.ndarray:
+    """Mean of the 10- and 20-bar rate of change, 5% = full score"""
+    if closes.shape[1] < 20:
+        return np.zeros(len(closes))
+    last = closes[:, -1]
+
+    def roc(back: np.ndarray) -> np.ndarray:
+        return np.where(back != 0, (last - back) / np.where(back != 0, back, 1.0), 0.0)
+
+    return np.clip((roc(closes[:, -10]) + roc(closes[:, -20])) / 2 / 0.05, -1.0, 1.0)
+
+
+def htf_bias_scores(closes: np.ndarray) -> np.ndarray:
+    """+1 price > SMA20 > SMA50, -1 price < SMA20 < SMA50, else 0"""
+    if closes.shape[1] < HTF_BARS:
+        return np.zeros(len(closes))
+    price = closes[:, -1]
+    sma_20 = closes[:, -20:].mean(axis=1)
+    sma_50 = closes[:, -50:].mean(axis=1)
+    return np.select([(price > sma_20) & (sma_20 > sma_50), (price < sma_20) & (sma_20 < sma_50)],
+                     [1.0, -1.0], 0.0)
+
+
+def trend_scores(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, volumes: np.ndarray,
+                 mtf_bias: Optional[np.ndarray] = None) -> np.ndarray:
+    """Weighted composite of all factors, one score per row"""
+    score = (structure_scores(highs, lows) * WEIGHTS['structure'] +
+             adx_scores(highs, lows, closes) * WEIGHTS['adx'] +
+             volume_scores(closes, volumes) * WEIGHTS['volume'] +
+             momentum_scores(closes) * WEIGHTS['momentum'])
+    if mtf_bias is not None:
+        score = score + mtf_bias * WEIGHTS['mtf']
+    return score
+
+
+def classify(score: float) -> str:
+    if score > TREND_THRESHOLD:
+        return 'bullish'
+    if score < -TREND_THRESHOLD:
+        return 'bearish'
+    return 'neutral'
+
+
+# ==================== MATRIX ====================
+
+
+@dataclass
+class TrendCell:
+    """Trend of one symbol on one timeframe"""
+    score: float
+    trend: str
+    # Fewer than LOOKBACK closed bars: scored neutral
+    available: bool
+    # Start of the first unclosed bar when the cell was computed
+    forming: int
+    computed_at: float
+
+
+class TrendMatrix:
+    """
+    (symbol, timeframe) -> TrendCell, recomputed only when a bar closes
+
+    Usage:
+        trend_matrix.refresh(symbols, ('H1', 'H4'))      # one batch pass
+        trend_matrix.get_trend('EURUSD', 'H4')           # 'bullish' / 'bearish' / 'neutral'
+        trend_matrix.alignment('EURUSD', 'BUY')          # H1/H4 alignment
+        trend_matrix.scores(symbols)                     # DataFrame, symbols x timeframes
+    """
+
+    def __init__(self, resampler=bar_resampler, lookback: int = LOOKBACK):
+        self.resampler = resampler
+        self.lookback = lookback
+        self.cells: Dict[Tuple[str, str], TrendCell] = {}
+        self._lock = threading.RLock()
+
+    def reset(self):
+        with self._lock:
+            self.cells.clear()
+
+    def _base_end(self, symbol: str) -> Optional[int]:
+        """Close time of the newest base bar (None without data for symbol)"""
+        series = self.resampler.refresh(symbol)
+        if series is None or len(series.base) == 0:
+            return None
+        return int(series.base['time'][-1]) + self.resampler.base_seconds
+
+    def _closed_rates(self, symbol: str, timeframe: str, count: int) -> Optional[np.ndarray]:
+        rates = self.resampler.copy_rates(symbol, timeframe, count, include_partial=False)
+        return rates if rates is not None and len(rates) >= count else None
+
+    def refresh(self, symbols: Iterable[str], timeframes: Iterable[str] = TREND_TIMEFRAMES) -> int:
+        """Recompute the cells whose bar closed; returns how many were recomputed"""
+        timeframes = list(timeframes)
+        with self._lock:
+            dirty: List[Tuple[str, str, int]] = []
+            for symbol in symbols:
+                base_end = self._base_end(symbol)
+                if base_end is None:
+                    continue
+                for timeframe in timeframes:
+                    # Same closed/forming split as copy_rates(include_partial=False)
+                    forming = int(bucket_starts(np.array([base_end]), timeframe, self.resampler.day_offset)[0])
+                    cell = self.cells.get((symbol, timeframe))
+                    if cell is None or cell.forming != forming:
+                        dirty.append((symbol, timeframe, forming))
+
+            if dirty:
+                with instrumentation.span('trend_matrix.compute'):
+                    self._compute(dirty)
+            instrumentation.count('trend_matrix.recomputed', len(dirty))
+            return len(dirty)
+
+    def _compute(self, dirty: List[Tuple[str, str, int]]):
+        now = time.time()
+        rows, keys = [], []
+        for symbol, timeframe, forming in dirty:
+            rates = self._closed_rates(symbol, timeframe, self.lookback)
+            if rates is None:
+                # Not enough history: neutral, like the single-call fallback
+                self.cells[(symbol, timeframe)] = TrendCell(0.0, 'neutral', False, forming, now)
+                continue
+            higher = HIGHER_TIMEFRAME.get(timeframe)
+            htf = self._closed_rates(symbol, higher, HTF_BARS) if higher else None
+            rows.append((rates, htf))
+            keys.append((symbol, timeframe, forming))
+
+        if not rows:
+            return
+
+        highs = np.stack([rates['high'] for rates, _ in rows])
+        lows = np.stack([rates['low'] for rates, _ in rows])
+        closes = np.stack([rates['close'] for rates, _ in rows])
+        volumes = np.stack([rates['tick_volume'] for rates, _ in rows])
+
+        # Higher-timeframe bias; rows without HTF history contribute 0
+        htf_closes = np.stack([htf['close'] if htf is not None else np.zeros(HTF_BARS) for _, htf in rows])
+        has_htf = np.array([htf is not None for _, htf in rows])
+        bias = np.where(has_htf, htf_bias_scores(htf_closes), 0.0)
+
+        scores = trend_scores(highs, lows, closes, volumes, bias)
+        for (symbol, timeframe, forming), score in zip(keys, scores):
+            self.cells[(symbol, timeframe)] = TrendCell(float(score), classify(score), True, forming, now)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def cell(self, symbol: str, timeframe: str) -> Optional[TrendCell]:
+        """Up-to-date cell (None when there are no bars for symbol)"""
+        self.refresh([symbol], [timeframe])
+        return self.cells.get((symbol, timeframe))
+
+    def get_trend(self, symbol: str, timeframe: str) -> str:
+        cell = self.cell(symbol, timeframe)
+        return cell.trend if cell is not None else 'neutral'
+
+    def cached_trend(self, symbol: str, timeframe: str, default: str = 'neutral') -> str:
+        """Trend as last computed, without fetching bars"""
+        cell = self.cells.get((symbol, timeframe))
+        return cell.trend if cell is not None else default
+
+    def scores(self, symbols: Iterable[str], timeframes: Iterable[str] = TREND_TIMEFRAMES) -> pd.DataFrame:
+        """Score matrix (rows symbols, columns timeframes; NaN without data)"""
+        symbols, timeframes = list(symbols), list(timeframes)
+        self.refresh(symbols, timeframes)
+        with self._lock:
+            return pd.DataFrame(
+                [[self.cells[(s, tf)].score if (s, tf) in self.cells else np.nan for tf in timeframes]
+                 for s in symbols],
+                index=symbols, columns=timeframes)
+
+    def alignment(self, symbol: str, direction: str, timeframes: Tuple[str, str] = ('H1', 'H4')) -> Optional[Dict]:
+        """
+        Whether `direction` agrees with the trends of `timeframes`
+
+        Returns None without bars for symbol, otherwise:
+        {'aligned', 'trends': {tf: trend}, 'alignment_score' (0-10), 'rejection_reason'}
+        """
+        self.refresh([symbol], timeframes)
+        cells = [self.cells.get((symbol, tf)) for tf in timeframes]
+        if any(cell is None for cell in cells):
+            return None
+
+        wanted = 'bullish' if direction == 'BUY' else 'bearish'
+        trends = {tf: cell.trend for tf, cell in zip(timeframes, cells)}
+        agrees = {tf: trend in (wanted, 'neutral') for tf, trend in trends.items()}
+
+        # 5 points per agreeing timeframe, 10 when all trend the trade's way
+        score = 5 * sum(agrees.values()) * 2 // len(timeframes)
+        if all(trend == wanted for trend in trends.values()):
+            score = 10
+
+        rejection_reason = None
+        for tf, ok in agrees.items():
+            if not ok:
+                rejection_reason = f"{tf} trend is {trends[tf]}, conflicts with {direction} trade"
+                break
+
+        return {'aligned': all(agrees.values()), 'trends': trends,
+                'alignment_score': score, 'rejection_reason': rejection_reason}
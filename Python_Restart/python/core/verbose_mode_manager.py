@@ -1,9 +1,20 @@
 """
 Verbose Mode Manager
 Controls console output verbosity globally
+
+vprint() output goes through the 'verbose' log category (core/log_manager.py):
+one level check when verbose mode is off, and a queued, rate-limited record
+when it is on - the console is written from the log thread.
 """
 
-from PyQt6.QtCore import QObject, pyqtSignal
+import logging
+
+from core.dev_config import is_verbose_default
+from core.log_manager import get_logger, log_manager
+from core.qt_compat import QObject, pyqtSignal
+
+
+_verbose_logger = get_logger('verbose')
 
 
 class VerboseModeManager(QObject):
@@ -16,7 +27,11 @@ class VerboseModeManager(QObject):
 
     def __init__(self):
         super().__init__()
-        self._verbose = True  # Start with verbose mode ON by default
+        self._verbose = is_verbose_default()  # Quiet unless TRADING_APP_VERBOSE=1
+        self._apply_level()
+
+    def _apply_level(self):
+        log_manager.set_level('verbose', logging.DEBUG if self._verbose else logging.WARNING)
 
     @property
     def verbose(self):
@@ -28,9 +43,10 @@ class VerboseModeManager(QObject):
         """Set verbose state and emit signal"""
         if self._verbose != value:
             self._verbose = value
+            self._apply_level()
             self.mode_changed.emit(value)
             status = "ENABLED" if value else "DISABLED"
-            print(f"[Verbose Mode] Console output {status}")
+            get_logger('settings').info(f"[Verbose Mode] Console output {status}")
 
 
 # Global singleton instance
@@ -42,16 +58,16 @@ def is_verbose():
     return verbose_mode_manager.verbose
 
 
-def vprint(*args, **kwargs):
+def vprint(*args, sep=' ', **kwargs):
     """
-    Verbose print - only prints if verbose mode is enabled
+    Verbose print - only logs if verbose mode is enabled
 
     Usage:
         from core.verbose_mode_manager import vprint
         vprint("[DEBUG] This will only show if verbose mode is ON")
     """
-    if verbose_mode_manager.verbose:
-        print(*args, **kwargs)
+    if _verbose_logger.isEnabledFor(logging.DEBUG):
+        _verbose_logger.debug(sep.join(str(arg) for arg in args))
 
 
 def set_verbose(enabled: bool):
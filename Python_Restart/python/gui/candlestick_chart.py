@@ -0,0 +1,570 @@
+"""
+AppleTrader Pro - Candlestick Chart
+QPainter candlestick engine for deep history (100k+ bars)
+
+Bars are kept in columnar arrays (CandleColumns). When the visible window
+holds more bars than there are pixel columns, every pixel column is drawn
+as one min/max bar - open of its first bar, highest high, lowest low, close
+of its last bar - read from a pyramid of pre-aggregated levels, so a frame
+costs O(width) at any zoom. Only the visible window is drawn.
+
+Layers: the candles, grid, axes and zones are rendered into a QPixmap that
+is reused until the view, the bars or the zones change; zones are recorded
+once into a QPicture in price coordinates and replayed through the view
+transform. The crosshair is the only thing painted on every frame.
+
+Mouse: drag to pan, wheel to zoom around the cursor, double-click to go back
+to the latest bar. Keys: Left/Right pan, +/- zoom, Home/End.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QLineF, QPointF, QRectF, pyqtSignal
+from PyQt6.QtGui import (QPainter, QColor, QPen, QBrush, QFont, QPicture, QPixmap,
+                         QTransform)
+
+from gui.chart_overlay_system import Zone
+from core.instrumentation import instrumentation
+
+
+BACKGROUND = QColor('#0A0E27')
+# Opaque (blending full-length grid lines is most of a frame's fill cost)
+GRID = QColor('#1B1F37')
+AXIS_TEXT = QColor('#94A3B8')
+BULL = QColor('#10B981')
+BEAR = QColor('#EF4444')
+CROSSHAIR = QColor(255, 255, 255, 90)
+
+PRICE_AXIS_WIDTH = 72
+TIME_AXIS_HEIGHT = 22
+
+DEFAULT_VISIBLE_BARS = 150
+MIN_VISIBLE_BARS = 10
+# Empty bars kept right of the latest bar
+RIGHT_MARGIN_BARS = 3
+# Below this many pixels per bar, bars are drawn as min/max columns
+MIN_CANDLE_PIXELS = 3.0
+ZOOM_STEP = 1.2
+KEY_PAN_FRACTION = 0.1
+
+
+@dataclass
+class CandleColumns:
+    """OHLC bars as one array per field (time in epoch seconds), oldest first"""
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    @classmethod
+    def from_rates(cls, rates) -> 'CandleColumns':
+        """From an MT5 rates array or a DataFrame with time/open/high/low/close"""
+        if isinstance(rates, pd.DataFrame):
+            times = rates['time']
+            if pd.api.types.is_datetime64_any_dtype(times):
+                times = times.astype('datetime64[s]').astype('int64')
+            times = np.asarray(times, dtype=np.int64)
+        else:
+            times = np.asarray(rates['time'], dtype=np.int64)
+        return cls(times, *(np.asarray(rates[field], dtype=float)
+                            for field in ('open', 'high', 'low', 'close')))
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+
+def _pair_up(open_, high, low, close) -> Tuple[np.ndarray, ...]:
+    """Aggregate consecutive pairs of bars (an odd last bar stands alone)"""
+    n = len(open_)
+    odd = n % 2
+    even = n - odd
+    o, h = open_[0:even:2], np.maximum(high[0:even:2], high[1:even:2])
+    l, c = np.minimum(low[0:even:2], low[1:even:2]), close[1:even:2]
+    if odd:
+        o, h = np.append(o, open_[-1]), np.append(h, high[-1])
+        l, c = np.append(l, low[-1]), np.append(c, close[-1])
+    return o, h, l, c
+
+
+class LodPyramid:
+    """
+    Level k holds the bars aggregated in aligned groups of 2**k
+
+    columns(start, stop, buckets) reads the level just below the wanted
+    bars-per-bucket, so it touches about 2 * buckets values at any zoom.
+    """
+
+    def __init__(self, bars: CandleColumns):
+        self.levels: List[Tuple[np.ndarray, ...]] = []
+        self.rebuild(bars)
+
+    def rebuild(self, bars: CandleColumns, from_index: int = 0):
+        """Recompute every level from bar `from_index` on"""
+        base = (bars.open, bars.high, bars.low, bars.close)
+        if from_index <= 0 or not self.levels:
+            self.levels = [base]
+            while len(self.levels[-1][0]) > 1:
+                self.levels.append(_pair_up(*self.levels[-1]))
+            return
+
+        self.levels[0] = base
+        k = 1
+        while len(self.levels[k - 1][0]) > 1:
+            # First group touched at this level; its first member one level down
+            group = from_index >> k
+            tail = _pair_up(*(column[2 * group:] for column in self.levels[k - 1]))
+            if k < len(self.levels):
+                self.levels[k] = tuple(np.concatenate((column[:group], part))
+                                       for column, part in zip(self.levels[k], tail))
+            else:
+                self.levels.append(tail)
+            k += 1
+        del self.levels[k:]
+
+    def columns(self, start: float, stop: float, buckets: int) -> Tuple[np.ndarray, ...]:
+        """
+        OHLC of `buckets` equal slices of bars [start, stop)
+
+        Returns (first bar index, open, high, low, close) per non-empty slice.
+        """
+        n = len(self.levels[0][0])
+        per_bucket = (stop - start) / buckets
+        k = max(0, min(len(self.levels) - 1, int(math.log2(max(per_bucket, 1.0)))))
+        size = 1 << k
+        o, h, l, c = self.levels[k]
+        end = min(len(o), int(math.ceil(min(stop, n) / size)))
+
+        edges = start + np.arange(buckets) * per_bucket
+        groups = np.unique(np.floor(np.clip(edges, 0, n) / size).astype(np.int64))
+        groups = groups[groups < end]
+        if len(groups) == 0:
+            return (np.empty(0, np.int64),) + tuple(np.empty(0) for _ in range(4))
+
+        last = np.append(groups[1:] - 1, end - 1)
+        return (groups * size, o[groups], np.maximum.reduceat(h[:end], groups),
+                np.minimum.reduceat(l[:end], groups), c[last])
+
+
+def _vertical_lines(x: np.ndarray, top: np.ndarray, bottom: np.ndarray) -> List[QLineF]:
+    # Plain floats first: building QLineF from numpy scalars is several times slower
+    return [QLineF(*line) for line in np.column_stack((x, top, x, bottom)).tolist()]
+
+
+def _nice_step(span: float, target: int) -> float:
+    """1/2/5 x 10^n step giving about `target` ticks over `span`"""
+    if span <= 0:
+        return 1.0
+    raw = span / max(target, 1)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if raw <= factor * magnitude:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+class CandlestickChart(QWidget):
+    """
+    Pan/zoom candlestick chart over columnar bars
+
+    Usage:
+        chart = CandlestickChart()
+        chart.set_bars(rates)                 # MT5 rates array or DataFrame
+        chart.update_bars(latest_rates)       # live: replace/append the tail
+        chart.add_zone("Bullish OB", "#00ff00", top, bottom, "Order Block")
+    """
+
+    view_changed = pyqtSignal(int, int)  # First visible bar, visible bar count
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.bars = CandleColumns(*(np.empty(0, dtype) for dtype in (np.int64,) + (float,) * 4))
+        self.pyramid: Optional[LodPyramid] = None
+        self.digits = 5
+
+        # View: bar index at the right edge of the plot and bars across it
+        self.right_edge = 0.0
+        self.visible_bars = float(DEFAULT_VISIBLE_BARS)
+        self.follow_latest = True
+
+        # Zones (same API as ChartOverlaySystem, so the smart money overlay can feed either)
+        self.zones: List[Zone] = []
+        self.show_zones = True
+
+        self._layer: Optional[QPixmap] = None
+        self._layer_key = None
+        self._price_range = (0.0, 1.0)
+        self._zone_picture: Optional[QPicture] = None
+        self._zones_version = 0
+        self._drag_origin: Optional[Tuple[float, float]] = None
+        self._cursor: Optional[QPointF] = None
+
+        self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.setMinimumSize(400, 250)
+
+    # ------------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------------
+
+    def set_bars(self, rates, digits: Optional[int] = None):
+        """Replace all bars; keeps the view on the latest bars"""
+        self.bars = CandleColumns.from_rates(rates)
+        self.pyramid = LodPyramid(self.bars) if len(self.bars) else None
+        if digits is not None:
+            self.digits = digits
+        self.visible_bars = float(min(max(len(self.bars), MIN_VISIBLE_BARS), DEFAULT_VISIBLE_BARS))
+        self.follow_latest = True
+        self._set_view(self._latest_edge())
+
+    def update_bars(self, rates):
+        """Merge the newest bars: same-time bars are replaced, later ones appended"""
+        latest = CandleColumns.from_rates(rates)
+        if len(latest) == 0:
+            return
+        if self.pyramid is None:
+            self.set_bars(rates)
+            return
+
+        keep = int(np.searchsorted(self.bars.time, latest.time[0]))
+        self.bars = CandleColumns(*(np.concatenate((getattr(self.bars, field)[:keep], getattr(latest, field)))
+                                    for field in ('time', 'open', 'high', 'low', 'close')))
+        self.pyramid.rebuild(self.bars, keep)
+        self._layer_key = None
+        self._set_view(self._latest_edge() if self.follow_latest else self.right_edge)
+
+    # ------------------------------------------------------------------
+    # Zones
+    # ------------------------------------------------------------------
+
+    def add_zone(self, name: str, color: str, top: float, bottom: float, zone_type: str = ""):
+        self.zones.append(Zone(name, color, top, bottom, zone_type))
+        self._zone_picture = None
+        self._zones_version += 1
+        self.update()
+
+    def clear_zones(self):
+        self.zones.clear()
+        self._zone_picture = None
+        self._zones_version += 1
+        self.update()
+
+    def toggle_zones(self, enabled: bool):
+        self.show_zones = enabled
+        self.update()
+
+    def _record_zones(self) -> QPicture:
+        """Zones in (0..1 across, price) coordinates, replayed through the view transform"""
+        picture = QPicture()
+        painter = QPainter(picture)
+        for zone in self.zones:
+            fill = QColor(zone.color)
+            fill.setAlpha(60)
+            border = QColor(zone.color)
+            border.setAlpha(200)
+            pen = QPen(border, 1.5)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.setBrush(QBrush(fill))
+            painter.drawRect(QRectF(0.0, min(zone.top, zone.bottom), 1.0, abs(zone.top - zone.bottom)))
+        painter.end()
+        return picture
+
+    # ------------------------------------------------------------------
+    # View
+    # ------------------------------------------------------------------
+
+    def _latest_edge(self) -> float:
+        return float(len(self.bars) + RIGHT_MARGIN_BARS)
+
+    def _clamp_visible(self, visible_bars: float) -> float:
+        return float(min(max(visible_bars, MIN_VISIBLE_BARS), max(self._latest_edge(), MIN_VISIBLE_BARS)))
+
+    def _set_view(self, right_edge: float, visible_bars: Optional[float] = None):
+        if visible_bars is not None:
+            self.visible_bars = self._clamp_visible(visible_bars)
+        # Keep at least a few bars on screen at either end
+        self.right_edge = float(min(max(right_edge, min(self.visible_bars, MIN_VISIBLE_BARS)), self._latest_edge()))
+        self.follow_latest = self.right_edge >= self._latest_edge() - 0.5
+        first, count = self.visible_range()
+        self.view_changed.emit(first, count)
+        self.update()
+
+    def visible_range(self) -> Tuple[int, int]:
+        """(first visible bar index, number of visible bars)"""
+        first = max(0, int(math.floor(self.right_edge - self.visible_bars)))
+        return first, max(0, min(len(self.bars), int(math.ceil(self.right_edge))) - first)
+
+    def show_range(self, first: int, count: int):
+        """Show bars [first, first + count)"""
+        self._set_view(first + count, count)
+
+    def plot_rect(self) -> QRectF:
+        return QRectF(0, 0, max(1, self.width() - PRICE_AXIS_WIDTH), max(1, self.height() - TIME_AXIS_HEIGHT))
+
+    def _bar_at(self, x: float) -> float:
+        plot = self.plot_rect()
+        return self.right_edge - self.visible_bars + (x - plot.left()) / plot.width() * self.visible_bars
+
+    # ------------------------------------------------------------------
+    # Input
+    # ------------------------------------------------------------------
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._drag_origin = (event.position().x(), self.right_edge)
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        self._cursor = event.position()
+        if self._drag_origin is not None:
+            origin_x, origin_edge = self._drag_origin
+            bars_per_pixel = self.visible_bars / self.plot_rect().width()
+            self._set_view(origin_edge - (event.position().x() - origin_x) * bars_per_pixel)
+        else:
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._drag_origin = None
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        self._set_view(self._latest_edge())
+
+    def leaveEvent(self, event):
+        self._cursor = None
+        self.update()
+        super().leaveEvent(event)
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if not steps:
+            return
+        anchor = self._bar_at(event.position().x())
+        visible = self._clamp_visible(self.visible_bars / (ZOOM_STEP ** steps))
+        # Keep the bar under the cursor where it is
+        fraction = (self.right_edge - anchor) / self.visible_bars
+        self._set_view(anchor + fraction * visible, visible)
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key == Qt.Key.Key_Left:
+            self._set_view(self.right_edge - self.visible_bars * KEY_PAN_FRACTION)
+        elif key == Qt.Key.Key_Right:
+            self._set_view(self.right_edge + self.visible_bars * KEY_PAN_FRACTION)
+        elif key in (Qt.Key.Key_Plus, Qt.Key.Key_Equal):
+            self._set_view(self.right_edge, self.visible_bars / ZOOM_STEP)
+        elif key == Qt.Key.Key_Minus:
+            self._set_view(self.right_edge, self.visible_bars * ZOOM_STEP)
+        elif key == Qt.Key.Key_Home:
+            self._set_view(self.visible_bars)
+        elif key == Qt.Key.Key_End:
+            self._set_view(self._latest_edge())
+        else:
+            super().keyPressEvent(event)
+
+    # ------------------------------------------------------------------
+    # Painting
+    # ------------------------------------------------------------------
+
+    def paintEvent(self, event):
+        with instrumentation.span('draw.CandlestickChart'):
+            key = (self.width(), self.height(), self.devicePixelRatioF(), self.right_edge,
+                   self.visible_bars, len(self.bars), self._zones_version, self.show_zones)
+            if self._layer is None or key != self._layer_key:
+                self._render_layer()
+                self._layer_key = key
+
+            painter = QPainter(self)
+            painter.drawPixmap(0, 0, self._layer)
+            if self._cursor is not None and self.pyramid is not None:
+                self._draw_crosshair(painter)
+            painter.end()
+
+    def _visible_columns(self):
+        """Bars to draw: (bar index, open, high, low, close, min/max columns?)"""
+        plot = self.plot_rect()
+        start = self.right_edge - self.visible_bars
+        first, count = self.visible_range()
+        if count == 0:
+            return None
+        if plot.width() / self.visible_bars >= MIN_CANDLE_PIXELS:
+            stop = first + count
+            return (np.arange(first, stop), self.bars.open[first:stop], self.bars.high[first:stop],
+                    self.bars.low[first:stop], self.bars.close[first:stop], False)
+        # One column per pixel, only over the pixels that have bars
+        columns_start = max(start, 0.0)
+        columns_stop = min(self.right_edge, float(len(self.bars)))
+        pixels = max(1, int((columns_stop - columns_start) / self.visible_bars * plot.width()))
+        return self.pyramid.columns(columns_start, columns_stop, pixels) + (True,)
+
+    def _render_layer(self):
+        ratio = self.devicePixelRatioF()
+        self._layer = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        self._layer.setDevicePixelRatio(ratio)
+        self._layer.fill(BACKGROUND)
+
+        painter = QPainter(self._layer)
+        plot = self.plot_rect()
+        columns = self._visible_columns() if self.pyramid is not None else None
+        if columns is None:
+            painter.setPen(AXIS_TEXT)
+            painter.drawText(plot, Qt.AlignmentFlag.AlignCenter, "No bars")
+            painter.end()
+            return
+
+        index, opens, highs, lows, closes, as_columns = columns
+        low, high = float(lows.min()), float(highs.max())
+        pad = (high - low) * 0.05 or abs(high) * 0.001 or 1.0
+        self._price_range = (low - pad, high + pad)
+
+        self._draw_grid(painter, plot)
+        if self.show_zones and self.zones:
+            self._draw_zones(painter, plot)
+
+        painter.setClipRect(plot)
+        if as_columns:
+            self._draw_min_max(painter, index, opens, highs, lows, closes)
+        else:
+            self._draw_candles(painter, index, opens, highs, lows, closes)
+        painter.setClipping(False)
+
+        self._draw_last_price(painter, plot)
+        painter.end()
+
+    def _x(self, bar: np.ndarray) -> np.ndarray:
+        plot = self.plot_rect()
+        return plot.left() + (bar - (self.right_edge - self.visible_bars)) * (plot.width() / self.visible_bars)
+
+    def _y(self, price):
+        plot = self.plot_rect()
+        low, high = self._price_range
+        return plot.top() + (high - price) * (plot.height() / (high - low))
+
+    def _draw_candles(self, painter: QPainter, index, opens, highs, lows, closes):
+        bar_width = self.plot_rect().width() / self.visible_bars
+        body_width = max(1.0, bar_width * 0.7)
+        centers = self._x(index + 0.5)
+        y_open, y_close = self._y(opens), self._y(closes)
+        y_high, y_low = self._y(highs), self._y(lows)
+        bullish = closes >= opens
+
+        for mask, color in ((bullish, BULL), (~bullish, BEAR)):
+            if not mask.any():
+                continue
+            painter.setPen(QPen(color, 1))
+            painter.setBrush(QBrush(color))
+            painter.drawLines(_vertical_lines(centers[mask], y_high[mask], y_low[mask]))
+            lefts = centers[mask] - body_width / 2
+            tops = np.minimum(y_open[mask], y_close[mask])
+            heights = np.maximum(np.abs(y_open[mask] - y_close[mask]), 1.0)
+            painter.drawRects([QRectF(*rect) for rect in np.column_stack(
+                (lefts, tops, np.full(len(tops), body_width), heights)).tolist()])
+
+    def _draw_min_max(self, painter: QPainter, index, opens, highs, lows, closes):
+        x = np.floor(self._x(index)) + 0.5
+        y_high, y_low = self._y(highs), self._y(lows)
+        # At least one pixel tall, so flat stretches stay visible
+        y_low = np.maximum(y_low, y_high + 1.0)
+        bullish = closes >= opens
+        for mask, color in ((bullish, BULL), (~bullish, BEAR)):
+            if not mask.any():
+                continue
+            painter.setPen(QPen(color, 1))
+            painter.drawLines(_vertical_lines(x[mask], y_high[mask], y_low[mask]))
+
+    def _draw_grid(self, painter: QPainter, plot: QRectF):
+        low, high = self._price_range
+        painter.setFont(QFont("Consolas", 8))
+        metrics = painter.fontMetrics()
+
+        lines, labels = [], []
+        step = _nice_step(high - low, max(2, int(plot.height() / 50)))
+        price = math.ceil(low / step) * step
+        while price <= high:
+            y = float(self._y(price))
+            lines.append(QLineF(plot.left(), y, plot.right(), y))
+            labels.append((QPointF(plot.right() + 6, y + metrics.ascent() / 2 - 1), f"{price:.{self.digits}f}"))
+            price += step
+
+        # Time labels about every 110 px, on bar multiples so they move with the bars
+        first, count = self.visible_range()
+        if count:
+            every = max(1, int(110 / (plot.width() / self.visible_bars)))
+            span = int(self.bars.time[first + count - 1] - self.bars.time[first])
+            fmt = '%H:%M' if span < 2 * 86400 else '%d %b %H:%M' if span < 60 * 86400 else '%d %b %Y'
+            for bar in range((first // every + 1) * every, first + count, every):
+                x = float(self._x(np.float64(bar + 0.5)))
+                lines.append(QLineF(x, plot.top(), x, plot.bottom()))
+                label = time.strftime(fmt, time.gmtime(int(self.bars.time[bar])))
+                labels.append((QPointF(x - metrics.horizontalAdvance(label) / 2,
+                                       plot.bottom() + metrics.ascent() + 4), label))
+
+        if lines:
+            painter.setPen(QPen(GRID, 1))
+            painter.drawLines(lines)
+        painter.setPen(AXIS_TEXT)
+        for position, label in labels:
+            painter.drawText(position, label)
+
+    def _draw_zones(self, painter: QPainter, plot: QRectF):
+        if self._zone_picture is None:
+            self._zone_picture = self._record_zones()
+        low, high = self._price_range
+        scale = plot.height() / (high - low)
+
+        painter.save()
+        painter.setClipRect(plot)
+        painter.setTransform(QTransform(plot.width(), 0, 0, -scale, plot.left(), plot.top() + high * scale))
+        painter.drawPicture(0, 0, self._zone_picture)
+        painter.restore()
+
+        painter.setFont(QFont("Arial", 8, QFont.Weight.Bold))
+        for zone in self.zones:
+            y = float(self._y(max(zone.top, zone.bottom)))
+            if plot.top() <= y <= plot.bottom() - 12:
+                painter.setPen(QColor(zone.color))
+                painter.drawText(QPointF(plot.left() + 6, y + 12), zone.name)
+
+    def _draw_last_price(self, painter: QPainter, plot: QRectF):
+        close = float(self.bars.close[-1])
+        y = float(self._y(close))
+        if not plot.top() <= y <= plot.bottom():
+            return
+        color = BULL if close >= self.bars.open[-1] else BEAR
+        pen = QPen(color, 1, Qt.PenStyle.DashLine)
+        painter.setPen(pen)
+        painter.drawLine(QLineF(plot.left(), y, plot.right(), y))
+        painter.fillRect(QRectF(plot.right() + 1, y - 8, PRICE_AXIS_WIDTH - 2, 16), color)
+        painter.setPen(QColor('#FFFFFF'))
+        painter.setFont(QFont("Consolas", 8, QFont.Weight.Bold))
+        painter.drawText(QPointF(plot.right() + 6, y + 4), f"{close:.{self.digits}f}")
+
+    def _draw_crosshair(self, painter: QPainter):
+        plot = self.plot_rect()
+        if not plot.contains(self._cursor):
+            return
+        x, y = self._cursor.x(), self._cursor.y()
+        painter.setPen(QPen(CROSSHAIR, 1, Qt.PenStyle.DotLine))
+        painter.drawLine(QLineF(plot.left(), y, plot.right(), y))
+        painter.drawLine(QLineF(x, plot.top(), x, plot.bottom()))
+
+        low, high = self._price_range
+        price = high - (y - plot.top()) / plot.height() * (high - low)
+        bar = int(self._bar_at(x))
+        label = f"{price:.{self.digits}f}"
+        if 0 <= bar < len(self.bars):
+            b = self.bars
+            label = (f"{time.strftime('%Y-%m-%d %H:%M', time.gmtime(int(b.time[bar])))}  "
+                     f"O {b.open[bar]:.{self.digits}f}  H {b.high[bar]:.{self.digits}f}  "
+                     f"L {b.low[bar]:.{self.digits}f}  C {b.close[bar]:.{self.digits}f}  |  {label}")
+        painter.setFont(QFont("Consolas", 8))
+        painter.setPen(AXIS_TEXT)
+        painter.drawText(QPointF(plot.left() + 6, plot.top() + 14), label)
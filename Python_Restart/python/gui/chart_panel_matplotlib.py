@@ -18,12 +18,11 @@ from matplotlib.patches import Rectangle
 import numpy as np
 import pandas as pd
 from datetime import datetime
-try:
-    import MetaTrader5 as mt5
-    MT5_AVAILABLE = True
-except ImportError:
-    MT5_AVAILABLE = False
-    mt5 = None
+from core.lazy_loader import lazy_import
+
+# MetaTrader5 is imported on first use to keep startup fast
+mt5 = lazy_import('MetaTrader5')
+MT5_AVAILABLE = mt5 is not None
 import warnings
 import logging
 
@@ -37,6 +36,7 @@ from core.data_manager import data_manager
 from core.verbose_mode_manager import vprint
 from core.visual_controls import visual_controls
 from core.verbose_mode_manager import vprint
+from core.instrumentation import instrumentation
 
 
 # Simple theme and settings (inline replacement for config module)
@@ -650,6 +650,7 @@ class ChartPanel(QWidget):
         except Exception as e:
             pass
 
+    @instrumentation.timed('widget')
     def plot_candlesticks(self):
         """Plot candlestick chart - STANDARDIZED for all timeframes"""
 
@@ -788,7 +789,8 @@ class ChartPanel(QWidget):
         vprint(f"[Chart] {self.current_timeframe}: Final xlim = {final_xlim}, Expected = (-2, 102)")
         vprint(f"[Chart] {self.current_timeframe}: Figure size = {fig_width}x{fig_height} inches, Canvas size = {canvas_width}x{canvas_height} pixels")
 
-        self.canvas.draw()
+        with instrumentation.span('draw.ChartPanel'):
+            self.canvas.draw()
         self.canvas.flush_events()
 
     def calculate_support_resistance(self):
@@ -2094,6 +2096,7 @@ class ChartPanel(QWidget):
             bbox=dict(boxstyle='round,pad=0.3', facecolor='#0A0E27', edgecolor='#EF4444', alpha=0.8)
         )
 
+    @instrumentation.timed('widget')
     def update_chart(self):
         """Update chart - reload data from MT5 to show new candles"""
 
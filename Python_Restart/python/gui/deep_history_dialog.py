@@ -0,0 +1,169 @@
+"""
+AppleTrader Pro - Deep History Dialog
+Months of bars on the QPainter candlestick engine (gui/candlestick_chart.py)
+
+Loads up to 200k bars of one symbol/timeframe straight from the terminal,
+then merges the newest bars once a second while visible (after a pause,
+every bar since the last loaded one). Smart money zones
+of the latest 150 bars are drawn as overlays. Non-modal.
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+                             QSpinBox, QPushButton, QCheckBox)
+from PyQt6.QtCore import QTimer
+
+from core.lazy_loader import lazy_import
+from core.symbol_manager import symbol_specs_manager
+from gui.candlestick_chart import CandlestickChart
+
+# MetaTrader5 is imported on first use to keep startup fast
+mt5 = lazy_import('MetaTrader5')
+
+TIMEFRAMES = ['M1', 'M5', 'M15', 'M30', 'H1', 'H4', 'D1']
+DEFAULT_TIMEFRAME = 'M5'
+DEFAULT_BARS = 100000
+MAX_BARS = 200000
+# Bars re-read on each live update (the forming bar and the one before it);
+# multiplied by CATCH_UP_FACTOR until the fetch reaches the last loaded bar
+LIVE_BARS = 2
+CATCH_UP_FACTOR = 8
+ZONE_BARS = 150
+
+REFRESH_MS = 1000
+
+
+class DeepHistoryDialog(QDialog):
+    """Symbol/timeframe picker over a CandlestickChart"""
+
+    def __init__(self, symbol: str = "EURUSD", parent=None):
+        super().__init__(parent)
+        self.symbol = symbol
+        self.timeframe = DEFAULT_TIMEFRAME
+        self.init_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh_latest)
+
+    def init_ui(self):
+        self.setWindowTitle("Deep History Chart")
+        self.resize(1400, 800)
+
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.symbol_combo = QComboBox()
+        self.symbol_combo.setEditable(True)
+        self.symbol_combo.addItems(symbol_specs_manager.get_all_symbols())
+        self.symbol_combo.setCurrentText(self.symbol)
+        controls.addWidget(self.symbol_combo)
+
+        self.timeframe_combo = QComboBox()
+        self.timeframe_combo.addItems(TIMEFRAMES)
+        self.timeframe_combo.setCurrentText(DEFAULT_TIMEFRAME)
+        controls.addWidget(self.timeframe_combo)
+
+        controls.addWidget(QLabel("Bars:"))
+        self.bars_spin = QSpinBox()
+        self.bars_spin.setRange(1000, MAX_BARS)
+        self.bars_spin.setSingleStep(10000)
+        self.bars_spin.setValue(DEFAULT_BARS)
+        controls.addWidget(self.bars_spin)
+
+        load_btn = QPushButton("Load")
+        load_btn.clicked.connect(self.load)
+        controls.addWidget(load_btn)
+
+        self.zones_check = QCheckBox("Zones")
+        self.zones_check.setChecked(True)
+        self.zones_check.toggled.connect(lambda enabled: self.chart.toggle_zones(enabled))
+        controls.addWidget(self.zones_check)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.chart = CandlestickChart()
+        self.chart.view_changed.connect(self.on_view_changed)
+        layout.addWidget(self.chart, 1)
+
+        self.status_label = QLabel("Drag to pan, wheel to zoom, double-click for the latest bar")
+        layout.addWidget(self.status_label)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if len(self.chart.bars) == 0:
+            self.load()
+        self.refresh_timer.start(REFRESH_MS)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def set_symbol(self, symbol: str):
+        if symbol != self.symbol_combo.currentText():
+            self.symbol_combo.setCurrentText(symbol)
+            if self.isVisible():
+                self.load()
+
+    def _copy_rates(self, count: int):
+        """Latest `count` bars of the loaded symbol/timeframe"""
+        if mt5 is None or not mt5.initialize():
+            return None
+        rates = mt5.copy_rates_from_pos(self.symbol, getattr(mt5, f"TIMEFRAME_{self.timeframe}"), 0, count)
+        return rates if rates is not None and len(rates) > 0 else None
+
+    def load(self):
+        self.symbol = self.symbol_combo.currentText()
+        self.timeframe = self.timeframe_combo.currentText()
+        rates = self._copy_rates(self.bars_spin.value())
+        if rates is None:
+            self.status_label.setText(f"No bars for {self.symbol} {self.timeframe} "
+                                      f"(MT5 not connected or no history)")
+            return
+
+        specs = symbol_specs_manager.get_symbol_specs(self.symbol)
+        self.chart.set_bars(rates, digits=specs.digits if specs else None)
+        self.update_zones(rates)
+        self.on_view_changed(*self.chart.visible_range())
+
+    def refresh_latest(self):
+        """
+        Merge every bar since the last loaded one
+
+        Normally the forming bar and its predecessor; after a pause (dialog
+        hidden, terminal disconnected) the fetch grows until it overlaps the
+        loaded bars, and the history is reloaded when the terminal cannot
+        reach back that far.
+        """
+        if len(self.chart.bars) == 0:
+            return
+        last_time = int(self.chart.bars.time[-1])
+        count = LIVE_BARS
+        while True:
+            rates = self._copy_rates(count)
+            if rates is None:
+                return
+            if int(rates['time'][0]) <= last_time:
+                self.chart.update_bars(rates)
+                return
+            if len(rates) < count or count >= MAX_BARS:
+                self.load()
+                return
+            count = min(count * CATCH_UP_FACTOR, MAX_BARS)
+
+    def update_zones(self, rates):
+        """Order block / FVG / liquidity zones of the latest bars (same detectors as the main chart)"""
+        from gui.smart_money_chart_overlay import smart_money_chart_overlay
+
+        candles = [{'time': int(bar['time']), 'open': float(bar['open']), 'high': float(bar['high']),
+                    'low': float(bar['low']), 'close': float(bar['close']),
+                    'tick_volume': int(bar['tick_volume'])}
+                   for bar in rates[-ZONE_BARS:]]
+        smart_money_chart_overlay.generate_zones_from_detectors(
+            candles=candles, symbol=self.symbol, chart_overlay_system=self.chart)
+
+    def on_view_changed(self, first: int, count: int):
+        bars = self.chart.bars
+        if count == 0:
+            return
+        self.status_label.setText(
+            f"{self.symbol} {self.timeframe}: {len(bars):,} bars, "
+            f"showing {count:,} ({first:,} - {first + count - 1:,}), {len(self.chart.zones)} zones")
@@ -0,0 +1,131 @@
+"""
+AppleTrader Pro - Diagnostics Dialog
+Live view of the hot-path instrumentation (core/instrumentation.py)
+
+Shows per-stage latency (count, mean, p50/p95/p99, max and a bar of the
+rolling histogram) and counters. Non-modal, refreshes once a second while
+visible; can enable/disable instrumentation, reset it and dump it as JSON.
+"""
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QFileDialog)
+from PyQt6.QtCore import Qt, QTimer
+
+from core.instrumentation import instrumentation, DUMP_FILE
+
+
+STAGE_COLUMNS = ["Stage", "Count", "Mean ms", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Histogram"]
+
+# Characters for the inline histogram, lowest to highest bucket share
+SPARK_CHARS = " ▁▂▃▄▅▆▇█"
+
+REFRESH_MS = 1000
+
+
+def histogram_bar(buckets) -> str:
+    """One character per bucket, scaled to the fullest bucket"""
+    peak = max(buckets) if buckets else 0
+    if not peak:
+        return ""
+    top = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[round(count / peak * top)] for count in buckets)
+
+
+class DiagnosticsDialog(QDialog):
+    """Per-stage latency table and counters of the global instrumentation"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def init_ui(self):
+        self.setWindowTitle("Diagnostics")
+        self.resize(900, 520)
+
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.enabled_check = QCheckBox("Instrumentation enabled")
+        self.enabled_check.setChecked(instrumentation.enabled)
+        self.enabled_check.toggled.connect(instrumentation.set_enabled)
+        controls.addWidget(self.enabled_check)
+        controls.addStretch()
+
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.on_reset)
+        controls.addWidget(reset_btn)
+
+        dump_btn = QPushButton("Dump JSON...")
+        dump_btn.clicked.connect(self.on_dump)
+        controls.addWidget(dump_btn)
+        layout.addLayout(controls)
+
+        self.stage_table = QTableWidget(0, len(STAGE_COLUMNS))
+        self.stage_table.setHorizontalHeaderLabels(STAGE_COLUMNS)
+        self.stage_table.verticalHeader().setVisible(False)
+        self.stage_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        header = self.stage_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for col in range(1, len(STAGE_COLUMNS)):
+            header.setSectionResizeMode(col, QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.stage_table, stretch=3)
+
+        self.counter_table = QTableWidget(0, 2)
+        self.counter_table.setHorizontalHeaderLabels(["Counter", "Value"])
+        self.counter_table.verticalHeader().setVisible(False)
+        self.counter_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.counter_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.counter_table, stretch=1)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start(REFRESH_MS)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = instrumentation.snapshot()
+
+        stages = snapshot['stages']
+        self.stage_table.setRowCount(len(stages))
+        for row, (name, stats) in enumerate(stages.items()):
+            values = [name, str(stats['count'])] + [
+                f"{stats[key]:.3f}" for key in ('mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms')
+            ] + [histogram_bar(stats['buckets'])]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if 0 < col < len(values) - 1:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.stage_table.setItem(row, col, item)
+
+        counters = snapshot['counters']
+        self.counter_table.setRowCount(len(counters))
+        for row, (name, value) in enumerate(counters.items()):
+            self.counter_table.setItem(row, 0, QTableWidgetItem(name))
+            self.counter_table.setItem(row, 1, QTableWidgetItem(str(value)))
+
+        if instrumentation.enabled:
+            self.status_label.setText(f"{len(stages)} stages, {len(counters)} counters")
+        else:
+            self.status_label.setText("Instrumentation is off - enable it to start collecting")
+
+    def on_reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def on_dump(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Dump Instrumentation", str(DUMP_FILE),
+                                              "JSON Files (*.json)")
+        if path:
+            written = instrumentation.dump(path)
+            self.status_label.setText(f"Written to {written}")
@@ -15,16 +15,16 @@ from matplotlib.patches import Rectangle
 import numpy as np
 import pandas as pd
 from datetime import datetime
-try:
-    import MetaTrader5 as mt5
-    MT5_AVAILABLE = True
-except ImportError:
-    MT5_AVAILABLE = False
-    mt5 = None
+from core.lazy_loader import lazy_import
+
+# MetaTrader5 is imported on first use to keep startup fast
+mt5 = lazy_import('MetaTrader5')
+MT5_AVAILABLE = mt5 is not None
 
 from core.data_manager import data_manager
 from gui.chart_overlay_system import ChartOverlaySystem
 from gui.smart_money_chart_overlay import smart_money_chart_overlay
+from core.instrumentation import instrumentation
 
 
 class MplCanvas(FigureCanvasQTAgg):
@@ -190,7 +190,8 @@ class EnhancedChartPanel(QWidget):
         self.canvas.axes.clear()
         self.canvas.axes.set_title("Loading chart...", color='white', fontsize=14)
         self.canvas.axes.grid(True, alpha=0.2, color='white')
-        self.canvas.draw()
+        with instrumentation.span('draw.EnhancedChartPanel'):
+            self.canvas.draw()
 
         # Load initial data
         self.load_historical_data()
@@ -270,6 +271,7 @@ class EnhancedChartPanel(QWidget):
 
         self.candle_data = pd.DataFrame(data)
 
+    @instrumentation.timed('widget')
     def plot_candlesticks(self):
         """Plot candlestick chart"""
         if len(self.candle_data) == 0:
@@ -355,8 +357,10 @@ class EnhancedChartPanel(QWidget):
         else:
             self.overlay.add_commentary("✓ Bearish candle - sellers in control")
 
-        self.canvas.draw()
+        with instrumentation.span('draw.EnhancedChartPanel'):
+            self.canvas.draw()
 
+    @instrumentation.timed('widget')
     def update_chart(self):
         """Update chart with latest data"""
         if not self.is_loading:
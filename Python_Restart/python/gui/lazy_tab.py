@@ -0,0 +1,102 @@
+"""
+Lazy Tab - Placeholder tab that builds its real widget on first show
+Used by the main window's lazy startup mode to keep time-to-first-paint low
+"""
+
+import importlib
+from typing import Callable, Optional
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt, QObject, QEvent, QTimer, pyqtSignal
+
+from core.startup_profiler import startup_profiler
+
+
+def load_widget_class(component: str, module_name: str, class_name: str) -> type:
+    """Import a widget class, recording the import time for the component"""
+    with startup_profiler.measure(component, 'import'):
+        module = importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+class FirstPaintTracker(QObject):
+    """Event filter that records a widget's first paint in the startup profiler"""
+
+    def __init__(self, widget: QWidget, component: str, callback: Optional[Callable[[], None]] = None):
+        super().__init__(widget)
+        self.component = component
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            startup_profiler.mark_first_paint(self.component)
+            if self.callback:
+                # Run after the paint completes
+                QTimer.singleShot(0, self.callback)
+        return False
+
+
+def track_first_paint(widget: QWidget, component: str,
+                      callback: Optional[Callable[[], None]] = None) -> FirstPaintTracker:
+    """Record time-to-first-paint for widget under the given component name"""
+    return FirstPaintTracker(widget, component, callback)
+
+
+class LazyTab(QWidget):
+    """
+    Tab page that shows a lightweight placeholder until it is first shown
+
+    The real widget's module is imported and the widget is constructed
+    the first time the tab becomes visible (or when materialize() is called).
+
+    Signals:
+        widget_created: Emitted with the real widget once it is built
+    """
+
+    widget_created = pyqtSignal(object)
+
+    def __init__(self, component: str, module_name: str, class_name: str, parent=None):
+        super().__init__(parent)
+        self.component = component
+        self.module_name = module_name
+        self.class_name = class_name
+        self.widget: Optional[QWidget] = None
+        self._pending = False
+
+        self.page_layout = QVBoxLayout(self)
+
+        self.placeholder = QLabel(f"Loading {component}...")
+        self.placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.placeholder.setStyleSheet("color: #94A3B8; font-size: 12px;")
+        self.page_layout.addWidget(self.placeholder)
+
+    def showEvent(self, event):
+        """Build the real widget once the placeholder has been painted"""
+        super().showEvent(event)
+        if self.widget is None and not self._pending:
+            self._pending = True
+            QTimer.singleShot(0, self.materialize)
+
+    def is_materialized(self) -> bool:
+        """Check if the real widget has been built"""
+        return self.widget is not None
+
+    def materialize(self) -> QWidget:
+        """Import and construct the real widget (no-op if already built)"""
+        if self.widget is not None:
+            return self.widget
+
+        widget_class = load_widget_class(self.component, self.module_name, self.class_name)
+        with startup_profiler.measure(self.component, 'construct'):
+            widget = widget_class()
+
+        self.widget = widget
+        self.page_layout.removeWidget(self.placeholder)
+        self.placeholder.deleteLater()
+        self.page_layout.addWidget(widget)
+        track_first_paint(widget, self.component)
+
+        self.widget_created.emit(widget)
+        return widget
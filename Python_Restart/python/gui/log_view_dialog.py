@@ -0,0 +1,154 @@
+"""
+AppleTrader Pro - Log View Dialog
+In-app view of the log ring buffer (core/log_manager.py)
+
+Shows the most recent records of every category, filterable by category
+and minimum level, plus how many records the rate limiter suppressed.
+Non-modal; refreshes once a second while visible. Category levels can be
+changed here without restarting; the 'verbose' category is switched through
+VerboseModeManager so the toolbar toggle stays in step.
+"""
+
+import logging
+from datetime import datetime
+
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+                             QPlainTextEdit, QPushButton, QCheckBox)
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFont
+
+from core.log_manager import log_manager
+from core.verbose_mode_manager import verbose_mode_manager
+
+
+LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR']
+ALL_CATEGORIES = "All categories"
+# vprint() category, owned by VerboseModeManager (DEBUG = verbose on)
+VERBOSE_CATEGORY = 'verbose'
+
+REFRESH_MS = 1000
+
+
+class LogViewDialog(QDialog):
+    """Recent log records with category/level filters"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._shown = None
+        self.init_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        verbose_mode_manager.mode_changed.connect(self.on_verbose_mode_changed)
+        self.refresh()
+
+    def init_ui(self):
+        self.setWindowTitle("Log")
+        self.resize(950, 560)
+
+        layout = QVBoxLayout(self)
+
+        filters = QHBoxLayout()
+        self.category_combo = QComboBox()
+        self.category_combo.addItem(ALL_CATEGORIES)
+        self.category_combo.currentTextChanged.connect(self.on_category_changed)
+        filters.addWidget(self.category_combo)
+
+        filters.addWidget(QLabel("Show from:"))
+        self.view_level_combo = QComboBox()
+        self.view_level_combo.addItems(LEVELS)
+        self.view_level_combo.currentTextChanged.connect(self.refresh)
+        filters.addWidget(self.view_level_combo)
+
+        filters.addWidget(QLabel("Category level:"))
+        self.category_level_combo = QComboBox()
+        self.category_level_combo.addItems(LEVELS)
+        self.category_level_combo.setEnabled(False)
+        self.category_level_combo.activated.connect(self.on_category_level_changed)
+        filters.addWidget(self.category_level_combo)
+
+        filters.addStretch()
+        self.follow_check = QCheckBox("Follow")
+        self.follow_check.setChecked(True)
+        filters.addWidget(self.follow_check)
+
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.on_clear)
+        filters.addWidget(clear_btn)
+        layout.addLayout(filters)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFont("Consolas", 9))
+        self.text.setMaximumBlockCount(log_manager.ring_buffer.entries.maxlen)
+        layout.addWidget(self.text)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start(REFRESH_MS)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def selected_category(self):
+        category = self.category_combo.currentText()
+        return None if category == ALL_CATEGORIES else category
+
+    def refresh(self):
+        entries = log_manager.recent(self.selected_category(),
+                                     logging.getLevelName(self.view_level_combo.currentText()))
+
+        # Keep the category list in step with what has been logged
+        known = {self.category_combo.itemText(i) for i in range(self.category_combo.count())}
+        for category in sorted({entry[2] for entry in log_manager.recent()} - known):
+            self.category_combo.addItem(category)
+
+        shown = (len(entries), entries[-1] if entries else None)
+        if shown != self._shown:
+            self._shown = shown
+            self.text.setPlainText('\n'.join(
+                f"{datetime.fromtimestamp(created):%H:%M:%S}.{int(created * 1000) % 1000:03d} "
+                f"{level:<7} {category:<14} {message}"
+                for created, level, category, message in entries))
+            if self.follow_check.isChecked():
+                self.text.verticalScrollBar().setValue(self.text.verticalScrollBar().maximum())
+
+        suppressed = log_manager.rate_limiter.suppressed
+        total = sum(suppressed.values())
+        self.status_label.setText(
+            f"{len(entries)} records shown, {total} suppressed" +
+            (f" ({', '.join(f'{k}: {v}' for k, v in sorted(suppressed.items()))})" if total else ""))
+
+    def show_category_level(self):
+        selected = self.selected_category()
+        if selected is not None:
+            level = log_manager.get_logger(selected).getEffectiveLevel()
+            self.category_level_combo.setCurrentText(logging.getLevelName(level))
+
+    def on_category_changed(self, category: str):
+        self.category_level_combo.setEnabled(self.selected_category() is not None)
+        self.show_category_level()
+        self._shown = None
+        self.refresh()
+
+    def on_category_level_changed(self, index: int):
+        selected = self.selected_category()
+        if selected == VERBOSE_CATEGORY:
+            # vprint() only logs at DEBUG: any higher level means verbose off
+            verbose_mode_manager.verbose = self.category_level_combo.currentText() == 'DEBUG'
+            self.show_category_level()
+        elif selected is not None:
+            log_manager.set_level(selected, self.category_level_combo.currentText())
+
+    def on_verbose_mode_changed(self, verbose: bool):
+        if self.selected_category() == VERBOSE_CATEGORY:
+            self.show_category_level()
+
+    def on_clear(self):
+        log_manager.ring_buffer.entries.clear()
+        self._shown = None
+        self.refresh()
@@ -10,24 +10,33 @@ from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction, QFont
 from datetime import datetime
 
-# Import all improvement widgets
-from widgets.opportunity_scanner_widget import OpportunityScannerWidget
-from widgets.price_action_commentary_widget import PriceActionCommentaryWidget
-from widgets.correlation_heatmap_widget import CorrelationHeatmapWidget
-from widgets.volatility_position_widget import VolatilityPositionWidget
-from widgets.session_momentum_widget import SessionMomentumWidget
-from widgets.order_flow_widget import InstitutionalOrderFlowWidget
-from widgets.pattern_scorer_widget import PatternScorerWidget
-from widgets.mtf_structure_widget import MTFStructureWidget
-from widgets.news_impact_widget import NewsImpactWidget
-from widgets.risk_reward_widget import RiskRewardWidget
-from widgets.equity_curve_widget import EquityCurveWidget
-from widgets.trade_journal_widget import TradeJournalWidget
-from gui.chart_panel_matplotlib import ChartPanel
-from gui.controls_panel import ControlsPanel
-from gui.symbol_manager_dialog import SymbolManagerDialog
-from core.mt5_connector import MT5Connector
-
+from core.startup_profiler import startup_profiler
+from core.dev_config import is_lazy_startup, should_print_startup_report
+from core.log_manager import get_logger
+from gui.lazy_tab import LazyTab, load_widget_class, track_first_paint
+
+mt5_log = get_logger('mt5')
+
+
+# Analysis/performance tabs: (attribute, widget module, widget class, tab label)
+# Widget modules are imported when the tab is built so that their heavy
+# dependencies (matplotlib, pandas analyzers) stay off the startup path.
+CENTER_TABS = [
+    ('commentary_widget', 'widgets.price_action_commentary_widget', 'PriceActionCommentaryWidget', "📊 Price Action"),
+    ('momentum_widget', 'widgets.session_momentum_widget', 'SessionMomentumWidget', "⚡ Momentum"),
+    ('correlation_widget', 'widgets.correlation_heatmap_widget', 'CorrelationHeatmapWidget', "🔥 Correlation"),
+    ('structure_widget', 'widgets.mtf_structure_widget', 'MTFStructureWidget', "📊 Structure"),
+    ('orderflow_widget', 'widgets.order_flow_widget', 'InstitutionalOrderFlowWidget', "💼 Order Flow"),
+    ('news_widget', 'widgets.news_impact_widget', 'NewsImpactWidget', "📰 News"),
+]
+
+RIGHT_TABS = [
+    ('position_widget', 'widgets.volatility_position_widget', 'VolatilityPositionWidget', "🎯 Position Size"),
+    ('rr_widget', 'widgets.risk_reward_widget', 'RiskRewardWidget', "🎯 Risk-Reward"),
+    ('pattern_widget', 'widgets.pattern_scorer_widget', 'PatternScorerWidget', "⭐ Quality"),
+    ('equity_widget', 'widgets.equity_curve_widget', 'EquityCurveWidget', "📊 Equity"),
+    ('journal_widget', 'widgets.trade_journal_widget', 'TradeJournalWidget', "📝 Journal"),
+]
 
 class MainWindow(QMainWindow):
     """
@@ -41,8 +50,14 @@ class MainWindow(QMainWindow):
         self.current_symbol = "EURUSD"
         self.current_timeframe = "H4"
 
-        # Initialize MT5 connector
-        self.mt5_connector = MT5Connector()
+        # Lazy startup: tabs are placeholders until first shown
+        self.lazy_startup = is_lazy_startup()
+        self.lazy_tabs = {}
+
+        # Initialize MT5 connector (shared global instance, built on first use)
+        with startup_profiler.measure('MT5Connector', 'import'):
+            from core.mt5_connector import mt5_connector
+        self.mt5_connector = mt5_connector.instance()
         self.mt5_connector.connection_status_changed.connect(self.on_mt5_connection_changed)
         self.mt5_connector.data_updated.connect(self.on_mt5_data_updated)
         self.mt5_connector.error_occurred.connect(self.on_mt5_error)
@@ -70,7 +85,11 @@ class MainWindow(QMainWindow):
         # NO TOOLBAR - Scanner goes directly to top as requested
 
         # === OPPORTUNITY SCANNER (at very top of screen) ===
-        self.scanner_widget = OpportunityScannerWidget()
+        scanner_class = load_widget_class('OpportunityScanner', 'widgets.opportunity_scanner_widget',
+                                          'OpportunityScannerWidget')
+        with startup_profiler.measure('OpportunityScanner', 'construct'):
+            self.scanner_widget = scanner_class()
+        track_first_paint(self.scanner_widget, 'OpportunityScanner')
         self.scanner_widget.setMinimumHeight(320)  # Increased so cards don't get cut off
         self.scanner_widget.setMaximumHeight(340)
         # Give scanner access to MT5 connector immediately
@@ -124,24 +143,39 @@ class MainWindow(QMainWindow):
         # Apply dark theme
         self.apply_dark_theme()
 
+        track_first_paint(self, 'MainWindow', self.on_first_paint)
+
     def create_max_mode_panel(self) -> QWidget:
         """Create independent MAX MODE chart panel"""
         panel = QWidget()
-        layout = QVBoxLayout(panel)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
+        self.max_mode_layout = QVBoxLayout(panel)
+        self.max_mode_layout.setContentsMargins(0, 0, 0, 0)
+        self.max_mode_layout.setSpacing(0)
 
-        # Create a new independent chart panel for MAX MODE
-        self.max_mode_chart = ChartPanel()
+        # In lazy startup the MAX MODE chart is built on first use
+        if not self.lazy_startup:
+            self.ensure_max_mode_chart()
+
+        return panel
+
+    def ensure_max_mode_chart(self):
+        """Create the independent MAX MODE chart panel if it doesn't exist yet"""
+        if hasattr(self, 'max_mode_chart'):
+            return self.max_mode_chart
+
+        chart_class = load_widget_class('MaxModeChart', 'gui.chart_panel_matplotlib', 'ChartPanel')
+        with startup_profiler.measure('MaxModeChart', 'construct'):
+            self.max_mode_chart = chart_class()
 
         # Connect signals
         self.max_mode_chart.timeframe_changed.connect(self.on_timeframe_changed)
         self.max_mode_chart.symbol_changed.connect(self.on_symbol_changed)
         self.max_mode_chart.display_mode_changed.connect(self.on_display_mode_changed)
 
-        layout.addWidget(self.max_mode_chart)
+        self.max_mode_layout.addWidget(self.max_mode_chart)
+        track_first_paint(self.max_mode_chart, 'MaxModeChart')
 
-        return panel
+        return self.max_mode_chart
 
     def create_toolbar(self) -> QHBoxLayout:
         """Create top toolbar - compact without title"""
@@ -170,12 +204,18 @@ class MainWindow(QMainWindow):
         layout.setContentsMargins(0, 0, 0, 0)
 
         # Chart
-        self.chart_panel = ChartPanel()
+        chart_class = load_widget_class('ChartPanel', 'gui.chart_panel_matplotlib', 'ChartPanel')
+        with startup_profiler.measure('ChartPanel', 'construct'):
+            self.chart_panel = chart_class()
         layout.addWidget(self.chart_panel, 3)  # 75% height
+        track_first_paint(self.chart_panel, 'ChartPanel')
 
         # Controls
-        self.controls_panel = ControlsPanel()
+        controls_class = load_widget_class('ControlsPanel', 'gui.controls_panel', 'ControlsPanel')
+        with startup_profiler.measure('ControlsPanel', 'construct'):
+            self.controls_panel = controls_class()
         layout.addWidget(self.controls_panel, 1)  # 25% height
+        track_first_paint(self.controls_panel, 'ControlsPanel')
 
         # Connect controls panel signals
         self.controls_panel.order_requested.connect(self.on_order_requested)
@@ -193,49 +233,9 @@ class MainWindow(QMainWindow):
         tabs = QTabWidget()
         tabs.setTabPosition(QTabWidget.TabPosition.North)
 
-        # Tab 1: PRICE ACTION COMMENTARY (Most Important!)
-        commentary_tab = QWidget()
-        commentary_layout = QVBoxLayout(commentary_tab)
-        self.commentary_widget = PriceActionCommentaryWidget()
-        # Connect to MT5 for live data
-        self.commentary_widget.set_symbol(self.current_symbol)
-        commentary_layout.addWidget(self.commentary_widget)
-        tabs.addTab(commentary_tab, "📊 Price Action")
-
-        # Tab 2: Momentum & Correlation
-        momentum_tab = QWidget()
-        momentum_layout = QVBoxLayout(momentum_tab)
-        self.momentum_widget = SessionMomentumWidget()
-        momentum_layout.addWidget(self.momentum_widget)
-        tabs.addTab(momentum_tab, "⚡ Momentum")
-
-        # Tab 3: Correlation Heatmap
-        correlation_tab = QWidget()
-        correlation_layout = QVBoxLayout(correlation_tab)
-        self.correlation_widget = CorrelationHeatmapWidget()
-        correlation_layout.addWidget(self.correlation_widget)
-        tabs.addTab(correlation_tab, "🔥 Correlation")
-
-        # Tab 4: Structure Map
-        structure_tab = QWidget()
-        structure_layout = QVBoxLayout(structure_tab)
-        self.structure_widget = MTFStructureWidget()
-        structure_layout.addWidget(self.structure_widget)
-        tabs.addTab(structure_tab, "📊 Structure")
-
-        # Tab 5: Order Flow
-        orderflow_tab = QWidget()
-        orderflow_layout = QVBoxLayout(orderflow_tab)
-        self.orderflow_widget = InstitutionalOrderFlowWidget()
-        orderflow_layout.addWidget(self.orderflow_widget)
-        tabs.addTab(orderflow_tab, "💼 Order Flow")
-
-        # Tab 6: News Events
-        news_tab = QWidget()
-        news_layout = QVBoxLayout(news_tab)
-        self.news_widget = NewsImpactWidget()
-        news_layout.addWidget(self.news_widget)
-        tabs.addTab(news_tab, "📰 News")
+        # Price Action Commentary first (Most Important!)
+        for attr, module_name, class_name, label in CENTER_TABS:
+            self.add_widget_tab(tabs, attr, module_name, class_name, label)
 
         return tabs
 
@@ -244,43 +244,84 @@ class MainWindow(QMainWindow):
         tabs = QTabWidget()
         tabs.setTabPosition(QTabWidget.TabPosition.North)
 
-        # Tab 1: Position Sizing
-        sizing_tab = QWidget()
-        sizing_layout = QVBoxLayout(sizing_tab)
-        self.position_widget = VolatilityPositionWidget()
-        sizing_layout.addWidget(self.position_widget)
-        tabs.addTab(sizing_tab, "🎯 Position Size")
-
-        # Tab 2: Risk-Reward
-        rr_tab = QWidget()
-        rr_layout = QVBoxLayout(rr_tab)
-        self.rr_widget = RiskRewardWidget()
-        rr_layout.addWidget(self.rr_widget)
-        tabs.addTab(rr_tab, "🎯 Risk-Reward")
-
-        # Tab 3: Pattern Scorer
-        pattern_tab = QWidget()
-        pattern_layout = QVBoxLayout(pattern_tab)
-        self.pattern_widget = PatternScorerWidget()
-        pattern_layout.addWidget(self.pattern_widget)
-        tabs.addTab(pattern_tab, "⭐ Quality")
-
-        # Tab 4: Equity Curve
-        equity_tab = QWidget()
-        equity_layout = QVBoxLayout(equity_tab)
-        self.equity_widget = EquityCurveWidget()
-        equity_layout.addWidget(self.equity_widget)
-        tabs.addTab(equity_tab, "📊 Equity")
-
-        # Tab 5: Trade Journal
-        journal_tab = QWidget()
-        journal_layout = QVBoxLayout(journal_tab)
-        self.journal_widget = TradeJournalWidget()
-        journal_layout.addWidget(self.journal_widget)
-        tabs.addTab(journal_tab, "📝 Journal")
+        for attr, module_name, class_name, label in RIGHT_TABS:
+            self.add_widget_tab(tabs, attr, module_name, class_name, label)
 
         return tabs
 
+    def add_widget_tab(self, tabs: QTabWidget, attr: str, module_name: str, class_name: str, label: str):
+        """Add a widget tab - a placeholder in lazy startup, the real widget otherwise"""
+        if self.lazy_startup:
+            lazy_tab = LazyTab(class_name, module_name, class_name)
+            lazy_tab.widget_created.connect(
+                lambda widget, attr=attr: self.on_tab_widget_created(attr, widget, sync_symbol=True)
+            )
+            self.lazy_tabs[attr] = lazy_tab
+            tabs.addTab(lazy_tab, label)
+            return
+
+        tab = QWidget()
+        tab_layout = QVBoxLayout(tab)
+        widget_class = load_widget_class(class_name, module_name, class_name)
+        with startup_profiler.measure(class_name, 'construct'):
+            widget = widget_class()
+        tab_layout.addWidget(widget)
+        track_first_paint(widget, class_name)
+        tabs.addTab(tab, label)
+
+        # Only the commentary widget is connected to the current symbol at startup
+        self.on_tab_widget_created(attr, widget, sync_symbol=(attr == 'commentary_widget'))
+
+    def on_tab_widget_created(self, attr: str, widget: QWidget, sync_symbol: bool):
+        """Register a freshly built tab widget on the window"""
+        setattr(self, attr, widget)
+
+        # Widgets built after startup must pick up the symbol chosen meanwhile
+        if sync_symbol and hasattr(widget, 'set_symbol'):
+            widget.set_symbol(self.current_symbol)
+
+    def ensure_tab_widget(self, attr: str) -> QWidget:
+        """Get a tab widget, building it now if it is still a placeholder"""
+        if not hasattr(self, attr) and attr in self.lazy_tabs:
+            self.lazy_tabs[attr].materialize()
+        return getattr(self, attr)
+
+    def on_first_paint(self):
+        """Called once the main window has painted for the first time"""
+        if should_print_startup_report():
+            startup_profiler.print_report()
+
+    def show_startup_report(self):
+        """Show the per-component startup timing report"""
+        from PyQt6.QtWidgets import QMessageBox
+        report = startup_profiler.format_report()
+        print(report)
+        QMessageBox.information(self, "Startup Timing", f"<pre>{report}</pre>")
+
+    def show_diagnostics(self):
+        """Show the hot-path latency/counter diagnostics (non-modal)"""
+        if getattr(self, 'diagnostics_dialog', None) is None:
+            from gui.diagnostics_dialog import DiagnosticsDialog
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+
+    def show_log_view(self):
+        """Show the in-app log (recent records of every category, non-modal)"""
+        if getattr(self, 'log_view_dialog', None) is None:
+            from gui.log_view_dialog import LogViewDialog
+            self.log_view_dialog = LogViewDialog(self)
+        self.log_view_dialog.show()
+        self.log_view_dialog.raise_()
+
+    def show_deep_history(self):
+        """Show months of bars of the current symbol on the QPainter chart (non-modal)"""
+        if getattr(self, 'deep_history_dialog', None) is None:
+            from gui.deep_history_dialog import DeepHistoryDialog
+            self.deep_history_dialog = DeepHistoryDialog(self.current_symbol, self)
+        self.deep_history_dialog.show()
+        self.deep_history_dialog.raise_()
+
     def create_status_bar(self):
         """Create status bar"""
         self.status_bar = QStatusBar()
@@ -321,6 +362,22 @@ class MainWindow(QMainWindow):
         manage_symbols_action.triggered.connect(self.on_manage_symbols)
         view_menu.addAction(manage_symbols_action)
 
+        startup_report_action = QAction("Startup Timing Report", self)
+        startup_report_action.triggered.connect(self.show_startup_report)
+        view_menu.addAction(startup_report_action)
+
+        diagnostics_action = QAction("Diagnostics...", self)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        view_menu.addAction(diagnostics_action)
+
+        log_action = QAction("Log...", self)
+        log_action.triggered.connect(self.show_log_view)
+        view_menu.addAction(log_action)
+
+        deep_history_action = QAction("Deep History Chart...", self)
+        deep_history_action.triggered.connect(self.show_deep_history)
+        view_menu.addAction(deep_history_action)
+
         # Help Menu
         help_menu = menubar.addMenu("&Help")
 
@@ -342,6 +399,9 @@ class MainWindow(QMainWindow):
             self.max_mode_chart.current_symbol = symbol
             self.max_mode_chart.symbol_combo.setCurrentText(symbol)
 
+        if getattr(self, 'deep_history_dialog', None) is not None:
+            self.deep_history_dialog.set_symbol(symbol)
+
         # Update all widgets with new symbol
         if hasattr(self, 'orderflow_widget'):
             self.orderflow_widget.set_symbol(symbol)
@@ -402,6 +462,7 @@ class MainWindow(QMainWindow):
         if is_max_mode:
             # MAX MODE: Switch to page 1 (full-screen chart)
             print("[DEBUG] Entering MAX MODE")
+            self.ensure_max_mode_chart()
 
             # Sync current symbol and timeframe to MAX MODE chart
             self.max_mode_chart.current_symbol = self.chart_panel.current_symbol
@@ -513,7 +574,7 @@ class MainWindow(QMainWindow):
         # CRITICAL: Update data_manager with MT5 data so all widgets get live data
         from core.data_manager import data_manager
         data_manager.update_from_mt5_data(data)
-        print(f"[MT5] Updated data_manager with live data for {self.current_symbol}")
+        mt5_log.debug("[MT5] Updated data_manager with live data for %s", self.current_symbol)
 
         # Feed real data to Chart Panel
         if hasattr(self, 'chart_panel'):
@@ -525,20 +586,25 @@ class MainWindow(QMainWindow):
                     self.chart_panel.plot_candlesticks()  # CRITICAL: Redraw the chart!
             # Chart auto-updates via its own timer using data_manager
 
-        # Feed real data to Order Flow widget
+        # Feed real data to Order Flow widget (whole watchlist in one scan)
         if hasattr(self, 'orderflow_widget'):
-            # Get candle data for analysis
-            df = self.mt5_connector.get_candles(self.current_symbol, self.current_timeframe, 200)
-            if df is not None and len(df) > 50:
+            from core.multi_symbol_manager import get_all_symbols
+            frames = {}
+            for symbol in dict.fromkeys([self.current_symbol] + get_all_symbols()):
+                df = self.mt5_connector.get_candles(symbol, self.current_timeframe, 200)
+                if df is not None and len(df) > 50:
+                    frames[symbol] = df
+
+            if frames:
                 # Scan for institutional orders using real data
-                self.orderflow_widget.scan_and_update(self.current_symbol, df, lookback=50)
-                print(f"[MT5] Fed {len(df)} candles to Order Flow widget for {self.current_symbol}")
+                self.orderflow_widget.scan_watchlist_and_update(frames, self.current_symbol, lookback=50)
+                mt5_log.debug("[MT5] Fed candles for %d symbols to Order Flow widget", len(frames))
 
         # Feed real data to Opportunity Scanner
         if hasattr(self, 'scanner_widget'):
             # Notify scanner that real data is available
             self.scanner_widget.set_mt5_connector(self.mt5_connector)
-            print(f"[MT5] Opportunity Scanner now using REAL market data")
+            mt5_log.debug("[MT5] Opportunity Scanner now using REAL market data")
 
         # Feed real data to Momentum Widget
         if hasattr(self, 'momentum_widget'):
@@ -546,7 +612,7 @@ class MainWindow(QMainWindow):
             market_data = self.mt5_connector.get_all_symbols_data()
             if market_data and len(market_data) > 0:
                 self.momentum_widget.scan_and_update(market_data)
-                print(f"[MT5] Fed {len(market_data)} symbols to Momentum Widget")
+                mt5_log.debug("[MT5] Fed %d symbols to Momentum Widget", len(market_data))
 
         # Feed real data to Correlation Widget
         if hasattr(self, 'correlation_widget'):
@@ -554,7 +620,7 @@ class MainWindow(QMainWindow):
             market_data = self.mt5_connector.get_all_symbols_data()
             if market_data and len(market_data) > 0:
                 self.correlation_widget.update_data(market_data)
-                print(f"[MT5] Fed {len(market_data)} symbols to Correlation Widget")
+                mt5_log.debug("[MT5] Fed %d symbols to Correlation Widget", len(market_data))
 
         # Update status
         self.status_label.setText(f"MT5 data received: {self.current_symbol} {self.current_timeframe}")
@@ -562,7 +628,7 @@ class MainWindow(QMainWindow):
     def on_mt5_error(self, error_message: str):
         """Handle MT5 error"""
         self.status_label.setText(f"MT5 Error: {error_message}")
-        print(f"[MT5 ERROR] {error_message}")
+        mt5_log.error("[MT5 ERROR] %s", error_message)
 
     def on_order_requested(self, order_type: str):
         """Handle quick order button click from controls panel"""
@@ -644,7 +710,7 @@ class MainWindow(QMainWindow):
         """Handle export action"""
         self.status_label.setText("Exporting data...")
         # Export trade journal
-        self.journal_widget.on_export_clicked()
+        self.ensure_tab_widget('journal_widget').on_export_clicked()
 
     def show_about(self):
         """Show about dialog"""
@@ -664,6 +730,7 @@ class MainWindow(QMainWindow):
 
     def on_manage_symbols(self):
         """Show symbol manager dialog"""
+        from gui.symbol_manager_dialog import SymbolManagerDialog
         dialog = SymbolManagerDialog(self)
         dialog.symbols_changed.connect(self.on_symbols_updated)
         dialog.exec()
@@ -10,9 +10,15 @@ Features:
 """
 
 import sys
+
+# Imported first so startup timings are measured from application start
+from core.startup_profiler import startup_profiler
+
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
-from gui.main_window import MainWindow
+
+with startup_profiler.measure('MainWindow', 'import'):
+    from gui.main_window import MainWindow
 
 # License system (bypassed in development mode)
 from widgets.license_dialog import check_license_on_startup
@@ -40,7 +46,8 @@ def main():
     # ================================================
 
     # Create and show main window
-    window = MainWindow()
+    with startup_profiler.measure('MainWindow', 'construct'):
+        window = MainWindow()
     window.show()
 
     # Start event loop
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Materialize ML features from cached bar history
+
+For every data/bars/<SYMBOL>_<TIMEFRAME>.csv (or .parquet), computes the
+feature store columns and writes them to data/features/. Optionally
+rewrites an EA training_data.csv with store features, so MLTradingModel is
+trained on the same features the prediction server is given, and writes
+the newest row as a store_features.json (kept current by
+scripts/run_feature_server.py).
+
+Usage:
+    python scripts/build_features.py
+    python scripts/build_features.py --timeframes H1 --symbols EURUSD
+    python scripts/build_features.py --symbols EURUSD --timeframes H1 \\
+        --training-data ML_Data/training_data.csv --output ML_Data/training_data_store.csv
+    python scripts/build_features.py --symbols EURUSD --timeframes H1 \\
+        --write-latest ../ML_Modules/ML_Data/store_features.json
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.feature_store import FEATURE_NAMES, feature_store
+from core.replay_data_source import BAR_FILE_SUFFIXES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the ML feature store from cached bars")
+    parser.add_argument('--timeframes', nargs='+', default=['M15', 'H1', 'H4'],
+                        help="Timeframes to build (default: M15 H1 H4)")
+    parser.add_argument('--symbols', nargs='*', help="Only these symbols (default: all cached)")
+    parser.add_argument('--training-data', help="EA training_data.csv to re-feature (one symbol/timeframe)")
+    parser.add_argument('--output', help="Output CSV for --training-data (default: overwrite it)")
+    parser.add_argument('--write-latest', help="Write the newest row as store_features.json (one symbol/timeframe)")
+    args = parser.parse_args()
+
+    wanted = {s.upper() for s in args.symbols} if args.symbols else None
+    start = time.perf_counter()
+    built = 0
+
+    for timeframe in args.timeframes:
+        symbols = sorted({path.stem[:-(len(timeframe) + 1)].upper()
+                          for suffix in BAR_FILE_SUFFIXES
+                          for path in feature_store.bars_dir.glob(f"*_{timeframe}{suffix}")})
+        for symbol in symbols:
+            if wanted is not None and symbol not in wanted:
+                continue
+            rows = feature_store.build(symbol, timeframe)
+            print(f"{symbol:<10} {timeframe:<4} {rows:>8} rows")
+            built += 1
+
+    print(f"\n{built} feature sets ({len(FEATURE_NAMES)} features) written to "
+          f"{feature_store.store_dir} in {time.perf_counter() - start:.2f}s")
+
+    if args.training_data or args.write_latest:
+        if not args.symbols or len(args.symbols) != 1 or len(args.timeframes) != 1:
+            parser.error("--training-data/--write-latest need exactly one --symbols and one --timeframes")
+        symbol, timeframe = args.symbols[0].upper(), args.timeframes[0]
+
+        if args.training_data:
+            samples = pd.read_csv(args.training_data)
+            frame = feature_store.training_frame(symbol, timeframe, samples)
+            output = args.output or args.training_data
+            frame.to_csv(output, index=False)
+            print(f"{len(frame)} of {len(samples)} training samples written to {output}")
+
+        if args.write_latest:
+            if feature_store.write_latest(symbol, timeframe, Path(args.write_latest)):
+                print(f"Latest {symbol} {timeframe} features written to {args.write_latest}")
+            else:
+                print(f"No stored features for {symbol} {timeframe}")
+
+
+if __name__ == '__main__':
+    main()
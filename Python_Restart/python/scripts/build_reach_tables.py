@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Pre-build take-profit reach tables from cached bar history
+
+For every data/bars/<SYMBOL>_<TIMEFRAME>.csv, computes the MFE/MAE based
+P(reach k·R before -1R) table used by the Risk-Reward Optimizer and saves
+it to data/reach_tables/, so the first TP optimization for a symbol does
+not have to build it.
+
+Usage:
+    python scripts/build_reach_tables.py
+    python scripts/build_reach_tables.py --timeframes H1 H4 --symbols EURUSD GBPUSD
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.excursion_engine import HORIZON_BARS, excursion_engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build TP reach probability tables")
+    parser.add_argument('--timeframes', nargs='+', default=['M15', 'H1', 'H4', 'D1'],
+                        help="Timeframes to build (default: M15 H1 H4 D1)")
+    parser.add_argument('--symbols', nargs='*', help="Only these symbols (default: all cached)")
+    args = parser.parse_args()
+
+    wanted = {s.upper() for s in args.symbols} if args.symbols else None
+    start = time.perf_counter()
+    built = 0
+
+    for timeframe in args.timeframes:
+        for path in sorted(excursion_engine.bars_dir.glob(f"*_{timeframe}.csv")):
+            symbol = path.stem[:-(len(timeframe) + 1)].upper()
+            if wanted is not None and symbol not in wanted:
+                continue
+
+            table = excursion_engine.build_table(symbol, timeframe)
+            if table is None:
+                print(f"{symbol} {timeframe}: not enough history")
+                continue
+
+            p2r = table.probability('BUY', 1.0, 2.0) * 100
+            print(f"{symbol:<10} {timeframe:<4} {table.samples:>7} entries  "
+                  f"horizon {HORIZON_BARS.get(timeframe, table.horizon):>3} bars  "
+                  f"P(2R before -1R, 1 ATR stop) {p2r:.1f}%")
+            built += 1
+
+    print(f"\n{built} tables written to {excursion_engine.cache_dir} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
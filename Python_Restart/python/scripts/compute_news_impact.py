@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compute empirical news-impact statistics
+
+Reads past events from data/economic_calendar.json and cached bars from
+data/bars/<SYMBOL>_<TIMEFRAME>.csv, measures how price reacted after each
+release and writes data/news_impact_table.json.
+
+The News Impact Predictor loads that table at startup, so re-run this
+whenever new events (with actuals) or new bar history are added.
+
+Usage:
+    python scripts/compute_news_impact.py
+    python scripts/compute_news_impact.py --timeframe M5 --windows 15 60 240
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.news_impact_stats import (
+    BARS_DIR, CALENDAR_FILE, DEFAULT_WINDOWS, IMPACT_TABLE_FILE, PRIMARY_WINDOW,
+    compute_impact_table, save_impact_table
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute news impact table from historical bars")
+    parser.add_argument('--calendar', default=str(CALENDAR_FILE), help="Calendar JSON file")
+    parser.add_argument('--bars-dir', default=str(BARS_DIR), help="Directory with cached bar CSVs")
+    parser.add_argument('--timeframe', default='M1', help="Bar timeframe suffix (default: M1)")
+    parser.add_argument('--windows', type=int, nargs='+', default=list(DEFAULT_WINDOWS),
+                        help="Post-release windows in minutes")
+    parser.add_argument('--primary', type=int, default=PRIMARY_WINDOW,
+                        help="Window used for the headline pip impact")
+    parser.add_argument('--symbols', nargs='*', help="Only these symbols (default: all cached)")
+    parser.add_argument('--output', default=str(IMPACT_TABLE_FILE), help="Output JSON file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = compute_impact_table(
+        calendar_file=Path(args.calendar),
+        bars_dir=Path(args.bars_dir),
+        timeframe=args.timeframe,
+        windows=args.windows,
+        primary_window=args.primary,
+        symbols=args.symbols,
+    )
+    save_impact_table(table, Path(args.output))
+    elapsed = time.perf_counter() - start
+
+    print("=" * 60)
+    print(f"NEWS IMPACT TABLE ({args.primary}min window)")
+    print("=" * 60)
+    for name, stats in table['events'].items():
+        print(f"{name:<36} {stats['avg_range_pips']:>7.1f} pips  "
+              f"{stats['currency_bullish_pct']:>5.1f}% bullish  "
+              f"peak {stats['median_minutes_to_peak']:>5.1f}min  (n={stats['samples']})")
+    print("-" * 60)
+    print(f"{len(table['events'])} events written to {args.output} in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
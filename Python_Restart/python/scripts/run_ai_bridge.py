@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Run the AI bridge server the EA's CAIBridgePipe connects to
+
+Answers ping / market_data / get_signal / risk_score over the EA's
+length-prefixed framing (core/ai_bridge_server.py). Signals use the spread
+rules of ml_service_multisymbol.py and, when --model-dir holds a trained
+trading_model.pkl / feature_scaler.pkl, the MLTradingModel of
+ML_Modules/ml_training_service.py.
+
+Usage:
+    python scripts/run_ai_bridge.py                       # \\\\.\\pipe\\mt5_ai_bridge on Windows
+    python scripts/run_ai_bridge.py --address /tmp/mt5_ai_bridge.sock
+    python scripts/run_ai_bridge.py --model-dir ../ML_Modules
+    python scripts/run_ai_bridge.py --client --requests 500   # round trips against a running server
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.ai_bridge_server import AIBridgeServer, BridgeClient, SignalEngine, default_address
+
+# ml_service_multisymbol.py and ML_Modules/ live next to the python/ package
+ML_ROOT = Path(__file__).resolve().parent.parent.parent
+STATS_INTERVAL = 60.0
+
+
+def load_spread_predictor():
+    """MultiSymbolMLService.generate_prediction (None if the module is missing)"""
+    sys.path.insert(0, str(ML_ROOT))
+    try:
+        from ml_service_multisymbol import MultiSymbolMLService
+    except ImportError as e:
+        print(f"[AIBridge] Spread rules unavailable ({e}) - neutral signals")
+        return None
+    # __init__ needs MetaTrader5 and the terminal directory; the rules need neither
+    return MultiSymbolMLService.__new__(MultiSymbolMLService).generate_prediction
+
+
+def load_model(model_dir: Path):
+    """Trained MLTradingModel from `model_dir` (None if unavailable)"""
+    sys.path.insert(0, str(ML_ROOT / 'ML_Modules'))
+    try:
+        import ml_training_service
+    except ImportError as e:
+        print(f"[AIBridge] MLTradingModel unavailable ({e}) - spread rules only")
+        return None
+    ml_training_service.MODEL_FILE = str(model_dir / 'trading_model.pkl')
+    ml_training_service.SCALER_FILE = str(model_dir / 'feature_scaler.pkl')
+    ml_training_service.ENSEMBLE_FILE = str(model_dir / 'trading_model.npz')
+    model = ml_training_service.MLTradingModel()
+    return model if model.load() else None
+
+
+async def serve(args):
+    model = load_model(Path(args.model_dir).expanduser()) if args.model_dir else None
+    server = AIBridgeServer(SignalEngine(load_spread_predictor(), model), args.address)
+    await server.start()
+    print(f"[AIBridge] Listening on {server.address}" + (" (MLTradingModel loaded)" if model else ""))
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    try:
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), STATS_INTERVAL)
+            except asyncio.TimeoutError:
+                stats = server.stats()
+                signal_ms = stats['latency'].get('get_signal', {})
+                print(f"[AIBridge] {stats['requests']} requests, {stats['errors']} errors, "
+                      f"{stats['open_connections']} clients, get_signal p50 "
+                      f"{signal_ms.get('p50_ms', 0)} ms / p99 {signal_ms.get('p99_ms', 0)} ms")
+    finally:
+        await server.stop()
+    return 0
+
+
+def run_client(args):
+    """Send synthetic market data, then time get_signal / risk_score round trips"""
+    from benchmarks.synthetic_data import generate_ohlcv
+
+    bars = generate_ohlcv(50, seed=1, symbol=args.symbol, timeframe='H1')
+    close = float(bars['close'].iloc[-1])
+
+    with BridgeClient(args.address) as client:
+        client.send_market_data(args.symbol, 'H1', bars, bid=close, ask=close * 1.00012, spread=12)
+        timings = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            direction, confidence = client.get_signal(args.symbol)
+            timings.append(time.perf_counter() - start)
+        risk_score, factors = client.get_risk_score(args.symbol)
+
+    ms = np.array(timings) * 1000.0
+    print(f"{args.symbol}: direction={direction} confidence={confidence} "
+          f"risk={risk_score} ({factors})")
+    print(f"get_signal round trip over {len(ms)} requests: p50 {np.percentile(ms, 50):.3f} ms, "
+          f"p99 {np.percentile(ms, 99):.3f} ms, max {ms.max():.3f} ms")
+    return 0 if client.error_count == 0 else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AI bridge server for the EA's CAIBridgePipe")
+    parser.add_argument('--address', default=default_address(),
+                        help="Named pipe, Unix socket path or tcp://host:port (default: %(default)s)")
+    parser.add_argument('--model-dir', help="Directory with trading_model.pkl and feature_scaler.pkl")
+    parser.add_argument('--client', action='store_true',
+                        help="Connect to a running server and measure round trips")
+    parser.add_argument('--symbol', default='EURUSD', help="Symbol for --client (default: %(default)s)")
+    parser.add_argument('--requests', type=int, default=200,
+                        help="get_signal requests for --client (default: %(default)s)")
+    args = parser.parse_args()
+
+    try:
+        if args.client:
+            return run_client(args)
+        return asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
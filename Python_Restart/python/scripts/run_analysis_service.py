@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Run the analysis stack headless and publish results to GUI clients
+
+Polls the EA export (market_data.json), runs data_manager, the Smart Money
+detectors, opportunity generation and ML status on every update, and
+publishes each result on a local TCP socket (JSON lines) and/or a JSON
+file. Needs no PyQt6, so it can run on a headless Linux box next to the
+terminal and serve several dashboards.
+
+Usage:
+    python scripts/run_analysis_service.py --data-dir ~/.wine/drive_c/.../Common/Files/AppleTrader
+    python scripts/run_analysis_service.py --port 47800 --output analysis_latest.json
+    python scripts/run_analysis_service.py --listen            # print what a client receives
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Core QObjects use plain Python signals/timers (must be set before core imports)
+os.environ['TRADING_APP_HEADLESS'] = '1'
+
+from core.analysis_service import (
+    DEFAULT_HOST, DEFAULT_POLL_INTERVAL, DEFAULT_PORT, DEFAULT_TIMEFRAME,
+    AnalysisService, FilePublisher, SocketPublisher, stream_results
+)
+
+
+async def listen(host: str, port: int):
+    async for message in stream_results(host, port):
+        if message['type'] == 'analysis':
+            print(f"#{message['sequence']} {message['timestamp']}  {len(message['symbols'])} symbols  "
+                  f"{len(message['opportunities'])} opportunities  {message['duration_ms']} ms")
+        else:
+            print(f"[{message['type']}] {message}")
+
+
+async def serve(args):
+    publishers = []
+    if not args.no_socket:
+        publishers.append(SocketPublisher(args.host, args.port))
+    if args.output:
+        publishers.append(FilePublisher(Path(args.output)))
+
+    service = AnalysisService(symbols=args.symbols, timeframe=args.timeframe,
+                              poll_interval=args.interval, publishers=publishers)
+    if args.data_dir:
+        service.connector.set_data_directory(Path(args.data_dir).expanduser())
+    if service.connector.market_data_file is None:
+        print("No EA data directory found (set --data-dir)")
+        return 1
+
+    def log_result(message):
+        if message['type'] == 'analysis':
+            print(f"[AnalysisService] #{message['sequence']} {len(message['symbols'])} symbols "
+                  f"in {message['duration_ms']} ms")
+
+    service.add_listener(log_result)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, service.stop)
+        except NotImplementedError:  # Windows
+            pass
+
+    print(f"[AnalysisService] Watching {service.connector.market_data_file}")
+    for publisher in publishers:
+        target = publisher.path if isinstance(publisher, FilePublisher) else f"{args.host}:{args.port}"
+        print(f"[AnalysisService] Publishing to {target}")
+    await service.run()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless analysis service")
+    parser.add_argument('--data-dir', help="EA export directory (default: MT5 Common Files)")
+    parser.add_argument('--symbols', nargs='*', help="Symbols to analyse (default: all exported)")
+    parser.add_argument('--timeframe', default=DEFAULT_TIMEFRAME,
+                        help="Analysis timeframe (default: %(default)s)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="Seconds between polls of the EA export (default: %(default)s)")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Socket host (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Socket port (default: %(default)s)")
+    parser.add_argument('--no-socket', action='store_true', help="Do not publish on a socket")
+    parser.add_argument('--output', help="Also write the latest result to this JSON file")
+    parser.add_argument('--listen', action='store_true',
+                        help="Connect to a running service and print its messages")
+    args = parser.parse_args()
+
+    try:
+        if args.listen:
+            asyncio.run(listen(args.host, args.port))
+            return 0
+        return asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Serve feature store vectors to the ML prediction server
+
+Refreshes the feature store of one symbol/timeframe from the terminal (bar
+resampler) and writes the newest row to ML_Data/store_features.json every
+time a bar closes. Run ML_Modules/ml_training_service.py --store-features
+next to it, so a model trained on store features (build_features.py
+--training-data) is given the same features at inference, not the EA's
+z-scored current_features.json.
+
+Usage:
+    python scripts/run_feature_server.py --symbol EURUSD --timeframe H1
+    python scripts/run_feature_server.py --symbol EURUSD --timeframe H1 --output /path/to/ML_Data/store_features.json
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.feature_store import SERVING_FILE_NAME, feature_store
+from core.replay_data_source import TIMEFRAME_SECONDS
+
+DEFAULT_OUTPUT = Path(__file__).parent.parent.parent / "ML_Modules" / "ML_Data" / SERVING_FILE_NAME
+DEFAULT_INTERVAL = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the latest feature store row for PredictionServer")
+    parser.add_argument('--symbol', required=True, help="Symbol the model predicts")
+    parser.add_argument('--timeframe', required=True, choices=sorted(TIMEFRAME_SECONDS),
+                        help="Timeframe the model was trained on")
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT), help="Features file (default: %(default)s)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help="Seconds between store refreshes (default: %(default)s)")
+    args = parser.parse_args()
+
+    symbol, output = args.symbol.upper(), Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    print(f"[FeatureServer] {symbol} {args.timeframe} -> {output}")
+
+    try:
+        while True:
+            if feature_store.refresh_latest(symbol, args.timeframe, output):
+                row = feature_store.latest(symbol, args.timeframe)
+                print(f"[FeatureServer] {time.strftime('%H:%M:%S')} bar "
+                      f"{time.strftime('%Y-%m-%d %H:%M', time.gmtime(row['time']))} written")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
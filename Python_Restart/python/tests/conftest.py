@@ -0,0 +1,6 @@
+"""Make the application packages (core, widgets, ...) importable from tests"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,68 @@
+"""Tests for core/ai_bridge_server.py"""
+
+import numpy as np
+
+from benchmarks.synthetic_data import generate_ohlcv
+from core.ai_bridge_server import SignalEngine
+from core.feature_store import FEATURE_NAMES, compute_features, context_bars
+from core.replay_data_source import rates_from_frame
+
+
+class StoreModel:
+    """Model trained on the feature store's FEATURE_NAMES"""
+
+    class scaler:
+        n_features_in_ = len(FEATURE_NAMES)
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_probability(self, features):
+        self.calls.append(list(features))
+        return {'probability': 0.7, 'confidence': 0.4, 'signal': 'WAIT'}
+
+
+class ContextStore:
+    def __init__(self, rates):
+        self.rates = rates
+
+    def context_rates(self, symbol, timeframe):
+        return self.rates
+
+
+def market_data(rates):
+    """market_data as BuildJSON() sends it: 50 bars newest first, with open times"""
+    ohlcv = [{'t': int(bar['time']), 'o': bar['open'], 'h': bar['high'], 'l': bar['low'],
+              'c': bar['close'], 'v': int(bar['tick_volume'])} for bar in rates[-50:][::-1]]
+    return {'type': 'market_data', 'symbol': 'EURUSD', 'timeframe': 'PERIOD_H1',
+            'timestamp': int(rates['time'][-1]), 'bid': float(rates['close'][-1]),
+            'ask': float(rates['close'][-1]) + 0.0001, 'spread': 10, 'ohlcv': ohlcv}
+
+
+def test_store_model_gets_features_from_snapshot_bars():
+    rates = rates_from_frame(generate_ohlcv(600, seed=3, symbol='EURUSD', timeframe='H1'))
+    model = StoreModel()
+    engine = SignalEngine(model=model, store=ContextStore(rates[:-10]))
+
+    engine.update_market(market_data(rates))
+    prediction, source = engine.predict('EURUSD')
+
+    assert source == 'model'
+    # History = seeded context + the snapshot's closed bars (newest one still forming)
+    history = engine.history[('EURUSD', 'H1')]
+    assert np.array_equal(history['time'], rates['time'][:-1][-context_bars('H1'):])
+    # Same row the store computes for the last closed bar
+    columns = compute_features(rates[:-1], 'H1', 'EURUSD')
+    expected = np.nan_to_num([columns[name][-1] for name in FEATURE_NAMES])
+    assert np.allclose(model.calls[-1], expected)
+
+
+def test_store_model_waits_for_warm_history():
+    rates = rates_from_frame(generate_ohlcv(60, seed=3, symbol='EURUSD', timeframe='H1'))
+    model = StoreModel()
+    engine = SignalEngine(model=model, store=ContextStore(None))
+
+    engine.update_market(market_data(rates))
+    assert engine.uses_model('EURUSD')
+    assert engine.predict('EURUSD')[1] == 'rules'
+    assert model.calls == []
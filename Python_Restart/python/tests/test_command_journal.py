@@ -0,0 +1,33 @@
+"""Tests for core/command_journal.py"""
+
+import json
+
+from core.command_journal import ACK_FILE, JOURNAL_FILE, CommandJournal
+
+
+def read_journal(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_sequence_continues_across_reopen(tmp_path):
+    journal = CommandJournal(tmp_path)
+    assert journal.append('FILTER_TOGGLE', {'enabled': True}, flush=True) == 1
+    journal.close()
+
+    reopened = CommandJournal(tmp_path)
+    assert reopened.append('FILTER_TOGGLE', {'enabled': False}, flush=True) == 2
+    reopened.close()
+
+
+def test_deleted_journal_continues_above_ack(tmp_path):
+    (tmp_path / ACK_FILE).write_text(json.dumps({'seq': 5, 'offset': 400, 'generation': 3}))
+
+    journal = CommandJournal(tmp_path)
+    seq = journal.append('PLACE_ORDER', {'type': 'BUY', 'volume': 0.1}, flush=True)
+    journal.close()
+
+    assert seq == 6
+    assert journal.pending_count() == 1
+    header, record = read_journal(tmp_path / JOURNAL_FILE)
+    assert header['generation'] == 4
+    assert record['seq'] == 6 and record['command'] == 'PLACE_ORDER'
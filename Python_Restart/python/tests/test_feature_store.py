@@ -0,0 +1,26 @@
+"""Tests for core/feature_store.py"""
+
+import json
+
+import core.feature_store as fs
+from benchmarks.synthetic_data import generate_ohlcv
+from core.feature_store import FEATURE_NAMES, FeatureStore
+from core.replay_data_source import rates_from_frame
+
+
+def test_refresh_latest_writes_serving_file_once_per_closed_bar(tmp_path, monkeypatch):
+    rates = rates_from_frame(generate_ohlcv(400, seed=5, symbol='EURUSD', timeframe='H1'))
+    closed = {'bars': 300}
+    monkeypatch.setattr(fs.bar_resampler, 'copy_rates',
+                        lambda symbol, timeframe, count, include_partial=True: rates[:closed['bars']][-count:])
+    store = FeatureStore(tmp_path / "bars", tmp_path / "features")
+    path = tmp_path / fs.SERVING_FILE_NAME
+
+    assert store.refresh_latest('EURUSD', 'H1', path)
+    assert not store.refresh_latest('EURUSD', 'H1', path)
+
+    closed['bars'] = 301
+    assert store.refresh_latest('EURUSD', 'H1', path)
+    payload = json.loads(path.read_text())
+    assert len(payload['features']) == len(FEATURE_NAMES)
+    assert store.latest('EURUSD', 'H1')['time'] == rates['time'][300]
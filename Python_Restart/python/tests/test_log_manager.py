@@ -0,0 +1,17 @@
+"""Tests for core/log_manager.py and the TRADING_APP_LOG_LEVELS parsing"""
+
+import logging
+
+from core import dev_config
+from core.log_manager import log_manager
+
+
+def test_unknown_env_levels_are_skipped(monkeypatch):
+    monkeypatch.setattr(dev_config, 'LOG_LEVELS', 'scanner=WARN1, data_manager=debug')
+    assert dev_config.get_log_levels() == {'data_manager': 'DEBUG'}
+
+
+def test_set_level_ignores_unknown_names():
+    log_manager.set_level('test_category', 'ERROR')
+    assert log_manager.set_level('test_category', 'WARN1') is False
+    assert log_manager.get_logger('test_category').level == logging.ERROR
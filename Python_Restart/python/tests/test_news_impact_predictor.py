@@ -0,0 +1,22 @@
+"""Tests for widgets/news_impact_predictor.py"""
+
+from widgets.news_impact_predictor import EventNameMatcher
+
+
+def test_exact_key_wins():
+    matcher = EventNameMatcher(['CPI', 'CPI m/m', 'DEFAULT'])
+    assert matcher.match('CPI m/m') == 'CPI m/m'
+
+
+def test_first_contained_key_in_database_order():
+    # 'CPI' is a prefix of 'CPI m/m' and listed first, so it wins like the linear lookup
+    assert EventNameMatcher(['CPI', 'CPI m/m', 'DEFAULT']).match('US CPI m/m (Oct)') == 'CPI'
+    assert EventNameMatcher(['CPI m/m', 'CPI', 'DEFAULT']).match('US CPI m/m (Oct)') == 'CPI m/m'
+
+
+def test_case_insensitive_and_default():
+    matcher = EventNameMatcher(['Non-Farm Payrolls', 'DEFAULT'])
+    assert matcher.match('US NON-FARM PAYROLLS') == 'Non-Farm Payrolls'
+    assert matcher.match('Building Permits') == 'DEFAULT'
+    # Memoized result is returned again
+    assert matcher.match('Building Permits') == 'DEFAULT'
@@ -0,0 +1,29 @@
+"""Tests for core/news_impact_stats.py"""
+
+import numpy as np
+import pandas as pd
+
+from core.news_impact_stats import build_impact_table, measure_reactions
+
+TIMES = pd.date_range('2024-01-01', periods=600, freq='min')
+
+
+def random_walk(start, step):
+    close = start + np.cumsum(np.random.default_rng(1).normal(0, step, len(TIMES)))
+    return pd.DataFrame({'time': TIMES, 'open': close, 'high': close + step,
+                         'low': close - step, 'close': close})
+
+
+def test_headline_stats_use_forex_pairs_only():
+    events = pd.DataFrame({'name': ['Non-Farm Payrolls'], 'currency': ['USD'],
+                           'timestamp': [TIMES[200]], 'actual': [1.0], 'forecast': [0.5]})
+    bars = {'EURUSD': random_walk(1.1, 0.0002), 'XAUUSD': random_walk(2000, 0.5)}
+
+    entry = build_impact_table(measure_reactions(events, bars))['events']['Non-Farm Payrolls']
+
+    assert entry['asset_class'] == 'forex'
+    assert entry['avg_range_pips'] == entry['symbols']['EURUSD']['avg_range_pips']
+    assert set(entry['asset_classes']) == {'forex', 'commodity'}
+    # Gold is measured in points of 0.01, not in 0.0001 "pips"
+    gold = entry['symbols']['XAUUSD']['avg_range_pips']
+    assert gold < 10_000
@@ -0,0 +1,50 @@
+"""Tests for widgets/order_flow_detector.py"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from widgets.order_flow_detector import InstitutionalOrderFlowDetector
+
+
+def spike_frame(spikes, candles=50):
+    """Flat candles with a bullish high-volume sweep candle every 4th bar from bar 12"""
+    now = datetime.now().replace(second=0, microsecond=0)
+    open_ = np.full(candles, 1.1000)
+    close = open_.copy()
+    volume = np.full(candles, 100.0)
+    for idx in range(12, 12 + 4 * spikes, 4):
+        close[idx] = 1.1030  # 30 pip body
+        volume[idx] = 2000.0
+    return pd.DataFrame({
+        'time': [now - timedelta(minutes=15 * (candles - i)) for i in range(candles)],
+        'open': open_, 'high': np.maximum(open_, close), 'low': np.minimum(open_, close),
+        'close': close, 'volume': volume,
+    })
+
+
+def make_detector():
+    detector = InstitutionalOrderFlowDetector()
+    detector._pip_sizes = {f"SYM{i:02d}": 0.0001 for i in range(30)}
+    return detector
+
+
+def test_rescans_do_not_duplicate_orders():
+    detector = make_detector()
+    frames = {'SYM00': spike_frame(10)}
+
+    assert len(detector.scan_watchlist(frames)['SYM00']) == 10
+    assert detector.scan_watchlist(frames)['SYM00'] == []
+    assert len(detector.get_recent_orders('SYM00')) == 10
+
+
+def test_watchlist_does_not_evict_active_symbol():
+    detector = make_detector()
+    frames = {f"SYM{i:02d}": spike_frame(10) for i in range(30)}
+
+    for _ in range(3):
+        detector.scan_watchlist(frames)
+
+    assert len(detector.get_recent_orders('SYM00')) == 10
+    assert len(detector.order_history) == 300
@@ -0,0 +1,20 @@
+"""Tests for core/pattern_stats_store.py"""
+
+from core.pattern_stats_store import PatternStatsStore
+
+
+def test_ea_files_reachable_twice_load_once(tmp_path, monkeypatch):
+    ea_dir = tmp_path / "MLTrainingData"
+    ea_dir.mkdir()
+    (ea_dir / "IGTR_PatternPerformance_EURUSD.csv").write_text(
+        "PatternName,Regime,TotalTrades,WinningTrades,TotalPnL,AvgRR\n"
+        "Bullish Engulfing,0,10,6,250.0,1.8\n")
+    monkeypatch.chdir(tmp_path)
+
+    store = PatternStatsStore(tmp_path / "pattern_stats.json")
+    # Same directory through an absolute and a cwd-relative path
+    store.load_ea_performance([ea_dir, "MLTrainingData"])
+    store.load_ea_performance([ea_dir])
+
+    stats = store.lookup('Bullish Engulfing')
+    assert (stats.trades, stats.wins) == (10, 6)
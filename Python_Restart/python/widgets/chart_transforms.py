@@ -0,0 +1,163 @@
+"""
+AppleTrader Pro - Chart Transforms
+Vectorized price/volume series and matplotlib collections for the chart types
+
+Each chart type is drawn with two or three artists built from whole arrays
+(a LineCollection of wicks, a PolyCollection of bodies, ...) instead of one
+plot()/Rectangle per bar, so switching chart type or symbol re-renders
+thousands of bars without per-bar Python work.
+
+x positions are matplotlib date numbers; widths are fractions of the bar
+spacing, so candles never overlap whatever the timeframe.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.colors import to_rgba
+from matplotlib.collections import LineCollection, PolyCollection
+
+CHART_TYPES = ('Candlesticks', 'OHLC Bars', 'Line Chart', 'Heikin Ashi', 'Area Chart')
+
+BULL_COLOR = '#00ff00'
+BEAR_COLOR = '#ff0000'
+WICK_COLOR = '#666'
+LINE_COLOR = '#00aaff'
+
+# Fractions of the bar spacing
+BODY_WIDTH = 0.6
+TICK_WIDTH = 0.3
+VOLUME_WIDTH = 0.8
+
+# Bars of Heikin-Ashi history that still move ha_open (weights halve per bar,
+# 2^-64 is far below double precision)
+HA_WINDOW = 64
+
+
+def date_numbers(times):
+    """Matplotlib date numbers of MT5 epoch seconds (scalar or array)"""
+    return mdates.date2num(np.asarray(times).astype('datetime64[s]'))
+
+
+def bar_positions(times: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Date numbers of MT5 epoch seconds and the typical bar spacing in days"""
+    x = date_numbers(times)
+    spacing = float(np.median(np.diff(x))) if len(x) > 1 else 1.0
+    return x, spacing if spacing > 0 else 1.0
+
+
+def heikin_ashi(opens, highs, lows, closes) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Heikin-Ashi open/high/low/close without the per-bar recurrence
+
+    ha_open[i] = (ha_open[i-1] + ha_close[i-1]) / 2 unrolls to
+    ha_open[0] / 2^i + sum over m = 1..i of ha_close[i-m] / 2^m, i.e. a
+    convolution of ha_close with a halving kernel plus the decaying seed.
+    """
+    opens = np.asarray(opens, dtype=float)
+    highs = np.asarray(highs, dtype=float)
+    lows = np.asarray(lows, dtype=float)
+    closes = np.asarray(closes, dtype=float)
+    n = len(opens)
+    if n == 0:
+        empty = np.empty(0)
+        return empty, empty, empty, empty
+
+    ha_close = (opens + highs + lows + closes) / 4
+    kernel = np.concatenate(([0.0], 0.5 ** np.arange(1, HA_WINDOW + 1)))
+    ha_open = np.convolve(ha_close, kernel)[:n]
+    ha_open += (opens[0] + closes[0]) / 2 * 0.5 ** np.arange(n)
+
+    ha_high = np.maximum(highs, np.maximum(ha_open, ha_close))
+    ha_low = np.minimum(lows, np.minimum(ha_open, ha_close))
+    return ha_open, ha_high, ha_low, ha_close
+
+
+def direction_colors(opens, closes) -> np.ndarray:
+    """(n, 4) RGBA bull/bear colour per bar (close >= open is bullish)"""
+    bullish = np.asarray(closes) >= np.asarray(opens)
+    return np.where(bullish[:, None], to_rgba(BULL_COLOR), to_rgba(BEAR_COLOR))
+
+
+def _rectangles(x: np.ndarray, width: float, bottom: np.ndarray, top: np.ndarray) -> np.ndarray:
+    """(n, 4, 2) vertices of bars centred on x"""
+    left = x - width / 2
+    right = x + width / 2
+    return np.stack([np.column_stack([left, bottom]), np.column_stack([left, top]),
+                     np.column_stack([right, top]), np.column_stack([right, bottom])], axis=1)
+
+
+def _segments(x0, y0, x1, y1) -> np.ndarray:
+    """(n, 2, 2) line segments"""
+    return np.stack([np.column_stack([x0, y0]), np.column_stack([x1, y1])], axis=1)
+
+
+def candle_collections(x, opens, highs, lows, closes, spacing: float) -> List:
+    """Wicks and bodies of a candlestick (or Heikin-Ashi) series"""
+    colors = direction_colors(opens, closes)
+    wicks = LineCollection(_segments(x, lows, x, highs), colors=WICK_COLOR, linewidths=1, zorder=1)
+    bodies = PolyCollection(_rectangles(x, spacing * BODY_WIDTH, np.minimum(opens, closes),
+                                        np.maximum(opens, closes)),
+                            facecolors=colors, edgecolors=colors, alpha=0.8, zorder=2)
+    return [wicks, bodies]
+
+
+def ohlc_collections(x, opens, highs, lows, closes, spacing: float) -> List:
+    """High-low bars with open (left) and close (right) ticks, one collection"""
+    colors = direction_colors(opens, closes)
+    tick = spacing * TICK_WIDTH
+    segments = np.concatenate([_segments(x, lows, x, highs),
+                               _segments(x - tick, opens, x, opens),
+                               _segments(x, closes, x + tick, closes)])
+    return [LineCollection(segments, colors=np.concatenate([colors] * 3), linewidths=2, zorder=2)]
+
+
+def volume_collections(x, volumes, opens, closes, spacing: float) -> List:
+    """Volume bars coloured by candle direction"""
+    volumes = np.asarray(volumes, dtype=float)
+    colors = direction_colors(opens, closes)
+    bars = PolyCollection(_rectangles(x, spacing * VOLUME_WIDTH, np.zeros_like(volumes), volumes),
+                          facecolors=colors, edgecolors='none', alpha=0.5)
+    return [bars]
+
+
+def line_style(chart_type: str, closes) -> Dict:
+    """Colour and fill alpha of the close-price line/area charts"""
+    if chart_type == 'Area Chart':
+        color = BULL_COLOR if closes[-1] >= closes[0] else BEAR_COLOR
+        return {'color': color, 'fill_alpha': 0.3}
+    return {'color': LINE_COLOR, 'fill_alpha': 0.1}
+
+
+def plot_price(ax, chart_type: str, x, rates, spacing: float):
+    """Draw `rates` on `ax` as `chart_type` (one of CHART_TYPES)"""
+    opens, highs, lows, closes = rates['open'], rates['high'], rates['low'], rates['close']
+
+    if chart_type in ('Line Chart', 'Area Chart'):
+        style = line_style(chart_type, closes)
+        ax.plot(x, closes, color=style['color'], linewidth=2, zorder=2)
+        # Fill down to the lowest close, not to zero, so the price range keeps the axis
+        ax.fill_between(x, closes, np.min(closes), alpha=style['fill_alpha'], color=style['color'], zorder=1)
+        return
+
+    if chart_type == 'Heikin Ashi':
+        collections = candle_collections(x, *heikin_ashi(opens, highs, lows, closes), spacing)
+    elif chart_type == 'OHLC Bars':
+        collections = ohlc_collections(x, opens, highs, lows, closes, spacing)
+    else:
+        collections = candle_collections(x, opens, highs, lows, closes, spacing)
+    _add_collections(ax, collections)
+
+
+def plot_volume(ax, x, rates, spacing: float):
+    """Draw the tick volume of `rates` on `ax`"""
+    _add_collections(ax, volume_collections(x, rates['tick_volume'], rates['open'],
+                                            rates['close'], spacing))
+
+
+def _add_collections(ax, collections: List):
+    for collection in collections:
+        ax.add_collection(collection)
+    # add_collection() only extends the data limits; rescale once for all of them
+    ax.autoscale_view()
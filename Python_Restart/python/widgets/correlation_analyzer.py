@@ -10,6 +10,8 @@ import numpy as np
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from core.instrumentation import instrumentation
+
 
 class CorrelationPair:
     """Correlation data for a pair of symbols"""
@@ -89,6 +91,7 @@ class MultiSymbolCorrelationAnalyzer:
             ('GBPUSD', 'USDCHF'): -0.75,
         }
 
+    @instrumentation.timed('analyzer')
     def calculate_correlations(self, market_data: Dict[str, pd.DataFrame],
                               short_period: int = 20,
                               long_period: int = 100) -> Dict:
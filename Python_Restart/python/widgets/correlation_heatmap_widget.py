@@ -18,6 +18,7 @@ from core.demo_mode_manager import demo_mode_manager, is_demo_mode, get_demo_dat
 from core.verbose_mode_manager import vprint
 from core.multi_symbol_manager import get_all_symbols
 from core.verbose_mode_manager import vprint
+from core.instrumentation import instrumentation
 
 
 class CorrelationHeatmapWidget(QWidget, AIAssistMixin):
@@ -153,6 +154,7 @@ class CorrelationHeatmapWidget(QWidget, AIAssistMixin):
             print(f"    ⚠️ MT5 fetch error: {e}")
             return {}
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
@@ -630,6 +632,7 @@ class CorrelationHeatmapWidget(QWidget, AIAssistMixin):
         self.status_label.setText("Refreshing...")
         # Actual data calculation done by parent/controller
 
+    @instrumentation.timed('widget')
     def scan_and_update(self, market_data: Dict[str, pd.DataFrame],
                        short_period: int = 20, long_period: int = 100):
         """
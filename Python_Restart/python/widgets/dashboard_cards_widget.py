@@ -13,6 +13,7 @@ from core.ai_assist_base import AIAssistMixin
 from core.demo_mode_manager import is_demo_mode, get_demo_data
 from core.data_manager import data_manager
 import random
+from core.instrumentation import instrumentation
 
 
 class DashboardCard(QFrame):
@@ -144,6 +145,7 @@ class DashboardCardsWidget(AIAssistMixin, QWidget):
         self.current_symbol = symbol
         self.update_data()
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update all cards with current data"""
         if is_demo_mode():
@@ -19,6 +19,7 @@ from datetime import datetime
 from widgets.equity_curve_analyzer import equity_curve_analyzer
 from core.ai_assist_base import AIAssistMixin
 from core.demo_mode_manager import demo_mode_manager, is_demo_mode, get_demo_data
+from core.instrumentation import instrumentation
 
 
 class EquityCurveCanvas(FigureCanvasQTAgg):
@@ -364,6 +365,7 @@ class EquityCurveWidget(AIAssistMixin, QWidget):
                 entry_time, exit_time, profit, pips
             )
 
+    @instrumentation.timed('widget')
     def refresh_display(self):
         """Refresh all displays with current data"""
         # Update balance/equity
@@ -499,6 +501,7 @@ class EquityCurveWidget(AIAssistMixin, QWidget):
         self.max_dd_label.setText("0.0%")
         self.alerts_text.setPlainText("No data")
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
@@ -10,6 +10,8 @@ import numpy as np
 from datetime import datetime
 from collections import defaultdict
 
+from core.instrumentation import instrumentation
+
 
 class MTFStructureMap:
     """
@@ -37,6 +39,7 @@ class MTFStructureMap:
         self.trend_analysis = {}    # {timeframe: trend_direction}
         self.last_update = None
 
+    @instrumentation.timed('analyzer')
     def analyze_structure(self, data_by_timeframe: Dict[str, pd.DataFrame],
                          current_price: float) -> Dict:
         """
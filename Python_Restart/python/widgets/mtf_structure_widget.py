@@ -21,6 +21,7 @@ from analysis.order_block_detector import order_block_detector
 from analysis.liquidity_sweep_detector import liquidity_sweep_detector
 from analysis.fair_value_gap_detector import fair_value_gap_detector
 from analysis.market_structure_detector import market_structure_detector
+from core.instrumentation import instrumentation
 
 
 class MTFStructureWidget(QWidget, AIAssistMixin):
@@ -504,6 +505,7 @@ class MTFStructureWidget(QWidget, AIAssistMixin):
             self.current_symbol = symbol
             self.on_refresh_requested()
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
@@ -4,11 +4,14 @@ Economic calendar with historical impact analysis
 Prevents spike losses and identifies high-probability news trades
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from enum import Enum
+from bisect import bisect_left, bisect_right
+
+from core.news_impact_stats import load_impact_table
 
 
 class ImpactLevel(Enum):
@@ -72,6 +75,130 @@ class NewsEvent:
         }
 
 
+class EconomicCalendar:
+    """
+    Time-indexed store of NewsEvents
+
+    Events are kept sorted by timestamp with per-currency sub-indexes (all
+    events and high-impact only), so interval queries are a bisect plus the
+    matching slice instead of a scan and re-sort of every event.
+    """
+
+    HIGH_IMPACT = (ImpactLevel.EXTREME, ImpactLevel.HIGH)
+
+    def __init__(self, events: Optional[Iterable[NewsEvent]] = None):
+        self._times: List[datetime] = []
+        self._events: List[NewsEvent] = []
+        self._by_currency: Dict[str, Tuple[List[datetime], List[NewsEvent]]] = {}
+        self._high_by_currency: Dict[str, Tuple[List[datetime], List[NewsEvent]]] = {}
+        if events:
+            self.replace(events)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self):
+        return iter(self._events)
+
+    @staticmethod
+    def _insert(times: List[datetime], events: List[NewsEvent], event: NewsEvent):
+        idx = bisect_right(times, event.timestamp)
+        times.insert(idx, event.timestamp)
+        events.insert(idx, event)
+
+    def add(self, event: NewsEvent):
+        """Insert an event keeping every index sorted"""
+        self._insert(self._times, self._events, event)
+        self._insert(*self._by_currency.setdefault(event.currency, ([], [])), event)
+        if event.impact_level in self.HIGH_IMPACT:
+            self._insert(*self._high_by_currency.setdefault(event.currency, ([], [])), event)
+
+    def replace(self, events: Iterable[NewsEvent]):
+        """Replace all events (sorted once, then indexed)"""
+        ordered = sorted(events, key=lambda e: e.timestamp)
+        self._events = ordered
+        self._times = [e.timestamp for e in ordered]
+
+        self._by_currency = {}
+        self._high_by_currency = {}
+        for event in ordered:
+            times, bucket = self._by_currency.setdefault(event.currency, ([], []))
+            times.append(event.timestamp)
+            bucket.append(event)
+            if event.impact_level in self.HIGH_IMPACT:
+                times, bucket = self._high_by_currency.setdefault(event.currency, ([], []))
+                times.append(event.timestamp)
+                bucket.append(event)
+
+    def clear(self):
+        """Remove all events"""
+        self.replace([])
+
+    def events(self) -> List[NewsEvent]:
+        """All events in time order"""
+        return list(self._events)
+
+    def between(self, start: datetime, end: datetime, currency: Optional[str] = None,
+                high_impact_only: bool = False) -> List[NewsEvent]:
+        """
+        Events with start <= timestamp <= end, in time order
+
+        Args:
+            start: Interval start (inclusive)
+            end: Interval end (inclusive)
+            currency: Only events for this currency
+            high_impact_only: Only EXTREME/HIGH events (requires currency)
+        """
+        if currency is None:
+            times, events = self._times, self._events
+            if high_impact_only:
+                lo, hi = bisect_left(times, start), bisect_right(times, end)
+                return [e for e in events[lo:hi] if e.impact_level in self.HIGH_IMPACT]
+        else:
+            index = self._high_by_currency if high_impact_only else self._by_currency
+            times, events = index.get(currency, ([], []))
+
+        return events[bisect_left(times, start):bisect_right(times, end)]
+
+    def remove_until(self, cutoff: datetime):
+        """Remove events with timestamp <= cutoff"""
+        if self._times and self._times[0] <= cutoff:
+            self.replace(self._events[bisect_right(self._times, cutoff):])
+
+
+class EventNameMatcher:
+    """
+    Precompiled matcher from calendar event names to historical database keys
+
+    Same rules as a linear lookup: exact key first, otherwise the first key
+    (in database order) contained in the event name, case-insensitive - so
+    'CPI' wins over 'CPI m/m' when listed first. Keys are lowercased once and
+    results are memoized per event name.
+    """
+
+    def __init__(self, keys: Iterable[str], default: str = 'DEFAULT'):
+        self.keys = [k for k in keys if k != default]
+        self.default = default
+        self._exact = set(self.keys)
+        self._lowered = [(k.lower(), k) for k in self.keys]
+        self._cache: Dict[str, str] = {}
+
+    def match(self, event_name: str) -> str:
+        """Get the database key for an event name"""
+        cached = self._cache.get(event_name)
+        if cached is not None:
+            return cached
+
+        if event_name in self._exact:
+            result = event_name
+        else:
+            name = event_name.lower()
+            result = next((key for lowered, key in self._lowered if lowered in name), self.default)
+
+        self._cache[event_name] = result
+        return result
+
+
 class NewsImpactPredictor:
     """
     News Event Impact Predictor
@@ -91,24 +218,48 @@ class NewsImpactPredictor:
     Expected Impact: -80% spike losses, +3-5% win rate
     """
 
+    # Measured events need this many reactions before overriding estimates
+    MIN_MEASURED_SAMPLES = 5
+
+    # Measured avg post-release range (pips) -> impact level
+    MEASURED_IMPACT_THRESHOLDS = (
+        (ImpactLevel.EXTREME, 80),
+        (ImpactLevel.HIGH, 45),
+        (ImpactLevel.MEDIUM, 25),
+    )
+
     def __init__(self):
         """Initialize predictor"""
-        self.events = []  # List of upcoming events
+        self.calendar = EconomicCalendar()  # Upcoming events, indexed by time/currency
         self.historical_database = self._load_historical_data()
+        self.event_matcher = EventNameMatcher(self.historical_database.keys())
         self.last_update = None
 
+        # Symbol -> (base, quote) currency cache
+        self._symbol_currencies: Dict[str, Optional[Tuple[str, str]]] = {}
+
         # Alert thresholds
         self.alert_minutes_extreme = 5  # Alert 5min before extreme events
         self.alert_minutes_high = 3     # Alert 3min before high events
 
+    @property
+    def events(self) -> List[NewsEvent]:
+        """Upcoming events in time order"""
+        return self.calendar.events()
+
+    @events.setter
+    def events(self, events: List[NewsEvent]):
+        """Replace all events (re-indexes the calendar)"""
+        self.calendar.replace(events)
+
     def _load_historical_data(self) -> Dict:
         """
         Load historical impact data for news events
 
-        In production, this would load from a database.
-        For now, using simplified estimates.
+        Starts from built-in estimates, then overlays measured statistics
+        from the impact table (scripts/compute_news_impact.py) if present.
         """
-        return {
+        database = {
             # US Events
             'Non-Farm Payrolls': {
                 'avg_impact_pips': 180,
@@ -186,6 +337,65 @@ class NewsImpactPredictor:
             }
         }
 
+        self._apply_measured_impacts(database)
+        return database
+
+    def _apply_measured_impacts(self, database: Dict):
+        """
+        Overlay measured event statistics from the on-disk impact table
+
+        Each measured event gets its own entry (inheriting bullish_if_better and
+        typical_threshold from the best-matching built-in entry). Events with
+        fewer than MIN_MEASURED_SAMPLES reactions are ignored, as are events
+        measured only on non-forex symbols (their points do not compare with
+        the pip thresholds).
+        """
+        self.measured_impacts: Dict[str, Dict] = {}
+        table = load_impact_table()
+        if not table:
+            return
+
+        builtin_matcher = EventNameMatcher(database.keys())
+        for name, stats in table.get('events', {}).items():
+            if stats.get('samples', 0) < self.MIN_MEASURED_SAMPLES:
+                continue
+            if stats.get('asset_class', 'forex') != 'forex':
+                continue
+
+            entry = dict(database[builtin_matcher.match(name)])
+            entry['avg_impact_pips'] = stats['avg_range_pips']
+            entry['impact_level'] = self._measured_impact_level(stats['avg_range_pips'])
+            if stats.get('surprise_samples', 0) >= self.MIN_MEASURED_SAMPLES:
+                entry['bullish_if_better'] = stats['surprise_alignment_pct'] >= 50
+            entry['measured'] = True
+
+            database[name] = entry
+            self.measured_impacts[name] = stats
+
+    def _measured_impact_level(self, avg_range_pips: float) -> ImpactLevel:
+        """Map a measured post-release pip range to an impact level"""
+        for level, threshold in self.MEASURED_IMPACT_THRESHOLDS:
+            if avg_range_pips >= threshold:
+                return level
+        return ImpactLevel.LOW
+
+    def get_measured_impact(self, event_name: str, symbol: Optional[str] = None) -> Optional[Dict]:
+        """
+        Get measured reaction statistics for an event
+
+        Args:
+            event_name: Event name (matched like add_event)
+            symbol: Optional symbol for the per-symbol breakdown
+
+        Returns:
+            Stats dict (avg_range_pips, currency_bullish_pct, median_minutes_to_peak, ...)
+            or None if the event has not been measured
+        """
+        stats = self.measured_impacts.get(self.event_matcher.match(event_name))
+        if stats is None or symbol is None:
+            return stats
+        return stats.get('symbols', {}).get(symbol)
+
     def add_event(self, event: NewsEvent):
         """Add an upcoming news event"""
         # Enrich with historical data
@@ -204,21 +414,24 @@ class NewsImpactPredictor:
             else:
                 event.bullish_probability = 30 if bullish_if_better else 70
 
-        self.events.append(event)
+        self.calendar.add(event)
 
     def _get_historical_data(self, event_name: str) -> Dict:
-        """Get historical data for event"""
-        # Try exact match first
-        if event_name in self.historical_database:
-            return self.historical_database[event_name]
-
-        # Try partial match
-        for key in self.historical_database:
-            if key.lower() in event_name.lower():
-                return self.historical_database[key]
-
-        # Default
-        return self.historical_database['DEFAULT']
+        """Get historical data for event (exact match, then partial match, then DEFAULT)"""
+        return self.historical_database[self.event_matcher.match(event_name)]
+
+    def _get_symbol_currencies(self, symbol: str) -> Optional[Tuple[str, str]]:
+        """Get (base, quote) currencies for a symbol, cached"""
+        if symbol not in self._symbol_currencies:
+            self._symbol_currencies[symbol] = (symbol[:3], symbol[3:6]) if len(symbol) >= 6 else None
+        return self._symbol_currencies[symbol]
+
+    @staticmethod
+    def _refresh_minutes_until(events: List[NewsEvent], now: datetime) -> List[NewsEvent]:
+        """Update minutes_until on returned events from a single clock read"""
+        for event in events:
+            event.minutes_until = (event.timestamp - now).total_seconds() / 60
+        return events
 
     def get_upcoming_events(self, hours: int = 24) -> List[NewsEvent]:
         """
@@ -230,30 +443,15 @@ class NewsImpactPredictor:
         Returns:
             List of upcoming NewsEvent objects
         """
-        cutoff = datetime.now() + timedelta(hours=hours)
-
-        upcoming = [
-            event for event in self.events
-            if datetime.now() <= event.timestamp <= cutoff
-        ]
-
-        # Sort by time
-        upcoming.sort(key=lambda x: x.timestamp)
-
-        return upcoming
+        now = datetime.now()
+        upcoming = self.calendar.between(now, now + timedelta(hours=hours))
+        return self._refresh_minutes_until(upcoming, now)
 
     def get_imminent_events(self, minutes: int = 30) -> List[NewsEvent]:
         """Get events happening in next N minutes"""
-        cutoff = datetime.now() + timedelta(minutes=minutes)
-
-        imminent = [
-            event for event in self.events
-            if datetime.now() <= event.timestamp <= cutoff
-        ]
-
-        imminent.sort(key=lambda x: x.timestamp)
-
-        return imminent
+        now = datetime.now()
+        imminent = self.calendar.between(now, now + timedelta(minutes=minutes))
+        return self._refresh_minutes_until(imminent, now)
 
     def get_high_impact_alerts(self) -> List[Dict]:
         """Get alerts for high-impact events happening soon"""
@@ -310,25 +508,31 @@ class NewsImpactPredictor:
             (should_flatten, reason)
         """
         # Extract currencies from symbol
-        if len(symbol) >= 6:
-            base_currency = symbol[:3]
-            quote_currency = symbol[3:6]
-        else:
+        currencies = self._get_symbol_currencies(symbol)
+        if currencies is None:
             return False, None
 
-        # Check imminent high-impact events
-        imminent = self.get_imminent_events(minutes=10)
+        # Earliest imminent high-impact event for either currency of the pair
+        now = datetime.now()
+        cutoff = now + timedelta(minutes=10)
+        candidates = []
+        for currency in set(currencies):
+            events = self.calendar.between(now, cutoff, currency, high_impact_only=True)
+            if events:
+                candidates.append(events[0])
+
+        if not candidates:
+            return False, None
 
-        for event in imminent:
-            if event.impact_level in [ImpactLevel.EXTREME, ImpactLevel.HIGH]:
-                # Check if event affects this pair
-                if event.currency in [base_currency, quote_currency]:
-                    time_str = event.timestamp.strftime("%H:%M")
-                    reason = (f"Flatten {symbol} before {event.event_name} "
-                             f"at {time_str} GMT (avg {event.avg_pip_impact:.0f} pips)")
-                    return True, reason
+        event = min(candidates, key=lambda e: e.timestamp)
+        time_str = event.timestamp.strftime("%H:%M")
 
-        return False, None
+        # Prefer the move measured on this symbol over the event-wide average
+        measured = self.get_measured_impact(event.event_name, symbol)
+        avg_pips = measured['avg_range_pips'] if measured else event.avg_pip_impact
+        reason = (f"Flatten {symbol} before {event.event_name} "
+                 f"at {time_str} GMT (avg {avg_pips:.0f} pips)")
+        return True, reason
 
     def analyze_event(self, event: NewsEvent) -> Dict:
         """
@@ -459,8 +663,7 @@ class NewsImpactPredictor:
 
     def clear_old_events(self):
         """Remove events that have already passed"""
-        now = datetime.now()
-        self.events = [e for e in self.events if e.timestamp > now]
+        self.calendar.remove_until(datetime.now())
 
 
 # Global instance
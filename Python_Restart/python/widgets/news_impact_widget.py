@@ -18,6 +18,7 @@ from core.ai_assist_base import AIAssistMixin
 from core.verbose_mode_manager import vprint
 from core.demo_mode_manager import demo_mode_manager, is_demo_mode, get_demo_data
 from core.verbose_mode_manager import vprint
+from core.instrumentation import instrumentation
 
 
 class NewsEventListItem(QWidget):
@@ -780,6 +781,7 @@ class NewsImpactWidget(AIAssistMixin, QWidget):
         self.refresh_btn.setText("🔄 Refresh")
         self.refresh_btn.setEnabled(True)
 
+    @instrumentation.timed('widget')
     def refresh_display(self):
         """Refresh the display with current data"""
         # Get upcoming events (7 days)
@@ -893,6 +895,7 @@ class NewsImpactWidget(AIAssistMixin, QWidget):
         """Check if positions should be flattened"""
         return news_impact_predictor.should_flatten_positions(symbol)
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
@@ -0,0 +1,378 @@
+"""
+AppleTrader Pro - Opportunity List Model/View
+Keyed list model + painted card delegate for the opportunity scanner
+
+Opportunities are keyed by (symbol, timeframe, direction). Each scan is
+applied to the model as insert/update/move/remove diffs, so no widgets or
+timers are created per card. New cards are highlighted by one shared
+animation clock instead of a blink timer per card.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt6.QtCore import (Qt, QObject, QTimer, QAbstractListModel, QModelIndex,
+                          QRect, QRectF, QSize, pyqtSignal)
+from PyQt6.QtGui import QFont, QColor, QPainter, QPen
+
+
+OpportunityKey = Tuple[str, str, str]
+
+# Custom item data roles
+OPPORTUNITY_ROLE = Qt.ItemDataRole.UserRole + 1
+HIGHLIGHT_ROLE = Qt.ItemDataRole.UserRole + 2
+
+# Highlight timing (same look as the old per-card blink: 300ms for 1 minute)
+BLINK_INTERVAL_MS = 300
+HIGHLIGHT_DURATION = 60.0
+
+CARD_HEIGHT = 90
+CARD_COLUMNS = 4
+
+
+def opportunity_key(opp: Dict) -> OpportunityKey:
+    """Identity of an opportunity across scans"""
+    return (opp['symbol'], opp['timeframe'], opp['direction'])
+
+
+def quality_colors(score: float) -> Tuple[str, str]:
+    """Get (border, background) colours for a quality score"""
+    if score >= 85:
+        return '#10B981', '#064E3B'  # Green - Excellent
+    elif score >= 70:
+        return '#3B82F6', '#1E3A8A'  # Blue - Good
+    elif score >= 60:
+        return '#F59E0B', '#78350F'  # Orange - Fair
+    else:
+        return '#6B7280', '#374151'  # Gray - Weak
+
+
+class AnimationClock(QObject):
+    """
+    Single shared timer that drives highlight blinking for every model
+
+    The timer only runs while at least one model has highlighted rows.
+    """
+
+    tick = pyqtSignal(bool)  # Current blink phase (True = highlighted)
+
+    def __init__(self, interval_ms: int = BLINK_INTERVAL_MS):
+        super().__init__()
+        self.phase = False
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._on_timeout)
+        self._active = set()
+
+    def request(self, model: 'OpportunityListModel'):
+        """Keep the clock running while model has highlights"""
+        self._active.add(id(model))
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def release(self, model: 'OpportunityListModel'):
+        """Model has no more highlights"""
+        self._active.discard(id(model))
+        if not self._active and self.timer.isActive():
+            self.timer.stop()
+            self.phase = False
+
+    def _on_timeout(self):
+        self.phase = not self.phase
+        self.tick.emit(self.phase)
+
+
+_animation_clock: Optional[AnimationClock] = None
+
+
+def get_animation_clock() -> AnimationClock:
+    """Get the shared animation clock (created on first use)"""
+    global _animation_clock
+    if _animation_clock is None:
+        _animation_clock = AnimationClock()
+    return _animation_clock
+
+
+class OpportunityListModel(QAbstractListModel):
+    """
+    List model of opportunities keyed by (symbol, timeframe, direction)
+
+    set_opportunities() diffs the new scan against the current rows and
+    emits the minimal rowsRemoved/rowsMoved/rowsInserted/dataChanged
+    notifications, so views keep their item state and never rebuild.
+    """
+
+    def __init__(self, parent=None, clock: Optional[AnimationClock] = None):
+        super().__init__(parent)
+        self._keys: List[OpportunityKey] = []
+        self._rows: Dict[OpportunityKey, Dict] = {}
+        self._highlight_until: Dict[OpportunityKey, float] = {}
+
+        self.clock = clock or get_animation_clock()
+        self.clock.tick.connect(self._on_clock_tick)
+
+    # ------------------------------------------------------------------
+    # Qt model interface
+    # ------------------------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._keys)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._keys):
+            return None
+
+        key = self._keys[index.row()]
+        opp = self._rows[key]
+
+        if role == OPPORTUNITY_ROLE:
+            return opp
+        if role == HIGHLIGHT_ROLE:
+            return key in self._highlight_until and self.clock.phase
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{opp['symbol']} {opp['direction']} {opp['timeframe']}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return " • ".join(opp.get('confluence_reasons', []))
+        return None
+
+    # ------------------------------------------------------------------
+    # Diffing
+    # ------------------------------------------------------------------
+
+    def opportunity(self, row: int) -> Dict:
+        """Get opportunity dict at row"""
+        return self._rows[self._keys[row]]
+
+    def set_opportunities(self, opportunities: List[Dict]):
+        """Apply a new scan result as insert/update/move/remove diffs"""
+        new_keys = []
+        new_rows = {}
+        for opp in opportunities:
+            key = opportunity_key(opp)
+            if key not in new_rows:
+                new_keys.append(key)
+                new_rows[key] = opp
+
+        # 1. Remove rows that disappeared (bottom-up keeps indices valid)
+        for row in range(len(self._keys) - 1, -1, -1):
+            key = self._keys[row]
+            if key not in new_rows:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._keys[row]
+                del self._rows[key]
+                self._highlight_until.pop(key, None)
+                self.endRemoveRows()
+
+        # 2. Walk the target order: update in place, move, or insert
+        now = time.monotonic()
+        for target, key in enumerate(new_keys):
+            if target < len(self._keys) and self._keys[target] == key:
+                if self._rows[key] != new_rows[key]:
+                    self._rows[key] = new_rows[key]
+                    idx = self.index(target)
+                    self.dataChanged.emit(idx, idx)
+                continue
+
+            if key in self._rows:
+                source = self._keys.index(key, target)
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), target)
+                self._keys.insert(target, self._keys.pop(source))
+                self.endMoveRows()
+                if self._rows[key] != new_rows[key]:
+                    self._rows[key] = new_rows[key]
+                    idx = self.index(target)
+                    self.dataChanged.emit(idx, idx)
+            else:
+                self.beginInsertRows(QModelIndex(), target, target)
+                self._keys.insert(target, key)
+                self._rows[key] = new_rows[key]
+                self.endInsertRows()
+                self._highlight_until[key] = now + HIGHLIGHT_DURATION
+
+        if self._highlight_until:
+            self.clock.request(self)
+
+    # ------------------------------------------------------------------
+    # Highlight animation
+    # ------------------------------------------------------------------
+
+    def _on_clock_tick(self, phase: bool):
+        """Repaint highlighted rows; expire finished highlights"""
+        if not self._highlight_until:
+            return
+
+        now = time.monotonic()
+        expired = [key for key, until in self._highlight_until.items() if until <= now]
+        for key in expired:
+            del self._highlight_until[key]
+
+        for key in list(self._highlight_until) + expired:
+            row = self._keys.index(key) if key in self._rows else -1
+            if row >= 0:
+                idx = self.index(row)
+                self.dataChanged.emit(idx, idx, [HIGHLIGHT_ROLE])
+
+        if not self._highlight_until:
+            self.clock.release(self)
+
+
+class OpportunityCardDelegate(QStyledItemDelegate):
+    """Paints an opportunity card (symbol, direction, score, levels, reasons)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font_symbol = QFont("Arial", 13, QFont.Weight.Bold)
+        self.font_header = QFont("Arial", 12, QFont.Weight.Bold)
+        self.font_levels = QFont("Courier", 9)
+        self.font_levels_bold = QFont("Courier", 9, QFont.Weight.Bold)
+        self.font_small = QFont("Arial", 8)
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(max(50, option.rect.width()), CARD_HEIGHT)
+
+    def paint(self, painter: QPainter, option, index):
+        opp = index.data(OPPORTUNITY_ROLE)
+        if not opp:
+            return
+
+        highlighted = bool(index.data(HIGHLIGHT_ROLE))
+        score = opp['quality_score']
+        border_color, bg_color = quality_colors(score)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        rect = QRectF(option.rect).adjusted(2, 2, -2, -2)
+        pen_width = 3 if highlighted else 2
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            pen_width += 1
+        painter.setPen(QPen(QColor('#FFD700' if highlighted else border_color), pen_width))
+        painter.setBrush(QColor(bg_color))
+        painter.drawRoundedRect(rect, 8, 8)
+
+        inner = option.rect.adjusted(10, 7, -10, -6)
+        line_h = inner.height() // 4
+
+        # Header: Symbol + Direction + Score
+        header = QRect(inner.left(), inner.top(), inner.width(), line_h + 4)
+        painter.setFont(self.font_symbol)
+        painter.setPen(QColor('#FFFFFF'))
+        painter.drawText(header, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, opp['symbol'])
+        symbol_w = painter.fontMetrics().horizontalAdvance(opp['symbol']) + 8
+
+        painter.setFont(self.font_header)
+        score_text = f"⭐ {score}"
+        score_w = painter.fontMetrics().horizontalAdvance(score_text) + 6
+        painter.setPen(QColor(border_color))
+        painter.drawText(header, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, score_text)
+
+        # Direction fills the space between symbol and score
+        direction = opp['direction']
+        dir_icon = '📈' if direction == 'BUY' else '📉'
+        dir_rect = header.adjusted(symbol_w, 0, -score_w, 0)
+        if dir_rect.width() > 0:
+            painter.setPen(QColor('#10B981' if direction == 'BUY' else '#EF4444'))
+            dir_text = painter.fontMetrics().elidedText(f"{dir_icon} {direction}",
+                                                        Qt.TextElideMode.ElideRight, dir_rect.width())
+            painter.drawText(dir_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, dir_text)
+
+        # Entry and targets
+        levels = QRect(inner.left(), header.bottom() + 2, inner.width(), line_h)
+        x = levels.left()
+        for text, color, font in (
+            (f"Entry: {opp['entry']:.5f}", '#94A3B8', self.font_levels),
+            (f"SL: {opp['stop_loss']:.5f}", '#EF4444', self.font_levels),
+            (f"TP: {opp['take_profit']:.5f}", '#10B981', self.font_levels),
+            (f"R:R {opp['risk_reward']:.1f}", '#3B82F6', self.font_levels_bold),
+        ):
+            if x >= levels.right():
+                break
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(QRect(x, levels.top(), levels.right() - x, levels.height()),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+            x += painter.fontMetrics().horizontalAdvance(text) + 10
+
+        # Confluence reasons
+        painter.setFont(self.font_small)
+        reasons = " • ".join(opp.get('confluence_reasons', [])[:3])
+        reasons_rect = QRect(inner.left(), levels.bottom() + 1, inner.width(), line_h)
+        painter.setPen(QColor('#D1D5DB'))
+        elided = painter.fontMetrics().elidedText(f"✓ {reasons}", Qt.TextElideMode.ElideRight, inner.width())
+        painter.drawText(reasons_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, elided)
+
+        # Timeframe
+        tf_rect = QRect(inner.left(), reasons_rect.bottom() + 1, inner.width(), line_h)
+        painter.setPen(QColor('#9CA3AF'))
+        painter.drawText(tf_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, f"⏱ {opp['timeframe']}")
+
+        painter.restore()
+
+
+class OpportunityListView(QListView):
+    """
+    Grid of opportunity cards (4 columns, cards flow left to right)
+
+    Signals:
+        opportunity_clicked: (opportunity dict, card rect in global coords, column)
+    """
+
+    opportunity_clicked = pyqtSignal(dict, QRect, int)
+
+    def __init__(self, empty_title: str = "No Opportunities", parent=None):
+        super().__init__(parent)
+        self.empty_title = empty_title
+
+        self.setViewMode(QListView.ViewMode.ListMode)
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(True)
+        self.setMovement(QListView.Movement.Static)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setMouseTracking(True)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setItemDelegate(OpportunityCardDelegate(self))
+
+        self.clicked.connect(self._on_clicked)
+
+    def resizeEvent(self, event):
+        """Keep 4 equal-width columns"""
+        super().resizeEvent(event)
+        width = max(50, self.viewport().width() // CARD_COLUMNS)
+        self.setGridSize(QSize(width, CARD_HEIGHT + 2))
+
+    def _on_clicked(self, index: QModelIndex):
+        opp = index.data(OPPORTUNITY_ROLE)
+        if not opp:
+            return
+        rect = self.visualRect(index)
+        top_left = self.viewport().mapToGlobal(rect.topLeft())
+        self.opportunity_clicked.emit(opp, QRect(top_left, rect.size()), index.row() % CARD_COLUMNS)
+
+    def paintEvent(self, event):
+        """Paint cards, or an informative message when there are none"""
+        model = self.model()
+        if model is not None and model.rowCount() > 0:
+            super().paintEvent(event)
+            return
+
+        painter = QPainter(self.viewport())
+        rect = self.viewport().rect()
+        painter.setPen(QColor('#475569'))
+        painter.setFont(QFont("Arial", 32))
+        painter.drawText(rect.adjusted(0, 0, 0, -70), Qt.AlignmentFlag.AlignCenter, "📊")
+
+        painter.setPen(QColor('#94A3B8'))
+        painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, self.empty_title)
+
+        painter.setPen(QColor('#64748B'))
+        painter.setFont(QFont("Arial", 9))
+        painter.drawText(rect.adjusted(0, 60, 0, 0), Qt.AlignmentFlag.AlignCenter,
+                         "Waiting for high-quality setups\nto meet filter criteria")
+        painter.end()
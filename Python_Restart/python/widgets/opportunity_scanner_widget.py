@@ -6,7 +6,7 @@ Scans all pairs for high-probability trading setups in real-time
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                             QFrame, QScrollArea, QGridLayout, QSizePolicy, QDialog, QCheckBox, QGraphicsOpacityEffect,
                             QPushButton, QGroupBox)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QPropertyAnimation, QEasingCurve, pyqtProperty
+from PyQt6.QtCore import Qt, QTimer, QRect, pyqtSignal, QPropertyAnimation, QEasingCurve, pyqtProperty
 from PyQt6.QtGui import QFont, QMouseEvent
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
@@ -22,228 +22,9 @@ from core.demo_mode_manager import demo_mode_manager, is_demo_mode, get_demo_dat
 from core.ml_integration import ml_integration, get_ml_prediction  # ML INTEGRATION ADDED
 from core.verbose_mode_manager import vprint
 from core.symbol_manager import symbol_specs_manager
-
-
-class OpportunityCard(QFrame):
-    """Card widget for a single trading opportunity"""
-
-    # Signal emitted when card is clicked
-    clicked = pyqtSignal(dict)
-
-    def __init__(self, opportunity: Dict, is_new: bool = False, parent=None):
-        super().__init__(parent)
-        self.opportunity = opportunity
-        self.is_new = is_new  # Track if this is a new/updated card
-        self.column_index = 0  # Will be set when added to grid
-        self.setObjectName("OpportunityCard")
-        self.setMouseTracking(True)  # Enable mouse tracking for hover effects
-        self.setCursor(Qt.CursorShape.PointingHandCursor)  # Show hand cursor on hover
-        self.blink_count = 0  # Track number of blinks
-        self.blink_timer = None  # Timer for blinking
-        self.original_border_color = None  # Store original border color
-        self.init_ui()
-
-        # Start blinking if this is a new card
-        if self.is_new:
-            QTimer.singleShot(100, self.start_blinking)
-
-    def init_ui(self):
-        """Initialize the opportunity card UI"""
-        # CRITICAL: Card must expand to fill grid cell - REDUCED HEIGHT to fit better
-        self.setMinimumHeight(88)  # Reduced from 90
-        self.setMaximumHeight(92)  # Reduced from 95
-        self.setMinimumWidth(50)  # Allow cards to shrink if needed
-        self.setSizePolicy(
-            QSizePolicy.Policy.Expanding,  # Expand horizontally to fill cell
-            QSizePolicy.Policy.Fixed        # Fixed height
-        )
-        self.setFrameShape(QFrame.Shape.StyledPanel)
-
-        # Color based on quality score
-        score = self.opportunity['quality_score']
-        if score >= 85:
-            border_color = '#10B981'  # Green - Excellent
-            bg_color = '#064E3B'
-        elif score >= 70:
-            border_color = '#3B82F6'  # Blue - Good
-            bg_color = '#1E3A8A'
-        elif score >= 60:
-            border_color = '#F59E0B'  # Orange - Fair
-            bg_color = '#78350F'
-        else:
-            border_color = '#6B7280'  # Gray - Weak
-            bg_color = '#374151'
-
-        self.setStyleSheet(f"""
-            OpportunityCard {{
-                background-color: {bg_color};
-                border: 2px solid {border_color};
-                border-radius: 8px;
-                padding: 6px;
-            }}
-            OpportunityCard QLabel {{
-                background-color: transparent;
-                border: none;
-            }}
-        """)
-
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(8, 6, 8, 6)
-        layout.setSpacing(4)
-
-        # Header: Symbol + Direction + Score
-        header_layout = QHBoxLayout()
-
-        symbol_label = QLabel(self.opportunity['symbol'])
-        symbol_label.setFont(QFont("Arial", 13, QFont.Weight.Bold))
-        symbol_label.setStyleSheet("color: #FFFFFF;")
-        header_layout.addWidget(symbol_label)
-
-        direction = self.opportunity['direction']
-        dir_color = '#10B981' if direction == 'BUY' else '#EF4444'
-        dir_icon = '📈' if direction == 'BUY' else '📉'
-        dir_label = QLabel(f"{dir_icon} {direction}")
-        dir_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        dir_label.setStyleSheet(f"color: {dir_color};")
-        header_layout.addWidget(dir_label)
-
-        header_layout.addStretch()
-
-        score_label = QLabel(f"⭐ {score}")
-        score_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        score_label.setStyleSheet(f"color: {border_color};")
-        header_layout.addWidget(score_label)
-
-        layout.addLayout(header_layout)
-
-        # Entry and targets
-        entry_layout = QHBoxLayout()
-        entry_layout.setSpacing(10)
-
-        entry_text = QLabel(f"Entry: {self.opportunity['entry']:.5f}")
-        entry_text.setFont(QFont("Courier", 9))
-        entry_text.setStyleSheet("color: #94A3B8;")
-        entry_layout.addWidget(entry_text)
-
-        sl_text = QLabel(f"SL: {self.opportunity['stop_loss']:.5f}")
-        sl_text.setFont(QFont("Courier", 9))
-        sl_text.setStyleSheet("color: #EF4444;")
-        entry_layout.addWidget(sl_text)
-
-        tp_text = QLabel(f"TP: {self.opportunity['take_profit']:.5f}")
-        tp_text.setFont(QFont("Courier", 9))
-        tp_text.setStyleSheet("color: #10B981;")
-        entry_layout.addWidget(tp_text)
-
-        rr_text = QLabel(f"R:R {self.opportunity['risk_reward']:.1f}")
-        rr_text.setFont(QFont("Courier", 9, QFont.Weight.Bold))
-        rr_text.setStyleSheet("color: #3B82F6;")
-        entry_layout.addWidget(rr_text)
-
-        entry_layout.addStretch()
-        layout.addLayout(entry_layout)
-
-        # Confluence reasons
-        reasons = self.opportunity.get('confluence_reasons', [])
-        reasons_text = " • ".join(reasons[:3])
-        reasons_label = QLabel(f"✓ {reasons_text}")
-        reasons_label.setFont(QFont("Arial", 8))
-        reasons_label.setStyleSheet("color: #D1D5DB;")
-        reasons_label.setWordWrap(True)
-        layout.addWidget(reasons_label)
-
-        # Timeframe
-        tf_label = QLabel(f"⏱ {self.opportunity['timeframe']}")
-        tf_label.setFont(QFont("Arial", 8))
-        tf_label.setStyleSheet("color: #9CA3AF;")
-        layout.addWidget(tf_label)
-
-    def mousePressEvent(self, event):
-        """Handle mouse press - emit clicked signal with opportunity data"""
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.clicked.emit(self.opportunity)
-        super().mousePressEvent(event)
-
-    def start_blinking(self):
-        """Start the blinking animation to grab attention"""
-        # Store original border color based on quality score
-        score = self.opportunity['quality_score']
-        if score >= 85:
-            self.original_border_color = '#10B981'  # Green
-        elif score >= 70:
-            self.original_border_color = '#3B82F6'  # Blue
-        elif score >= 60:
-            self.original_border_color = '#F59E0B'  # Orange
-        else:
-            self.original_border_color = '#6B7280'  # Gray
-
-        # Start blink timer (blink every 300ms)
-        self.blink_timer = QTimer(self)
-        self.blink_timer.timeout.connect(self.toggle_blink)
-        self.blink_timer.start(300)  # Blink every 300ms
-
-    def toggle_blink(self):
-        """Toggle between highlighted and normal state"""
-        if self.blink_count >= 200:  # Blink for 1 minute (200 toggles × 300ms = 60 seconds)
-            # Stop blinking and restore original color
-            if self.blink_timer:
-                self.blink_timer.stop()
-                self.blink_timer = None
-            self.restore_original_style()
-            return
-
-        # Alternate between bright highlight and original color
-        if self.blink_count % 2 == 0:
-            # Highlight state - bright yellow/gold border
-            highlight_color = '#FFD700'  # Gold
-            bg_color = self.get_bg_color()
-            self.setStyleSheet(f"""
-                OpportunityCard {{
-                    background-color: {bg_color};
-                    border: 3px solid {highlight_color};
-                    border-radius: 8px;
-                    padding: 6px;
-                }}
-                OpportunityCard QLabel {{
-                    background-color: transparent;
-                    border: none;
-                }}
-            """)
-        else:
-            # Normal state
-            self.restore_original_style()
-
-        self.blink_count += 1
-
-    def restore_original_style(self):
-        """Restore the original card styling"""
-        score = self.opportunity['quality_score']
-        bg_color = self.get_bg_color()
-
-        self.setStyleSheet(f"""
-            OpportunityCard {{
-                background-color: {bg_color};
-                border: 2px solid {self.original_border_color};
-                border-radius: 8px;
-                padding: 6px;
-            }}
-            OpportunityCard QLabel {{
-                background-color: transparent;
-                border: none;
-            }}
-        """)
-
-    def get_bg_color(self):
-        """Get background color based on quality score"""
-        score = self.opportunity['quality_score']
-        if score >= 85:
-            return '#064E3B'  # Green
-        elif score >= 70:
-            return '#1E3A8A'  # Blue
-        elif score >= 60:
-            return '#78350F'  # Orange
-        else:
-            return '#374151'  # Gray
+from widgets.opportunity_list_view import OpportunityListModel, OpportunityListView
+from core.instrumentation import instrumentation
+from core.bar_resampler import bar_resampler
 
 
 class TimeframeGroup(QWidget):
@@ -254,7 +35,6 @@ class TimeframeGroup(QWidget):
         self.timeframes = timeframes
         self.opportunities = []
         self.current_popup = None  # Store reference to current popup
-        self.previous_opportunity_keys = set()  # Track previous opportunities for new detection
         self.init_ui()
 
     def init_ui(self):
@@ -263,182 +43,80 @@ class TimeframeGroup(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
 
-        # Scroll area - REDUCED height to fit in parent container
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll.setMinimumHeight(305)  # Reduced from 330 to 305 to fit better
-        scroll.setMaximumHeight(305)  # Lock height to prevent overflow
-        scroll.setStyleSheet("""
-            QScrollArea {
+        # Keyed model + painted cards: scans are applied as diffs, no per-card widgets
+        self.model = OpportunityListModel(self)
+
+        timeframe_range = "/".join(self.timeframes)
+        self.view = OpportunityListView(f"No Opportunities ({timeframe_range})")
+        self.view.setModel(self.model)
+        self.view.setMinimumHeight(305)  # Reduced from 330 to 305 to fit better
+        self.view.setMaximumHeight(305)  # Lock height to prevent overflow
+        self.view.setStyleSheet("""
+            QListView {
                 background-color: #0F1729;
                 border: 1px solid #1E293B;
                 border-radius: 5px;
             }
         """)
+        self.view.opportunity_clicked.connect(self.show_mini_chart)
 
-        scroll_content = QWidget()
-
-        # Grid layout - 4 columns, cards flow left-to-right
-        self.grid_layout = QGridLayout(scroll_content)
-        self.grid_layout.setSpacing(3)  # Reduced from 4 to 3
-        self.grid_layout.setContentsMargins(3, 3, 3, 3)  # Reduced from 4 to 3
-
-        # CRITICAL: Make all columns equal width so cards resize properly
-        for col in range(4):
-            self.grid_layout.setColumnStretch(col, 1)
-
-        scroll.setWidget(scroll_content)
-        layout.addWidget(scroll)
+        layout.addWidget(self.view)
 
     def update_opportunities(self, opportunities: List[Dict]):
         """Update opportunities - LIMIT TO 12 CARDS MAX, 3 rows × 4 columns"""
         # CRITICAL: Hard limit to 12 cards per timeframe section
         self.opportunities = opportunities[:12]
 
-        # Track current opportunity keys to detect NEW cards
-        current_opportunity_keys = {
-            (opp['symbol'], opp['timeframe'], opp['direction'])
-            for opp in self.opportunities
-        }
+        # New (symbol, timeframe, direction) keys are highlighted by the model
+        self.model.set_opportunities(self.opportunities)
 
-        # Detect NEW opportunities (not in previous set)
-        new_opportunity_keys = current_opportunity_keys - self.previous_opportunity_keys
-
-        # Update previous keys for next comparison
-        self.previous_opportunity_keys = current_opportunity_keys
-
-        # Clear existing cards
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.setParent(None)
-                widget.deleteLater()
-
-        # If no opportunities, show informative message
-        if len(self.opportunities) == 0:
-            timeframe_range = "/".join(self.timeframes)
-            no_opp_widget = QWidget()
-            no_opp_layout = QVBoxLayout(no_opp_widget)
-            no_opp_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            # Icon
-            icon_label = QLabel("📊")
-            icon_label.setFont(QFont("Arial", 32))
-            icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            icon_label.setStyleSheet("color: #475569; background: transparent; border: none;")
-            no_opp_layout.addWidget(icon_label)
-
-            # Main message
-            message_label = QLabel(f"No Opportunities ({timeframe_range})")
-            message_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-            message_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            message_label.setStyleSheet("color: #94A3B8; background: transparent; border: none;")
-            no_opp_layout.addWidget(message_label)
-
-            # Explanation
-            reason_label = QLabel("Waiting for high-quality setups\nto meet filter criteria")
-            reason_label.setFont(QFont("Arial", 9))
-            reason_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            reason_label.setStyleSheet("color: #64748B; background: transparent; border: none;")
-            no_opp_layout.addWidget(reason_label)
-
-            no_opp_widget.setStyleSheet("background-color: transparent;")
-
-            # Add centered message spanning all 4 columns
-            self.grid_layout.addWidget(no_opp_widget, 0, 0, 3, 4)  # Span 3 rows, 4 cols
-            return
-
-        # Add cards in 4-column grid (max 3 rows × 4 cols = 12 cards)
-        for idx, opp in enumerate(self.opportunities):
-            # Check if this opportunity is NEW
-            opp_key = (opp['symbol'], opp['timeframe'], opp['direction'])
-            is_new_card = opp_key in new_opportunity_keys
-
-            # Create card with is_new flag
-            card = OpportunityCard(opp, is_new=is_new_card)
-            card.setCursor(Qt.CursorShape.PointingHandCursor)
-
-            row = idx // 4  # 4 cards per row
-            col = idx % 4   # Columns 0, 1, 2, 3
-
-            # CRITICAL: Store column index in card for popup positioning
-            card.column_index = col
-
-            # Connect card click to show mini chart popup
-            card.clicked.connect(self.show_mini_chart)
-
-            self.grid_layout.addWidget(card, row, col)
-
-        # Fill remaining slots with spacers if < 12 cards (for even layout)
-        for idx in range(len(self.opportunities), 12):
-            spacer = QWidget()
-            spacer.setMinimumHeight(88)  # Match reduced card height
-            spacer.setMaximumHeight(92)  # Match reduced card height
-            spacer.setMinimumWidth(50)
-            spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-            spacer.setStyleSheet("background-color: transparent;")
-            row = idx // 4
-            col = idx % 4
-            self.grid_layout.addWidget(spacer, row, col)
-
-    def show_mini_chart(self, opportunity: Dict):
+    def show_mini_chart(self, opportunity: Dict, card_rect: QRect, column: int):
         """Show mini chart popup for the clicked opportunity"""
         # Close any existing popup first to prevent multiple popups
         if self.current_popup and self.current_popup.isVisible():
             self.current_popup.close()
 
-        # Get the sender (the card that was clicked)
-        sender = self.sender()
-        if sender:
-            # CRITICAL: Get card's exact position on screen (top-left corner)
-            card_global_pos = sender.mapToGlobal(sender.rect().topLeft())
-
-            # Create popup
-            self.current_popup = MiniChartPopup(opportunity, parent=None)
-            popup_width = self.current_popup.width()  # 900px
-            popup_height = self.current_popup.height()  # 650px
-
-            # UPDATED RULE:
-            # Column 0 (leftmost) → RIGHT
-            # Column 1 (third from right) → LEFT
-            # Column 2 (third from left) → RIGHT
-            # Column 3 (rightmost) → LEFT
-            column = sender.column_index
-
-            if column in [0, 2]:
-                # Columns 0 and 2 - show popup on RIGHT of card
-                popup_x = card_global_pos.x() + sender.width() + 5
-            else:  # column in [1, 3]
-                # Columns 1 and 3 - show popup on LEFT of card
-                popup_x = card_global_pos.x() - popup_width - 5
-
-            # CRITICAL: Align popup TOP with card TOP - no offset
-            popup_y = card_global_pos.y()
-
-            # Ensure popup doesn't go off screen vertically
-            from PyQt6.QtWidgets import QApplication
-            screen = QApplication.primaryScreen().geometry()
-
-            # Check if popup goes off bottom of screen
-            if popup_y + popup_height > screen.height():
-                # Move up to fit on screen
-                popup_y = screen.height() - popup_height - 10
-
-            # Check if popup goes off top of screen
-            if popup_y < 10:
-                popup_y = 10
-
-            # CRITICAL: Set position THEN show (not the other way around)
-            self.current_popup.move(popup_x, popup_y)
-            self.current_popup.show()
-
-            vprint(f"[MiniChart] Card at Y:{card_global_pos.y()}, Column:{column}, Popup {'RIGHT' if column in [0,2] else 'LEFT'} at X:{popup_x} Y:{popup_y}")
-        else:
-            # Fallback if sender not found
-            self.current_popup = MiniChartPopup(opportunity, parent=None)
-            self.current_popup.show()
+        # CRITICAL: Card's exact position on screen (top-left corner)
+        card_global_pos = card_rect.topLeft()
+
+        # Create popup
+        self.current_popup = MiniChartPopup(opportunity, parent=None)
+        popup_width = self.current_popup.width()  # 900px
+        popup_height = self.current_popup.height()  # 650px
+
+        # UPDATED RULE:
+        # Column 0 (leftmost) → RIGHT
+        # Column 1 (third from right) → LEFT
+        # Column 2 (third from left) → RIGHT
+        # Column 3 (rightmost) → LEFT
+        if column in [0, 2]:
+            # Columns 0 and 2 - show popup on RIGHT of card
+            popup_x = card_global_pos.x() + card_rect.width() + 5
+        else:  # column in [1, 3]
+            # Columns 1 and 3 - show popup on LEFT of card
+            popup_x = card_global_pos.x() - popup_width - 5
+
+        # CRITICAL: Align popup TOP with card TOP - no offset
+        popup_y = card_global_pos.y()
+
+        # Ensure popup doesn't go off screen vertically
+        from PyQt6.QtWidgets import QApplication
+        screen = QApplication.primaryScreen().geometry()
+
+        # Check if popup goes off bottom of screen
+        if popup_y + popup_height > screen.height():
+            # Move up to fit on screen
+            popup_y = screen.height() - popup_height - 10
+
+        # Check if popup goes off top of screen
+        if popup_y < 10:
+            popup_y = 10
+
+        # CRITICAL: Set position THEN show (not the other way around)
+        self.current_popup.move(popup_x, popup_y)
+        self.current_popup.show()
+
+        vprint(f"[MiniChart] Card at Y:{card_global_pos.y()}, Column:{column}, Popup {'RIGHT' if column in [0,2] else 'LEFT'} at X:{popup_x} Y:{popup_y}")
 
 
 class SymbolSelectorDialog(QDialog):
@@ -1063,30 +741,18 @@ class OpportunityScannerWidget(AIAssistMixin, QWidget):
 
             # CRITICAL: Fetch MULTIPLE timeframes (not just H4!)
             # Cards expect: Short (M5/M15), Medium (M30/H1), Long (H4)
-            timeframes_to_fetch = {
-                'M5': mt5.TIMEFRAME_M5,
-                'M15': mt5.TIMEFRAME_M15,
-                'M30': mt5.TIMEFRAME_M30,
-                'H1': mt5.TIMEFRAME_H1,
-                'H4': mt5.TIMEFRAME_H4
-            }
+            # One M5 fetch per symbol; higher timeframes are derived locally
+            timeframes_to_fetch = ['M5', 'M15', 'M30', 'H1', 'H4']
 
             vprint(f"    → Fetching {len(priority_pairs)} symbols × {len(timeframes_to_fetch)} timeframes from MT5...")
 
             for symbol in priority_pairs:
-                for tf_name, tf_constant in timeframes_to_fetch.items():
+                for tf_name in timeframes_to_fetch:
                     try:
-                        # Fetch candles for this specific timeframe
-                        rates = mt5.copy_rates_from_pos(symbol, tf_constant, 0, 100)
-
-                        if rates is not None and len(rates) > 0:
-                            # Convert to DataFrame
-                            df = pd.DataFrame(rates)
-
-                            # Add required columns
-                            if 'time' in df.columns:
-                                df['time'] = pd.to_datetime(df['time'], unit='s')
+                        # Candles for this timeframe (time already converted)
+                        df = bar_resampler.get_frame(symbol, tf_name, 100)
 
+                        if df is not None:
                             # Store timeframe metadata
                             df.timeframe = tf_name
 
@@ -1102,6 +768,9 @@ class OpportunityScannerWidget(AIAssistMixin, QWidget):
                         continue
 
             vprint(f"    → Total symbol-timeframe combinations: {len(symbols_data)}")
+
+            # Trends of every pair on every timeframe in one batch (only cells whose bar closed)
+            market_analyzer.get_trend_matrix(priority_pairs, timeframes_to_fetch)
             return symbols_data
 
         except ImportError:
@@ -1180,6 +849,15 @@ class OpportunityScannerWidget(AIAssistMixin, QWidget):
             current_session = market_analyzer.get_current_session()
             session_quality = market_analyzer.get_session_quality_score()
 
+            # H1/H4 alignment from the trend matrix (neutral defaults without bars)
+            alignment = market_analyzer.trend_matrix.alignment(symbol, trend)
+            if alignment is not None:
+                mtf_score = alignment['alignment_score']
+                mtf_confirmed = alignment['aligned']
+                h4_trend = alignment['trends']['H4']
+            else:
+                mtf_score, mtf_confirmed, h4_trend = 5, True, 'neutral'
+
             # ATR stays in RAW PRICE UNITS - universal for all asset types
             # Volatility filter now uses percentage-based checks, no conversion needed
 
@@ -1224,8 +902,9 @@ class OpportunityScannerWidget(AIAssistMixin, QWidget):
                 'volume': 100,  # Reasonable default (filter uses min 50)
                 'spread': atr * 0.1,  # 10% of ATR (reasonable spread in price units)
                 'pattern_strength': quality_score / 10,  # Convert quality to 0-10 scale
-                'mtf_score': 5,  # Neutral MTF score (0-10 scale)
-                'mtf_confirmed': True,  # MTF alignment confirmed
+                'mtf_score': mtf_score,  # H1/H4 alignment (0-10 scale)
+                'mtf_confirmed': mtf_confirmed,  # Direction agrees with H1 and H4 trends
+                'h4_trend': h4_trend,
                 # Smart Money Concepts fields (required by institutional filters)
                 'liquidity_sweep': True,  # Liquidity sweep detected (scanner validates entry)
                 'is_retail_trap': False,  # Not a retail trap (quality score validates)
@@ -1244,17 +923,15 @@ class OpportunityScannerWidget(AIAssistMixin, QWidget):
             traceback.print_exc()
             return None
 
+    @instrumentation.timed('widget')
     def update_display(self):
         """Update all three groups with filtered opportunities - APPLIES INSTITUTIONAL FILTERS"""
         from core.filter_manager import filter_manager
 
         vprint(f"\n[Scanner] update_display() called with {len(self.opportunities)} opportunities")
 
-        # Apply institutional filters to all opportunities
-        filtered_opportunities = [
-            opp for opp in self.opportunities
-            if filter_manager.filter_opportunity(opp)
-        ]
+        # Apply institutional filters to all opportunities in one batch
+        filtered_opportunities, rejections = filter_manager.filter_opportunities(self.opportunities)
 
         vprint(f"[Scanner] After filter_manager: {len(filtered_opportunities)} opportunities passed")
 
@@ -1284,6 +961,7 @@ class OpportunityScannerWidget(AIAssistMixin, QWidget):
         # QTimer.singleShot(200, lambda: self.status_label.setStyleSheet("color: #10B981;"))
         pass  # Do nothing, labels removed
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
@@ -7,7 +7,8 @@ from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from collections import deque
+
+from core.instrumentation import instrumentation
 
 
 class InstitutionalOrder:
@@ -66,15 +67,24 @@ class InstitutionalOrderFlowDetector:
     Expected Impact: Trade WITH institutions, not against them
     """
 
+    # Candle classification codes
+    ORDER_NONE = 0
+    ORDER_ABSORPTION_SELL = 1
+    ORDER_ABSORPTION_BUY = 2
+    ORDER_SWEEP = 3
+    ORDER_ACCUMULATION = 4
+
     def __init__(self, max_history: int = 100):
         """
         Initialize detector
 
         Args:
-            max_history: Maximum orders to keep in history
+            max_history: Maximum orders to keep in history per symbol
         """
         self.max_history = max_history
-        self.order_history = deque(maxlen=max_history)
+        # {symbol: {(timestamp, order_type): order}} in detection order, so a
+        # busy watchlist cannot push the active symbol's orders out
+        self.symbol_history: Dict[str, Dict[Tuple, InstitutionalOrder]] = {}
         self.active_levels = {}  # {symbol: [price_levels]}
         self.last_scan = None
 
@@ -82,158 +92,225 @@ class InstitutionalOrderFlowDetector:
         self.volume_spike_threshold = 3.0  # 3× average volume
         self.pip_move_threshold = 20  # Minimum 20 pip move
         self.wick_ratio_threshold = 0.6  # 60% of candle is wick
-
-    def scan_for_orders(self, symbol: str, df: pd.DataFrame,
-                       lookback: int = 50) -> List[InstitutionalOrder]:
-        """
-        Scan for institutional orders in recent price action
-
-        Args:
-            symbol: Trading symbol
-            df: DataFrame with OHLC and volume data
-            lookback: Number of recent candles to analyze
-
-        Returns:
-            List of detected institutional orders
-        """
+        self.accumulation_range_pips = 10  # Accumulation candles range under 10 pips
+        self.accumulation_volume_threshold = 4.0  # Accumulation needs 4× average volume
+        self.min_history_candles = 10  # Candles needed before the first detection
+
+        # Symbol -> pip size (from SymbolManager)
+        self._pip_sizes: Dict[str, float] = {}
+
+    def get_pip_size(self, symbol: str) -> float:
+        """Pip size for symbol from SymbolManager specs (cached)"""
+        if symbol not in self._pip_sizes:
+            from core.symbol_manager import symbol_specs_manager
+            self._pip_sizes[symbol] = symbol_specs_manager.get_pip_size(symbol)
+        return self._pip_sizes[symbol]
+
+    def _extract_window(self, df: pd.DataFrame, lookback: int) -> Optional[Dict]:
+        """Get the last `lookback` candles as column arrays (None if unusable)"""
         if df is None or len(df) < lookback:
-            return []
+            return None
 
         required_cols = ['open', 'high', 'low', 'close', 'time']
         if not all(col in df.columns for col in required_cols):
-            return []
+            return None
 
         # Get volume column (prefer volume, fallback to tick_volume)
-        volume_col = None
         if 'volume' in df.columns:
             volume_col = 'volume'
         elif 'tick_volume' in df.columns:
             volume_col = 'tick_volume'
+        else:
+            return None
+
+        recent_df = df.iloc[-lookback:]
+        window = {col: recent_df[col].to_numpy(dtype=float)
+                  for col in ('open', 'high', 'low', 'close')}
+        window['volume'] = recent_df[volume_col].to_numpy(dtype=float)
+        window['time'] = recent_df['time']
+        return window
+
+    def _classify_candles(self, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                          close: np.ndarray, volume: np.ndarray,
+                          pip_size: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Classify every candle at once
 
-        if volume_col is None:
-            return []
-
-        detected_orders = []
+        Price/volume arrays have shape (symbols, candles); pip_size has shape
+        (symbols, 1). Patterns are checked in priority order (upper-wick
+        absorption, lower-wick absorption, sweep, accumulation), and a candle
+        matching an earlier pattern's shape is not considered for later ones.
 
-        # Analyze recent candles
-        recent_df = df.tail(lookback).copy()
+        Returns:
+            Dict of (symbols, candles) arrays: code (ORDER_* constant),
+            volume_multiplier, pip_move, is_bullish
+        """
+        avg_volume = volume.mean(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_multiplier = np.where(avg_volume > 0, volume / avg_volume, 0.0)
+
+        # Candle metrics in pips
+        is_bullish = close > open_
+        body_size = np.abs(close - open_) / pip_size
+        candle_range = (high - low) / pip_size
+        upper_wick = (high - np.maximum(open_, close)) / pip_size
+        lower_wick = (np.minimum(open_, close) - low) / pip_size
+
+        # Volume spike, skipping candles without enough data for comparison
+        eligible = volume_multiplier >= self.volume_spike_threshold
+        eligible[:, :self.min_history_candles] = False
+
+        # Candle shapes (mutually exclusive, in priority order)
+        upper_rejection = upper_wick > candle_range * self.wick_ratio_threshold
+        lower_rejection = ~upper_rejection & (lower_wick > candle_range * self.wick_ratio_threshold)
+        no_rejection = ~upper_rejection & ~lower_rejection
+        large_body = no_rejection & (body_size > self.pip_move_threshold)
+        small_range = no_rejection & ~large_body & (candle_range < self.accumulation_range_pips)
+
+        conditions = [
+            eligible & upper_rejection & (upper_wick > self.pip_move_threshold),
+            eligible & lower_rejection & (lower_wick > self.pip_move_threshold),
+            eligible & large_body & (body_size > candle_range * 0.7),  # Strong body, small wicks
+            eligible & small_range & (volume_multiplier > self.accumulation_volume_threshold),
+        ]
+        codes = [self.ORDER_ABSORPTION_SELL, self.ORDER_ABSORPTION_BUY,
+                 self.ORDER_SWEEP, self.ORDER_ACCUMULATION]
 
-        # Calculate average volume
-        avg_volume = recent_df[volume_col].mean()
+        return {
+            'code': np.select(conditions, codes, self.ORDER_NONE),
+            'volume_multiplier': volume_multiplier,
+            'pip_move': np.select(conditions, [upper_wick, lower_wick, body_size, candle_range], 0.0),
+            'is_bullish': is_bullish,
+        }
 
-        if avg_volume == 0:
-            return []
+    def _build_orders(self, symbol: str, window: Dict, classified: Dict,
+                      row: int = 0) -> List[InstitutionalOrder]:
+        """Create InstitutionalOrder objects for the classified candles of one symbol"""
+        orders = []
+        code = classified['code'][row]
+
+        for idx in np.flatnonzero(code):
+            order_code = code[idx]
+            volume_multiplier = float(classified['volume_multiplier'][row, idx])
+
+            if order_code == self.ORDER_ABSORPTION_SELL:
+                # Sellers absorbed buying pressure
+                price, direction, order_type, weight = window['high'][idx], 'SELL', 'absorption', 20
+            elif order_code == self.ORDER_ABSORPTION_BUY:
+                # Buyers absorbed selling pressure
+                price, direction, order_type, weight = window['low'][idx], 'BUY', 'absorption', 20
+            elif order_code == self.ORDER_SWEEP:
+                direction = 'BUY' if classified['is_bullish'][row, idx] else 'SELL'
+                price, order_type, weight = window['close'][idx], 'sweep', 15
+            else:
+                # Accumulation at this level
+                price = (window['high'][idx] + window['low'][idx]) / 2
+                direction, order_type, weight = 'NEUTRAL', 'accumulation', 12
+
+            orders.append(InstitutionalOrder(
+                symbol=symbol,
+                timestamp=window['time'].iloc[idx],
+                price=float(price),
+                direction=direction,
+                volume_multiplier=volume_multiplier,
+                pip_move=float(classified['pip_move'][row, idx]),
+                order_type=order_type,
+                confidence=min(100, volume_multiplier * weight)
+            ))
+
+        return orders
+
+    @property
+    def order_history(self) -> List[InstitutionalOrder]:
+        """All orders in history, every symbol"""
+        return [order for orders in self.symbol_history.values() for order in orders.values()]
+
+    def add_orders(self, orders: List[InstitutionalOrder]) -> List[InstitutionalOrder]:
+        """
+        Add orders to their symbol's history, skipping ones already recorded
 
-        # Scan each candle
-        for idx in range(len(recent_df)):
-            candle = recent_df.iloc[idx]
+        An order is identified by (symbol, candle time, order type), so
+        rescanning the same candles does not duplicate them.
 
-            # Skip if not enough data for comparison
-            if idx < 10:
+        Returns:
+            Orders that were not in history yet
+        """
+        new_orders = []
+        for order in orders:
+            history = self.symbol_history.setdefault(order.symbol, {})
+            key = (order.timestamp, order.order_type)
+            if key in history:
                 continue
+            history[key] = order
+            new_orders.append(order)
+            if len(history) > self.max_history:
+                # Drop the oldest recorded order of this symbol
+                del history[next(iter(history))]
+        return new_orders
 
-            # Volume spike detection
-            current_volume = candle[volume_col]
-            volume_multiplier = current_volume / avg_volume
+    def clear_history(self):
+        """Forget all recorded orders"""
+        self.symbol_history.clear()
 
-            if volume_multiplier < self.volume_spike_threshold:
-                continue
+    def scan_for_orders(self, symbol: str, df: pd.DataFrame,
+                       lookback: int = 50) -> List[InstitutionalOrder]:
+        """
+        Scan for institutional orders in recent price action
+
+        Args:
+            symbol: Trading symbol
+            df: DataFrame with OHLC and volume data
+            lookback: Number of recent candles to analyze
+
+        Returns:
+            List of newly detected institutional orders
+        """
+        return self.scan_watchlist({symbol: df}, lookback).get(symbol, [])
 
-            # Price movement analysis
-            open_price = candle['open']
-            high_price = candle['high']
-            low_price = candle['low']
-            close_price = candle['close']
+    @instrumentation.timed('analyzer')
+    def scan_watchlist(self, frames: Dict[str, pd.DataFrame],
+                       lookback: int = 50) -> Dict[str, List[InstitutionalOrder]]:
+        """
+        Scan several symbols for institutional orders in one pass
 
-            pip_multiplier = 10000 if symbol != 'USDJPY' else 100
+        The last `lookback` candles of every usable symbol are stacked into
+        (symbols x candles) arrays and classified together.
 
-            # Bullish or bearish candle
-            is_bullish = close_price > open_price
-            body_size = abs(close_price - open_price) * pip_multiplier
-            candle_range = (high_price - low_price) * pip_multiplier
+        Args:
+            frames: {symbol: DataFrame with OHLC and volume data}
+            lookback: Number of recent candles to analyze per symbol
 
-            # Upper and lower wicks
-            if is_bullish:
-                upper_wick = (high_price - close_price) * pip_multiplier
-                lower_wick = (open_price - low_price) * pip_multiplier
-            else:
-                upper_wick = (high_price - open_price) * pip_multiplier
-                lower_wick = (close_price - low_price) * pip_multiplier
-
-            # Check for various order patterns
-
-            # 1. ABSORPTION (Large wick rejection)
-            if upper_wick > candle_range * self.wick_ratio_threshold:
-                if upper_wick > self.pip_move_threshold:
-                    # Sellers absorbed buying pressure
-                    order = InstitutionalOrder(
-                        symbol=symbol,
-                        timestamp=candle['time'],
-                        price=high_price,
-                        direction='SELL',
-                        volume_multiplier=volume_multiplier,
-                        pip_move=upper_wick,
-                        order_type='absorption',
-                        confidence=min(100, volume_multiplier * 20)
-                    )
-                    detected_orders.append(order)
-
-            elif lower_wick > candle_range * self.wick_ratio_threshold:
-                if lower_wick > self.pip_move_threshold:
-                    # Buyers absorbed selling pressure
-                    order = InstitutionalOrder(
-                        symbol=symbol,
-                        timestamp=candle['time'],
-                        price=low_price,
-                        direction='BUY',
-                        volume_multiplier=volume_multiplier,
-                        pip_move=lower_wick,
-                        order_type='absorption',
-                        confidence=min(100, volume_multiplier * 20)
-                    )
-                    detected_orders.append(order)
-
-            # 2. SWEEP (Strong directional move with volume)
-            elif body_size > self.pip_move_threshold:
-                if body_size > candle_range * 0.7:  # Strong body, small wicks
-                    direction = 'BUY' if is_bullish else 'SELL'
-                    order_price = close_price
-
-                    order = InstitutionalOrder(
-                        symbol=symbol,
-                        timestamp=candle['time'],
-                        price=order_price,
-                        direction=direction,
-                        volume_multiplier=volume_multiplier,
-                        pip_move=body_size,
-                        order_type='sweep',
-                        confidence=min(100, volume_multiplier * 15)
-                    )
-                    detected_orders.append(order)
-
-            # 3. ACCUMULATION (Large volume, small body - consolidation)
-            elif candle_range < 10 * (1 / pip_multiplier):  # Small range
-                if volume_multiplier > 4.0:  # Even higher volume threshold
-                    # Accumulation at this level
-                    order = InstitutionalOrder(
-                        symbol=symbol,
-                        timestamp=candle['time'],
-                        price=(high_price + low_price) / 2,
-                        direction='NEUTRAL',
-                        volume_multiplier=volume_multiplier,
-                        pip_move=candle_range,
-                        order_type='accumulation',
-                        confidence=min(100, volume_multiplier * 12)
-                    )
-                    detected_orders.append(order)
-
-        # Add to history
-        for order in detected_orders:
-            self.order_history.append(order)
+        Returns:
+            {symbol: newly detected orders} for every symbol that could be
+            scanned (orders found by an earlier scan are not repeated)
+        """
+        windows = {}
+        for symbol, df in frames.items():
+            window = self._extract_window(df, lookback)
+            if window is not None:
+                windows[symbol] = window
+
+        if not windows:
+            return {}
+
+        symbols = list(windows)
+        stacked = {col: np.vstack([windows[symbol][col] for symbol in symbols])
+                   for col in ('open', 'high', 'low', 'close', 'volume')}
+        pip_size = np.array([[self.get_pip_size(symbol)] for symbol in symbols])
+
+        classified = self._classify_candles(stacked['open'], stacked['high'], stacked['low'],
+                                            stacked['close'], stacked['volume'], pip_size)
+
+        results = {}
+        for row, symbol in enumerate(symbols):
+            detected_orders = self._build_orders(symbol, windows[symbol], classified, row)
+
+            # Add to history
+            results[symbol] = self.add_orders(detected_orders)
 
         self.last_scan = datetime.now()
 
-        return detected_orders
+        return results
 
     def get_recent_orders(self, symbol: Optional[str] = None,
                          hours: int = 24) -> List[InstitutionalOrder]:
@@ -249,11 +326,12 @@ class InstitutionalOrderFlowDetector:
         """
         cutoff = datetime.now() - timedelta(hours=hours)
 
-        recent = []
-        for order in self.order_history:
-            if order.timestamp >= cutoff:
-                if symbol is None or order.symbol == symbol:
-                    recent.append(order)
+        if symbol is None:
+            orders = self.order_history
+        else:
+            orders = self.symbol_history.get(symbol, {}).values()
+
+        recent = [order for order in orders if order.timestamp >= cutoff]
 
         return sorted(recent, key=lambda x: x.timestamp, reverse=True)
 
@@ -274,8 +352,7 @@ class InstitutionalOrderFlowDetector:
         if not orders:
             return []
 
-        pip_multiplier = 10000 if symbol != 'USDJPY' else 100
-        price_tolerance = price_tolerance_pips / pip_multiplier
+        price_tolerance = price_tolerance_pips * self.get_pip_size(symbol)
 
         clusters = []
 
@@ -391,7 +468,8 @@ class InstitutionalOrderFlowDetector:
 
     def get_summary_stats(self) -> Dict:
         """Get summary statistics"""
-        total_orders = len(self.order_history)
+        order_history = self.order_history
+        total_orders = len(order_history)
 
         if total_orders == 0:
             return {
@@ -402,12 +480,12 @@ class InstitutionalOrderFlowDetector:
                 'avg_confidence': 0
             }
 
-        buy_count = sum(1 for o in self.order_history if o.direction == 'BUY')
-        sell_count = sum(1 for o in self.order_history if o.direction == 'SELL')
+        buy_count = sum(1 for o in order_history if o.direction == 'BUY')
+        sell_count = sum(1 for o in order_history if o.direction == 'SELL')
         neutral_count = total_orders - buy_count - sell_count
 
-        avg_volume = np.mean([o.volume_multiplier for o in self.order_history])
-        avg_confidence = np.mean([o.confidence for o in self.order_history])
+        avg_volume = np.mean([o.volume_multiplier for o in order_history])
+        avg_confidence = np.mean([o.confidence for o in order_history])
 
         return {
             'total_orders': total_orders,
@@ -16,6 +16,7 @@ from core.ai_assist_base import AIAssistMixin
 from core.verbose_mode_manager import vprint
 from core.demo_mode_manager import demo_mode_manager, is_demo_mode, get_demo_data
 from core.verbose_mode_manager import vprint
+from core.instrumentation import instrumentation
 
 
 class OrderFlowListItem(QWidget):
@@ -343,6 +344,7 @@ class InstitutionalOrderFlowWidget(AIAssistMixin, QWidget):
             # Immediate refresh with new symbol
             self.refresh_display()
 
+    @instrumentation.timed('widget')
     def refresh_display(self):
         """Refresh the display with current data"""
         if not self.current_symbol:
@@ -421,6 +423,7 @@ class InstitutionalOrderFlowWidget(AIAssistMixin, QWidget):
         self.status_label.setText("Scanning...")
         # Actual scanning done by parent/controller
 
+    @instrumentation.timed('widget')
     def scan_and_update(self, symbol: str, df: pd.DataFrame, lookback: int = 50):
         """
         Convenience method to scan and update in one call
@@ -430,21 +433,33 @@ class InstitutionalOrderFlowWidget(AIAssistMixin, QWidget):
             df: DataFrame with OHLC and volume data
             lookback: Number of candles to analyze
         """
-        self.current_symbol = symbol
+        self.scan_watchlist_and_update({symbol: df}, symbol, lookback)
+
+    def scan_watchlist_and_update(self, frames: Dict[str, pd.DataFrame],
+                                  active_symbol: str, lookback: int = 50):
+        """
+        Scan every watchlist symbol in one pass and update the display
+
+        Args:
+            frames: {symbol: DataFrame with OHLC and volume data}
+            active_symbol: Symbol shown in the widget
+            lookback: Number of candles to analyze per symbol
+        """
+        self.current_symbol = active_symbol
 
         # Mark that we're using real data now
         if not self.using_real_data:
             self.using_real_data = True
             # Clear demo data from detector
-            order_flow_detector.order_history.clear()
+            order_flow_detector.clear_history()
             vprint("[Order Flow] Switched from demo data to REAL MT5 data")
 
-        # Run scan on real data
-        detected_orders = order_flow_detector.scan_for_orders(
-            symbol, df, lookback
-        )
+        # Run scan on real data (only orders not seen in an earlier scan are returned)
+        results = order_flow_detector.scan_watchlist(frames, lookback)
+        detected_orders = [order for orders in results.values() for order in orders]
 
-        vprint(f"[Order Flow] Detected {len(detected_orders)} institutional orders in real data")
+        vprint(f"[Order Flow] Detected {len(detected_orders)} new institutional orders "
+               f"across {len(results)} symbols in real data")
 
         # Emit signals for new orders
         for order in detected_orders:
@@ -549,12 +564,13 @@ class InstitutionalOrderFlowWidget(AIAssistMixin, QWidget):
         ]
 
         # Add sample orders to the detector's order history
-        order_flow_detector.order_history.extend(sample_orders)
+        order_flow_detector.add_orders(sample_orders)
         self.current_symbol = 'GBPUSD'
 
         # Refresh display
         self.refresh_display()
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
@@ -3,10 +3,13 @@ AppleTrader Pro - AI Pattern Quality Scorer
 Rates trading setups from 0-100 based on confluence factors
 """
 
-from typing import Dict, List, Tuple
+from typing import Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
+from core.lazy_loader import LazySingleton
+from core.pattern_stats_store import PatternStats, PatternStatsStore
+
 
 @dataclass
 class PatternScore:
@@ -34,6 +37,10 @@ class PatternScore:
     stars: int  # 1-5
     recommendation: str  # Detailed recommendation text
 
+    # 95% Wilson confidence bounds of the historical win rate
+    historical_win_rate_lower: float = 0.0
+    historical_win_rate_upper: float = 0.0
+
 
 class PatternQualityScorer:
     """
@@ -43,9 +50,14 @@ class PatternQualityScorer:
     and provides actionable recommendations
     """
 
+    # Trades needed before a (regime, session, timeframe) specific stat is used
+    HISTORICAL_MIN_SAMPLES = 10
+
     def __init__(self):
-        # Historical pattern database (would be loaded from file/database)
-        self.pattern_history: Dict[str, List[Dict]] = {}
+        # Historical pattern stats: EA performance CSVs + trades recorded by the app
+        self.stats_store = PatternStatsStore()
+        self.stats_store.load_ea_performance()
+        self.stats_store.load()
 
         # Quality tier thresholds
         self.tier_thresholds = {
@@ -71,6 +83,8 @@ class PatternQualityScorer:
         in_session: str = "ASIAN",
         with_structure: bool = False,
         swing_level: bool = False,
+        regime: Optional[str] = None,
+        timeframe: Optional[str] = None,
     ) -> PatternScore:
         """
         Score a trading pattern based on confluence factors
@@ -89,6 +103,8 @@ class PatternQualityScorer:
             in_session: Trading session (LONDON, NY, ASIAN)
             with_structure: Aligned with market structure
             swing_level: At swing high/low
+            regime: Market regime (TREND, RANGE, TRANSITION) for historical stats
+            timeframe: Pattern timeframe (e.g., 'H1') for historical stats
 
         Returns:
             PatternScore object with full breakdown
@@ -186,7 +202,11 @@ class PatternQualityScorer:
         # ========================================
         # HISTORICAL PERFORMANCE (0-5 points)
         # ========================================
-        historical_win_rate, historical_avg_rr, sample_size = self._get_historical_stats(pattern_type)
+        history = self._get_historical_stats(pattern_type, regime, in_session, timeframe)
+        historical_win_rate = history.win_rate
+        historical_avg_rr = history.avg_rr
+        sample_size = history.trades
+        win_rate_lower, win_rate_upper = history.wilson_bounds()
 
         if sample_size >= 30 and historical_win_rate >= 0.70:
             historical_score = 5  # Proven high win rate
@@ -220,7 +240,8 @@ class PatternQualityScorer:
             pattern_type, total_score, tier,
             zone_score, volume_score, liquidity_score,
             mtf_score, session_score, structure_score,
-            historical_win_rate, historical_avg_rr
+            historical_win_rate, historical_avg_rr,
+            win_rate_lower, win_rate_upper
         )
 
         return PatternScore(
@@ -240,26 +261,24 @@ class PatternQualityScorer:
             historical_sample_size=sample_size,
             quality_tier=tier,
             stars=stars,
-            recommendation=recommendation
+            recommendation=recommendation,
+            historical_win_rate_lower=win_rate_lower,
+            historical_win_rate_upper=win_rate_upper
         )
 
-    def _get_historical_stats(self, pattern_type: str) -> Tuple[float, float, int]:
-        """Get historical statistics for a pattern type"""
-
-        if pattern_type not in self.pattern_history:
-            return 0.0, 0.0, 0
-
-        history = self.pattern_history[pattern_type]
-        if not history:
-            return 0.0, 0.0, 0
-
-        wins = sum(1 for trade in history if trade.get('profit', 0) > 0)
-        total = len(history)
-        win_rate = wins / total if total > 0 else 0.0
-
-        avg_rr = sum(trade.get('rr', 0) for trade in history) / total if total > 0 else 0.0
+    def _get_historical_stats(self, pattern_type: str, regime: Optional[str] = None,
+                              session: Optional[str] = None,
+                              timeframe: Optional[str] = None) -> PatternStats:
+        """
+        Get historical statistics for a pattern type
 
-        return win_rate, avg_rr, total
+        Uses the most specific (regime, session, timeframe) bucket with at
+        least HISTORICAL_MIN_SAMPLES trades, backing off to coarser buckets.
+        """
+        if session == 'UNKNOWN':
+            session = None
+        return self.stats_store.lookup(pattern_type, regime, session, timeframe,
+                                       min_samples=self.HISTORICAL_MIN_SAMPLES)
 
     def _get_quality_tier(self, score: int) -> Tuple[str, int, str]:
         """Get quality tier based on score"""
@@ -283,7 +302,9 @@ class PatternQualityScorer:
         session_score: int,
         structure_score: int,
         historical_win_rate: float,
-        historical_avg_rr: float
+        historical_avg_rr: float,
+        win_rate_lower: float = 0.0,
+        win_rate_upper: float = 0.0
     ) -> str:
         """Generate detailed recommendation text"""
 
@@ -314,7 +335,9 @@ class PatternQualityScorer:
 
         # Add specific strengths/weaknesses
         if historical_win_rate > 0:
-            recommendation += f"\nHistorical Win Rate: {historical_win_rate*100:.0f}% ({historical_avg_rr:.1f}R avg)\n"
+            recommendation += (f"\nHistorical Win Rate: {historical_win_rate*100:.0f}% "
+                               f"(95% CI {win_rate_lower*100:.0f}-{win_rate_upper*100:.0f}%, "
+                               f"{historical_avg_rr:.1f}R avg)\n")
 
         strengths = []
         if zone_score >= 15:
@@ -331,18 +354,12 @@ class PatternQualityScorer:
 
         return recommendation
 
-    def add_historical_trade(self, pattern_type: str, profit: float, rr: float):
-        """Add a completed trade to historical database"""
-
-        if pattern_type not in self.pattern_history:
-            self.pattern_history[pattern_type] = []
-
-        self.pattern_history[pattern_type].append({
-            'profit': profit,
-            'rr': rr,
-            'timestamp': datetime.now()
-        })
+    def add_historical_trade(self, pattern_type: str, profit: float, rr: float,
+                             regime: Optional[str] = None, session: Optional[str] = None,
+                             timeframe: Optional[str] = None):
+        """Add a completed trade to the historical stats store (persisted)"""
+        self.stats_store.record_trade(pattern_type, profit, rr, regime, session, timeframe)
 
 
-# Global scorer instance
-pattern_scorer = PatternQualityScorer()
+# Global scorer instance (constructed on first use)
+pattern_scorer = LazySingleton(PatternQualityScorer, 'pattern_scorer')
@@ -17,6 +17,7 @@ from core.demo_mode_manager import demo_mode_manager, is_demo_mode, get_demo_dat
 from core.verbose_mode_manager import vprint
 from core.multi_symbol_manager import get_all_symbols
 from core.verbose_mode_manager import vprint
+from core.instrumentation import instrumentation
 
 
 # Simple theme and settings (inline replacement for config module)
@@ -212,7 +213,8 @@ class PatternScorerWidget(QWidget, AIAssistMixin):
                     mtf_m15_aligned=structure_aligned,
                     in_session=market_state.get('session', 'UNKNOWN'),
                     with_structure=structure_aligned,
-                    swing_level=at_order_block or at_fvg  # OB/FVG are swing levels
+                    swing_level=at_order_block or at_fvg,  # OB/FVG are swing levels
+                    timeframe=opp.get('timeframe')
                 )
 
                 vprint(f"[PatternScorer]   → Scored opportunity pattern: {pattern_type}, Score: {pattern_score.total_score:.1f}")
@@ -254,6 +256,7 @@ class PatternScorerWidget(QWidget, AIAssistMixin):
             vprint(f"[Pattern Scorer] Error fetching live data: {e}")
             # Keep existing score if error occurs
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
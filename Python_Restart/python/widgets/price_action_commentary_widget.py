@@ -18,6 +18,7 @@ from analysis.order_block_detector import order_block_detector
 from analysis.liquidity_sweep_detector import liquidity_sweep_detector
 from analysis.fair_value_gap_detector import fair_value_gap_detector
 from analysis.market_structure_detector import market_structure_detector
+from core.instrumentation import instrumentation
 
 
 class PriceActionCommentaryWidget(AIAssistMixin, QWidget):
@@ -593,6 +594,7 @@ class PriceActionCommentaryWidget(AIAssistMixin, QWidget):
         self.live_label.setStyleSheet("color: #FFFFFF;")
         QTimer.singleShot(200, lambda: self.live_label.setStyleSheet("color: #10B981;"))
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         # This widget uses get_market_data() which automatically handles demo/live
@@ -3,11 +3,13 @@ AppleTrader Pro - Risk-Reward Optimizer with Structure Targeting (IMPROVEMENT #8
 Intelligent TP placement at structure levels for maximum expected value
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from core.excursion_engine import excursion_engine
+
 
 class TakeProfitLevel:
     """Individual take profit target"""
@@ -61,7 +63,8 @@ class RiskRewardOptimizer:
 
     Features:
     - Scans for resistance/support levels above/below entry
-    - Calculates reach probability for each level
+    - Calculates reach probability for each level (empirical MFE/MAE
+      table when bar history is cached, heuristic otherwise)
     - Optimizes partial TP percentages
     - Recommends best TP configuration
 
@@ -87,6 +90,9 @@ class RiskRewardOptimizer:
             'D1':  {'1R': 85, '2R': 70, '3R': 50, '4R': 32, '5R': 18}
         }
 
+        # Empirical P(reach k·R before -1R) tables from bar history
+        self.excursion_engine = excursion_engine
+
     def optimize_take_profits(self, symbol: str, direction: str,
                              entry_price: float, stop_loss: float,
                              structure_levels: Dict,
@@ -119,14 +125,18 @@ class RiskRewardOptimizer:
             target_levels = structure_levels.get('support', [])
             is_bullish = False
 
+        # Empirical reach curve for this symbol/timeframe/stop size (None = heuristic)
+        reach = self._get_reach_curve(symbol, timeframe, direction, r_distance)
+
         if not target_levels:
             # Fallback to fixed R:R if no structure
             return self._generate_fixed_rr_targets(
-                symbol, entry_price, stop_loss, r_distance, is_bullish, timeframe
+                symbol, entry_price, stop_loss, r_distance, is_bullish, timeframe, reach
             )
 
-        # Analyze each structure level
-        tp_candidates = []
+        # Collect structure levels in a reasonable R range
+        valid_levels = []
+        r_multiples = []
 
         for level in target_levels:
             level_price = level['price']
@@ -144,10 +154,24 @@ class RiskRewardOptimizer:
             if r_multiple < 0.5 or r_multiple > 10:
                 continue
 
+            valid_levels.append(level)
+            r_multiples.append(r_multiple)
+
+        # One table query for all candidate levels
+        base_probs = reach(np.array(r_multiples)) if reach and r_multiples else None
+
+        # Analyze each structure level
+        tp_candidates = []
+
+        for i, level in enumerate(valid_levels):
+            level_price = level['price']
+            r_multiple = r_multiples[i]
+
             # Estimate probability
             probability = self._estimate_reach_probability(
                 r_multiple, level.get('strength', 50),
-                level.get('timeframe', timeframe), timeframe
+                level.get('timeframe', timeframe), timeframe,
+                base_prob=base_probs[i] if base_probs is not None else None
             )
 
             # Create TP candidate
@@ -165,14 +189,17 @@ class RiskRewardOptimizer:
         if not tp_candidates:
             # Fallback if no valid structure levels
             return self._generate_fixed_rr_targets(
-                symbol, entry_price, stop_loss, r_distance, is_bullish, timeframe
+                symbol, entry_price, stop_loss, r_distance, is_bullish, timeframe, reach
             )
 
         # Sort by expected value (descending)
         tp_candidates.sort(key=lambda x: x.expected_value, reverse=True)
 
         # Select best 3 TPs and optimize partials
-        best_tps = self._select_and_optimize_tps(tp_candidates, r_distance)
+        best_tps = self._select_and_optimize_tps(
+            tp_candidates, r_distance, reach=reach,
+            entry_price=entry_price, is_bullish=is_bullish, timeframe=timeframe
+        )
 
         # Calculate overall expected value
         total_ev = self._calculate_total_expected_value(best_tps)
@@ -188,23 +215,42 @@ class RiskRewardOptimizer:
             'tp_levels': [tp.to_dict() for tp in best_tps],
             'total_expected_value': total_ev,
             'recommendation': self._generate_recommendation(best_tps, total_ev),
+            'probability_source': 'empirical' if reach else 'heuristic',
             'analysis_time': self.last_analysis
         }
 
+    def _get_reach_curve(self, symbol: str, timeframe: str, direction: str,
+                         r_distance: float) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        """
+        Get the empirical reach curve (R multiples -> probability %) for a trade
+
+        Returns None when no bar history is cached for the symbol/timeframe.
+        """
+        table = self.excursion_engine.get_table(symbol, timeframe)
+        if table is None:
+            return None
+
+        stop_atr = table.stop_in_atr(r_distance)
+        return lambda r_multiples: table.probability(direction, stop_atr, r_multiples) * 100.0
+
     def _estimate_reach_probability(self, r_multiple: float,
                                     level_strength: float,
                                     level_timeframe: str,
-                                    trade_timeframe: str) -> float:
+                                    trade_timeframe: str,
+                                    base_prob: Optional[float] = None) -> float:
         """
         Estimate probability of reaching a level
 
         Factors:
-        - R multiple (higher R = lower probability)
+        - R multiple (higher R = lower probability); taken from base_prob
+          (empirical reach table) when given
         - Level strength (stronger level = higher probability)
         - Timeframe alignment (higher TF level = higher probability)
         """
         # Base probability from R multiple
-        if trade_timeframe in self.reach_probabilities:
+        if base_prob is not None:
+            base_prob = float(base_prob)
+        elif trade_timeframe in self.reach_probabilities:
             tf_probs = self.reach_probabilities[trade_timeframe]
 
             # Interpolate probability
@@ -238,7 +284,11 @@ class RiskRewardOptimizer:
         return max(5, min(95, adjusted_prob))
 
     def _select_and_optimize_tps(self, candidates: List[TakeProfitLevel],
-                                r_distance: float) -> List[TakeProfitLevel]:
+                                r_distance: float,
+                                reach: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                                entry_price: Optional[float] = None,
+                                is_bullish: bool = True,
+                                timeframe: str = 'H4') -> List[TakeProfitLevel]:
         """
         Select best 3 TPs and optimize partial close percentages
 
@@ -246,40 +296,63 @@ class RiskRewardOptimizer:
         - TP1: Nearest good level (1-2R) - Close 30%
         - TP2: Medium level (2-4R) - Close 50%
         - TP3: Extended level (4-8R) - Close 20%
+
+        Slots without a structure level are filled with the fixed R target
+        that maximizes R x P(reach) on the empirical reach curve (requires
+        reach and entry_price).
         """
         selected = []
 
+        def pick(slot: str, min_r: float, max_r: float):
+            slot_candidates = [tp for tp in candidates if min_r <= tp.r_multiple <= max_r]
+            if slot_candidates:
+                tp = max(slot_candidates, key=lambda x: x.expected_value)
+            else:
+                tp = self._best_fixed_target(reach, entry_price, r_distance, is_bullish,
+                                             timeframe, min_r, max_r)
+            if tp is not None:
+                tp.partial_close_pct = self.default_partials[slot]
+                selected.append(tp)
+
         # Find TP1 (1-2R range, highest EV)
-        tp1_candidates = [tp for tp in candidates if 0.8 <= tp.r_multiple <= 2.5]
-        if tp1_candidates:
-            tp1 = max(tp1_candidates, key=lambda x: x.expected_value)
-            tp1.partial_close_pct = self.default_partials['TP1']
-            selected.append(tp1)
+        pick('TP1', 0.8, 2.5)
 
         # Find TP2 (2-4R range, must be beyond TP1)
         min_tp2_r = selected[0].r_multiple + 0.5 if selected else 2.0
-        tp2_candidates = [tp for tp in candidates
-                         if min_tp2_r <= tp.r_multiple <= 5.0]
-        if tp2_candidates:
-            tp2 = max(tp2_candidates, key=lambda x: x.expected_value)
-            tp2.partial_close_pct = self.default_partials['TP2']
-            selected.append(tp2)
+        pick('TP2', min_tp2_r, 5.0)
 
         # Find TP3 (4-10R range, must be beyond TP2)
         min_tp3_r = selected[-1].r_multiple + 0.5 if len(selected) >= 2 else 4.0
-        tp3_candidates = [tp for tp in candidates if tp.r_multiple >= min_tp3_r]
-        if tp3_candidates:
-            tp3 = max(tp3_candidates, key=lambda x: x.expected_value)
-            tp3.partial_close_pct = self.default_partials['TP3']
-            selected.append(tp3)
-
-        # If we have less than 3, fill with fixed R:R
-        if len(selected) < 3:
-            # Add fallback targets
-            pass
+        pick('TP3', min_tp3_r, 10.0)
 
         return selected
 
+    def _best_fixed_target(self, reach: Optional[Callable[[np.ndarray], np.ndarray]],
+                           entry_price: Optional[float], r_distance: float,
+                           is_bullish: bool, timeframe: str,
+                           min_r: float, max_r: float) -> Optional[TakeProfitLevel]:
+        """Fixed R target in [min_r, max_r] with the highest empirical expected value"""
+        if reach is None or entry_price is None or min_r > max_r:
+            return None
+
+        grid = np.round(np.arange(min_r, max_r + 1e-9, 0.25), 2)
+        if len(grid) == 0:
+            return None
+
+        probabilities = np.clip(reach(grid), 5, 95)
+        best = int(np.argmax(grid * probabilities))
+        r_multiple = float(grid[best])
+        multiplier = 1 if is_bullish else -1
+
+        return TakeProfitLevel(
+            price=entry_price + r_distance * r_multiple * multiplier,
+            r_multiple=r_multiple,
+            structure_type='fixed',
+            timeframe=timeframe,
+            probability=float(probabilities[best]),
+            partial_close_pct=0
+        )
+
     def _calculate_total_expected_value(self, tps: List[TakeProfitLevel]) -> float:
         """
         Calculate total expected value considering partial closes
@@ -297,7 +370,8 @@ class RiskRewardOptimizer:
 
     def _generate_fixed_rr_targets(self, symbol: str, entry: float,
                                    sl: float, r_distance: float,
-                                   is_bullish: bool, timeframe: str) -> Dict:
+                                   is_bullish: bool, timeframe: str,
+                                   reach: Optional[Callable[[np.ndarray], np.ndarray]] = None) -> Dict:
         """Generate fixed R:R targets as fallback"""
         direction = 'BUY' if is_bullish else 'SELL'
         multiplier = 1 if is_bullish else -1
@@ -308,9 +382,10 @@ class RiskRewardOptimizer:
         tp3_price = entry + (r_distance * 3.0 * multiplier)
 
         # Estimate probabilities
-        tp1_prob = self._estimate_reach_probability(1.0, 50, timeframe, timeframe)
-        tp2_prob = self._estimate_reach_probability(2.0, 50, timeframe, timeframe)
-        tp3_prob = self._estimate_reach_probability(3.0, 50, timeframe, timeframe)
+        base_probs = reach(np.array([1.0, 2.0, 3.0])) if reach else [None, None, None]
+        tp1_prob = self._estimate_reach_probability(1.0, 50, timeframe, timeframe, base_probs[0])
+        tp2_prob = self._estimate_reach_probability(2.0, 50, timeframe, timeframe, base_probs[1])
+        tp3_prob = self._estimate_reach_probability(3.0, 50, timeframe, timeframe, base_probs[2])
 
         tp1 = TakeProfitLevel(tp1_price, 1.0, 'fixed', timeframe, tp1_prob, 30)
         tp2 = TakeProfitLevel(tp2_price, 2.0, 'fixed', timeframe, tp2_prob, 50)
@@ -328,6 +403,7 @@ class RiskRewardOptimizer:
             'tp_levels': [tp.to_dict() for tp in tps],
             'total_expected_value': total_ev,
             'recommendation': 'Using fixed R:R targets (no structure data available)',
+            'probability_source': 'empirical' if reach else 'heuristic',
             'analysis_time': datetime.now()
         }
 
@@ -17,6 +17,7 @@ from core.demo_mode_manager import demo_mode_manager, is_demo_mode, get_demo_dat
 from core.verbose_mode_manager import vprint
 from core.multi_symbol_manager import get_all_symbols
 from core.verbose_mode_manager import vprint
+from core.instrumentation import instrumentation
 
 
 class TPLevelWidget(QWidget):
@@ -471,6 +472,7 @@ class RiskRewardWidget(QWidget, AIAssistMixin):
         # Update recommendation
         self.recommendation_text.setPlainText(analysis['recommendation'])
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
@@ -10,6 +10,13 @@ import numpy as np
 from datetime import datetime
 from collections import defaultdict
 
+from core.instrumentation import instrumentation
+
+
+# Panel layout: (symbols, bars, field) with fields in this order
+PANEL_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+PANEL_BARS = 50  # Bars per symbol stacked into the panel (scan needs 50)
+
 
 class SessionMomentumScanner:
     """
@@ -42,6 +49,16 @@ class SessionMomentumScanner:
         self.last_update = None
         self.leaderboard = []  # Sorted list of symbols by momentum
 
+        # Panel mode: score all symbols in one vectorized pass over a
+        # (symbols x bars x OHLCV) array instead of one DataFrame at a time
+        self.panel_mode = True
+        self.panel_symbols: List[str] = []
+        self.panel_scores = np.empty(0)
+
+        # Symbol -> pip size (from SymbolManager)
+        self._pip_sizes: Dict[str, float] = {}
+
+    @instrumentation.timed('analyzer')
     def scan_momentum(self, market_data: Dict[str, pd.DataFrame]) -> List[Dict]:
         """
         Scan momentum across all symbols
@@ -52,6 +69,9 @@ class SessionMomentumScanner:
         Returns:
             Sorted list of momentum data (highest first)
         """
+        if self.panel_mode:
+            return self.scan_momentum_panel(market_data)
+
         self.momentum_scores = {}
 
         for symbol, df in market_data.items():
@@ -69,6 +89,167 @@ class SessionMomentumScanner:
             reverse=True
         )
 
+        self.panel_symbols = [data['symbol'] for data in self.leaderboard]
+        self.panel_scores = np.array([data['momentum_score'] for data in self.leaderboard])
+
+        self.last_update = datetime.now()
+
+        return self.leaderboard
+
+    def get_pip_size(self, symbol: str) -> float:
+        """Pip size for symbol from SymbolManager specs (cached)"""
+        if symbol not in self._pip_sizes:
+            from core.symbol_manager import symbol_specs_manager
+            self._pip_sizes[symbol] = symbol_specs_manager.get_pip_size(symbol)
+        return self._pip_sizes[symbol]
+
+    def build_panel(self, market_data: Dict[str, pd.DataFrame],
+                    bars: int = PANEL_BARS) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Stack the last `bars` candles of every usable symbol
+
+        Symbols are aligned on their most recent bar.
+
+        Returns:
+            (symbols, panel, has_volume) where panel has shape
+            (symbols, bars, 5) with fields PANEL_FIELDS and has_volume is a
+            (symbols,) bool array (volume is NaN where it is missing)
+        """
+        symbols = []
+        rows = []
+        has_volume = []
+
+        for symbol, df in market_data.items():
+            if df is None or len(df) < bars:
+                continue
+            if not all(col in df.columns for col in ('open', 'high', 'low', 'close')):
+                continue
+
+            vol_col = 'volume' if 'volume' in df.columns else (
+                'tick_volume' if 'tick_volume' in df.columns else None)
+            row = np.empty((bars, len(PANEL_FIELDS)))
+            for i, field in enumerate(PANEL_FIELDS[:4]):
+                row[:, i] = df[field].to_numpy()[-bars:]
+            row[:, 4] = df[vol_col].to_numpy()[-bars:] if vol_col else np.nan
+
+            symbols.append(symbol)
+            rows.append(row)
+            has_volume.append(vol_col is not None)
+
+        if not rows:
+            return [], np.empty((0, bars, len(PANEL_FIELDS))), np.empty(0, dtype=bool)
+        return symbols, np.stack(rows), np.array(has_volume)
+
+    def calculate_panel_momentum(self, panel: np.ndarray, has_volume: np.ndarray,
+                                 period: int = 14, average_bars: int = 20) -> Dict[str, np.ndarray]:
+        """
+        Momentum metrics for every symbol of a panel in one pass
+
+        Same definitions as _calculate_momentum/_calculate_trending_strength:
+        the last bar is compared against the mean of the previous
+        average_bars - 1 bars.
+
+        Args:
+            panel: (symbols, bars, 5) array from build_panel
+            has_volume: (symbols,) bool array from build_panel
+
+        Returns:
+            Dict of (symbols,) arrays
+        """
+        open_, high, low, close, volume = (panel[:, :, i] for i in range(len(PANEL_FIELDS)))
+        previous = slice(-average_bars, -1)
+
+        # ATR (simple moving average of true range) at every bar
+        prev_close = close[:, :-1]
+        true_range = np.maximum(high[:, 1:] - low[:, 1:],
+                                np.maximum(np.abs(high[:, 1:] - prev_close),
+                                           np.abs(low[:, 1:] - prev_close)))
+        csum = np.cumsum(true_range, axis=1)
+        atr = (csum[:, period - 1:] - np.hstack([np.zeros((len(panel), 1)), csum[:, :-period]])) / period
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            current_atr = atr[:, -1]
+            avg_atr = atr[:, previous].mean(axis=1)
+            atr_spike_pct = np.where(avg_atr == 0, 0.0, (current_atr - avg_atr) / avg_atr * 100)
+
+            ranges = high - low
+            current_range = ranges[:, -1]
+            avg_range = ranges[:, previous].mean(axis=1)
+            range_expansion_pct = np.where(avg_range == 0, 0.0,
+                                           (current_range - avg_range) / avg_range * 100)
+
+            avg_volume = volume[:, previous].mean(axis=1)
+            volume_ok = has_volume & (avg_volume > 0)
+            volume_spike_pct = np.where(volume_ok, (volume[:, -1] - avg_volume) / avg_volume * 100, 0.0)
+
+        atr_score = np.clip(atr_spike_pct * 0.7, 0, 35)
+        range_score = np.clip(range_expansion_pct * 0.7, 0, 35)
+        volume_score = np.where(volume_ok, np.clip(volume_spike_pct * 0.6, 0, 30), 0.0)
+
+        # Trending strength (simplified ADX over the last `period` moves)
+        up_move = np.diff(high, axis=1)[:, -period:]
+        down_move = -np.diff(low, axis=1)[:, -period:]
+        avg_up = np.where(up_move > down_move, np.maximum(up_move, 0), 0).mean(axis=1)
+        avg_down = np.where(down_move > up_move, np.maximum(down_move, 0), 0).mean(axis=1)
+        total_movement = avg_up + avg_down
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dx = np.where(total_movement == 0, 0.0,
+                          np.abs(avg_up - avg_down) / total_movement * 100)
+
+        return {
+            'momentum_score': atr_score + range_score + volume_score,
+            'atr_score': atr_score,
+            'range_score': range_score,
+            'volume_score': volume_score,
+            'atr_spike_pct': atr_spike_pct,
+            'range_expansion_pct': range_expansion_pct,
+            'current_range': current_range,
+            'bullish': close[:, -1] - close[:, -5] > 0,
+            'trending_strength': np.minimum(100, dx),
+            'current_price': close[:, -1],
+        }
+
+    def scan_momentum_panel(self, market_data: Dict[str, pd.DataFrame]) -> List[Dict]:
+        """
+        Panel-mode scan_momentum: stack all symbols and score them together
+
+        Args:
+            market_data: {symbol: DataFrame with OHLC data}
+
+        Returns:
+            Sorted list of momentum data (highest first)
+        """
+        symbols, panel, has_volume = self.build_panel(market_data)
+        self.momentum_scores = {}
+
+        if symbols:
+            metrics = self.calculate_panel_momentum(panel, has_volume)
+            pip_sizes = np.array([self.get_pip_size(symbol) for symbol in symbols])
+            session_range_pips = metrics['current_range'] / pip_sizes
+
+            columns = {key: metrics[key].tolist() for key in (
+                'momentum_score', 'atr_score', 'range_score', 'volume_score',
+                'atr_spike_pct', 'range_expansion_pct', 'trending_strength', 'current_price')}
+            bullish = metrics['bullish'].tolist()
+            pips = session_range_pips.tolist()
+
+            for i, symbol in enumerate(symbols):
+                data = {'symbol': symbol}
+                for key, values in columns.items():
+                    data[key] = values[i]
+                data['session_range_pips'] = pips[i]
+                data['direction'] = 'BULLISH' if bullish[i] else 'BEARISH'
+                self.momentum_scores[symbol] = data
+
+            order = np.argsort(-metrics['momentum_score'], kind='stable')
+            self.panel_symbols = symbols
+            self.panel_scores = metrics['momentum_score']
+            self.leaderboard = [self.momentum_scores[symbols[i]] for i in order]
+        else:
+            self.panel_symbols = []
+            self.panel_scores = np.empty(0)
+            self.leaderboard = []
+
         self.last_update = datetime.now()
 
         return self.leaderboard
@@ -144,8 +325,7 @@ class SessionMomentumScanner:
         momentum_score = atr_score + range_score + volume_score
 
         # Calculate pip movement (session range)
-        pip_multiplier = 10000 if symbol != 'USDJPY' else 100
-        session_range_pips = current_range * pip_multiplier
+        session_range_pips = current_range / self.get_pip_size(symbol)
 
         # Determine momentum direction
         recent_candles = df.iloc[-5:]
@@ -239,7 +419,16 @@ class SessionMomentumScanner:
         Returns:
             List of momentum data dicts
         """
-        return self.leaderboard[:count]
+        scores = self.panel_scores
+        if count <= 0 or len(scores) == 0:
+            return []
+        if count >= len(scores):
+            return self.leaderboard[:count]
+
+        # Partial selection of the top N, then order just those
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [self.momentum_scores[self.panel_symbols[i]] for i in top]
 
     def get_best_opportunity(self) -> Optional[Dict]:
         """
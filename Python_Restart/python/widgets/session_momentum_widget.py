@@ -21,6 +21,7 @@ from core.multi_symbol_manager import get_all_symbols, get_active_symbol
 from core.verbose_mode_manager import vprint
 from core.ml_integration import create_ai_suggestion
 from core.verbose_mode_manager import vprint
+from core.instrumentation import instrumentation
 
 
 class MomentumListItem(QWidget):
@@ -279,6 +280,7 @@ class SessionMomentumWidget(QWidget, AIAssistMixin):
             vprint(f"    ⚠️ MT5 fetch error: {e}")
             return {}
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
@@ -626,6 +628,7 @@ class SessionMomentumWidget(QWidget, AIAssistMixin):
         if symbol:
             self.symbol_selected.emit(symbol)
 
+    @instrumentation.timed('widget')
     def scan_and_update(self, market_data: Dict[str, pd.DataFrame]):
         """
         Convenience method to scan and update in one call
@@ -14,6 +14,7 @@ from widgets.trade_journal import (trade_journal, TradeJournalEntry,
                                    TradeSetupType)
 from core.ai_assist_base import AIAssistMixin
 from core.demo_mode_manager import demo_mode_manager, is_demo_mode, get_demo_data
+from core.instrumentation import instrumentation
 
 
 class TradeJournalWidget(AIAssistMixin, QWidget):
@@ -378,6 +379,7 @@ class TradeJournalWidget(AIAssistMixin, QWidget):
                 entry_time, exit_time, profit, pips, r_mult
             )
 
+    @instrumentation.timed('widget')
     def refresh_display(self):
         """Refresh all displays with current data"""
         # Get analysis
@@ -554,6 +556,7 @@ class TradeJournalWidget(AIAssistMixin, QWidget):
         self.ai_text.setPlainText("No data")
         self.recommendations_text.setPlainText("No data")
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         if is_demo_mode():
@@ -15,11 +15,14 @@ from PyQt6.QtGui import QFont
 from core.verbose_mode_manager import vprint
 from core.symbol_manager import symbol_specs_manager
 
-try:
-    import MetaTrader5 as mt5
-    MT5_AVAILABLE = True
-except ImportError:
-    MT5_AVAILABLE = False
+from core.lazy_loader import lazy_import
+from core.instrumentation import instrumentation
+from core.bar_resampler import bar_resampler
+from core.market_analyzer import market_analyzer
+
+# MetaTrader5 is imported on first use to keep startup fast
+mt5 = lazy_import('MetaTrader5')
+MT5_AVAILABLE = mt5 is not None
 
 # Import Wyckoff analyzer
 try:
@@ -30,6 +33,9 @@ except ImportError:
     from core.verbose_mode_manager import vprint
     vprint("Warning: Wyckoff analyzer not available")
 
+# Bars per timeframe for Wyckoff analysis (incremental after the first check)
+WYCKOFF_BARS = 500
+
 
 class TradeValidatorWidget(QWidget):
     """Widget for validating manual trade ideas"""
@@ -295,7 +301,7 @@ Note: Spread is YOUR call - we focus on ML predictions and market conditions.
             }
 
             for tf_name, tf_value in timeframes.items():
-                wyckoff_result = self.wyckoff_analyzer.analyze_symbol(symbol, tf_value, bars=100)
+                wyckoff_result = self.wyckoff_analyzer.analyze_symbol(symbol, tf_value, bars=WYCKOFF_BARS)
                 if wyckoff_result:
                     wyckoff_multi_tf[tf_name] = wyckoff_result
 
@@ -468,25 +474,19 @@ Note: Spread is YOUR call - we focus on ML predictions and market conditions.
             current_price = tick.bid
 
             # MULTI-TIMEFRAME TREND ANALYSIS
-            timeframes = {
-                'M15': mt5.TIMEFRAME_M15,
-                'H1': mt5.TIMEFRAME_H1,
-                'H4': mt5.TIMEFRAME_H4,
-                'D1': mt5.TIMEFRAME_D1
-            }
-
+            # All timeframes come from one base series (bar_resampler), fetched once
+            timeframes = ['M15', 'H1', 'H4', 'D1']
+            rates_by_tf = {tf_name: bar_resampler.copy_rates(symbol, tf_name, 100)
+                           for tf_name in timeframes}
+
+            # Trends from the shared trend matrix (recomputed only when a bar closes)
+            trend_labels = {'bullish': "BULLISH", 'bearish': "BEARISH", 'neutral': "RANGING"}
+            market_analyzer.trend_matrix.refresh([symbol], timeframes)
             trends = {}
-            for tf_name, tf_value in timeframes.items():
-                rates = mt5.copy_rates_from_pos(symbol, tf_value, 0, 100)
-                if rates is not None and len(rates) >= 50:
-                    ma50 = np.mean(rates[-50:]['close'])
-
-                    if current_price > ma50 * 1.005:  # 0.5% above MA
-                        trends[tf_name] = "BULLISH"
-                    elif current_price < ma50 * 0.995:  # 0.5% below MA
-                        trends[tf_name] = "BEARISH"
-                    else:
-                        trends[tf_name] = "RANGING"
+            for tf_name in timeframes:
+                cell = market_analyzer.trend_matrix.cells.get((symbol, tf_name))
+                if cell is not None and cell.available:
+                    trends[tf_name] = trend_labels[cell.trend]
 
             # Primary trend (use H4 as main timeframe for decision)
             trend = trends.get('H4', 'UNKNOWN')
@@ -496,15 +496,15 @@ Note: Spread is YOUR call - we focus on ML predictions and market conditions.
             ranging_timeframes = {}
 
             scalping_tfs = {
-                'M15': {'mt5_tf': mt5.TIMEFRAME_M15, 'bars': 50, 'bar_minutes': 15},
-                'H1': {'mt5_tf': mt5.TIMEFRAME_H1, 'bars': 50, 'bar_minutes': 60},
-                'H4': {'mt5_tf': mt5.TIMEFRAME_H4, 'bars': 50, 'bar_minutes': 240}
+                'M15': {'bars': 50, 'bar_minutes': 15},
+                'H1': {'bars': 50, 'bar_minutes': 60},
+                'H4': {'bars': 50, 'bar_minutes': 240}
             }
 
             for tf_name, tf_config in scalping_tfs.items():
                 # Only analyze ranges for timeframes that are actually RANGING
                 if trends.get(tf_name) == "RANGING":
-                    rates = mt5.copy_rates_from_pos(symbol, tf_config['mt5_tf'], 0, 100)
+                    rates = rates_by_tf[tf_name]
                     if rates is not None and len(rates) >= tf_config['bars']:
                         # Find recent swing high/low
                         range_high = np.max(rates[-tf_config['bars']:]['high'])
@@ -561,7 +561,7 @@ Note: Spread is YOUR call - we focus on ML predictions and market conditions.
             range_info = ranging_timeframes.get('H4', None)
 
             # Analyze volatility (using H1)
-            rates_h1 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 0, 100)
+            rates_h1 = rates_by_tf['H1']
             if rates_h1 is not None and len(rates_h1) >= 20:
                 high_low = rates_h1[-20:]['high'] - rates_h1[-20:]['low']
                 avg_range = np.mean(high_low)
@@ -1411,6 +1411,7 @@ Note: Spread is YOUR call - we focus on ML predictions and market conditions.
         """Update the current symbol"""
         self.current_symbol = symbol
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget data - called periodically"""
         pass  # No periodic updates needed for this widget
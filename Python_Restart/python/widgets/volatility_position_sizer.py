@@ -11,6 +11,7 @@ import numpy as np
 from datetime import datetime
 from enum import Enum
 from core.symbol_manager import symbol_specs_manager
+from core.instrumentation import instrumentation
 
 
 class VolatilityRegime(Enum):
@@ -80,6 +81,7 @@ class VolatilityPositionSizer:
 
         self.last_calculation = None
 
+    @instrumentation.timed('analyzer')
     def calculate_position_size(self, symbol: str, df: pd.DataFrame,
                                entry_price: float, stop_loss: float,
                                direction: str = 'BUY') -> Dict:
@@ -18,6 +18,7 @@ from core.verbose_mode_manager import vprint
 from core.demo_mode_manager import demo_mode_manager, is_demo_mode, get_demo_data
 from core.verbose_mode_manager import vprint
 from core.symbol_manager import symbol_specs_manager
+from core.instrumentation import instrumentation
 
 
 class VolatilityPositionWidget(AIAssistMixin, QWidget):
@@ -953,6 +954,7 @@ class VolatilityPositionWidget(AIAssistMixin, QWidget):
         self.sl_distance_label.setText("--")
         self.recommendation_label.setText("No data")
 
+    @instrumentation.timed('widget')
     def update_data(self):
         """Update widget with data based on current mode (demo/live)"""
         vprint(f"\n[VolatilityPosition] ====== Timer fired: update_data() ======")
@@ -4,7 +4,6 @@ Displays candlestick charts with Wyckoff LPS/LPSY overlays
 """
 
 import numpy as np
-from datetime import datetime
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QComboBox, QTextEdit, QSplitter)
 from PyQt6.QtCore import Qt
@@ -12,15 +11,20 @@ from PyQt6.QtGui import QFont
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
 import matplotlib.dates as mdates
 from core.verbose_mode_manager import vprint
 
-try:
-    import MetaTrader5 as mt5
-    MT5_AVAILABLE = True
-except ImportError:
-    MT5_AVAILABLE = False
+from core.lazy_loader import lazy_import
+from core.instrumentation import instrumentation
+from core.bar_resampler import bar_resampler
+from widgets.chart_transforms import bar_positions, date_numbers, plot_price, plot_volume
+
+# MetaTrader5 is imported on first use to keep startup fast
+mt5 = lazy_import('MetaTrader5')
+MT5_AVAILABLE = mt5 is not None
+
+# Bars drawn per chart
+CHART_BARS = 100
 
 
 class WyckoffChartWidget(QWidget):
@@ -170,7 +174,8 @@ class WyckoffChartWidget(QWidget):
         ax.spines['right'].set_visible(False)
         ax.spines['bottom'].set_visible(False)
         ax.spines['left'].set_visible(False)
-        self.canvas.draw()
+        with instrumentation.span('draw.WyckoffChartWidget'):
+            self.canvas.draw()
         
     def on_timeframe_changed(self, timeframe):
         """Handle timeframe change"""
@@ -189,6 +194,7 @@ class WyckoffChartWidget(QWidget):
         if self.wyckoff_data and self.current_symbol:
             self.plot_wyckoff_chart(self.current_symbol, self.wyckoff_data)
             
+    @instrumentation.timed('widget')
     def update_chart(self, symbol, wyckoff_data, main_chart_timeframe=None):
         """
         Update chart with Wyckoff analysis data
@@ -230,25 +236,10 @@ class WyckoffChartWidget(QWidget):
         if not MT5_AVAILABLE:
             self.show_error("MT5 not available")
             return
-            
-        # Get data for selected timeframe
-        tf_map = {
-            'M15': mt5.TIMEFRAME_M15,
-            'H1': mt5.TIMEFRAME_H1,
-            'H4': mt5.TIMEFRAME_H4,
-            'D1': mt5.TIMEFRAME_D1
-        }
-        
-        timeframe = tf_map.get(self.current_timeframe, mt5.TIMEFRAME_H4)
-        
-        # Get price data
-        if not mt5.initialize():
-            self.show_error("Failed to initialize MT5")
-            return
-            
-        rates = mt5.copy_rates_from_pos(symbol, timeframe, 0, 100)
-        mt5.shutdown()
-        
+
+        # Shared resampled history: switching type/symbol does not go back to the terminal
+        rates = bar_resampler.copy_rates(symbol, self.current_timeframe, CHART_BARS)
+
         if rates is None or len(rates) == 0:
             self.show_error(f"No data for {symbol}")
             return
@@ -265,24 +256,16 @@ class WyckoffChartWidget(QWidget):
         ax_price = self.figure.add_subplot(gs[0])
         ax_volume = self.figure.add_subplot(gs[1], sharex=ax_price)
         
-        # Convert timestamps to datetime
-        times = [datetime.fromtimestamp(r['time']) for r in rates]
-
-        # Plot price chart based on selected type
-        chart_type = self.chart_type_combo.currentText()
-        if chart_type == "Candlesticks":
-            self._plot_candlesticks(ax_price, times, rates)
-        elif chart_type == "OHLC Bars":
-            self._plot_ohlc_bars(ax_price, times, rates)
-        elif chart_type == "Line Chart":
-            self._plot_line_chart(ax_price, times, rates)
-        elif chart_type == "Heikin Ashi":
-            self._plot_heikin_ashi(ax_price, times, rates)
-        elif chart_type == "Area Chart":
-            self._plot_area_chart(ax_price, times, rates)
+        # Bar positions as matplotlib date numbers
+        times, spacing = bar_positions(rates['time'])
+
+        # Plot price chart based on selected type (a few collections per type)
+        plot_price(ax_price, self.chart_type_combo.currentText(), times, rates, spacing)
 
         # Plot volume
-        self._plot_volume(ax_volume, times, rates)
+        plot_volume(ax_volume, times, rates, spacing)
+        ax_volume.set_ylabel('Volume', color='#888', fontsize=10)
+        ax_volume.tick_params(colors='#888')
         
         # Overlay Wyckoff analysis
         if tf_wyckoff:
@@ -291,124 +274,20 @@ class WyckoffChartWidget(QWidget):
         # Style the chart
         self._style_chart(ax_price, ax_volume, symbol)
 
-        self.canvas.draw()
+        with instrumentation.span('draw.WyckoffChartWidget'):
+            self.canvas.draw()
 
         # Generate real-time educational analysis with actual numbers
         if tf_wyckoff:
             self._update_educational_analysis(symbol, rates, tf_wyckoff)
         
-    def _plot_candlesticks(self, ax, times, rates):
-        """Plot candlestick chart"""
-        # Prepare data
-        opens = rates['open']
-        highs = rates['high']
-        lows = rates['low']
-        closes = rates['close']
-        
-        # Calculate candle colors
-        colors = ['#00ff00' if c >= o else '#ff0000' for c, o in zip(closes, opens)]
-        
-        # Plot candles
-        width = 0.6
-        for i, (t, o, h, l, c, color) in enumerate(zip(times, opens, highs, lows, closes, colors)):
-            # Wick (high-low line)
-            ax.plot([t, t], [l, h], color='#666', linewidth=1, zorder=1)
-            
-            # Body (open-close rectangle)
-            height = abs(c - o)
-            bottom = min(o, c)
-            rect = Rectangle((mdates.date2num(t) - width/2, bottom), width, height,
-                           facecolor=color, edgecolor=color, alpha=0.8, zorder=2)
-            ax.add_patch(rect)
-
-    def _plot_ohlc_bars(self, ax, times, rates):
-        """Plot OHLC bar chart"""
-        opens = rates['open']
-        highs = rates['high']
-        lows = rates['low']
-        closes = rates['close']
-
-        colors = ['#00ff00' if c >= o else '#ff0000' for c, o in zip(closes, opens)]
-
-        width = 0.3
-        for t, o, h, l, c, color in zip(times, opens, highs, lows, closes, colors):
-            # Vertical line (high-low)
-            ax.plot([t, t], [l, h], color=color, linewidth=2, zorder=2)
-            # Open tick (left)
-            ax.plot([mdates.date2num(t) - width, t], [o, o], color=color, linewidth=2, zorder=2)
-            # Close tick (right)
-            ax.plot([t, mdates.date2num(t) + width], [c, c], color=color, linewidth=2, zorder=2)
-
-    def _plot_line_chart(self, ax, times, rates):
-        """Plot simple line chart (close prices only)"""
-        closes = rates['close']
-        ax.plot(times, closes, color='#00aaff', linewidth=2, zorder=2)
-        ax.fill_between(times, closes, alpha=0.1, color='#00aaff', zorder=1)
-
-    def _plot_heikin_ashi(self, ax, times, rates):
-        """Plot Heikin Ashi smoothed candles"""
-        opens = rates['open']
-        highs = rates['high']
-        lows = rates['low']
-        closes = rates['close']
-
-        # Calculate Heikin Ashi values
-        ha_close = (opens + highs + lows + closes) / 4
-        ha_open = np.zeros(len(opens))
-        ha_open[0] = (opens[0] + closes[0]) / 2
-
-        for i in range(1, len(opens)):
-            ha_open[i] = (ha_open[i-1] + ha_close[i-1]) / 2
-
-        ha_high = np.maximum(highs, np.maximum(ha_open, ha_close))
-        ha_low = np.minimum(lows, np.minimum(ha_open, ha_close))
-
-        # Calculate colors
-        colors = ['#00ff00' if ha_close[i] >= ha_open[i] else '#ff0000'
-                 for i in range(len(ha_close))]
-
-        # Plot Heikin Ashi candles
-        width = 0.6
-        for i, (t, o, h, l, c, color) in enumerate(zip(times, ha_open, ha_high, ha_low, ha_close, colors)):
-            # Wick
-            ax.plot([t, t], [l, h], color='#666', linewidth=1, zorder=1)
-            # Body
-            height = abs(c - o)
-            bottom = min(o, c)
-            rect = Rectangle((mdates.date2num(t) - width/2, bottom), width, height,
-                           facecolor=color, edgecolor=color, alpha=0.8, zorder=2)
-            ax.add_patch(rect)
-
-    def _plot_area_chart(self, ax, times, rates):
-        """Plot area chart (filled close prices)"""
-        closes = rates['close']
-
-        # Determine overall trend for color
-        if closes[-1] >= closes[0]:
-            color = '#00ff00'  # Green for uptrend
-        else:
-            color = '#ff0000'  # Red for downtrend
-
-        ax.plot(times, closes, color=color, linewidth=2, zorder=2)
-        ax.fill_between(times, closes, alpha=0.3, color=color, zorder=1)
-
-    def _plot_volume(self, ax, times, rates):
-        """Plot volume bars"""
-        volumes = rates['tick_volume']
-        colors = ['#00ff00' if c >= o else '#ff0000' 
-                 for c, o in zip(rates['close'], rates['open'])]
-        
-        ax.bar(times, volumes, color=colors, alpha=0.5, width=0.8)
-        ax.set_ylabel('Volume', color='#888', fontsize=10)
-        ax.tick_params(colors='#888')
-        
     def _overlay_wyckoff(self, ax, times, rates, wyckoff_data):
         """
         Overlay Wyckoff analysis on chart
 
         Args:
             ax: Matplotlib axis
-            times: List of datetime objects
+            times: Bar positions (matplotlib date numbers)
             rates: MT5 rates data
             wyckoff_data: Wyckoff analysis for this timeframe
         """
@@ -419,9 +298,9 @@ class WyckoffChartWidget(QWidget):
         vprint(f"[Wyckoff Chart] LPS/LPSY data: {lps_lpsy}")
 
         if lps_lpsy:
-            lps_index = lps_lpsy['index']
-            if lps_index < len(times):
-                lps_time = times[lps_index]
+            # Analysis windows can be longer than the chart: place markers by bar time
+            if lps_lpsy['time'] >= rates['time'][0]:
+                lps_time = date_numbers(lps_lpsy['time'])
                 lps_price = lps_lpsy['price']
                 lps_type = lps_lpsy['type']
                 
@@ -456,9 +335,8 @@ class WyckoffChartWidget(QWidget):
         event_explanations = self._get_event_explanations()
 
         for event in events[-10:]:  # Last 10 events
-            event_index = event['index']
-            if event_index < len(times):
-                event_time = times[event_index]
+            if event['time'] >= rates['time'][0]:
+                event_time = date_numbers(event['time'])
                 event_price = event['price']
                 event_type = event['event'].value
 
@@ -784,7 +662,8 @@ class WyckoffChartWidget(QWidget):
                 transform=ax.transAxes)
         ax.set_xticks([])
         ax.set_yticks([])
-        self.canvas.draw()
+        with instrumentation.span('draw.WyckoffChartWidget'):
+            self.canvas.draw()
 
     def _get_event_explanations(self) -> dict:
         """